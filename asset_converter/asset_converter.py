@@ -2,16 +2,62 @@
 """
 CK3 Coat of Arms Asset Converter - Entry Point
 
-Launches the asset converter GUI. All implementation lives in the src/ package.
+Launches the asset converter GUI, or with --watch re-bakes emblem and
+pattern DDS files as they change so a running editor can hot-reload them.
+All implementation lives in the src/ package.
+
+Arguments are parsed before the GUI is imported, so --help answers without
+loading PyQt5, PIL or NumPy. Unrecognised arguments are passed on to Qt.
 """
 
 import sys
 import os
+import argparse
 
 # Add parent directory to path so 'src' package is importable when run directly
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.gui import main
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert CK3 game and mod coat-of-arms assets for the editor."
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="Watch emblem/pattern DDS files and re-bake only those that change "
+             "(run a full conversion first); a running editor picks the changes up"
+    )
+    parser.add_argument('--ck3-dir', help="CK3 installation directory (with --watch)")
+    parser.add_argument('--mod-dir', help="Mod directory to include (with --watch)")
+    parser.add_argument('--output-dir', help="Converted assets directory, e.g. ck3_assets (with --watch)")
+    parser.add_argument(
+        '--interval', type=float, default=0.5,
+        help="Seconds between polls in watch mode (default: 0.5)"
+    )
+    args, unknown = parser.parse_known_args(argv)
+    if args.watch and not (args.ck3_dir and args.output_dir):
+        parser.error("--watch requires --ck3-dir and --output-dir")
+    return args, unknown
+
+
+def _watch(args):
+    from pathlib import Path
+    from src.mod_support import build_asset_sources
+    from src.watch_mode import AssetWatcher
+
+    mod_dir = Path(args.mod_dir) if args.mod_dir else None
+    sources = build_asset_sources(Path(args.ck3_dir), mod_dir)
+    AssetWatcher(sources, Path(args.output_dir)).run(interval=args.interval)
+
+
+def main():
+    args, _unknown = _parse_args()
+    if args.watch:
+        _watch(args)
+        return
+
+    from src.gui import main as gui_main
+    gui_main()
 
 
 if __name__ == '__main__':
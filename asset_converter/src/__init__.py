@@ -3,35 +3,63 @@ CK3 Coat of Arms Asset Converter - Package.
 
 Modules:
     ck3_parser        - CK3/Paradox script file parser
-    atlas_baking      - Emblem and pattern atlas creation
-    dds_loading       - DDS texture loading via imageio
-    mod_support       - Mod detection, asset sources, file discovery
+    atlas_baking      - Emblem and pattern atlas creation (batched baking engine)
+    dds_loading       - Built-in vectorized DDS reader (imageio fallback)
+    mod_support       - Mod detection, asset sources, single-pass file index
+    search_index      - Emblem search database for the editor sidebar
+    emblem_geometry   - Tight alpha bounds and occupancy masks of emblems
+    watch_mode        - Re-bake changed emblems/patterns for editor hot-reload
+    output_layout     - Output directory layout shared with the editor
     converter_worker  - QThread conversion pipeline
     gui               - PyQt5 GUI window
 """
 
-from .ck3_parser import CK3Parser, parse_ck3_file
-from .atlas_baking import create_emblem_atlas, create_pattern_atlas
-from .dds_loading import load_dds_image, HAS_IMAGEIO
-from .mod_support import (
-    ModAssetSource,
-    parse_mod_file,
-    detect_coa_assets,
-    scan_mod_files,
-    build_asset_sources,
-    find_asset_files,
-    merge_metadata_simple,
-)
-from .converter_worker import ConversionWorker
-from .gui import AssetConverterGUI, main
+import importlib
+
+# Exports are resolved on first access (PEP 562) so that importing one
+# module - e.g. the editor's headless renderer importing ck3_parser - does
+# not drag in PyQt5, PIL, NumPy and imageio through the GUI and worker.
+_EXPORTS = {
+    'CK3Parser': 'ck3_parser', 'parse_ck3_file': 'ck3_parser',
+    'create_emblem_atlas': 'atlas_baking', 'create_pattern_atlas': 'atlas_baking',
+    'bake_emblem_atlases': 'atlas_baking', 'bake_pattern_atlases': 'atlas_baking',
+    'load_dds_image': 'dds_loading', 'convert_dds_file': 'dds_loading', 'read_dds': 'dds_loading', 'HAS_IMAGEIO': 'dds_loading',
+    'ModAssetSource': 'mod_support', 'ModAssetIndex': 'mod_support',
+    'parse_mod_file': 'mod_support',
+    'detect_coa_assets': 'mod_support', 'scan_mod_files': 'mod_support',
+    'build_asset_sources': 'mod_support', 'find_asset_files': 'mod_support',
+    'merge_metadata_simple': 'mod_support',
+    'build_search_index': 'search_index',
+    'compute_alpha_geometry': 'emblem_geometry',
+    'AssetWatcher': 'watch_mode',
+    'ConversionWorker': 'converter_worker',
+    'AssetConverterGUI': 'gui', 'main': 'gui',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     'CK3Parser', 'parse_ck3_file',
     'create_emblem_atlas', 'create_pattern_atlas',
-    'load_dds_image', 'HAS_IMAGEIO',
-    'ModAssetSource', 'parse_mod_file', 'detect_coa_assets',
+    'bake_emblem_atlases', 'bake_pattern_atlases',
+    'load_dds_image', 'convert_dds_file', 'read_dds', 'HAS_IMAGEIO',
+    'ModAssetSource', 'ModAssetIndex', 'parse_mod_file', 'detect_coa_assets',
     'scan_mod_files', 'build_asset_sources', 'find_asset_files',
     'merge_metadata_simple',
+    'build_search_index',
+    'AssetWatcher',
     'ConversionWorker',
     'AssetConverterGUI', 'main',
 ]
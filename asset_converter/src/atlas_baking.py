@@ -6,14 +6,36 @@ composites them into atlas sheets for use by the editor's shaders.
 
 Emblem Atlas (512x512): 4 quadrants - Red(0,0), Green(256,0), Blue(0,256), Alpha(256,256)
 Pattern Atlas (512x256): 2 tiles - Green(0,0), Blue(256,0)
+
+The per-channel extractors below define what each quadrant contains. The
+baking engine (bake_emblem_atlases / bake_pattern_atlases) produces the
+same bytes for a whole stack of tiles with integer arithmetic written
+straight into a preallocated output, with no float conversion and no
+intermediate quadrant images.
 """
 
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional
 
 import numpy as np
 from PIL import Image
 
 
+TILE_SIZE = 256
+
+
+def resize_to_tile(img_array: np.ndarray) -> np.ndarray:
+    """LANCZOS-resize a source image to TILE_SIZE x TILE_SIZE if needed.
+
+    This is the only resize in the pipeline; the converter saves the
+    result as the source PNG and bakes the atlas from the same array.
+    """
+    h, w = img_array.shape[:2]
+    if h == TILE_SIZE and w == TILE_SIZE:
+        return img_array
+    img = Image.fromarray(img_array)
+    return np.array(img.resize((TILE_SIZE, TILE_SIZE), Image.Resampling.LANCZOS))
+
+
 # ============================================================================
 # EMBLEM CHANNEL EXTRACTORS
 # ============================================================================
@@ -95,28 +117,8 @@ def create_emblem_atlas(img_array: np.ndarray) -> Image.Image:
         Red   (0,0)     Green (256,0)
         Blue  (0,256)   Alpha (256,256)
     """
-    atlas = Image.new('RGBA', (512, 512), (0, 0, 0, 0))
-    
-    # Resize source to 256x256 if needed
-    h, w = img_array.shape[:2]
-    if h != 256 or w != 256:
-        img = Image.fromarray(img_array)
-        img = img.resize((256, 256), Image.Resampling.LANCZOS)
-        img_array = np.array(img)
-    
-    positions = {
-        'red': (0, 0),
-        'green': (256, 0),
-        'blue': (0, 256),
-        'alpha': (256, 256)
-    }
-    
-    for channel, extractor in QUADRANT_EXTRACTORS.items():
-        rgba_quadrant = extractor(img_array)
-        quadrant_img = Image.fromarray(rgba_quadrant, mode='RGBA')
-        atlas.paste(quadrant_img, positions[channel])
-    
-    return atlas
+    tile = resize_to_tile(img_array)
+    return Image.fromarray(bake_emblem_atlases(tile[np.newaxis])[0], mode='RGBA')
 
 
 # ============================================================================
@@ -155,19 +157,124 @@ def create_pattern_atlas(img_array: np.ndarray) -> Image.Image:
     Tile layout:
         Green (0,0)   Blue (256,0)
     """
-    atlas = Image.new('RGBA', (512, 256), (0, 0, 0, 0))
-    
-    # Resize source to 256x256 if needed
-    h, w = img_array.shape[:2]
-    if h != 256 or w != 256:
-        img = Image.fromarray(img_array)
-        img = img.resize((256, 256), Image.Resampling.LANCZOS)
-        img_array = np.array(img)
-    
-    green_tile = Image.fromarray(extract_green_tile(img_array), mode='RGBA')
-    blue_tile = Image.fromarray(extract_blue_tile(img_array), mode='RGBA')
-    
-    atlas.paste(green_tile, (0, 0))
-    atlas.paste(blue_tile, (256, 0))
-    
-    return atlas
+    tile = resize_to_tile(img_array)
+    return Image.fromarray(bake_pattern_atlases(tile[np.newaxis])[0], mode='RGBA')
+
+
+# ============================================================================
+# BATCHED BAKING ENGINE
+# ============================================================================
+# Each RGBA pixel is handled as one little-endian uint32 word
+# (r | g << 8 | b << 16 | a << 24), so a quadrant is a handful of integer
+# ops on a 256x256 word array. The extractors' float32 r*a product
+# truncates to exactly (r*a) // 255 for every uint8 pair, computed here as
+# (x * 0x8081) >> 23 (exact for x <= 255*255).
+
+_WHITE = 0x00FFFFFF
+
+
+def _rgba_words(tile: np.ndarray) -> np.ndarray:
+    """View one 256x256 tile (RGBA, RGB or grayscale uint8) as uint32 words."""
+    if tile.ndim == 2:
+        tile = np.repeat(tile[:, :, np.newaxis], 3, axis=2)
+    if tile.shape[2] == 3:
+        tile = np.concatenate([tile, np.full(tile.shape[:2] + (1,), 255, dtype=np.uint8)], axis=2)
+    return np.ascontiguousarray(tile).view('<u4')[:, :, 0]
+
+
+def _check_stack(images: np.ndarray):
+    if images.dtype != np.uint8:
+        raise ValueError(f"expected uint8 tiles, got {images.dtype}")
+    if images.ndim not in (3, 4) or images.shape[1:3] != (TILE_SIZE, TILE_SIZE) \
+            or (images.ndim == 4 and images.shape[3] not in (3, 4)):
+        raise ValueError(f"expected (N, {TILE_SIZE}, {TILE_SIZE}[, 3|4]) stack, got {images.shape}")
+
+
+def _check_out(out: Optional[np.ndarray], shape) -> np.ndarray:
+    if out is None:
+        return np.empty(shape, dtype=np.uint8)
+    if out.shape != shape or out.dtype != np.uint8 or not out.flags.c_contiguous:
+        raise ValueError(f"out must be a C-contiguous uint8 {shape} array, got {out.dtype} {out.shape}")
+    return out
+
+
+def _times_alpha(words: np.ndarray, alpha: np.ndarray, shift: int, scratch: np.ndarray) -> np.ndarray:
+    """White with channel*alpha/255 as alpha, for the channel at bit `shift`."""
+    np.right_shift(words, shift, out=scratch)
+    scratch &= 0xFF
+    scratch *= alpha
+    scratch *= 0x8081
+    scratch >>= 23
+    scratch <<= 24
+    scratch |= _WHITE
+    return scratch
+
+
+def bake_emblem_atlases(images: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Bake emblem atlases for a stack of 256x256 tiles.
+
+    Byte-for-byte identical to create_emblem_atlas() on each tile.
+
+    Args:
+        images: uint8 stack (N, 256, 256, 4|3) or grayscale (N, 256, 256),
+            already resized (see resize_to_tile)
+        out: Optional preallocated uint8 (N, 512, 512, 4) array to fill
+
+    Returns:
+        uint8 array (N, 512, 512, 4) of RGBA atlases
+    """
+    _check_stack(images)
+    t = TILE_SIZE
+    out = _check_out(out, (images.shape[0], 2 * t, 2 * t, 4))
+    out_words = out.view('<u4')[..., 0]
+    alpha = np.empty((t, t), dtype=np.uint32)
+    scratch = np.empty((t, t), dtype=np.uint32)
+
+    # One tile at a time keeps the scratch arrays in cache
+    for tile, atlas in zip(images, out_words):
+        words = _rgba_words(tile)
+        np.right_shift(words, 24, out=alpha)
+        atlas[:t, :t] = _times_alpha(words, alpha, 0, scratch)
+        atlas[:t, t:] = _times_alpha(words, alpha, 8, scratch)
+
+        # Blue: min(b*2, 255) as grey, original alpha
+        np.right_shift(words, 15, out=scratch)
+        scratch &= 0x1FE
+        np.minimum(scratch, 255, out=scratch)
+        scratch *= 0x010101
+        atlas[t:, :t] = scratch | (words & 0xFF000000)
+
+        # Alpha: white with 255 - a (the top byte of ~words)
+        np.invert(words, out=scratch)
+        scratch |= _WHITE
+        atlas[t:, t:] = scratch
+    return out
+
+
+def bake_pattern_atlases(images: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Bake pattern atlases for a stack of 256x256 tiles.
+
+    Byte-for-byte identical to create_pattern_atlas() on each tile.
+
+    Args:
+        images: uint8 stack (N, 256, 256, 4|3) or grayscale (N, 256, 256),
+            already resized (see resize_to_tile)
+        out: Optional preallocated uint8 (N, 256, 512, 4) array to fill
+
+    Returns:
+        uint8 array (N, 256, 512, 4) of RGBA atlases
+    """
+    _check_stack(images)
+    t = TILE_SIZE
+    out = _check_out(out, (images.shape[0], t, 2 * t, 4))
+    out_words = out.view('<u4')[..., 0]
+    scratch = np.empty((t, t), dtype=np.uint32)
+
+    for tile, atlas in zip(images, out_words):
+        words = _rgba_words(tile)
+        for shift, columns in ((16, slice(0, t)), (8, slice(t, 2 * t))):  # green, blue
+            np.left_shift(words, shift, out=scratch)
+            scratch &= 0xFF000000
+            scratch |= _WHITE
+            atlas[:, columns] = scratch
+    return out
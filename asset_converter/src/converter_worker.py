@@ -19,8 +19,11 @@ from PIL import Image
 
 from .ck3_parser import parse_ck3_file
 from .atlas_baking import create_emblem_atlas, create_pattern_atlas
-from .dds_loading import load_dds_image
+from .dds_loading import convert_dds_file, load_dds_image
+from .emblem_geometry import apply_alpha_geometry, compute_alpha_geometry
 from .mod_support import ModAssetSource, build_asset_sources, find_asset_files, merge_metadata_simple
+from .output_layout import EMBLEM_METADATA_PATH, PATTERN_METADATA_PATH
+from .search_index import INDEX_FILENAME as SEARCH_INDEX_FILENAME, build_search_index
 
 
 class ConversionWorker(QThread):
@@ -42,6 +45,9 @@ class ConversionWorker(QThread):
         # Per-source asset counts for content manifest
         self.source_counts = {source.name: {} for source in self.asset_sources}
         
+        # Tight alpha bounds/occupancy per emblem .dds name, merged into the metadata
+        self.emblem_geometry = {}
+        
         for src in self.asset_sources:
             print(f"DEBUG Source: {src.name}")
             print(f"  Path: {src.path}")
@@ -168,6 +174,7 @@ class ConversionWorker(QThread):
         label: str,
         atlas_fn: Optional[Callable] = None,
         source_size: Optional[Tuple[int, int]] = (256, 256),
+        source_fn: Optional[Callable] = None,
     ) -> bool:
         """Generic DDS-to-PNG processor for all asset types.
         
@@ -178,6 +185,7 @@ class ConversionWorker(QThread):
             label: Human-readable label for progress messages
             atlas_fn: Optional callable(np.ndarray) -> Image to bake an atlas per file
             source_size: Resize source PNG to this size, or None to keep original
+            source_fn: Optional callable(dds filename, np.ndarray) given each saved source
         """
         try:
             out_dir = self.output_dir / output_subdir
@@ -216,22 +224,15 @@ class ConversionWorker(QThread):
                     source_png = out_dir / f"{base_name}.png"
                     atlas_png = atlas_out / f"{base_name}_atlas.png" if atlas_out else None
                     
-                    img_array = load_dds_image(dds_file)
-                    if img_array is None:
-                        self.log_error(f"Failed to load DDS from {source.name}: {dds_file.name}")
-                        errors += 1
-                        continue
+                    on_source = None
+                    if source_fn:
+                        on_source = lambda pixels, name=dds_file.name: source_fn(name, pixels)
                     
                     try:
-                        img = Image.fromarray(img_array, mode='RGBA')
-                        if source_size and img.size != source_size:
-                            img = img.resize(source_size, Image.Resampling.LANCZOS)
-                        img.save(source_png, 'PNG')
-                        
-                        if atlas_png and atlas_fn:
-                            atlas = atlas_fn(img_array)
-                            atlas.save(atlas_png, 'PNG')
-                        
+                        if not convert_dds_file(dds_file, source_png, atlas_png, atlas_fn, source_size, on_source):
+                            self.log_error(f"Failed to load DDS from {source.name}: {dds_file.name}")
+                            errors += 1
+                            continue
                         processed += 1
                     except Exception as e:
                         self.log_error(f"Error processing {dds_file.name} from {source.name}: {str(e)}")
@@ -254,7 +255,12 @@ class ConversionWorker(QThread):
     # ========================================================================
     
     def process_emblems_from_sources(self) -> bool:
-        return self._process_dds_assets('emblems', 'has_emblems', 'coa_emblems/source', 'emblems', atlas_fn=create_emblem_atlas)
+        return self._process_dds_assets('emblems', 'has_emblems', 'coa_emblems/source', 'emblems',
+                                        atlas_fn=create_emblem_atlas, source_fn=self._record_emblem_geometry)
+    
+    def _record_emblem_geometry(self, filename: str, pixels):
+        # Later sources overwrite earlier ones, like the PNG itself
+        self.emblem_geometry[filename] = compute_alpha_geometry(pixels)
     
     def process_patterns_from_sources(self) -> bool:
         return self._process_dds_assets('patterns', 'has_patterns', 'coa_patterns/source', 'patterns', atlas_fn=create_pattern_atlas)
@@ -285,15 +291,7 @@ class ConversionWorker(QThread):
                 
                 self.progress.emit(f"Extracting frame transforms from {source.name}...", 0, 0)
                 
-                if source.is_base_game:
-                    culture_dir = source.path / "game" / "common" / "culture" / "cultures"
-                else:
-                    culture_dir = source.path / "common" / "culture" / "cultures"
-                
-                if not culture_dir.exists():
-                    continue
-                
-                culture_files = list(culture_dir.glob("*.txt"))
+                culture_files = find_asset_files(source, 'culture_files')
                 
                 for i, filepath in enumerate(culture_files):
                     self.progress.emit(f"Parsing {filepath.name} from {source.name}...", i, len(culture_files))
@@ -532,46 +530,45 @@ class ConversionWorker(QThread):
             patterns_metadata = {}
             
             for source in self.asset_sources:
-                if source.is_base_game:
-                    metadata_dir = source.path / "game" / "gfx" / "coat_of_arms"
-                else:
-                    metadata_dir = source.path / "gfx" / "coat_of_arms"
-                
                 self.progress.emit(f"Converting metadata from {source.name}...", 0, 0)
                 
                 if source.has_emblem_metadata:
-                    emblems_dir = metadata_dir / "colored_emblems"
-                    if emblems_dir.exists():
-                        emblem_txt_files = list(emblems_dir.glob("*.txt"))
-                        for txt_file in emblem_txt_files:
-                            self.progress.emit(f"Parsing {txt_file.name} from {source.name}...", 0, 0)
-                            try:
-                                data = parse_ck3_file(txt_file)
-                                emblems_metadata = merge_metadata_simple(emblems_metadata, data, source.name)
-                            except Exception as e:
-                                self.log_error(f"Error parsing {txt_file.name} from {source.name}: {e}")
+                    for txt_file in find_asset_files(source, 'emblem_metadata'):
+                        self.progress.emit(f"Parsing {txt_file.name} from {source.name}...", 0, 0)
+                        try:
+                            data = parse_ck3_file(txt_file)
+                            emblems_metadata = merge_metadata_simple(emblems_metadata, data, source.name)
+                        except Exception as e:
+                            self.log_error(f"Error parsing {txt_file.name} from {source.name}: {e}")
                 
                 if source.has_pattern_metadata:
-                    patterns_dir = metadata_dir / "patterns"
-                    if patterns_dir.exists():
-                        pattern_txt_files = list(patterns_dir.glob("*.txt"))
-                        for txt_file in pattern_txt_files:
-                            self.progress.emit(f"Parsing {txt_file.name} from {source.name}...", 0, 0)
-                            try:
-                                data = parse_ck3_file(txt_file)
-                                patterns_metadata = merge_metadata_simple(patterns_metadata, data, source.name)
-                            except Exception as e:
-                                self.log_error(f"Error parsing {txt_file.name} from {source.name}: {e}")
+                    for txt_file in find_asset_files(source, 'pattern_metadata'):
+                        self.progress.emit(f"Parsing {txt_file.name} from {source.name}...", 0, 0)
+                        try:
+                            data = parse_ck3_file(txt_file)
+                            patterns_metadata = merge_metadata_simple(patterns_metadata, data, source.name)
+                        except Exception as e:
+                            self.log_error(f"Error parsing {txt_file.name} from {source.name}: {e}")
             
             if emblems_metadata:
-                output_path = self.output_dir / "coa_emblems" / "metadata" / "50_coa_designer_emblems.json"
+                measured = apply_alpha_geometry(emblems_metadata, self.emblem_geometry)
+                self.progress.emit(f"Emblem alpha bounds: {measured} entries", 0, 0)
+                
+                output_path = self.output_dir / EMBLEM_METADATA_PATH
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(output_path, 'w', encoding='utf-8') as f:
                     json.dump(emblems_metadata, f, indent=2)
                 self.progress.emit(f"Emblems metadata: {len(emblems_metadata)} entries", 0, 0)
+                
+                # Search index for the editor's asset sidebar (non-critical)
+                try:
+                    indexed = build_search_index(emblems_metadata, output_path.parent / SEARCH_INDEX_FILENAME)
+                    self.progress.emit(f"Emblem search index: {indexed} entries", 0, 0)
+                except Exception as e:
+                    self.log_error(f"Failed to build emblem search index: {e}")
             
             if patterns_metadata:
-                output_path = self.output_dir / "coa_patterns" / "metadata" / "50_coa_designer_patterns.json"
+                output_path = self.output_dir / PATTERN_METADATA_PATH
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(output_path, 'w', encoding='utf-8') as f:
                     json.dump(patterns_metadata, f, indent=2)
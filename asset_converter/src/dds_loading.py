@@ -1,63 +1,704 @@
 """
 DDS image loading utilities.
 
-Loads DDS texture files using imageio and converts them to RGBA numpy arrays
-for further processing by the atlas baking and conversion pipeline.
+Reads DDS texture files into RGBA numpy arrays for the atlas baking and
+conversion pipeline. The reader is built in: the header is parsed here,
+the file is memory-mapped, and block-compressed data is decoded with NumPy
+operations over all blocks of the image at once.
+
+Supported formats (top mip level only):
+    BC1 (DXT1), BC2 (DXT3), BC3 (DXT5), BC4 (ATI1), BC5 (ATI2), BC7
+    Uncompressed RGB/RGBA/luminance with 8-32 bits per pixel (any masks)
+    The DX10-header (DXGI) equivalents of the above
+
+Decoding follows Pillow's BCn decoder bit for bit, so PNGs come out the
+same as through imageio. load_dds_image() picks the faster decoder per
+format: Pillow's C decoder (through imageio) for block-compressed data,
+this reader for uncompressed data, where imageio is orders of magnitude
+slower. Without imageio every supported format uses this reader; imageio
+also covers formats this reader lacks (e.g. BC6H, float textures).
+benchmarks/converter.py compares both decoders per format.
 """
 
+import mmap
+import struct
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 
-try:
-    import imageio
-    import imageio.v3 as iio
-    HAS_IMAGEIO = True
-except ImportError:
-    HAS_IMAGEIO = False
+HAS_IMAGEIO = find_spec("imageio") is not None
+
+
+class UnsupportedDDSFormat(ValueError):
+    """The DDS file uses a pixel format the built-in reader cannot decode."""
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Header
+# ══════════════════════════════════════════════════════════════════════════
+
+_MAGIC = b"DDS "
+_HEADER_SIZE = 124
+_DX10_HEADER_SIZE = 20
+
+_DDSD_PITCH = 0x8
+_DDPF_ALPHAPIXELS = 0x1
+_DDPF_FOURCC = 0x4
+_DDPF_RGB = 0x40
+_DDPF_LUMINANCE = 0x20000
+
+# FourCC / DXGI format -> block codec name
+_FOURCC_CODECS = {
+    b"DXT1": "bc1", b"DXT2": "bc2", b"DXT3": "bc2", b"DXT4": "bc3", b"DXT5": "bc3",
+    b"ATI1": "bc4", b"BC4U": "bc4", b"ATI2": "bc5", b"BC5U": "bc5",
+}
+_DXGI_CODECS = {
+    70: "bc1", 71: "bc1", 72: "bc1",
+    73: "bc2", 74: "bc2", 75: "bc2",
+    76: "bc3", 77: "bc3", 78: "bc3",
+    79: "bc4", 80: "bc4",
+    82: "bc5", 83: "bc5",
+    97: "bc7", 98: "bc7", 99: "bc7",
+}
+# DXGI uncompressed formats as (bits per pixel, R, G, B, A masks)
+_DXGI_UNCOMPRESSED = {
+    27: (32, 0xFF, 0xFF00, 0xFF0000, 0xFF000000),  # R8G8B8A8_TYPELESS
+    28: (32, 0xFF, 0xFF00, 0xFF0000, 0xFF000000),  # R8G8B8A8_UNORM
+    29: (32, 0xFF, 0xFF00, 0xFF0000, 0xFF000000),  # R8G8B8A8_UNORM_SRGB
+    87: (32, 0xFF0000, 0xFF00, 0xFF, 0xFF000000),  # B8G8R8A8_UNORM
+    88: (32, 0xFF0000, 0xFF00, 0xFF, 0),           # B8G8R8X8_UNORM
+    90: (32, 0xFF0000, 0xFF00, 0xFF, 0xFF000000),  # B8G8R8A8_TYPELESS
+    91: (32, 0xFF0000, 0xFF00, 0xFF, 0xFF000000),  # B8G8R8A8_UNORM_SRGB
+    92: (32, 0xFF0000, 0xFF00, 0xFF, 0),           # B8G8R8X8_TYPELESS
+    93: (32, 0xFF0000, 0xFF00, 0xFF, 0),           # B8G8R8X8_UNORM_SRGB
+    61: (8, 0xFF, 0, 0, 0),                        # R8_UNORM (as luminance)
+}
+
+# Bytes per 4x4 block
+_BLOCK_BYTES = {"bc1": 8, "bc2": 16, "bc3": 16, "bc4": 8, "bc5": 16, "bc7": 16}
+
+
+def _parse_header(buf) -> dict:
+    """Describe the top mip level of a DDS file.
+
+    Returns:
+        Dict with width, height, offset and either codec (block formats)
+        or bpp/masks/luminance/pitch (uncompressed)
+
+    Raises:
+        UnsupportedDDSFormat: Not a DDS file, or a format we cannot decode
+    """
+    if len(buf) < 4 + _HEADER_SIZE or buf[:4] != _MAGIC:
+        raise UnsupportedDDSFormat("not a DDS file")
+    (size, flags, height, width, pitch) = struct.unpack_from("<5I", buf, 4)
+    if size != _HEADER_SIZE:
+        raise UnsupportedDDSFormat(f"bad header size {size}")
+    pf_flags, fourcc, bpp, r_mask, g_mask, b_mask, a_mask = struct.unpack_from("<I4s5I", buf, 80)
+
+    info = {'width': width, 'height': height, 'offset': 4 + _HEADER_SIZE}
+
+    if pf_flags & _DDPF_FOURCC:
+        if fourcc == b"DX10":
+            (dxgi,) = struct.unpack_from("<I", buf, 4 + _HEADER_SIZE)
+            info['offset'] += _DX10_HEADER_SIZE
+            if dxgi in _DXGI_CODECS:
+                info['codec'] = _DXGI_CODECS[dxgi]
+                return info
+            if dxgi in _DXGI_UNCOMPRESSED:
+                bpp, r_mask, g_mask, b_mask, a_mask = _DXGI_UNCOMPRESSED[dxgi]
+                info.update(bpp=bpp, masks=(r_mask, g_mask, b_mask, a_mask),
+                            luminance=dxgi == 61, pitch=(width * bpp + 7) // 8)
+                return info
+            raise UnsupportedDDSFormat(f"DXGI format {dxgi}")
+        if fourcc in _FOURCC_CODECS:
+            info['codec'] = _FOURCC_CODECS[fourcc]
+            return info
+        raise UnsupportedDDSFormat(f"FourCC {fourcc!r}")
+
+    if pf_flags & (_DDPF_RGB | _DDPF_LUMINANCE) and bpp in (8, 16, 24, 32):
+        if not pf_flags & _DDPF_ALPHAPIXELS:
+            a_mask = 0
+        row_bytes = (width * bpp + 7) // 8
+        info.update(bpp=bpp, masks=(r_mask, g_mask, b_mask, a_mask),
+                    luminance=bool(pf_flags & _DDPF_LUMINANCE),
+                    pitch=pitch if flags & _DDSD_PITCH and pitch >= row_bytes else row_bytes)
+        return info
+
+    raise UnsupportedDDSFormat(f"pixel format flags 0x{pf_flags:x}, {bpp} bpp")
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Reading
+# ══════════════════════════════════════════════════════════════════════════
+
+def read_dds_info(dds_path: Path) -> dict:
+    """Parse only the header of a DDS file.
+
+    Returns:
+        See _parse_header(): 'codec' is present for block-compressed formats
+
+    Raises:
+        UnsupportedDDSFormat: Not a DDS file, or a format read_dds() cannot decode
+        OSError: File cannot be read
+    """
+    with open(dds_path, "rb") as f:
+        head = f.read(4 + _HEADER_SIZE + _DX10_HEADER_SIZE)
+    return _parse_header(head)
+
+
+def read_dds(dds_path: Path) -> np.ndarray:
+    """Decode the top mip level of a DDS file with the built-in reader.
+
+    Args:
+        dds_path: Path to the DDS file
+
+    Returns:
+        RGBA uint8 array (h, w, 4)
+
+    Raises:
+        UnsupportedDDSFormat: Unknown or unsupported pixel format
+        ValueError: Truncated file
+        OSError: File cannot be read
+    """
+    with open(dds_path, "rb") as f:
+        size = f.seek(0, 2)
+        if size < 4 + _HEADER_SIZE:
+            raise UnsupportedDDSFormat("not a DDS file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            info = _parse_header(mm)
+            width, height, offset = info['width'], info['height'], info['offset']
+            if 'codec' in info:
+                blocks_x, blocks_y = (width + 3) // 4, (height + 3) // 4
+                nbytes = blocks_x * blocks_y * _BLOCK_BYTES[info['codec']]
+            else:
+                nbytes = info['pitch'] * height
+            if offset + nbytes > size:
+                raise ValueError(f"truncated DDS data ({size} bytes, need {offset + nbytes})")
+            # Copy just the top level out of the mapping (mip chain stays unread)
+            data = np.frombuffer(mm, dtype=np.uint8, count=nbytes, offset=offset).copy()
+
+    if 'codec' in info:
+        return decode_blocks(data, info['codec'], width, height)
+    return _decode_uncompressed(data, info, width, height)
+
+
+def decode_blocks(data: np.ndarray, codec: str, width: int, height: int) -> np.ndarray:
+    """Decode block-compressed data to RGBA.
+
+    Args:
+        data: Raw block bytes (uint8), blocks in row-major order
+        codec: 'bc1', 'bc2', 'bc3', 'bc4', 'bc5' or 'bc7'
+        width, height: Image size in pixels
+
+    Returns:
+        RGBA uint8 array (height, width, 4)
+    """
+    blocks_x, blocks_y = (width + 3) // 4, (height + 3) // 4
+    blocks = np.asarray(data, dtype=np.uint8).reshape(blocks_x * blocks_y, _BLOCK_BYTES[codec])
+
+    # Pixels are handled as packed little-endian RGBA words, (blocks, 16) uint32
+    if codec == "bc1":
+        pixels = _decode_bc1_color(blocks, four_color_only=False)
+    elif codec == "bc2":
+        alpha = np.stack([blocks[:, :8] & 0x0F, blocks[:, :8] >> 4], axis=2).reshape(-1, 16) * 17
+        pixels = _with_alpha(_decode_bc1_color(blocks[:, 8:], four_color_only=True), alpha)
+    elif codec == "bc3":
+        pixels = _with_alpha(_decode_bc1_color(blocks[:, 8:], four_color_only=True),
+                             _decode_bc4_channel(blocks[:, :8]))
+    elif codec == "bc4":
+        red = _decode_bc4_channel(blocks).astype(np.uint32)
+        pixels = red | (red << 8) | (red << 16) | np.uint32(0xFF000000)
+    elif codec == "bc5":
+        pixels = (_decode_bc4_channel(blocks[:, :8]).astype(np.uint32)
+                  | (_decode_bc4_channel(blocks[:, 8:]).astype(np.uint32) << 8)
+                  | np.uint32(0xFF000000))
+    elif codec == "bc7":
+        pixels = _decode_bc7(blocks).view(np.uint32)[:, :, 0]
+    else:
+        raise UnsupportedDDSFormat(f"codec {codec}")
+
+    # (block row, block col, y, x) -> (row, col)
+    image = pixels.reshape(blocks_y, blocks_x, 4, 4).transpose(0, 2, 1, 3)
+    image = image.reshape(blocks_y * 4, blocks_x * 4)[:height, :width]
+    return np.ascontiguousarray(image).view(np.uint8).reshape(height, width, 4)
+
+
+def _decode_uncompressed(data: np.ndarray, info: dict, width: int, height: int) -> np.ndarray:
+    bpp, pitch = info['bpp'], info['pitch']
+    pixel_bytes = bpp // 8
+    rows = data.reshape(height, pitch)[:, :width * pixel_bytes].reshape(height, width, pixel_bytes)
+
+    # Little-endian pixel words
+    words = np.zeros((height, width), dtype=np.uint32)
+    for i in range(pixel_bytes):
+        words |= rows[:, :, i].astype(np.uint32) << np.uint32(8 * i)
+
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    channels = [_mask_channel(words, mask) for mask in info['masks']]
+    if info['luminance']:
+        channels[1] = channels[2] = channels[0]
+    for i, channel in enumerate(channels):
+        if channel is None:
+            rgba[:, :, i] = 255 if i == 3 else 0
+        else:
+            rgba[:, :, i] = channel
+    return rgba
+
+
+def _mask_channel(words: np.ndarray, mask: int) -> Optional[np.ndarray]:
+    """Extract a masked channel and scale it to 8 bits (None for mask 0)."""
+    if not mask:
+        return None
+    shift = (mask & -mask).bit_length() - 1
+    maximum = mask >> shift
+    values = (words & np.uint32(mask)) >> np.uint32(shift)
+    if maximum == 255:
+        return values.astype(np.uint8)
+    return ((values.astype(np.uint64) * 255 + maximum // 2) // maximum).astype(np.uint8)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# BC1-BC5
+# ══════════════════════════════════════════════════════════════════════════
+
+# 2-bit indices of one byte, least significant first
+_INDEX_2_LUT = ((np.arange(256)[:, None] >> np.arange(0, 8, 2)) & 3).astype(np.intp)
+_SHIFTS_3 = np.arange(0, 24, 3, dtype=np.uint32)
+
+
+def _decode_bc1_color(blocks: np.ndarray, four_color_only: bool) -> np.ndarray:
+    """BC1 color blocks (8 bytes each) -> (n, 16) packed RGBA.
+
+    BC2/BC3 embed BC1 color blocks that always use four-color mode.
+    """
+    n = len(blocks)
+    c0 = blocks[:, 0].astype(np.uint32) | (blocks[:, 1].astype(np.uint32) << 8)
+    c1 = blocks[:, 2].astype(np.uint32) | (blocks[:, 3].astype(np.uint32) << 8)
+    p0 = _expand_565(c0)
+    p1 = _expand_565(c1)
+
+    four = np.ones(n, dtype=bool) if four_color_only else c0 > c1
+    p2 = np.where(four, (2 * p0 + p1) // 3, (p0 + p1) // 2)
+    p3 = (p0 + 2 * p1) // 3
+
+    palette = np.empty((n, 4), dtype=np.uint32)
+    palette[:, 0] = _pack_rgb(p0)
+    palette[:, 1] = _pack_rgb(p1)
+    palette[:, 2] = _pack_rgb(p2)
+    palette[:, 3] = np.where(four, _pack_rgb(p3), 0)  # three-color mode: transparent black
+    palette[:, :3] |= np.uint32(0xFF000000)
+    palette[four, 3] |= np.uint32(0xFF000000)
+
+    indices = _INDEX_2_LUT[blocks[:, 4:8]].reshape(n, 16)
+    indices += np.arange(0, 4 * n, 4)[:, None]
+    return palette.ravel()[indices]
+
+
+def _expand_565(color: np.ndarray) -> np.ndarray:
+    """RGB565 -> (3, n) 8-bit channel values."""
+    r = (color >> 11) & 0x1F
+    g = (color >> 5) & 0x3F
+    b = color & 0x1F
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)])
+
+
+def _pack_rgb(channels: np.ndarray) -> np.ndarray:
+    return channels[0] | (channels[1] << 8) | (channels[2] << 16)
+
+
+def _with_alpha(pixels: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    return (pixels & np.uint32(0x00FFFFFF)) | (alpha.astype(np.uint32) << 24)
+
+
+def _decode_bc4_channel(blocks: np.ndarray) -> np.ndarray:
+    """BC4 / BC3-alpha blocks (8 bytes each) -> (n, 16) uint8."""
+    n = len(blocks)
+    pair = (blocks[:, 0].astype(np.intp) << 8) | blocks[:, 1]
+    lut = _bc4_palettes()[pair]
+
+    # Two groups of eight 3-bit indices, three bytes each
+    triples = blocks[:, 2:8].reshape(n, 2, 3).astype(np.uint32)
+    words = triples[:, :, 0] | (triples[:, :, 1] << 8) | (triples[:, :, 2] << 16)
+    indices = ((words[:, :, None] >> _SHIFTS_3) & 7).reshape(n, 16).astype(np.intp)
+    indices += np.arange(0, 8 * n, 8)[:, None]
+    return lut.ravel()[indices]
+
+
+@lru_cache(maxsize=None)
+def _bc4_palettes() -> np.ndarray:
+    """The eight BC4 values for every (a0, a1) endpoint pair, (65536, 8) uint8."""
+    a0 = np.repeat(np.arange(256, dtype=np.uint32), 256)[:, None]
+    a1 = np.tile(np.arange(256, dtype=np.uint32), 256)[:, None]
+    steps = np.arange(1, 7, dtype=np.uint32)
+    eight = a0 > a1
+
+    palettes = np.empty((65536, 8), dtype=np.uint32)
+    palettes[:, :1] = a0
+    palettes[:, 1:2] = a1
+    palettes[:, 2:] = np.where(eight, ((7 - steps) * a0 + steps * a1) // 7,
+                               ((5 - steps) * a0 + steps * a1) // 5)
+    palettes[:, 6:7] = np.where(eight, palettes[:, 6:7], 0)
+    palettes[:, 7:8] = np.where(eight, palettes[:, 7:8], 255)
+    return palettes.astype(np.uint8)
 
 
+# ══════════════════════════════════════════════════════════════════════════
+# BC7
+# ══════════════════════════════════════════════════════════════════════════
+
+# mode: (subsets, partition bits, rotation bits, index selection bits,
+#        color bits, alpha bits, endpoint p-bits, shared p-bits,
+#        index bits, secondary index bits)
+_BC7_MODES = (
+    (3, 4, 0, 0, 4, 0, 1, 0, 3, 0),
+    (2, 6, 0, 0, 6, 0, 0, 1, 3, 0),
+    (3, 6, 0, 0, 5, 0, 0, 0, 2, 0),
+    (2, 6, 0, 0, 7, 0, 1, 0, 2, 0),
+    (1, 0, 2, 1, 5, 6, 0, 0, 2, 3),
+    (1, 0, 2, 0, 7, 8, 0, 0, 2, 2),
+    (1, 0, 0, 0, 7, 7, 1, 0, 4, 0),
+    (2, 6, 0, 0, 5, 5, 1, 0, 2, 0),
+)
+
+_BC7_WEIGHTS = {
+    2: np.array([0, 21, 43, 64], dtype=np.int16),
+    3: np.array([0, 9, 18, 27, 37, 46, 55, 64], dtype=np.int16),
+    4: np.array([0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64], dtype=np.int16),
+}
+
+# Two-subset partitions, one bit per pixel (bit i = subset of pixel i)
+_BC7_PARTITIONS_2 = np.array([
+    (mask >> np.arange(16)) & 1 for mask in (
+        0xCCCC, 0x8888, 0xEEEE, 0xECC8, 0xC880, 0xFEEC, 0xFEC8, 0xEC80,
+        0xC800, 0xFFEC, 0xFE80, 0xE800, 0xFFE8, 0xFF00, 0xFFF0, 0xF000,
+        0xF710, 0x008E, 0x7100, 0x08CE, 0x008C, 0x7310, 0x3100, 0x8CCE,
+        0x088C, 0x3110, 0x6666, 0x366C, 0x17E8, 0x0FF0, 0x718E, 0x399C,
+        0xAAAA, 0xF0F0, 0x5A5A, 0x33CC, 0x3C3C, 0x55AA, 0x9696, 0xA55A,
+        0x73CE, 0x13C8, 0x324C, 0x3BDC, 0x6996, 0xC33C, 0x9966, 0x0660,
+        0x0272, 0x04E4, 0x4E40, 0x2720, 0xC936, 0x936C, 0x39C6, 0x639C,
+        0x9336, 0x9CC6, 0x817E, 0xE718, 0xCCF0, 0x0FCC, 0x7744, 0xEE22,
+    )
+], dtype=np.intp)
+
+# Three-subset partitions, one digit per pixel
+_BC7_PARTITIONS_3 = np.array([[int(c) for c in row] for row in (
+    "0011001102212222", "0001001122112221", "0000200122112211", "0222002200110111",
+    "0000000011221122", "0011001100220022", "0022002211111111", "0011001122112211",
+    "0000000011112222", "0000111111112222", "0000111122222222", "0012001200120012",
+    "0112011201120112", "0122012201220122", "0011011211221222", "0011200122002220",
+    "0001001101121122", "0111001120012200", "0000112211221122", "0022002200221111",
+    "0111011102220222", "0001000122212221", "0000001101220122", "0000110022102210",
+    "0122012200110000", "0012001211222222", "0110122112210110", "0000011012211221",
+    "0022110211020022", "0110011020022222", "0011012201220011", "0000200022112221",
+    "0000000211221222", "0222002200120011", "0011001200220222", "0120012001200120",
+    "0000111122220000", "0120120120120120", "0120201212010120", "0011220011220011",
+    "0011112222000011", "0101010122222222", "0000000021212121", "0022112200221122",
+    "0022001100220011", "0220122102201221", "0101222222220101", "0000212121212121",
+    "0101010101012222", "0222011102220111", "0002111200021112", "0000211221122112",
+    "0222011101110222", "0002111211120002", "0110011001102222", "0000000021122112",
+    "0110011022222222", "0022001100110022", "0022112211220022", "0000000000002112",
+    "0002000100020001", "0222122202221222", "0101222222222222", "0111201122012220",
+)], dtype=np.intp)
+
+# Anchor (implicit leading zero bit) of subset 1 in two-subset partitions
+_BC7_ANCHORS_2 = np.array([
+    15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15,
+    15, 2, 8, 2, 2, 8, 8, 15, 2, 8, 2, 2, 8, 8, 2, 2,
+    15, 15, 6, 8, 2, 8, 15, 15, 2, 8, 2, 2, 2, 15, 15, 6,
+    6, 2, 6, 8, 15, 15, 2, 2, 15, 15, 15, 15, 15, 2, 2, 15,
+], dtype=np.intp)
+
+# Anchors of subsets 1 and 2 in three-subset partitions
+_BC7_ANCHORS_3 = np.array([
+    (3, 15), (3, 8), (15, 8), (15, 3), (8, 15), (3, 15), (15, 3), (15, 8),
+    (8, 15), (8, 15), (6, 15), (6, 15), (6, 15), (5, 15), (3, 15), (3, 8),
+    (3, 15), (3, 8), (8, 15), (15, 3), (3, 15), (3, 8), (6, 15), (10, 8),
+    (5, 3), (8, 15), (8, 6), (6, 10), (8, 15), (5, 15), (15, 10), (15, 8),
+    (8, 15), (15, 3), (3, 15), (5, 10), (6, 10), (10, 8), (8, 9), (15, 10),
+    (15, 6), (3, 15), (15, 8), (5, 15), (15, 3), (15, 6), (15, 6), (15, 8),
+    (3, 15), (15, 3), (5, 15), (5, 15), (5, 15), (8, 15), (5, 15), (10, 15),
+    (5, 15), (10, 15), (8, 15), (13, 15), (15, 3), (12, 15), (3, 15), (3, 8),
+], dtype=np.intp)
+
+
+# Mode = number of trailing zero bits of the first byte (8 for a zero byte)
+_TRAILING_ZEROS = np.array([8] + [(i & -i).bit_length() - 1 for i in range(1, 256)], dtype=np.intp)
+
+
+def _decode_bc7(blocks: np.ndarray) -> np.ndarray:
+    """BC7 blocks (16 bytes each) -> (n, 16, 4) RGBA, one vectorized pass per mode."""
+    # Reserved mode 8 decodes to opaque black, as in Pillow
+    pixels = np.zeros((len(blocks), 16, 4), dtype=np.uint8)
+    pixels[:, :, 3] = 255
+    bits = np.unpackbits(blocks, axis=1, bitorder='little')
+    modes = _TRAILING_ZEROS[blocks[:, 0]]
+    for mode in range(8):
+        rows = np.flatnonzero(modes == mode)
+        if len(rows):
+            pixels[rows] = _decode_bc7_mode(bits[rows], mode)
+    return pixels
+
+
+def _decode_bc7_mode(bits: np.ndarray, mode: int) -> np.ndarray:
+    (subsets, partition_bits, rotation_bits, selection_bits, color_bits, alpha_bits,
+     endpoint_pbits, shared_pbits, index_bits, index2_bits) = _BC7_MODES[mode]
+    n = len(bits)
+    pos = mode + 1
+
+    def take(count, width):
+        """count consecutive little-endian fields of width bits -> (n, count)"""
+        nonlocal pos
+        field_bits = bits[:, pos:pos + count * width].reshape(n, count, width)
+        pos += count * width
+        return np.packbits(field_bits, axis=2, bitorder='little')[:, :, 0].astype(np.int16)
+
+    partition, rotation, selection = (
+        take(1, count)[:, 0].astype(np.intp) if count else np.zeros(n, dtype=np.intp)
+        for count in (partition_bits, rotation_bits, selection_bits)
+    )
+
+    # Endpoints (n, endpoint, channel); stored channel-major, endpoint-minor
+    endpoints = np.empty((n, subsets * 2, 4), dtype=np.int16)
+    endpoints[:, :, :3] = take(3 * subsets * 2, color_bits).reshape(n, 3, subsets * 2).transpose(0, 2, 1)
+    if alpha_bits:
+        endpoints[:, :, 3] = take(subsets * 2, alpha_bits)
+
+    if endpoint_pbits or shared_pbits:
+        if endpoint_pbits:
+            pbits = take(subsets * 2, 1)
+        else:
+            pbits = np.repeat(take(subsets, 1), 2, axis=1)
+        endpoints = (endpoints << 1) | pbits[:, :, None]
+        color_bits += 1
+        alpha_bits += 1 if alpha_bits else 0
+
+    endpoints[:, :, :3] = _bc7_unquantize(endpoints[:, :, :3], color_bits)
+    if alpha_bits:
+        endpoints[:, :, 3] = _bc7_unquantize(endpoints[:, :, 3], alpha_bits)
+    else:
+        endpoints[:, :, 3] = 255
+
+    # Subset of each pixel; anchor pixels store their index with one bit less
+    if subsets == 1:
+        subset = np.zeros((n, 16), dtype=np.intp)
+        anchor_table = _BC7_ANCHOR_MASKS_1
+        partition = np.zeros(n, dtype=np.intp)
+    elif subsets == 2:
+        subset = _BC7_PARTITIONS_2[partition]
+        anchor_table = _BC7_ANCHOR_MASKS_2
+    else:
+        subset = _BC7_PARTITIONS_3[partition]
+        anchor_table = _BC7_ANCHOR_MASKS_3
+
+    indices = _bc7_indices(bits, pos, index_bits, anchor_table, partition)
+    pos += 16 * index_bits - subsets
+    if index2_bits:
+        indices2 = _bc7_indices(bits, pos, index2_bits, _BC7_ANCHOR_MASKS_1, np.zeros(n, dtype=np.intp))
+
+    rows = endpoints.reshape(-1, 4)
+    first = 2 * subset + np.arange(0, n * subsets * 2, subsets * 2)[:, None]
+    e0 = rows[first]
+    e1 = rows[first + 1]
+
+    if index2_bits:
+        # Mode 4/5: colors and alpha use separate index sets (swapped by selection)
+        swap = (selection == 1)[:, None]
+        color_weights = np.where(swap, _BC7_WEIGHTS[index2_bits][indices2], _BC7_WEIGHTS[index_bits][indices])
+        alpha_weights = np.where(swap, _BC7_WEIGHTS[index_bits][indices], _BC7_WEIGHTS[index2_bits][indices2])
+        weights = np.concatenate([np.repeat(color_weights[:, :, None], 3, axis=2),
+                                  alpha_weights[:, :, None]], axis=2)
+    else:
+        weights = _BC7_WEIGHTS[index_bits][indices][:, :, None]
+
+    # At most 255 * 64 + 32, so int16 does not overflow
+    result = ((64 - weights) * e0 + weights * e1 + 32) >> 6
+
+    if rotation_bits:
+        for rot in (1, 2, 3):
+            rows = rotation == rot
+            if rows.any():
+                channel = rot - 1
+                swapped = result[rows]
+                swapped[:, :, [channel, 3]] = swapped[:, :, [3, channel]]
+                result[rows] = swapped
+
+    return result.astype(np.uint8)
+
+
+def _bc7_unquantize(values: np.ndarray, bits: int) -> np.ndarray:
+    if bits >= 8:
+        return values
+    return (values << (8 - bits)) | (values >> (2 * bits - 8))
+
+
+def _bc7_indices(bits: np.ndarray, start: int, index_bits: int,
+                 anchor_table: np.ndarray, partition: np.ndarray) -> np.ndarray:
+    """Read 16 pixel indices per block.
+
+    Args:
+        bits: (n, 128) block bits
+        start: Bit position of the first index
+        index_bits: Bits per index (anchors use one less)
+        anchor_table: (partitions, 16) bool anchor masks
+        partition: (n,) partition number of each block
+    """
+    # Per-partition layout first (at most 64 rows), then one gather per block
+    lengths = index_bits - anchor_table.astype(np.intp)
+    offsets = start + np.cumsum(lengths, axis=1) - lengths
+    lengths = lengths[partition]
+    offsets = offsets[partition] + np.arange(0, bits.size, 128)[:, None]
+
+    flat = bits.ravel()
+    indices = np.zeros(lengths.shape, dtype=np.intp)
+    for j in range(index_bits):
+        # offsets + j only runs past the last index for masked-out anchor bits
+        bit = flat[np.minimum(offsets + j, flat.size - 1)]
+        indices |= np.where(j < lengths, bit, 0) << j
+    return indices
+
+
+def _anchor_masks(*anchor_columns) -> np.ndarray:
+    masks = np.zeros((len(anchor_columns[0]) if anchor_columns else 1, 16), dtype=bool)
+    masks[:, 0] = True
+    rows = np.arange(len(masks))
+    for column in anchor_columns:
+        masks[rows, column] = True
+    return masks
+
+
+_BC7_ANCHOR_MASKS_1 = _anchor_masks()
+_BC7_ANCHOR_MASKS_2 = _anchor_masks(_BC7_ANCHORS_2)
+_BC7_ANCHOR_MASKS_3 = _anchor_masks(_BC7_ANCHORS_3[:, 0], _BC7_ANCHORS_3[:, 1])
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Public loader
+# ══════════════════════════════════════════════════════════════════════════
+
 def load_dds_image(dds_path: Path) -> Optional[np.ndarray]:
     """Load DDS file and convert to RGBA numpy array.
-    
+
+    Block-compressed formats go to imageio (Pillow's C decoder) when it is
+    installed, uncompressed ones to the built-in reader. Either falls back
+    to the other if it cannot decode the file.
+
     Args:
         dds_path: Path to the DDS file
-        
+
     Returns:
         RGBA numpy array (h, w, 4) or None on failure
-        
-    Raises:
-        ImportError: If imageio/imageio-dds are not installed
     """
-    if not HAS_IMAGEIO:
-        raise ImportError("imageio and imageio-dds are required for DDS loading")
-    
     try:
-        img_data = iio.imread(dds_path)
-        
-        if len(img_data.shape) == 2:
-            # Grayscale
-            h, w = img_data.shape
-            rgba = np.zeros((h, w, 4), dtype=np.uint8)
-            rgba[:, :, 0] = img_data
-            rgba[:, :, 1] = img_data
-            rgba[:, :, 2] = img_data
-            rgba[:, :, 3] = 255
-            return rgba
-        elif img_data.shape[2] == 3:
-            # RGB
-            h, w = img_data.shape[:2]
-            rgba = np.zeros((h, w, 4), dtype=np.uint8)
-            rgba[:, :, :3] = img_data
-            rgba[:, :, 3] = 255
-            return rgba
-        elif img_data.shape[2] == 4:
-            # Already RGBA
-            return img_data
-        else:
+        info = read_dds_info(dds_path)
+    except UnsupportedDDSFormat as e:
+        if not HAS_IMAGEIO:
+            print(f"ERROR loading DDS {dds_path}: unsupported format ({e}) and imageio is not installed")
             return None
-            
+        return load_dds_image_imageio(dds_path)
+    except Exception as e:
+        print(f"ERROR loading DDS {dds_path}: {type(e).__name__}: {str(e)}")
+        return None
+
+    if 'codec' in info and HAS_IMAGEIO:
+        try:
+            rgba = _read_dds_imageio(dds_path)
+            if rgba is not None:
+                return rgba
+        except Exception:
+            pass  # The built-in reader reports the error, if any
+
+    try:
+        return read_dds(dds_path)
+    except Exception as e:
+        print(f"ERROR loading DDS {dds_path}: {type(e).__name__}: {str(e)}")
+        return None
+
+
+def load_dds_image_imageio(dds_path: Path) -> Optional[np.ndarray]:
+    """Load a DDS file through imageio (BCn path, fallback and benchmark reference).
+
+    Returns:
+        RGBA numpy array (h, w, 4) or None on failure
+    """
+    try:
+        return _read_dds_imageio(dds_path)
     except Exception as e:
         print(f"ERROR loading DDS {dds_path}: {type(e).__name__}: {str(e)}")
         return None
+
+
+def _read_dds_imageio(dds_path: Path) -> Optional[np.ndarray]:
+    """imageio decode to RGBA (None for unexpected channel layouts); raises on failure."""
+    import imageio.v3 as iio
+    img_data = iio.imread(dds_path)
+
+    if len(img_data.shape) == 2:
+        # Grayscale
+        h, w = img_data.shape
+        rgba = np.zeros((h, w, 4), dtype=np.uint8)
+        rgba[:, :, 0] = img_data
+        rgba[:, :, 1] = img_data
+        rgba[:, :, 2] = img_data
+        rgba[:, :, 3] = 255
+        return rgba
+    elif img_data.shape[2] == 3:
+        # RGB
+        h, w = img_data.shape[:2]
+        rgba = np.zeros((h, w, 4), dtype=np.uint8)
+        rgba[:, :, :3] = img_data
+        rgba[:, :, 3] = 255
+        return rgba
+    elif img_data.shape[2] == 4:
+        # Already RGBA
+        return img_data
+    else:
+        return None
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Conversion
+# ══════════════════════════════════════════════════════════════════════════
+
+def convert_dds_file(dds_path: Path, source_png: Path, atlas_png: Optional[Path] = None,
+                     atlas_fn=None, source_size=(256, 256), source_fn=None):
+    """Convert one DDS texture to its source PNG (and baked atlas PNG).
+
+    Shared by the full conversion and watch mode, so a re-baked file is
+    byte-identical to one from a full run.
+
+    Args:
+        dds_path: DDS file to read
+        source_png: Output path of the source PNG
+        atlas_png: Output path of the atlas PNG, or None
+        atlas_fn: callable(np.ndarray) -> Image baking the atlas, or None
+        source_size: Resize the source to this size, or None to keep original
+        source_fn: Optional callable(np.ndarray) given the saved source pixels
+            (e.g. to measure emblem alpha geometry)
+
+    Returns:
+        True on success, False if the DDS could not be loaded
+
+    Raises:
+        Exception: Errors while resizing, baking or saving
+    """
+    from PIL import Image
+
+    img_array = load_dds_image(dds_path)
+    if img_array is None:
+        return False
+
+    img = Image.fromarray(img_array, mode='RGBA')
+    if source_size and img.size != source_size:
+        img = img.resize(source_size, Image.Resampling.LANCZOS)
+    img.save(source_png, 'PNG')
+    if source_fn:
+        source_fn(np.asarray(img))
+
+    if atlas_png and atlas_fn:
+        # Bake from the resized source so LANCZOS runs once per file
+        atlas = atlas_fn(np.asarray(img))
+        atlas.save(atlas_png, 'PNG')
+    return True
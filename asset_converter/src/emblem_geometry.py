@@ -0,0 +1,149 @@
+"""
+Tight alpha geometry of emblem textures.
+
+Most CK3 emblems cover only part of their 256x256 tile, but the editor
+used to treat every emblem as its full unit quad for bounds, hit tests
+and selection. While converting, the converter measures each emblem's
+source PNG once and stores three extra keys in its metadata entry
+(coa_emblems/metadata/50_coa_designer_emblems.json):
+
+    "alpha_bounds": [x0, y0, x1, y1]   tight box of all pixels with
+                                       alpha > 0, as fractions of the tile
+                                       (0-1, Y down, texel edges)
+    "occupancy": "00f0..."             OCCUPANCY_GRID x OCCUPANCY_GRID
+                                       bitmask as hex; bit row*grid+col is
+                                       set when that cell has any alpha > 0
+    "opaque": "0000..."                same layout; bit set when every
+                                       texel of the cell has alpha 255
+
+The opaque mask lets the canvas skip instances hidden under opaque
+emblems. Fully transparent emblems get none of the keys (the editor keeps
+the full quad for them). The editor reads the keys through
+services/asset_catalog.py.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+OCCUPANCY_GRID = 16
+
+ALPHA_BOUNDS_KEY = "alpha_bounds"
+OCCUPANCY_KEY = "occupancy"
+OPAQUE_KEY = "opaque"
+
+
+def compute_alpha_geometry(pixels: np.ndarray, grid: int = OCCUPANCY_GRID) -> Optional[dict]:
+    """Tight alpha bounds, occupancy and opaque masks of one texture.
+
+    Args:
+        pixels: (H, W, 4) RGBA array; other shapes have no alpha and
+            count as fully covered
+        grid: Occupancy cells per axis
+
+    Returns:
+        Dict with ALPHA_BOUNDS_KEY, OCCUPANCY_KEY and OPAQUE_KEY (see module
+        docstring), or None if no pixel is visible
+    """
+    if pixels.ndim == 3 and pixels.shape[2] == 4:
+        covered = pixels[:, :, 3] > 0
+        opaque = pixels[:, :, 3] == 255
+    else:
+        covered = np.ones(pixels.shape[:2], dtype=bool)
+        opaque = covered
+
+    rows = np.flatnonzero(covered.any(axis=1))
+    if not rows.size:
+        return None
+    cols = np.flatnonzero(covered.any(axis=0))
+    h, w = covered.shape
+    bounds = [cols[0] / w, rows[0] / h, (cols[-1] + 1) / w, (rows[-1] + 1) / h]
+
+    # Textures smaller than the grid: repeat texels so every cell has one
+    if h < grid or w < grid:
+        covered = np.repeat(np.repeat(covered, grid, axis=0), grid, axis=1)
+        opaque = np.repeat(np.repeat(opaque, grid, axis=0), grid, axis=1)
+        h, w = covered.shape
+    rows = (np.arange(grid) * h) // grid
+    cols = (np.arange(grid) * w) // grid
+    occupied = np.logical_or.reduceat(np.logical_or.reduceat(covered, rows, axis=0), cols, axis=1)
+    solid = np.logical_and.reduceat(np.logical_and.reduceat(opaque, rows, axis=0), cols, axis=1)
+    return {
+        ALPHA_BOUNDS_KEY: [float(v) for v in bounds],
+        OCCUPANCY_KEY: _hex_mask(occupied),
+        OPAQUE_KEY: _hex_mask(solid),
+    }
+
+
+def _hex_mask(cells: np.ndarray) -> str:
+    """Bit row * grid + col set for each true cell, as fixed-width hex"""
+    mask = 0
+    for bit in np.flatnonzero(cells.ravel()):
+        mask |= 1 << int(bit)
+    return format(mask, f"0{cells.size // 4}x")
+
+
+def apply_alpha_geometry(metadata: dict, geometry: Dict[str, Optional[dict]]) -> int:
+    """Store measured geometry in metadata entries (in place).
+
+    Entries without a measurement, or measured as fully transparent, lose
+    any stale geometry keys.
+
+    Args:
+        metadata: Emblem metadata keyed by .dds filename
+        geometry: compute_alpha_geometry() results keyed by .dds filename
+
+    Returns:
+        Number of entries that have geometry afterwards
+    """
+    count = 0
+    for filename, props in metadata.items():
+        if not isinstance(props, dict):
+            continue
+        measured = geometry.get(filename)
+        if measured:
+            props.update(measured)
+            count += 1
+        elif filename in geometry:
+            for key in (ALPHA_BOUNDS_KEY, OCCUPANCY_KEY, OPAQUE_KEY):
+                props.pop(key, None)
+    return count
+
+
+def update_metadata_file(metadata_path: Path, geometry: Dict[str, Optional[dict]]) -> bool:
+    """Patch re-measured geometry into an existing metadata JSON file.
+
+    Used by watch mode, which re-bakes single emblems without rewriting
+    the metadata. Filenames the metadata does not list are ignored.
+
+    Args:
+        metadata_path: Emblem metadata JSON written by a full conversion
+        geometry: compute_alpha_geometry() results keyed by .dds filename
+
+    Returns:
+        True if the file was rewritten
+    """
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except FileNotFoundError:
+        return False
+    listed = {name: value for name, value in geometry.items()
+              if isinstance(metadata.get(name), dict)}
+    if not listed or all(_stored(metadata[name]) == value for name, value in listed.items()):
+        return False
+    apply_alpha_geometry(metadata, listed)
+
+    tmp_path = Path(metadata_path).with_name(Path(metadata_path).name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    tmp_path.replace(metadata_path)
+    return True
+
+
+def _stored(props: dict) -> Optional[dict]:
+    if ALPHA_BOUNDS_KEY not in props:
+        return None
+    return {key: props.get(key) for key in (ALPHA_BOUNDS_KEY, OCCUPANCY_KEY, OPAQUE_KEY)}
@@ -153,10 +153,10 @@ class AssetConverterGUI(QMainWindow):
         button_layout.addWidget(self.convert_btn)
         layout.addLayout(button_layout)
         
-        # Check for imageio
+        # imageio is only needed for DDS formats the built-in reader lacks
         if not HAS_IMAGEIO:
-            self.log("WARNING: imageio and imageio-dds are required. Install with: pip install imageio imageio-dds")
-            self.convert_btn.setEnabled(False)
+            self.log("Note: imageio is not installed. DDS files other than BC1-BC5, BC7 and "
+                     "uncompressed RGB(A) will be skipped. Install with: pip install imageio imageio-dds")
     
     def browse_ck3_dir(self):
         """Open directory browser for CK3 installation."""
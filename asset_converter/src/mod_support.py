@@ -3,13 +3,59 @@ Mod support and asset source management.
 
 Handles detection of CK3 coat of arms assets across the base game and
 Steam Workshop mods. Provides file discovery, mod parsing, and metadata merging.
+
+File discovery goes through ModAssetIndex: each asset directory of a source
+is listed once with os.scandir and every entry is sorted into asset buckets
+in the same pass. detect_coa_assets() and find_asset_files() are answered
+from that index, and build_asset_sources() scans mods in parallel, so a
+conversion with hundreds of workshop mods lists each directory exactly once.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 
+# Asset directories relative to a source's content root
+# (<ck3>/game for the base game, the mod folder for mods)
+_EMBLEMS_DIR = ("gfx", "coat_of_arms", "colored_emblems")
+_PATTERNS_DIR = ("gfx", "coat_of_arms", "patterns")
+_COA_INTERFACE_DIR = ("gfx", "interface", "coat_of_arms")
+_FRAMES_DIR = _COA_INTERFACE_DIR + ("frames",)
+_REALM_FRAMES_DIR = ("gfx", "interface", "icons", "realm_frames")
+_CULTURES_DIR = ("common", "culture", "cultures")
+
+# Title frame textures in conversion order: masks, standalone specials,
+# sized title/crown/dynasty textures, then topframe variants
+_TITLE_FRAME_GROUPS = (
+    'title_mask.dds', 'house_mask.dds', 'designer_mask.dds', 'asia_house_mask.dds',
+    'coa_overlay.dds', 'lowborn.dds',
+    'crown_strip_*.dds',
+    'title_[0-9]*.dds',  # title_28.dds etc (not title_mask.dds)
+    'title_no_holder_*.dds',
+    'dynasty_*.dds',  # dynasty_115.dds etc
+    'topframe_*.dds',
+    'holyorder_topframe_*.dds',
+    'mercenary_topframe_*.dds',
+    'landless_adventurer_topframe_*.dds',
+)
+
+# Any of these marks a source as providing title frames (broader than the
+# files actually converted, e.g. modded *_mask.dds)
+_TITLE_FRAME_MARKERS = (
+    'title_mask.dds', 'house_mask.dds', 'designer_mask.dds', 'coa_overlay.dds', 'lowborn.dds',
+    'crown_strip_*.dds', 'title_*.dds', 'topframe_*.dds',
+    '*_topframe_*.dds',  # holyorder_, mercenary_, landless_adventurer_
+    'dynasty_*.dds', '*_mask.dds',
+)
+
+# Default thread count for scanning mods (directory listing releases the GIL)
+DEFAULT_SCAN_WORKERS = 8
+
+
 class ModAssetSource:
     """Represents a source of coat of arms assets (base game or mod)."""
     
@@ -18,17 +64,143 @@ class ModAssetSource:
         'has_title_frames', 'has_culture_files', 'has_emblem_metadata', 'has_pattern_metadata'
     )
     
-    def __init__(self, name: str, path: Path, is_base_game: bool = False, assets: Optional[Dict[str, bool]] = None):
+    def __init__(self, name: str, path: Path, is_base_game: bool = False, assets: Optional[Dict[str, bool]] = None,
+                 index: Optional['ModAssetIndex'] = None):
         self.name = name
         self.path = Path(path)
         self.is_base_game = is_base_game
+        self.index = index
+        if assets is None and index is not None:
+            assets = index.flags()
         for flag in self.ASSET_FLAGS:
             setattr(self, flag, assets.get(flag, False) if assets else False)
     
+    @property
+    def content_root(self) -> Path:
+        """Directory containing gfx/ and common/ for this source."""
+        return self.path / "game" if self.is_base_game else self.path
+    
+    def get_index(self) -> 'ModAssetIndex':
+        """Asset index for this source, scanned on first use."""
+        if self.index is None:
+            self.index = ModAssetIndex.scan(self.content_root)
+        return self.index
+    
     def __repr__(self):
         return f"ModAssetSource(name={self.name}, has_emblems={self.has_emblems}, has_patterns={self.has_patterns}, has_frames={self.has_frames})"
 
 
+class ModAssetIndex:
+    """Coat of arms asset files of one source, from one scandir per directory.
+    
+    Only the known asset directories are listed (not the whole mod tree,
+    which can hold thousands of unrelated files). Entries keep directory
+    listing order, the order glob() used to return them in. Names are
+    matched with fnmatch, so matching is case-insensitive on Windows like
+    glob.
+    
+    Buckets (asset types for files()):
+        emblems, patterns, frames, realm_frames, title_frames (.dds)
+        emblem_metadata, pattern_metadata, culture_files (.txt)
+    """
+    
+    ASSET_TYPES = (
+        'emblems', 'patterns', 'frames', 'realm_frames', 'title_frames',
+        'emblem_metadata', 'pattern_metadata', 'culture_files',
+    )
+    
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._files: Dict[str, List[Path]] = {asset_type: [] for asset_type in self.ASSET_TYPES}
+        self.has_realm_frame_masks = False
+        self.has_title_frame_markers = False
+    
+    @classmethod
+    def scan(cls, root: Path) -> 'ModAssetIndex':
+        """List and classify the asset directories under a content root.
+        
+        Args:
+            root: Content root (<ck3>/game or a mod folder)
+        
+        Returns:
+            Populated index (empty buckets for missing directories)
+        """
+        index = cls(root)
+        files = index._files
+        
+        for name, path in _list_files(index.root.joinpath(*_EMBLEMS_DIR)):
+            if fnmatch(name, '*.dds'):
+                files['emblems'].append(path)
+            elif fnmatch(name, '*.txt'):
+                files['emblem_metadata'].append(path)
+        
+        for name, path in _list_files(index.root.joinpath(*_PATTERNS_DIR)):
+            if fnmatch(name, '*.dds'):
+                files['patterns'].append(path)
+            elif fnmatch(name, '*.txt'):
+                files['pattern_metadata'].append(path)
+        
+        for name, path in _list_files(index.root.joinpath(*_FRAMES_DIR)):
+            if fnmatch(name, '*.dds'):
+                files['frames'].append(path)
+        
+        for name, path in _list_files(index.root.joinpath(*_REALM_FRAMES_DIR)):
+            if fnmatch(name, '*.dds'):
+                files['realm_frames'].append(path)
+                if fnmatch(name, '*_mask.dds'):
+                    index.has_realm_frame_masks = True
+        
+        groups = [[] for _ in _TITLE_FRAME_GROUPS]
+        for name, path in _list_files(index.root.joinpath(*_COA_INTERFACE_DIR)):
+            if not fnmatch(name, '*.dds'):
+                continue
+            if not index.has_title_frame_markers:
+                index.has_title_frame_markers = any(fnmatch(name, p) for p in _TITLE_FRAME_MARKERS)
+            for group, pattern in zip(groups, _TITLE_FRAME_GROUPS):
+                if fnmatch(name, pattern):
+                    group.append(path)
+                    break
+        for group in groups:
+            files['title_frames'].extend(group)
+        
+        for name, path in _list_files(index.root.joinpath(*_CULTURES_DIR)):
+            if fnmatch(name, '*.txt'):
+                files['culture_files'].append(path)
+        
+        return index
+    
+    def files(self, asset_type: str) -> List[Path]:
+        """Files of one asset type (see class docstring); [] for unknown types."""
+        return list(self._files.get(asset_type, ()))
+    
+    def flags(self) -> Dict[str, bool]:
+        """Asset flags as returned by detect_coa_assets()."""
+        files = self._files
+        return {
+            'has_emblems': bool(files['emblems']),
+            'has_patterns': bool(files['patterns']),
+            'has_frames': bool(files['frames']),
+            'has_realm_frames': self.has_realm_frame_masks,
+            'has_title_frames': self.has_title_frame_markers,
+            'has_culture_files': bool(files['culture_files']),
+            'has_emblem_metadata': bool(files['emblem_metadata']),
+            'has_pattern_metadata': bool(files['pattern_metadata']),
+        }
+
+
+def _list_files(directory: Path) -> List[Tuple[str, Path]]:
+    """(name, path) of the non-hidden files in a directory ([] if missing)."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                (entry.name, directory / entry.name)
+                for entry in entries
+                if not entry.name.startswith('.') and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+
+
 def parse_mod_file(mod_file_path: Path) -> Optional[Tuple[str, str]]:
     """Parse a .mod file to extract name and path.
     
@@ -61,56 +233,7 @@ def detect_coa_assets(mod_path: Path) -> Dict[str, bool]:
     Returns:
         Dict with boolean flags for each asset type
     """
-    # Check for emblems
-    emblems_dir = mod_path / "gfx" / "coat_of_arms" / "colored_emblems"
-    has_emblems = emblems_dir.exists() and any(emblems_dir.glob("*.dds"))
-    
-    # Check for patterns
-    patterns_dir = mod_path / "gfx" / "coat_of_arms" / "patterns"
-    has_patterns = patterns_dir.exists() and any(patterns_dir.glob("*.dds"))
-    
-    # Check for frames
-    frames_dir = mod_path / "gfx" / "interface" / "coat_of_arms" / "frames"
-    has_frames = frames_dir.exists() and any(frames_dir.glob("*.dds"))
-    
-    # Check for realm frames (government-specific)
-    realm_frames_dir = mod_path / "gfx" / "interface" / "icons" / "realm_frames"
-    has_realm_frames = realm_frames_dir.exists() and any(realm_frames_dir.glob("*_mask.dds"))
-    
-    # Check for title frames (crown_strip, title_mask, title_<size>, topframe, variants)
-    coa_dir = mod_path / "gfx" / "interface" / "coat_of_arms"
-    has_title_frames = coa_dir.exists() and (
-        (coa_dir / "title_mask.dds").exists() or
-        (coa_dir / "house_mask.dds").exists() or
-        (coa_dir / "designer_mask.dds").exists() or
-        (coa_dir / "coa_overlay.dds").exists() or
-        (coa_dir / "lowborn.dds").exists() or
-        any(coa_dir.glob("crown_strip_*.dds")) or
-        any(coa_dir.glob("title_*.dds")) or
-        any(coa_dir.glob("topframe_*.dds")) or
-        any(coa_dir.glob("*_topframe_*.dds")) or  # holyorder_, mercenary_, landless_adventurer_
-        any(coa_dir.glob("dynasty_*.dds")) or
-        any(coa_dir.glob("*_mask.dds"))
-    )
-    
-    # Check for culture files (frame transforms)
-    culture_dir = mod_path / "common" / "culture" / "cultures"
-    has_culture_files = culture_dir.exists() and any(culture_dir.glob("*.txt"))
-    
-    # Check for metadata files
-    has_emblem_metadata = emblems_dir.exists() and any(emblems_dir.glob("*.txt"))
-    has_pattern_metadata = patterns_dir.exists() and any(patterns_dir.glob("*.txt"))
-    
-    return {
-        'has_emblems': has_emblems,
-        'has_patterns': has_patterns,
-        'has_frames': has_frames,
-        'has_realm_frames': has_realm_frames,
-        'has_title_frames': has_title_frames,
-        'has_culture_files': has_culture_files,
-        'has_emblem_metadata': has_emblem_metadata,
-        'has_pattern_metadata': has_pattern_metadata
-    }
+    return ModAssetIndex.scan(mod_path).flags()
 
 
 def scan_mod_files(mod_dir: Path) -> List[Tuple[str, Path]]:
@@ -133,28 +256,41 @@ def scan_mod_files(mod_dir: Path) -> List[Tuple[str, Path]]:
     return mods
 
 
-def build_asset_sources(base_game_dir: Path, mod_dir: Optional[Path] = None) -> List[ModAssetSource]:
+def build_asset_sources(base_game_dir: Path, mod_dir: Optional[Path] = None,
+                        max_workers: int = DEFAULT_SCAN_WORKERS) -> List[ModAssetSource]:
     """Build list of asset sources from base game and mods.
     
+    Each source is indexed once (see ModAssetIndex); the index is kept on
+    the source for find_asset_files().
+    
     Args:
         base_game_dir: Path to CK3 base game installation
         mod_dir: Optional path to mod directory
+        max_workers: Threads used to scan mods (1 scans serially)
     
     Returns:
         List of ModAssetSource objects (base game first, then mods with CoA assets)
     """
+    base_game_dir = Path(base_game_dir)
     sources = []
     
     # Add base game source
-    base_assets = detect_coa_assets(base_game_dir / "game")
-    sources.append(ModAssetSource("Base Game", base_game_dir, is_base_game=True, assets=base_assets))
+    base_index = ModAssetIndex.scan(base_game_dir / "game")
+    sources.append(ModAssetSource("Base Game", base_game_dir, is_base_game=True, index=base_index))
     
     # Add mod sources if mod directory provided
     if mod_dir and mod_dir.exists():
-        for mod_name, mod_path in scan_mod_files(mod_dir):
-            mod_assets = detect_coa_assets(mod_path)
-            if any(mod_assets.values()):
-                sources.append(ModAssetSource(mod_name, mod_path, assets=mod_assets))
+        mods = scan_mod_files(mod_dir)
+        if max_workers > 1 and len(mods) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(mods))) as executor:
+                indexes = list(executor.map(ModAssetIndex.scan, [path for _, path in mods]))
+        else:
+            indexes = [ModAssetIndex.scan(path) for _, path in mods]
+        
+        for (mod_name, mod_path), index in zip(mods, indexes):
+            source = ModAssetSource(mod_name, mod_path, index=index)
+            if any(getattr(source, flag) for flag in ModAssetSource.ASSET_FLAGS):
+                sources.append(source)
     
     return sources
 
@@ -164,78 +300,14 @@ def find_asset_files(source: ModAssetSource, asset_type: str) -> List[Path]:
     
     Args:
         source: ModAssetSource to search
-        asset_type: 'emblems', 'patterns', 'frames', 'realm_frames', or 'title_frames'
+        asset_type: 'emblems', 'patterns', 'frames', 'realm_frames' or
+            'title_frames' (DDS files), or 'emblem_metadata',
+            'pattern_metadata' or 'culture_files' (.txt files)
     
     Returns:
-        List of DDS file paths
+        List of file paths
     """
-    if source.is_base_game:
-        base_path = source.path / "game" / "gfx"
-    else:
-        base_path = source.path / "gfx"
-    
-    if asset_type == 'emblems':
-        search_dir = base_path / "coat_of_arms" / "colored_emblems"
-        pattern = "*.dds"
-    elif asset_type == 'patterns':
-        search_dir = base_path / "coat_of_arms" / "patterns"
-        pattern = "*.dds"
-    elif asset_type == 'frames':
-        if source.is_base_game:
-            search_dir = source.path / "game" / "gfx" / "interface" / "coat_of_arms" / "frames"
-        else:
-            search_dir = source.path / "gfx" / "interface" / "coat_of_arms" / "frames"
-        pattern = "*.dds"
-    elif asset_type == 'realm_frames':
-        if source.is_base_game:
-            search_dir = source.path / "game" / "gfx" / "interface" / "icons" / "realm_frames"
-        else:
-            search_dir = source.path / "gfx" / "interface" / "icons" / "realm_frames"
-        pattern = "*.dds"
-    elif asset_type == 'title_frames':
-        if source.is_base_game:
-            search_dir = source.path / "game" / "gfx" / "interface" / "coat_of_arms"
-        else:
-            search_dir = source.path / "gfx" / "interface" / "coat_of_arms"
-        
-        if not search_dir.exists():
-            return []
-        
-        files = []
-        
-        # Mask textures
-        for mask_name in ('title_mask.dds', 'house_mask.dds', 'designer_mask.dds',
-                          'asia_house_mask.dds'):
-            mask_path = search_dir / mask_name
-            if mask_path.exists():
-                files.append(mask_path)
-        
-        # Standalone special textures
-        for special_name in ('coa_overlay.dds', 'lowborn.dds'):
-            special_path = search_dir / special_name
-            if special_path.exists():
-                files.append(special_path)
-        
-        # Sized title/crown/dynasty textures
-        files.extend(search_dir.glob("crown_strip_*.dds"))
-        files.extend(search_dir.glob("title_[0-9]*.dds"))       # title_28.dds etc (not title_mask.dds)
-        files.extend(search_dir.glob("title_no_holder_*.dds"))
-        files.extend(search_dir.glob("dynasty_*.dds"))           # dynasty_115.dds etc
-        
-        # Topframe variants (base + holyorder/mercenary/landless_adventurer)
-        files.extend(search_dir.glob("topframe_*.dds"))
-        files.extend(search_dir.glob("holyorder_topframe_*.dds"))
-        files.extend(search_dir.glob("mercenary_topframe_*.dds"))
-        files.extend(search_dir.glob("landless_adventurer_topframe_*.dds"))
-        
-        return files
-    else:
-        return []
-    
-    if not search_dir.exists():
-        return []
-    
-    return list(search_dir.glob(pattern))
+    return source.get_index().files(asset_type)
 
 
 def merge_metadata_simple(base_dict: Dict, new_dict: Dict, source_name: str) -> Dict:
@@ -0,0 +1,21 @@
+"""
+Layout of the converter's output directory (ck3_assets).
+
+The editor reads what the converter writes, so both take these names from
+here (the editor through utils/path_resolver.py and
+services/asset_hot_reload.py). Standard library only: the editor imports
+this module without pulling in the converter's dependencies.
+"""
+
+from pathlib import Path
+
+# Relative to the output directory
+EMBLEM_METADATA_PATH = Path("coa_emblems", "metadata", "50_coa_designer_emblems.json")
+PATTERN_METADATA_PATH = Path("coa_patterns", "metadata", "50_coa_designer_patterns.json")
+EMBLEM_SOURCE_DIR = Path("coa_emblems", "source")
+PATTERN_SOURCE_DIR = Path("coa_patterns", "source")
+EMBLEM_ATLAS_DIR = Path("coa_emblems", "atlases")
+PATTERN_ATLAS_DIR = Path("coa_patterns", "atlases")
+
+# Batches of textures re-baked by watch mode (watch_mode.py)
+CHANGE_LOG_FILENAME = "hot_reload.json"
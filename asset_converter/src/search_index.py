@@ -0,0 +1,108 @@
+"""
+Emblem search index.
+
+Writes coa_emblems/metadata/emblem_search.db next to the emblem metadata
+JSON: an SQLite database the editor's asset sidebar queries for
+as-you-type search. Filenames, categories and source mods are indexed
+with an FTS5 trigram table (substring matches from three characters on);
+category, color count and source are plain columns for faceting.
+
+This module owns the layout; the editor's services/emblem_search.py only
+reads the file. Bump SCHEMA_VERSION if the layout changes - the editor
+ignores indexes with a different PRAGMA user_version and falls back to a
+plain substring filter. The FTS table needs SQLite 3.34+ (trigram
+tokenizer); older builds write the emblems table only, which the editor
+also answers with the substring filter.
+"""
+
+import os
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+INDEX_FILENAME = "emblem_search.db"
+
+_TABLE_SCHEMA = """
+CREATE TABLE emblems (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    colors INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    visible INTEGER NOT NULL
+);
+CREATE INDEX emblems_category ON emblems(category);
+CREATE INDEX emblems_source ON emblems(source);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE emblems_fts USING fts5(
+    filename, category, source,
+    content='emblems', content_rowid='id', tokenize='trigram'
+);
+"""
+
+
+def iter_emblem_records(emblems_metadata: Dict) -> Iterable[Tuple[str, str, int, str, int]]:
+    """Index rows from merged emblem metadata.
+
+    Args:
+        emblems_metadata: Merged metadata as written to 50_coa_designer_emblems.json
+
+    Yields:
+        (filename, category, colors, source, visible) per emblem
+    """
+    for filename, props in emblems_metadata.items():
+        if not filename.endswith('.dds') or not isinstance(props, dict):
+            continue
+        yield (
+            filename,
+            str(props.get('category') or ''),
+            int(props.get('colors') or 1),
+            str(props.get('_source') or 'Base Game'),
+            0 if props.get('visible', True) is False else 1,
+        )
+
+
+def build_search_index(emblems_metadata: Dict, output_path: Path) -> int:
+    """Write the emblem search database, replacing any existing one.
+
+    Args:
+        emblems_metadata: Merged emblem metadata
+        output_path: Destination .db file
+
+    Returns:
+        Number of indexed emblems
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    records = list(iter_emblem_records(emblems_metadata))
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(_TABLE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO emblems (filename, category, colors, source, visible) VALUES (?, ?, ?, ?, ?)",
+            records,
+        )
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            conn.execute("INSERT INTO emblems_fts(emblems_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO emblems_fts(emblems_fts) VALUES ('optimize')")
+        except sqlite3.OperationalError as e:
+            # No FTS5 or no trigram tokenizer (SQLite < 3.34)
+            logger.info("Emblem search index written without full-text table: %s", e)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, output_path)
+    return len(records)
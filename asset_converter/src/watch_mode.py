@@ -0,0 +1,201 @@
+"""
+Watch mode: re-bake emblem and pattern DDS files as they change.
+
+Iterating on a mod's emblems used to mean re-running the whole conversion
+and restarting the editor. AssetWatcher keeps a snapshot (mtime and size)
+of every emblem and pattern DDS across the asset sources and, on each
+poll, converts only the files that changed - source PNG and baked atlas,
+through the same convert_dds_file() as a full run.
+
+Each batch of re-baked files is appended to hot_reload.json in the output
+directory. A running editor watches that file and patches just those
+tiles into its live atlas (editor/src/services/asset_hot_reload.py).
+
+When several sources provide the same file, the last one wins, as in a
+full conversion. New files are converted too, but appear in the editor
+only once the metadata lists them (a full conversion); deleted files are
+ignored. Re-baked emblems that the metadata lists get their alpha bounds
+and occupancy mask re-measured in the metadata (see emblem_geometry.py).
+
+Usage:
+    python asset_converter.py --watch --ck3-dir <ck3> --output-dir <ck3_assets> [--mod-dir <mods>]
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .mod_support import _EMBLEMS_DIR, _PATTERNS_DIR, ModAssetSource
+from .output_layout import (
+    CHANGE_LOG_FILENAME, EMBLEM_ATLAS_DIR, EMBLEM_METADATA_PATH, EMBLEM_SOURCE_DIR,
+    PATTERN_ATLAS_DIR, PATTERN_SOURCE_DIR,
+)
+
+# Batches kept in the change log; an editor polling slower than this many
+# batches falls back to reloading everything it has resident
+CHANGE_LOG_LIMIT = 64
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+# asset type -> (source directory, output source PNG dir, output atlas dir)
+WATCHED_TYPES = {
+    'emblems': (_EMBLEMS_DIR, EMBLEM_SOURCE_DIR, EMBLEM_ATLAS_DIR),
+    'patterns': (_PATTERNS_DIR, PATTERN_SOURCE_DIR, PATTERN_ATLAS_DIR),
+}
+
+# (asset type, dds filename) -> (path, mtime_ns, size) of the winning source
+Snapshot = Dict[Tuple[str, str], Tuple[Path, int, int]]
+
+
+def scan_watched_files(asset_sources: List[ModAssetSource]) -> Snapshot:
+    """Stat every emblem and pattern DDS, one scandir per directory.
+
+    Args:
+        asset_sources: Sources in conversion order (later ones override)
+
+    Returns:
+        Snapshot of the files a full conversion would use
+    """
+    snapshot = {}
+    for source in asset_sources:
+        for asset_type, (source_dir, _, _) in WATCHED_TYPES.items():
+            directory = source.content_root.joinpath(*source_dir)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.') or not fnmatch(entry.name, '*.dds'):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[(asset_type, entry.name)] = (
+                            directory / entry.name, stat.st_mtime_ns, stat.st_size)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+    return snapshot
+
+
+def changed_files(old: Snapshot, new: Snapshot) -> List[Tuple[str, str]]:
+    """Entries that are new in `new` or whose file or stat differs from `old`."""
+    return [key for key, value in new.items() if old.get(key) != value]
+
+
+def read_change_log(output_dir: Path) -> dict:
+    """Contents of hot_reload.json ({'sequence': 0, 'batches': []} if absent)."""
+    try:
+        with open(Path(output_dir) / CHANGE_LOG_FILENAME, 'r', encoding='utf-8') as f:
+            log = json.load(f)
+        if isinstance(log, dict) and isinstance(log.get('batches'), list):
+            return log
+    except (OSError, ValueError):
+        pass
+    return {'sequence': 0, 'batches': []}
+
+
+def write_change_log(output_dir: Path, filenames: List[str]) -> int:
+    """Append a batch of re-baked DDS filenames to hot_reload.json.
+
+    The file is replaced atomically so the editor never reads half of it.
+
+    Returns:
+        Sequence number of the new batch
+    """
+    output_dir = Path(output_dir)
+    log = read_change_log(output_dir)
+    sequence = int(log.get('sequence', 0)) + 1
+    batches = log['batches'] + [{
+        'sequence': sequence,
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'files': sorted(filenames),
+    }]
+    log = {'sequence': sequence, 'batches': batches[-CHANGE_LOG_LIMIT:]}
+
+    path = output_dir / CHANGE_LOG_FILENAME
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(log, f, indent=2)
+    os.replace(temp_path, path)
+    return sequence
+
+
+class AssetWatcher:
+    """Polls the asset sources and re-bakes changed emblem/pattern DDS files."""
+
+    def __init__(self, asset_sources: List[ModAssetSource], output_dir: Path,
+                 log: Callable[[str], None] = print):
+        """
+        Args:
+            asset_sources: Sources in conversion order (see build_asset_sources)
+            output_dir: Converted assets directory (ck3_assets)
+            log: Progress/error message sink
+        """
+        self.asset_sources = asset_sources
+        self.output_dir = Path(output_dir)
+        self.log = log
+        self.snapshot = scan_watched_files(asset_sources)
+
+    def poll(self) -> List[str]:
+        """Re-bake files changed since the last poll and record them.
+
+        Returns:
+            DDS filenames that were re-baked (also appended to hot_reload.json)
+        """
+        from .atlas_baking import create_emblem_atlas, create_pattern_atlas
+        from .dds_loading import convert_dds_file
+        from .emblem_geometry import compute_alpha_geometry, update_metadata_file
+
+        atlas_fns = {'emblems': create_emblem_atlas, 'patterns': create_pattern_atlas}
+        snapshot = scan_watched_files(self.asset_sources)
+        converted = []
+        geometry = {}
+        for asset_type, name in changed_files(self.snapshot, snapshot):
+            dds_path = snapshot[(asset_type, name)][0]
+            _, source_dir, atlas_dir = WATCHED_TYPES[asset_type]
+            source_png = self.output_dir / source_dir / f"{dds_path.stem}.png"
+            atlas_png = self.output_dir / atlas_dir / f"{dds_path.stem}_atlas.png"
+            try:
+                source_png.parent.mkdir(parents=True, exist_ok=True)
+                atlas_png.parent.mkdir(parents=True, exist_ok=True)
+                on_source = None
+                if asset_type == 'emblems':
+                    on_source = lambda pixels, name=name: geometry.__setitem__(name, compute_alpha_geometry(pixels))
+                if convert_dds_file(dds_path, source_png, atlas_png, atlas_fns[asset_type], source_fn=on_source):
+                    converted.append(name)
+                else:
+                    self.log(f"Failed to load DDS: {dds_path}")
+            except Exception as e:
+                self.log(f"Error processing {dds_path}: {e}")
+        self.snapshot = snapshot
+
+        if geometry:
+            # Before the change log, so an editor reloading the catalog sees it
+            metadata_path = self.output_dir / EMBLEM_METADATA_PATH
+            try:
+                update_metadata_file(metadata_path, geometry)
+            except Exception as e:
+                self.log(f"Error updating emblem alpha bounds: {e}")
+
+        if converted:
+            sequence = write_change_log(self.output_dir, converted)
+            self.log(f"[{sequence}] Re-baked {len(converted)} file(s): {', '.join(sorted(converted))}")
+        return converted
+
+    def run(self, interval: float = DEFAULT_POLL_INTERVAL, stop: Optional[Callable[[], bool]] = None):
+        """Poll until stop() returns True (or forever / Ctrl+C).
+
+        Args:
+            interval: Seconds between polls
+            stop: Optional callable checked before each poll
+        """
+        self.log(f"Watching {len(self.snapshot)} emblem/pattern files in {len(self.asset_sources)} source(s)")
+        try:
+            while stop is None or not stop():
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.log("Stopped watching")
@@ -0,0 +1 @@
+"""Performance benchmarks for the CoA Editor (see run_benchmarks.py)."""
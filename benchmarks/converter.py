@@ -0,0 +1,219 @@
+"""Asset converter benchmarks.
+
+Times the converter's per-texture hot paths on synthetic input:
+
+    dds    per pixel format: the built-in DDS reader (dds_loading.read_dds),
+           the imageio/Pillow path, and load_dds_image() which picks one
+    atlas  emblem/pattern atlas baking: the per-quadrant paste path it
+           replaced, one tile at a time, and a batched stack
+
+Results use the same JSON layout as run_benchmarks.py, so the same
+baseline comparison applies. The dds stage also prints a per-format table
+of the two decoders and exits with status 1 when load_dds_image() is
+slower than the faster decoder by more than the tolerance.
+
+Usage:
+    python -m benchmarks.converter [-o results.json] [--quick]
+    python -m benchmarks.converter --baseline benchmarks/converter_baseline.json --save-baseline
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+_bench_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_bench_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from benchmarks.run_benchmarks import (  # noqa: E402
+    RESULTS_VERSION, add_common_arguments, environment, finish, measure, parse_stages,
+)
+from benchmarks.synthetic import DDS_FORMATS, make_dds_bytes  # noqa: E402
+
+STAGES = ('dds', 'atlas')
+DEFAULT_BASELINE = os.path.join(_bench_dir, 'converter_baseline.json')
+
+# Emblem source textures are 256x256; atlases and frames go up to 1024
+FULL_DDS_SIZES = (256, 1024)
+QUICK_DDS_SIZES = (64,)
+FULL_ATLAS_BATCH = 64
+QUICK_ATLAS_BATCH = 4
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Stages
+# ══════════════════════════════════════════════════════════════════════════
+# Each yields (case label, callable) pairs; setup is untimed.
+
+def _stage_dds(quick, workdir):
+    from asset_converter.src.dds_loading import (
+        HAS_IMAGEIO, load_dds_image, load_dds_image_imageio, read_dds,
+    )
+
+    sizes = QUICK_DDS_SIZES if quick else FULL_DDS_SIZES
+    for fmt in DDS_FORMATS:
+        for size in sizes:
+            path = os.path.join(workdir, f"{fmt}_{size}.dds")
+            with open(path, 'wb') as f:
+                f.write(make_dds_bytes(fmt, size, size, seed=size))
+            yield f"{fmt} {size} native", (lambda p=path: read_dds(p))
+            if HAS_IMAGEIO:
+                yield f"{fmt} {size} imageio", (lambda p=path: load_dds_image_imageio(p))
+            yield f"{fmt} {size} loader", (lambda p=path: load_dds_image(p))
+
+
+def paste_emblem_atlas(tile):
+    """Emblem atlas as create_emblem_atlas() built it before the baking engine."""
+    from PIL import Image
+    from asset_converter.src.atlas_baking import QUADRANT_EXTRACTORS
+
+    atlas = Image.new('RGBA', (512, 512), (0, 0, 0, 0))
+    positions = {'red': (0, 0), 'green': (256, 0), 'blue': (0, 256), 'alpha': (256, 256)}
+    for channel, extractor in QUADRANT_EXTRACTORS.items():
+        atlas.paste(Image.fromarray(extractor(tile), mode='RGBA'), positions[channel])
+    return atlas
+
+
+def paste_pattern_atlas(tile):
+    """Pattern atlas as create_pattern_atlas() built it before the baking engine."""
+    from PIL import Image
+    from asset_converter.src.atlas_baking import extract_blue_tile, extract_green_tile
+
+    atlas = Image.new('RGBA', (512, 256), (0, 0, 0, 0))
+    atlas.paste(Image.fromarray(extract_green_tile(tile), mode='RGBA'), (0, 0))
+    atlas.paste(Image.fromarray(extract_blue_tile(tile), mode='RGBA'), (256, 0))
+    return atlas
+
+
+def _stage_atlas(quick, workdir):
+    import numpy as np
+    from asset_converter.src.atlas_baking import (
+        bake_emblem_atlases, bake_pattern_atlases, create_emblem_atlas, create_pattern_atlas,
+    )
+
+    count = QUICK_ATLAS_BATCH if quick else FULL_ATLAS_BATCH
+    tiles = np.random.default_rng(0).integers(0, 256, (count, 256, 256, 4), dtype=np.uint8)
+    emblem_out = np.empty((count, 512, 512, 4), dtype=np.uint8)
+    pattern_out = np.empty((count, 256, 512, 4), dtype=np.uint8)
+
+    yield f"emblem x{count} paste", (lambda: [paste_emblem_atlas(t) for t in tiles])
+    yield f"emblem x{count} single", (lambda: [create_emblem_atlas(t) for t in tiles])
+    yield f"emblem x{count} batched", (lambda: bake_emblem_atlases(tiles, out=emblem_out))
+    yield f"pattern x{count} paste", (lambda: [paste_pattern_atlas(t) for t in tiles])
+    yield f"pattern x{count} single", (lambda: [create_pattern_atlas(t) for t in tiles])
+    yield f"pattern x{count} batched", (lambda: bake_pattern_atlases(tiles, out=pattern_out))
+
+
+STAGE_FACTORIES = {
+    'dds': _stage_dds,
+    'atlas': _stage_atlas,
+}
+
+
+def run_suite(stages=STAGES, quick: bool = False, repeat: int = 5, progress=None) -> dict:
+    """Run the selected converter stages.
+
+    Args:
+        stages: Stage names from STAGES.
+        quick: Small inputs only (smoke run).
+        repeat: Timed runs per case.
+        progress: Optional callable receiving one status line per case.
+
+    Returns:
+        Results dict in the run_benchmarks.py format.
+    """
+    results = {
+        'version': RESULTS_VERSION,
+        'meta': environment(repeat),
+        'cases': {},
+        'skipped': {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for stage in stages:
+            for label, fn in STAGE_FACTORIES[stage](quick, workdir):
+                key = f"{stage}/{label}"
+                results['cases'][key] = dict(stage=stage, case=label, **measure(fn, repeat))
+                if progress:
+                    case = results['cases'][key]
+                    progress(f"{key:<28} {case['median_ms']:10.3f} ms  {case['peak_kib']:10.1f} KiB")
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Decoder comparison
+# ══════════════════════════════════════════════════════════════════════════
+
+def compare_decoders(results: dict, tolerance: float = 0.25, min_delta_ms: float = 0.5) -> list:
+    """Compare the DDS decoders per format and size.
+
+    load_dds_image() is flagged as slow when it exceeds the faster of the
+    native and imageio cases by more than `tolerance` (fractional) AND by
+    more than `min_delta_ms`, as in run_benchmarks.compare().
+
+    Returns:
+        List of dicts (case, native_ms, imageio_ms, loader_ms, best, slow)
+        in results order; imageio_ms is None without imageio.
+    """
+    cases = results.get('cases', {})
+    rows = []
+    for key, case in cases.items():
+        if case.get('stage') != 'dds' or not key.endswith(' loader'):
+            continue
+        prefix = key[:-len(' loader')]
+        native = cases.get(f"{prefix} native")
+        if native is None:
+            continue
+        imageio = cases.get(f"{prefix} imageio")
+        timings = {'native': native['median_ms']}
+        if imageio is not None:
+            timings['imageio'] = imageio['median_ms']
+        best = min(timings, key=timings.get)
+        loader_ms = case['median_ms']
+        best_ms = timings[best]
+        rows.append({
+            'case': prefix.split('/', 1)[1],
+            'native_ms': timings['native'],
+            'imageio_ms': timings.get('imageio'),
+            'loader_ms': loader_ms,
+            'best': best,
+            'slow': loader_ms - best_ms > min_delta_ms and loader_ms > best_ms * (1.0 + tolerance),
+        })
+    return rows
+
+
+def print_decoder_table(rows: list):
+    print(f"\n{'DDS case':<16} {'native':>10} {'imageio':>10} {'loader':>10}  best")
+    for row in rows:
+        imageio = f"{row['imageio_ms']:10.3f}" if row['imageio_ms'] is not None else f"{'-':>10}"
+        flag = '  SLOW' if row['slow'] else ''
+        print(f"{row['case']:<16} {row['native_ms']:10.3f} {imageio} {row['loader_ms']:10.3f}  {row['best']}{flag}")
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════════════════
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark asset converter texture paths.')
+    add_common_arguments(parser, STAGES, DEFAULT_BASELINE)
+    args = parser.parse_args(argv)
+    stages = parse_stages(parser, args, STAGES)
+
+    results = run_suite(stages, quick=args.quick, repeat=args.repeat, progress=print)
+
+    status = 0
+    rows = compare_decoders(results, args.tolerance)
+    if rows:
+        print_decoder_table(rows)
+        slow = [row['case'] for row in rows if row['slow']]
+        if slow:
+            print(f"\nload_dds_image() slower than the best decoder for: {', '.join(slow)}")
+            status = 1
+
+    return max(status, finish(results, args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""CoA Editor benchmark suite.
+
+Times the hot paths that correctness tests do not cover:
+
+    parse      CoAParser.parse_string()
+    model      CoA.from_string()
+    serialize  CoA.to_string()
+    undo       HistoryManager save/undo/redo cycle over CoA snapshots
+    render     HeadlessRenderer.render_image() (skipped without an OpenGL context)
+
+Each stage runs over the game sample corpus (examples/game_samples) and
+synthetic CoAs scaled from 10 to 5000 layers and 1 to 10000 instances.
+Results are written as JSON (median/min/mean wall time per case plus peak
+Python heap from tracemalloc) and optionally compared against a stored
+baseline; any case slower than the baseline by more than the tolerance is
+reported and the process exits with status 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks [-o results.json] [--quick]
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --tolerance 0.25
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.run_benchmarks --stages render
+
+Baselines are machine-specific: record one with --save-baseline on the
+machine that will run the comparison.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+from datetime import datetime, timezone
+
+_bench_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_bench_dir)
+_src_dir = os.path.join(_project_root, 'editor', 'src')
+for _path in (_src_dir, _project_root):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from benchmarks.synthetic import make_coa_text  # noqa: E402
+
+RESULTS_VERSION = 1
+STAGES = ('parse', 'model', 'serialize', 'undo', 'render')
+DEFAULT_BASELINE = os.path.join(_bench_dir, 'baseline.json')
+SAMPLES_DIR = os.path.join(_project_root, 'examples', 'game_samples')
+
+# (label, layers, instances per layer)
+FULL_SCALES = [
+    ('layers=10', 10, 1),
+    ('layers=100', 100, 1),
+    ('layers=1000', 1000, 1),
+    ('layers=5000', 5000, 1),
+    ('instances=1', 1, 1),
+    ('instances=100', 1, 100),
+    ('instances=1000', 1, 1000),
+    ('instances=10000', 1, 10000),
+]
+QUICK_SCALES = [
+    ('layers=10', 10, 1),
+    ('layers=100', 100, 1),
+    ('instances=100', 1, 100),
+]
+
+# Undo stage: snapshots pushed, then undone and redone, per measured run
+UNDO_STEPS = 10
+
+# Stage setup errors that mean "not available here" (no PyOpenGL, no GL
+# context); anything else is a bug and propagates
+ENVIRONMENT_ERRORS = (ImportError, RuntimeError)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Inputs
+# ══════════════════════════════════════════════════════════════════════════
+
+def load_sample_texts(samples_dir: str = SAMPLES_DIR) -> list:
+    """Read the game sample corpus, swapping the game key for coa_export.
+
+    Game files use keys like ``coa_dynasty_28014=`` which CoA.from_string()
+    does not recognise (see tests/test_game_sample_roundtrip.py).
+    """
+    texts = []
+    for path in sorted(glob.glob(os.path.join(samples_dir, '*.txt'))):
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            text = f.read()
+        texts.append(re.sub(r'^[a-zA-Z0-9_]+=', 'coa_export =', text.strip(), count=1))
+    return texts
+
+
+def build_inputs(scales, include_samples: bool = True) -> list:
+    """Return (case label, [ck3 text, ...]) pairs to benchmark."""
+    inputs = []
+    if include_samples:
+        samples = load_sample_texts()
+        if samples:
+            inputs.append(('samples', samples))
+    for label, layers, instances in scales:
+        inputs.append((label, [make_coa_text(layers, instances)]))
+    return inputs
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Stages
+# ══════════════════════════════════════════════════════════════════════════
+# Each factory does untimed setup and returns the callable to measure.
+
+def _stage_parse(texts, ctx):
+    from models.coa._internal.coa_parser import CoAParser
+
+    def run():
+        for text in texts:
+            CoAParser().parse_string(text)
+    return run
+
+
+def _stage_model(texts, ctx):
+    from models.coa import CoA
+
+    def run():
+        for text in texts:
+            CoA.from_string(text)
+    return run
+
+
+def _stage_serialize(texts, ctx):
+    from models.coa import CoA
+    coas = [CoA.from_string(text) for text in texts]
+
+    def run():
+        for coa in coas:
+            coa.to_string()
+    return run
+
+
+def _stage_undo(texts, ctx):
+    from models.coa import CoA
+    from utils.history_manager import HistoryManager
+    coas = [CoA.from_string(text) for text in texts]
+
+    def run():
+        for coa in coas:
+            history = HistoryManager(max_history=UNDO_STEPS + 1)
+            for _ in range(UNDO_STEPS):
+                history.save_state({'coa_snapshot': coa.get_snapshot()}, "bench")
+            while history.can_undo():
+                coa.set_snapshot(history.undo()['coa_snapshot'])
+            while history.can_redo():
+                coa.set_snapshot(history.redo()['coa_snapshot'])
+    return run
+
+
+def _stage_render(texts, ctx):
+    from models.coa import CoA
+    renderer = ctx.get('renderer')
+    if renderer is None:
+        from services.headless_renderer import HeadlessRenderer
+        renderer = ctx['renderer'] = HeadlessRenderer()
+    coas = [CoA.from_string(text) for text in texts]
+
+    def run():
+        for coa in coas:
+            renderer.render_image(coa)
+    return run
+
+
+STAGE_FACTORIES = {
+    'parse': _stage_parse,
+    'model': _stage_model,
+    'serialize': _stage_serialize,
+    'undo': _stage_undo,
+    'render': _stage_render,
+}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Measurement
+# ══════════════════════════════════════════════════════════════════════════
+
+def measure(fn, repeat: int) -> dict:
+    """Time fn() `repeat` times, then once more under tracemalloc.
+
+    The memory run is separate so tracing overhead never skews timings.
+    """
+    fn()  # warm-up: imports, caches, lazily built state
+    times = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'runs': len(times),
+        'median_ms': statistics.median(times),
+        'min_ms': min(times),
+        'mean_ms': statistics.fmean(times),
+        'peak_kib': peak / 1024.0,
+    }
+
+
+def run_suite(stages=STAGES, scales=FULL_SCALES, repeat: int = 5,
+              include_samples: bool = True, progress=None) -> dict:
+    """Run the selected stages over the corpus and synthetic scales.
+
+    Args:
+        stages: Stage names from STAGES.
+        scales: (label, layers, instances per layer) synthetic cases.
+        repeat: Timed runs per case.
+        include_samples: Also benchmark the game sample corpus.
+        progress: Optional callable receiving one status line per case.
+
+    Returns:
+        Results dict (see RESULTS_VERSION) ready for json.dump().
+    """
+    inputs = build_inputs(scales, include_samples)
+    results = {
+        'version': RESULTS_VERSION,
+        'meta': environment(repeat),
+        'cases': {},
+        'skipped': {},
+    }
+    ctx = {}
+
+    for stage in stages:
+        factory = STAGE_FACTORIES[stage]
+        for label, texts in inputs:
+            key = f"{stage}/{label}"
+            try:
+                fn = factory(texts, ctx)
+            except ENVIRONMENT_ERRORS as e:
+                # Skip the rest of the stage rather than every case failing
+                results['skipped'][stage] = f"{type(e).__name__}: {e}"
+                if progress:
+                    progress(f"{stage:<10} skipped ({e})")
+                break
+            results['cases'][key] = dict(stage=stage, case=label, **measure(fn, repeat))
+            if progress:
+                case = results['cases'][key]
+                progress(f"{key:<28} {case['median_ms']:10.3f} ms  {case['peak_kib']:10.1f} KiB")
+
+    renderer = ctx.get('renderer')
+    if renderer is not None:
+        renderer.cleanup()
+    return results
+
+
+def environment(repeat: int) -> dict:
+    """Machine and interpreter details stored with the results."""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Baseline comparison
+# ══════════════════════════════════════════════════════════════════════════
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25,
+            min_delta_ms: float = 0.5) -> list:
+    """Find cases slower than the baseline.
+
+    A case regresses when its median exceeds the baseline median by more
+    than `tolerance` (fractional) AND by more than `min_delta_ms`, so
+    sub-millisecond cases do not flap on timer noise. Cases missing from
+    either side are ignored.
+
+    Returns:
+        List of dicts (key, baseline_ms, current_ms, ratio), worst first.
+    """
+    regressions = []
+    base_cases = baseline.get('cases', {})
+    for key, case in results.get('cases', {}).items():
+        base = base_cases.get(key)
+        if not base:
+            continue
+        current_ms = case['median_ms']
+        baseline_ms = base['median_ms']
+        if current_ms - baseline_ms <= min_delta_ms:
+            continue
+        if current_ms > baseline_ms * (1.0 + tolerance):
+            regressions.append({
+                'key': key,
+                'baseline_ms': baseline_ms,
+                'current_ms': current_ms,
+                'ratio': current_ms / baseline_ms if baseline_ms else float('inf'),
+            })
+    regressions.sort(key=lambda r: r['ratio'], reverse=True)
+    return regressions
+
+
+def skipped_with_baseline(results: dict, baseline: dict) -> list:
+    """Stages skipped in this run that the baseline has cases for.
+
+    A stage that used to run and now cannot would otherwise pass compare()
+    silently.
+    """
+    base_stages = {case.get('stage') for case in baseline.get('cases', {}).values()}
+    return sorted(stage for stage in results.get('skipped', {}) if stage in base_stages)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════════════════
+
+def add_common_arguments(parser, stages, default_baseline: str):
+    """Add the options shared by every benchmark script.
+
+    Args:
+        parser: argparse.ArgumentParser to extend.
+        stages: The script's stage names (default for --stages).
+        default_baseline: Default --baseline path.
+    """
+    parser.add_argument('-o', '--output', help='Write results JSON to this path.')
+    parser.add_argument('--stages', default=','.join(stages),
+                        help=f"Comma-separated stages (default: {','.join(stages)}).")
+    parser.add_argument('--quick', action='store_true',
+                        help='Small inputs only (smoke run, e.g. in CI).')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (default: 5).')
+    parser.add_argument('--baseline', default=default_baseline,
+                        help=f"Baseline JSON to compare against (default: {os.path.relpath(default_baseline, _project_root)}).")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed fractional slowdown vs baseline (default: 0.25).')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write these results as the new baseline instead of comparing.')
+
+
+def parse_stages(parser, args, stages) -> list:
+    """Split --stages, exiting through parser.error() on unknown names."""
+    selected = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in selected if s not in stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    return selected
+
+
+def finish(results: dict, args) -> int:
+    """Write, save or compare results as the common options ask.
+
+    Returns:
+        Process exit status: 1 on regressions or on skipped stages that
+        have a baseline, else 0.
+    """
+    if args.output:
+        write_json(args.output, results)
+        print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    skipped = skipped_with_baseline(results, baseline)
+    for stage in skipped:
+        print(f"\nStage '{stage}' has a baseline but was skipped: {results['skipped'][stage]}")
+    if not regressions:
+        print(f"\nNo regressions vs baseline (tolerance {args.tolerance:.0%}).")
+        return 1 if skipped else 0
+
+    print(f"\n{len(regressions)} regression(s) vs baseline (tolerance {args.tolerance:.0%}):")
+    for r in regressions:
+        print(f"  {r['key']:<28} {r['baseline_ms']:10.3f} ms -> {r['current_ms']:10.3f} ms  (x{r['ratio']:.2f})")
+    return 1
+
+
+def write_json(path: str, data: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark CoA parse/model/serialize/undo/render paths.')
+    add_common_arguments(parser, STAGES, DEFAULT_BASELINE)
+    parser.add_argument('--no-samples', action='store_true', help='Skip the game sample corpus.')
+    args = parser.parse_args(argv)
+    stages = parse_stages(parser, args, STAGES)
+
+    results = run_suite(
+        stages=stages,
+        scales=QUICK_SCALES if args.quick else FULL_SCALES,
+        repeat=args.repeat,
+        include_samples=not args.no_samples,
+        progress=print,
+    )
+    return finish(results, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
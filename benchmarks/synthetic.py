@@ -0,0 +1,115 @@
+"""Synthetic inputs for benchmarks.
+
+Produces deterministic CK3 ``coa_export`` text with a chosen number of
+layers and instances per layer, so parse/model/serialize/undo timings can
+be measured well past the size of any real game sample, and DDS files
+filled with random block data for the converter's texture decoder.
+"""
+
+import random
+import struct
+
+import numpy as np
+
+# Emblem and pattern names found in the base game; the benchmarks never load
+# textures, these only need to look like real data.
+EMBLEMS = (
+    "ce_fleur.dds", "ce_cross.dds", "ce_lion_passant.dds", "ce_block_02.dds",
+    "ce_mena_bend.dds", "ce_tamgha_turkic_09.dds", "ce_star_06.dds",
+    "ce_crescent.dds", "ce_eagle.dds", "ce_circle.dds",
+)
+PATTERNS = ("pattern_solid.dds", "pattern_triangle_01.dds", "pattern_checkers_01.dds")
+COLORS = ("red", "yellow", "black", "white", "blue", "green", "blue_light", "purple")
+
+
+def make_coa_text(layers: int, instances_per_layer: int = 1, seed: int = 0) -> str:
+    """Build a CK3 coa_export string.
+
+    Args:
+        layers: Number of colored_emblem blocks.
+        instances_per_layer: instance={} blocks per emblem.
+        seed: RNG seed; the same arguments always produce the same text.
+
+    Returns:
+        CK3-format string accepted by CoA.from_string().
+    """
+    rng = random.Random(seed)
+    lines = [
+        "coa_export={",
+        f'\tpattern="{rng.choice(PATTERNS)}"',
+        f"\tcolor1={rng.choice(COLORS)}",
+        f"\tcolor2={rng.choice(COLORS)}",
+        f"\tcolor3={rng.choice(COLORS)}",
+    ]
+    for layer_idx in range(layers):
+        lines.append("\tcolored_emblem={")
+        lines.append(f"\t\tcolor1={rng.choice(COLORS)}")
+        if rng.random() < 0.5:
+            r, g, b = (rng.randrange(256) for _ in range(3))
+            lines.append(f"\t\tcolor2=rgb {{ {r} {g} {b} }}")
+        lines.append(f'\t\ttexture="{rng.choice(EMBLEMS)}"')
+        for inst_idx in range(instances_per_layer):
+            scale = rng.uniform(0.05, 1.0)
+            lines.append("\t\tinstance={")
+            lines.append(f"\t\t\tposition={{ {rng.random():.6f} {rng.random():.6f} }}")
+            lines.append(f"\t\t\tscale={{ {scale:.6f} {scale:.6f} }}")
+            lines.append(f"\t\t\tdepth={layer_idx + 1 + inst_idx * 0.001:.6f}")
+            if rng.random() < 0.3:
+                lines.append(f"\t\t\trotation={rng.randrange(360)}")
+            lines.append("\t\t}")
+        lines.append("\t}")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# DDS textures
+# ══════════════════════════════════════════════════════════════════════════
+
+# Block-compressed formats: (FourCC, DXGI format for a DX10 header, bytes per block)
+DDS_BLOCK_FORMATS = {
+    'bc1': (b"DXT1", None, 8),
+    'bc2': (b"DXT3", None, 16),
+    'bc3': (b"DXT5", None, 16),
+    'bc4': (b"ATI1", None, 8),
+    'bc5': (b"ATI2", None, 16),
+    'bc7': (b"DX10", 98, 16),
+}
+DDS_FORMATS = tuple(DDS_BLOCK_FORMATS) + ('bgra', 'bgr')
+
+
+def make_dds_bytes(fmt: str, width: int, height: int, seed: int = 0) -> bytes:
+    """Build a DDS file with random pixel or block data.
+
+    Random bytes are valid data for every supported block format (BC7
+    blocks exercise all eight modes), so decoders can be compared on
+    arbitrary input without an encoder.
+
+    Args:
+        fmt: One of DDS_FORMATS ('bgra'/'bgr' are uncompressed 32/24 bpp).
+        width, height: Image size in pixels.
+        seed: RNG seed.
+
+    Returns:
+        Complete DDS file contents (top mip level only).
+    """
+    rng = np.random.default_rng(seed)
+    dxgi = None
+    if fmt in DDS_BLOCK_FORMATS:
+        fourcc, dxgi, block_bytes = DDS_BLOCK_FORMATS[fmt]
+        size = ((width + 3) // 4) * ((height + 3) // 4) * block_bytes
+        pixel_format = struct.pack("<II4s5I", 32, 0x4, fourcc, 0, 0, 0, 0, 0)
+        flags, pitch = 0x1007 | 0x80000, size
+    else:
+        bpp = 32 if fmt == 'bgra' else 24
+        size = width * height * bpp // 8
+        alpha_mask = 0xFF000000 if bpp == 32 else 0
+        pf_flags = 0x40 | (0x1 if alpha_mask else 0)
+        pixel_format = struct.pack("<II4s5I", 32, pf_flags, b"\0\0\0\0", bpp,
+                                   0xFF0000, 0xFF00, 0xFF, alpha_mask)
+        flags, pitch = 0x1007 | 0x8, width * bpp // 8
+
+    header = struct.pack("<7I44x", 124, flags, height, width, pitch, 0, 1)
+    header += pixel_format + struct.pack("<4I4x", 0x1000, 0, 0, 0)
+    dx10 = struct.pack("<5I", dxgi, 3, 0, 1, 0) if dxgi is not None else b""
+    return b"DDS " + header + dx10 + rng.integers(0, 256, size, dtype=np.uint8).tobytes()
@@ -13,7 +13,7 @@ block_cipher = None
 
 a = Analysis(
     ['src/main.py'],
-    pathex=[],
+    pathex=[base_dir],  # asset_converter.src.output_layout
     binaries=[],
     datas=[
         ('src/shaders', 'shaders'),  # Bundle shaders into executable
@@ -72,6 +72,7 @@ class ClipboardActions:
             self.main_window.coa.parse(text)
             
             # Apply to UI - update from model
+            self.main_window.canvas_area.canvas_widget.prefetch_coa_textures(self.main_window.coa)
             self.main_window.canvas_area.canvas_widget.set_base_texture(self.main_window.coa.pattern)
             self.main_window.canvas_area.canvas_widget.set_base_colors([self.main_window.coa.pattern_color1, self.main_window.coa.pattern_color2, self.main_window.coa.pattern_color3])
             
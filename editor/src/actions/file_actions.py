@@ -160,6 +160,7 @@ class FileActions:
                 self.main_window.coa.parse(coa_text)
                 
                 # Apply to UI - update from model
+                self.main_window.canvas_area.canvas_widget.prefetch_coa_textures(self.main_window.coa)
                 self.main_window.canvas_area.canvas_widget.set_base_texture(self.main_window.coa.pattern)
                 # Pass Color objects to canvas
                 base_colors = [
@@ -253,3 +254,113 @@ class FileActions:
                 "Export Error",
                 f"Failed to export PNG: {str(e)}"
             )
+    
+    def export_high_resolution_png(self):
+        """Export a large PNG (print or promotional art) through the tiled exporter
+        
+        Tiles are rendered one per event-loop pass so the window stays
+        responsive; encoding and writing run on the export's worker thread.
+        """
+        from PyQt5.QtCore import Qt, QTimer
+        from PyQt5.QtWidgets import QInputDialog, QProgressDialog
+        
+        try:
+            sizes = ["4096", "8192", "16384", "32768"]
+            size_text, ok = QInputDialog.getItem(
+                self.main_window, "Export High Resolution PNG", "Size (pixels):", sizes, 2, False)
+            if not ok:
+                return
+            
+            supersampling = ["1x", "2x", "4x"]
+            supersample_text, ok = QInputDialog.getItem(
+                self.main_window, "Export High Resolution PNG", "Supersampling:", supersampling, 1, False)
+            if not ok:
+                return
+            
+            filename, _ = QFileDialog.getSaveFileName(
+                self.main_window,
+                "Export High Resolution PNG",
+                "",
+                "PNG Files (*.png);;All Files (*)"
+            )
+            if not filename:
+                return
+            if not filename.lower().endswith('.png'):
+                filename += '.png'
+            
+            export = self.main_window.canvas_area.canvas_widget.create_tiled_export(
+                filename, int(size_text), supersample=int(supersample_text[:-1]))
+        except Exception as e:
+            QMessageBox.critical(
+                self.main_window,
+                "Export Error",
+                f"Failed to export PNG: {str(e)}"
+            )
+            return
+        
+        # One extra step for writing the last rows
+        progress = QProgressDialog("Rendering tiles...", "Cancel", 0, export.tiles_total + 1, self.main_window)
+        progress.setWindowTitle("Export High Resolution PNG")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        timer = QTimer(progress)
+        
+        def step():
+            try:
+                if progress.wasCanceled():
+                    timer.stop()
+                    export.cancel()
+                    self.main_window.status_left.setText("High resolution export cancelled")
+                    return
+                more = export.step()
+                progress.setValue(export.tiles_done)
+                if more:
+                    return
+                timer.stop()
+                progress.setLabelText("Writing PNG...")
+                export.finish()
+                progress.setValue(progress.maximum())
+                self.main_window.status_left.setText(f"Exported to {os.path.basename(filename)}")
+            except Exception as e:
+                timer.stop()
+                export.cancel()
+                progress.close()
+                QMessageBox.critical(
+                    self.main_window,
+                    "Export Error",
+                    f"Failed to export PNG: {str(e)}"
+                )
+        
+        timer.timeout.connect(step)
+        timer.start(0)
+    
+    def export_preview_variants(self):
+        """Export government and title previews for every government, rank and size"""
+        try:
+            directory = QFileDialog.getExistingDirectory(
+                self.main_window,
+                "Export Preview Variants To"
+            )
+            
+            if not directory:
+                return
+            
+            from services.government_discovery import GovernmentDiscovery
+            from services.preview_export import preview_variants
+            
+            _, government_file_map = GovernmentDiscovery.get_government_types()
+            variants = preview_variants(government_file_map.values())
+            
+            prefix = "coa"
+            if self.main_window.current_file_path:
+                prefix = os.path.splitext(os.path.basename(self.main_window.current_file_path))[0]
+            
+            count = self.main_window.canvas_area.canvas_widget.export_preview_batch(directory, variants, prefix)
+            self.main_window.status_left.setText(f"Exported {count} previews to {os.path.basename(directory)}")
+            
+        except Exception as e:
+            QMessageBox.critical(
+                self.main_window,
+                "Export Error",
+                f"Failed to export previews: {str(e)}"
+            )
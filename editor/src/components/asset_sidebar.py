@@ -1,7 +1,7 @@
 # PyQt5 imports
 from PyQt5.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QLabel, 
-    QScrollArea, QPushButton, QWidget, QComboBox, QMenu
+    QScrollArea, QPushButton, QWidget, QComboBox, QMenu, QLineEdit
 )
 from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap
@@ -22,7 +22,11 @@ from constants import (
     CK3_NAMED_COLORS
 )
 from utils.atlas_compositor import composite_emblem_atlas, composite_pattern_atlas, get_atlas_path
-from utils.path_resolver import get_emblem_metadata_path, get_pattern_metadata_path, get_emblem_source_dir, get_pattern_source_dir
+from services.asset_catalog import get_catalog
+from services.emblem_search import get_search_index
+
+# Cap on search hits shown at once (the grid builds one widget per asset)
+SEARCH_RESULT_LIMIT = 500
 
 # Global dictionary mapping texture filenames to preview image paths
 # Key: filename (e.g., "ce_kamon_sorrel.dds"), Value: preview path
@@ -35,7 +39,13 @@ class AssetSidebar(QFrame):
     # Signal emitted when an asset is selected, passes the asset data
     asset_selected = pyqtSignal(dict)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, defer_load=False):
+        """
+        Args:
+            parent: Main window
+            defer_load: Start empty; the caller loads _load_asset_data() off
+                the GUI thread and passes the result to set_asset_data()
+        """
         super().__init__(parent)
         self.parent_window = parent
         self.size_buttons = {}
@@ -55,7 +65,11 @@ class AssetSidebar(QFrame):
         self._asset_color3 = Color.from_name(DEFAULT_EMBLEM_COLOR3)
         
         # Load asset data from JSON files
-        self.asset_data = self._load_asset_data()
+        self.asset_data = {} if defer_load else self._load_asset_data()
+        
+        # Emblem search (as-you-type, across all categories)
+        self.search_text = ""
+        self._index_emblems()
         
         # Set default category to base patterns on startup
         self.current_category = DEFAULT_BASE_CATEGORY
@@ -66,46 +80,34 @@ class AssetSidebar(QFrame):
         self._setup_ui()
     
     def _load_asset_data(self):
-        """Load asset definitions from JSON files"""
+        """Load asset definitions from the shared asset catalog"""
         asset_data = {}
         
+        catalog = get_catalog()
+        
         # Load emblems and organize by category
-        emblems_json = get_emblem_metadata_path()
         textured_emblems_json = "json_output/coat_of_arms/colored_emblems/50_coa_designer_emblems.json"  # Legacy path, may not exist
-        if emblems_json.exists():
-            with open(emblems_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Validate data is a dictionary
-                if not isinstance(data, dict):
-                    print(f"Warning: Invalid emblem metadata format in {emblems_json}")
-                    data = {}
-                for filename, properties in data.items():
-                    if properties is None or filename == "\ufeff" or not isinstance(properties, dict):
-                        continue
-                    # Convert .dds to .png
-                    png_filename = filename.replace('.dds', '.png')
-                    image_path = get_emblem_source_dir() / png_filename
-                    if image_path.exists():
-                        # Add to preview map
-                        TEXTURE_PREVIEW_MAP[filename] = image_path
-                        
-                        category = properties.get("category", None)
-                        colors = properties.get("colors", 1)
-                        
-                        # Skip assets without a category or with 0 colors (blank/empty assets)
-                        if not category or colors == 0:
-                            continue
-                        
-                        category = category.title()
-                        if category not in asset_data:
-                            asset_data[category] = []
-                        asset_data[category].append({
-                            "filename": png_filename,  # PNG for display
-                            "dds_filename": filename,  # DDS for texture lookup
-                            "path": str(image_path),
-                            "category": category,
-                            "colors": colors
-                        })
+        for filename, entry in catalog.emblems.items():
+            # Add to preview map
+            TEXTURE_PREVIEW_MAP[filename] = entry.path
+            
+            category = entry.category
+            colors = entry.colors if entry.colors is not None else 1
+            
+            # Skip assets without a category or with 0 colors (blank/empty assets)
+            if not category or colors == 0:
+                continue
+            
+            category = category.title()
+            if category not in asset_data:
+                asset_data[category] = []
+            asset_data[category].append({
+                "filename": entry.png_filename,  # PNG for display
+                "dds_filename": filename,  # DDS for texture lookup
+                "path": entry.path,
+                "category": category,
+                "colors": colors
+            })
         if os.path.exists(textured_emblems_json):
             with open(textured_emblems_json, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -139,35 +141,65 @@ class AssetSidebar(QFrame):
                         })
         
         # Load base patterns (background layer - separate from emblems)
-        patterns_json = get_pattern_metadata_path()
-        if patterns_json.exists():
+        if catalog.pattern_metadata():
             asset_data["__Base_Patterns__"] = []  # Special key for base patterns
-            with open(patterns_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Validate data is a dictionary
-                if not isinstance(data, dict):
-                    print(f"Warning: Invalid pattern metadata format in {patterns_json}")
-                    data = {}
-                for filename, properties in data.items():
-                    if properties is None or filename == "\ufeff" or not isinstance(properties, dict):
-                        continue
-                    # Convert .dds to .png for display
-                    png_filename = filename.replace('.dds', '.png')
-                    image_path = get_pattern_source_dir() / png_filename
-                    if image_path.exists():
-                        # Add to preview map
-                        TEXTURE_PREVIEW_MAP[filename] = str(image_path)
-                        
-                        asset_data["__Base_Patterns__"].append({
-                            "filename": filename,  # Store .dds name for texture lookup
-                            "display_name": png_filename,  # PNG name for display
-                            "path": str(image_path),
-                            "colors": properties.get("colors", 1),
-                            "visible": properties.get("visible", True)
-                        })
+            for filename, entry in catalog.patterns.items():
+                # Add to preview map
+                TEXTURE_PREVIEW_MAP[filename] = entry.path
+                
+                asset_data["__Base_Patterns__"].append({
+                    "filename": filename,  # Store .dds name for texture lookup
+                    "display_name": entry.png_filename,  # PNG name for display
+                    "path": entry.path,
+                    "colors": entry.colors if entry.colors is not None else 1,
+                    "visible": entry.visible
+                })
         
         return asset_data
     
+    def _index_emblems(self):
+        """Map .dds filename -> emblem asset dict (for search results)"""
+        self._emblems_by_dds = {
+            asset["dds_filename"]: asset
+            for category, assets in self.asset_data.items() if not category.startswith("__")
+            for asset in assets
+        }
+    
+    def set_asset_data(self, asset_data):
+        """Install asset data loaded in the background and rebuild the grid"""
+        self.asset_data = asset_data
+        self._index_emblems()
+        
+        emblem_categories = sorted([k for k in self.asset_data.keys() if not k.startswith("__")])
+        self.category_combo.blockSignals(True)
+        self.category_combo.clear()
+        self.category_combo.addItems(emblem_categories)
+        if self.current_mode == "emblems" and emblem_categories:
+            if self.last_emblem_category in emblem_categories:
+                self.current_category = self.last_emblem_category
+            elif self.current_category not in emblem_categories:
+                self.current_category = emblem_categories[0]
+            self.category_combo.setCurrentText(self.current_category)
+        self.category_combo.blockSignals(False)
+        
+        self.asset_buttons.clear()
+        self.clear_layout(self.assets_flow)
+        self.build_asset_grid()
+    
+    def reload_assets(self, filenames=None, reindex=False):
+        """Refresh previews after assets were re-converted (hot-reload)
+        
+        Args:
+            filenames: Changed DDS filenames (None if any may have changed)
+            reindex: The catalog gained or lost assets; reload the asset data
+        """
+        if reindex:
+            self.set_asset_data(self._load_asset_data())
+            return
+        shown = {asset.get("dds_filename", asset["filename"]) for asset in self._get_filtered_assets()}
+        if filenames is None or shown.intersection(filenames):
+            self.build_asset_grid()
+    
     def _setup_ui(self):
         """Setup the asset sidebar UI"""
         layout = QVBoxLayout(self)
@@ -210,6 +242,28 @@ class AssetSidebar(QFrame):
         
         layout.addLayout(category_layout)
         
+        # Search box (emblems mode only)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search emblems (e.g. lion colors:2 mod:name)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setVisible(False)
+        self.search_edit.setStyleSheet("""
+            QLineEdit {
+                padding: 4px 8px;
+                border-radius: 3px;
+                font-size: 11px;
+            }
+        """)
+        # Debounce: the query is fast, rebuilding the grid is not
+        self._search_timer = QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(lambda: self.set_search_text(self.search_edit.text()))
+        self.search_edit.textChanged.connect(lambda _text: self._search_timer.start(120))
+        search_layout = QHBoxLayout()
+        search_layout.setContentsMargins(10, 0, 10, 5)
+        search_layout.addWidget(self.search_edit)
+        layout.addLayout(search_layout)
+        
         # Size filter buttons
         size_layout = QHBoxLayout()
         size_layout.setSpacing(4)
@@ -401,11 +455,27 @@ class AssetSidebar(QFrame):
             self.assets_flow.addWidget(item)
     
     def _get_filtered_assets(self):
-        """Get assets filtered by current category and visibility"""
+        """Get assets filtered by current category (or search) and visibility"""
+        if self.current_mode == "emblems" and self.search_text.strip():
+            return self._search_assets(self.search_text)
         assets = self.asset_data.get(self.current_category, [])
         # Filter out assets marked as not visible
         return [asset for asset in assets if asset.get('visible', True)]
     
+    def _search_assets(self, text):
+        """Emblem assets matching a search query, in filename order"""
+        filenames = get_search_index().search(text, limit=SEARCH_RESULT_LIMIT)
+        # Index may list emblems without a source PNG or category - skip those
+        return [self._emblems_by_dds[f] for f in filenames if f in self._emblems_by_dds]
+    
+    def set_search_text(self, text):
+        """Filter the emblem grid by a search query (empty restores the category view)"""
+        if text == self.search_text:
+            return
+        self.search_text = text
+        if self.current_mode == "emblems":
+            self.build_asset_grid()
+    
     def clear_layout(self, layout):
         """Recursively clear all widgets from a layout"""
         if layout is not None:
@@ -532,11 +602,13 @@ class AssetSidebar(QFrame):
         if mode == "patterns":
             # Show base patterns - hide category dropdown and color pickers
             self.category_combo.setVisible(False)
+            self.search_edit.setVisible(False)
             self._asset_color_widget.setVisible(False)
             self.current_category = "__Base_Patterns__"
         else:
             # Show emblem categories - show category dropdown and color pickers
             self.category_combo.setVisible(True)
+            self.search_edit.setVisible(True)
             self._asset_color_widget.setVisible(True)
             self.category_combo.blockSignals(True)
             self.category_combo.clear()
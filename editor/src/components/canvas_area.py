@@ -11,6 +11,7 @@ from .canvas_area_helpers.canvas_area_transform_mixin import CanvasAreaTransform
 from .canvas_area_helpers.preview_bar import PreviewBar
 from .canvas_area_helpers.bottom_bar import BottomBar
 from services.government_discovery import GovernmentDiscovery
+from services.frame_coalescer import FrameCoalescer
 
 
 class CanvasArea(CanvasAreaTransformMixin, QFrame):
@@ -34,6 +35,10 @@ class CanvasArea(CanvasAreaTransformMixin, QFrame):
         self._instance_transforms = set()  # Set of UUIDs with active instance transforms
         
         self._setup_ui()
+        
+        # Drag updates: one model mutation + canvas sync per displayed frame (latest wins)
+        self._drag_updates = FrameCoalescer(lambda state: self._apply_widget_transform(*state),
+                                            frame_signal=self.canvas_widget.frameSwapped, parent=self)
     
     def mousePressEvent(self, event):
         """Handle clicks on canvas background to deselect layers"""
@@ -143,6 +148,8 @@ class CanvasArea(CanvasAreaTransformMixin, QFrame):
     
     def _reset_transform_state(self):
         """Reset all transform-related state when selection changes"""
+        # A queued drag update belongs to the state being discarded
+        self._drag_updates.cancel()
         self._drag_start_layers = None
         self._drag_start_aabb = None
         self.transform_widget.active_handle = None
@@ -243,17 +250,31 @@ class CanvasArea(CanvasAreaTransformMixin, QFrame):
     
     
     def _on_transform_changed(self, widget_transform):
-        """Handle transform changes from the widget (pixel space → CoA space).
+        """Queue a transform change from the widget.
+        
+        Mouse moves arrive faster than frames are displayed; only the latest
+        transform is applied, once per frame (see _apply_widget_transform).
+        
+        Args:
+            widget_transform: Transform object with pixel coordinates (widget space)
+        """
+        # The widget's rotating flag is cleared before drag end flushes the queue
+        rotating = bool(getattr(self.transform_widget, 'is_rotating', False))
+        self._drag_updates.submit((widget_transform, rotating))
+    
+    def _apply_widget_transform(self, widget_transform, rotating=False):
+        """Apply a transform from the widget to the model (pixel space → CoA space).
         
         Args:
             widget_transform: Transform object with pixel coordinates (widget space)
+            rotating: True if the rotation handle produced it
         """
         selected_uuids = self.property_sidebar.get_selected_uuids() if self.property_sidebar else []
         if not selected_uuids:
             return
         
         # Handle rotation (rotation handle dragged) - uses standard conversion
-        if hasattr(self.transform_widget, 'is_rotating') and self.transform_widget.is_rotating:
+        if rotating:
             coa_transform = self._convert_widget_to_coa_coords(widget_transform)
             self._handle_rotation_transform(selected_uuids, coa_transform.rotation)
             return
@@ -279,6 +300,9 @@ class CanvasArea(CanvasAreaTransformMixin, QFrame):
     
     def _on_transform_ended(self):
         """Handle transform widget drag end"""
+        # Apply the last queued drag update before closing the transform
+        self._drag_updates.flush()
+        
         # Clear rotation cache (rotation already applied during drag)
         if hasattr(self, '_rotation_start') and self._rotation_start is not None:
             self.main_window.coa.end_rotation_transform()
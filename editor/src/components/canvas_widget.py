@@ -44,6 +44,8 @@ from components.canvas_widgets.canvas_texture_loader_mixin import CanvasTextureL
 from components.canvas_widgets.canvas_zoom_pan_mixin import CanvasZoomPanMixin
 from components.canvas_widgets.canvas_coordinate_mixin import CanvasCoordinateMixin
 from services.framebuffer_rtt import FramebufferRTT
+from services.rtt_resolution import RTTResolutionPolicy
+from services.render_profiler import RenderProfiler
 
 
 # ========================================
@@ -96,19 +98,15 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
             Color.from_name(DEFAULT_BASE_COLOR3)
         ]
         
-        # Frame data
-        self.frameTextures = {}
-        self.frame_masks = {}
+        # Frame data (frameTextures, frame_masks: see _init_frame_texture_cache)
         self.frame_scales = {}
         self.frame_offsets = {}
         self.official_frame_scales = {}
         self.official_frame_offsets = {}
-        self.frameTexture = None
         self.current_frame_name = DEFAULT_FRAME
         self.prestige_level = 0
         
         # Mask textures
-        self.patternMask = None
         self.default_mask_texture = None
         self.texturedMask = None
         self.noiseMask = None
@@ -128,21 +126,27 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         # Display state
         self.clear_color = (0.08, 0.08, 0.08, 1.0)
         
+        # Opt-in per-frame profiler (View > Render Profiler)
+        self.render_profiler = RenderProfiler()
+        
+        # CoA RTT size follows the on-screen CoA size (see _update_rtt_resolution)
+        self.rtt_resolution = RTTResolutionPolicy()
+        
+        # Set by the main window: textures then load in the background
+        # (see CanvasTextureLoaderMixin._load_textures_async)
+        self.startup_pipeline = None
+        self.startup_gl_ready = None  # called once textures are queued
+        self.textures_loading = False
+        
         # Preview state (from CanvasPreviewMixin)
         self.preview_enabled = False
         self.preview_government = "_default"
         self.preview_rank = "Duke"
         self.preview_size = 86
-        self.realm_frame_masks = {}
-        self.realm_frame_frames = {}
-        self.realm_frame_shadows = {}
         self.title_mask = None
-        self.crown_strips = {}
-        self.title_frames = {}
-        self.topframes = {}
-        self.adventurer_topframes = {}
-        self.holyorder_topframes = {}
-        self.mercenary_topframes = {}
+        
+        # Frame and preview overlay textures load on first use (bounded LRU)
+        self._init_frame_texture_cache()
         
         # Initialize tool system
         self._init_tools()
@@ -196,15 +200,21 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         self.vao, self.vbo, self.ebo = QuadRenderer.create_unit_quad()
         
         # Load all textures
-        self._load_texture_atlases()
-        self._load_frame_textures()
-        self._load_default_mask_texture()
-        self._load_material_mask_texture()
-        self._load_noise_texture()
-        self._load_realm_frame_textures()
-        self._load_title_frame_textures()
+        if self.startup_pipeline is not None:
+            self._load_textures_async(self.startup_pipeline)
+        else:
+            self._load_texture_atlases()
+            self._load_frame_textures()
+            self._load_default_mask_texture()
+            self._load_material_mask_texture()
+            self._load_noise_texture()
+            self._load_realm_frame_textures()
+            self._load_title_frame_textures()
         
         # Initialize RTT framebuffer
+        max_texture_size = int(gl.glGetIntegerv(gl.GL_MAX_TEXTURE_SIZE))
+        self.rtt_resolution.set_limits(self.rtt_resolution.min_size,
+                                       min(self.rtt_resolution.max_size, max_texture_size))
         self.framebuffer_rtt.initialize()
         
         # Set defaults
@@ -214,6 +224,9 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         if "pattern_solid.dds" in self.texture_uv_map:
             self.set_base_texture("pattern_solid.dds")
         
+        if self.startup_gl_ready is not None:
+            self.startup_gl_ready()
+        
         # Force initial render
         from PyQt5.QtCore import QTimer
         QTimer.singleShot(0, self.update)
@@ -230,22 +243,82 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         if not self.vao:
             return
         
-        # Render CoA to framebuffer (512x512 canonical space)
-        self._render_coa_to_framebuffer()
+        profiler = self.render_profiler
+        with profiler.frame():
+            self._begin_texture_frame()
+            
+            # Render CoA to framebuffer (sized to the on-screen CoA, 512x512 canonical)
+            with profiler.stage("coa_rtt"):
+                self._update_rtt_resolution()
+                self._render_coa_to_framebuffer()
         
-        # Restore viewport to widget size
-        gl.glViewport(0, 0, self.width(), self.height())
+            # Restore viewport to widget size
+            gl.glViewport(0, 0, self.width(), self.height())
         
-        # Composite framebuffer to viewport with frame mask
-        self._composite_to_viewport()
+            # Composite framebuffer to viewport with frame mask
+            with profiler.stage("composite"):
+                self._composite_to_viewport()
         
-        # Render frame graphic on top
-        self._render_frame()
+            # Render frame graphic on top
+            with profiler.stage("frame"):
+                self._render_frame()
         
-        # Render preview overlays if enabled
-        if self.preview_enabled:
-            self._render_government_preview()
-            self._render_title_preview()
+            # Render preview overlays if enabled
+            if self.preview_enabled:
+                with profiler.stage("previews"):
+                    self._render_government_preview()
+                    self._render_title_preview()
+        
+        self._end_texture_frame()
+        if profiler.enabled:
+            self._paint_profiler_overlay()
+    
+    def _paint_profiler_overlay(self):
+        """Draw the render profiler readout in the top-left corner."""
+        from PyQt5.QtGui import QPainter, QColor, QFontDatabase
+        
+        lines = self.render_profiler.overlay_lines()
+        painter = QPainter(self)
+        painter.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        width = max(metrics.horizontalAdvance(line) for line in lines) + 12
+        height = line_height * len(lines) + 8
+        painter.fillRect(6, 6, width, height, QColor(0, 0, 0, 170))
+        painter.setPen(QColor(220, 220, 220))
+        for i, line in enumerate(lines):
+            painter.drawText(12, 10 + metrics.ascent() + i * line_height, line)
+        painter.end()
+    
+    def set_profiling_enabled(self, enabled):
+        """Enable/disable the per-frame render profiler and its overlay."""
+        self.render_profiler.set_enabled(enabled)
+        if not enabled:
+            self.render_profiler.clear()
+        self.update()
+    
+    def export_render_trace(self, filename):
+        """Write recorded profiler frames as Chrome trace JSON.
+        
+        Returns:
+            Number of frames written
+        """
+        self.render_profiler.export_chrome_trace(filename)
+        return len(self.render_profiler.frames)
+    
+    def _update_rtt_resolution(self):
+        """Resize the CoA RTT for the current zoom, viewport and interaction state."""
+        left, right, bottom, top = self.get_coa_viewport_bounds()
+        displayed_px = max(abs(right - left), abs(top - bottom)) * self.devicePixelRatioF()
+        size = self.rtt_resolution.choose(displayed_px, interactive=self._is_interacting())
+        self.framebuffer_rtt.resize(size)
+    
+    def _is_interacting(self):
+        """True while the view is panned or a transform handle is dragged."""
+        if self.is_panning:
+            return True
+        transform_widget = getattr(getattr(self, 'canvas_area', None), 'transform_widget', None)
+        return transform_widget is not None and transform_widget.drag_start_pos is not None
     
     def _render_coa_to_framebuffer(self):
         """Render pattern and emblems to RTT framebuffer."""
@@ -400,7 +473,7 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         self.main_composite_shader.setUniformValue("useMask", use_mask)
         
         # Set picker overlay uniforms if picker tool is active
-        if self.active_tool == 'layer_picker' and hasattr(self, 'picker_rtt') and self.picker_rtt:
+        if self.active_tool == 'layer_picker' and getattr(self, 'picker_rtt_valid', False):
             # Bind picker texture to unit 4 (units 0-3 are: coa, frameMask, texturedMask, noise)
             gl.glActiveTexture(gl.GL_TEXTURE4)
             gl.glBindTexture(gl.GL_TEXTURE_2D, self.picker_framebuffer.get_texture())
@@ -440,7 +513,8 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
             position: Optional (x, y) position in pixels from screen center.
                       Uses (pan_x, -pan_y) if None. Pass (0, 0) for export.
         """
-        if self.current_frame_name not in self.frameTextures:
+        frame_texture = self.frameTextures.get(self.current_frame_name)
+        if not frame_texture:
             return
         if not self.tilesheet_shader or not self.vao:
             return
@@ -466,7 +540,7 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         
         # Bind frame texture
         gl.glActiveTexture(gl.GL_TEXTURE0)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.frameTexture)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, frame_texture)
         self.tilesheet_shader.setUniformValue("tilesheetSampler", 0)
         
         # Set tilesheet properties
@@ -500,15 +574,16 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         old_scale, old_offset = self.get_frame_transform()
         
         if frame_name in self.frameTextures:
-            self.frameTexture = self.frameTextures[frame_name]
+            # Textures load on the next paint; decode them (and neighbours) now
             self.current_frame_name = frame_name
-            self.patternMask = self.frame_masks.get(frame_name, self.default_mask_texture)
+            self._prefetch_frame(frame_name)
             self.update()
         elif frame_name == "None":
-            self.frameTexture = None
             self.current_frame_name = "None"
-            self.patternMask = self.default_mask_texture
             self.update()
+        elif self.textures_loading:
+            # Applied once frame textures are uploaded
+            self.current_frame_name = frame_name
         
         # Notify transform widget of scale change
         # Update transform widget for new frame (recalculates pixel positions)
@@ -552,6 +627,9 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         if filename and filename in self.texture_uv_map:
             self.base_texture = filename
             self.update()
+        elif filename and self.textures_loading:
+            # Drawn once the atlas UV map arrives
+            self.base_texture = filename
     
     def set_base_colors(self, colors):
         """Set base layer colors as Color objects."""
@@ -572,21 +650,26 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
     
     def set_preview_enabled(self, enabled):
         self.preview_enabled = enabled
+        if enabled:
+            self._prefetch_preview_textures()
         self.update()
     
     def set_preview_government(self, government):
         self.preview_government = government
         if self.preview_enabled:
+            self._prefetch_preview_textures()
             self.update()
     
     def set_preview_rank(self, rank):
         self.preview_rank = rank
         if self.preview_enabled:
+            self._prefetch_preview_textures()
             self.update()
     
     def set_preview_size(self, size):
         self.preview_size = size
         if self.preview_enabled:
+            self._prefetch_preview_textures()
             self.update()
     
     # ========================================
@@ -650,11 +733,55 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
         # Clean up picker resources
         if hasattr(self, '_cleanup_picker_resources'):
             self._cleanup_picker_resources()
+        
+        # Delete frame textures and stop the prefetch worker
+        self.makeCurrent()
+        try:
+            self.frame_texture_cache.shutdown()
+        finally:
+            self.doneCurrent()
+        
+        # Restore uninstrumented GL calls and free timer queries
+        self.render_profiler.set_enabled(False)
+        self.render_profiler.release_gl_resources()
     
     # ========================================
     # Export Methods
     # ========================================
     
+    def _export_coa_bounds(self, export_size):
+        """CoA bounds (left, right, bottom, top) in an export_size framebuffer.
+        
+        In the interactive renderer, frame space (0-1) maps to COA_BASE_SIZE_PX pixels,
+        while the frame quad is FRAME_SIZE_PX pixels. The CoA content area is smaller
+        than the frame by the ratio COA_BASE_SIZE_PX / FRAME_SIZE_PX.
+        For export, the frame fills the full FBO (export_size), so we scale accordingly.
+        """
+        frame_scales, frame_offsets = self.get_frame_transform()
+        sx, sy = frame_scales
+        ox, oy = frame_offsets
+        
+        # CoA (0,0) and (1,1) in frame space
+        frame_tl_x = (0.0 - 0.5) * sx + 0.5 - ox * sx
+        frame_tl_y = (0.0 - 0.5) * sy + 0.5 - oy * sy
+        frame_br_x = (1.0 - 0.5) * sx + 0.5 - ox * sx
+        frame_br_y = (1.0 - 0.5) * sy + 0.5 - oy * sy
+        
+        # Account for frame-to-CoA size ratio (same as interactive denormalization)
+        # In the interactive renderer, denormalize_by_viewport uses COA_BASE_SIZE_PX,
+        # but the quad is FRAME_SIZE_PX. Scale the export bounds by the same ratio.
+        effective_coa_half = (COA_BASE_SIZE_PX * export_size / FRAME_SIZE_PX) / 2.0
+        fbo_center = export_size / 2.0
+        
+        # Frame space → export FBO pixels (same chain as interactive:
+        # frame→normalized→denormalize_by_COA_BASE→center_in_viewport→flip_Y)
+        export_coa_left = fbo_center + (frame_tl_x * 2.0 - 1.0) * effective_coa_half
+        export_coa_right = fbo_center + (frame_br_x * 2.0 - 1.0) * effective_coa_half
+        export_coa_top = fbo_center + (1.0 - frame_tl_y * 2.0) * effective_coa_half
+        export_coa_bottom = fbo_center + (1.0 - frame_br_y * 2.0) * effective_coa_half
+        
+        return (export_coa_left, export_coa_right, export_coa_bottom, export_coa_top)
+    
     def export_to_png(self, filename):
         """Export the current CoA rendering to PNG with transparency.
         Also exports government and title previews as separate files if preview_enabled.
@@ -701,41 +828,16 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
             gl.glClearColor(0.0, 0.0, 0.0, 0.0)
             gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
             
-            # Render the CoA: First to framebuffer RTT, then composite to FBO
+            # Render the CoA: First to framebuffer RTT, then composite to FBO.
+            # Exports never sample a smaller RTT than the canonical size; the
+            # next paint restores the on-screen size.
+            self.framebuffer_rtt.resize(max(self.framebuffer_rtt.width, FramebufferRTT.COA_RTT_WIDTH))
             self._render_coa_to_framebuffer()
             
             # Re-bind export FBO (render_coa_to_framebuffer unbinds back to screen)
             fbo.bind()
             
-            # Compute CoA viewport bounds for export FBO
-            # In the interactive renderer, frame space (0-1) maps to COA_BASE_SIZE_PX pixels,
-            # while the frame quad is FRAME_SIZE_PX pixels. The CoA content area is smaller
-            # than the frame by the ratio COA_BASE_SIZE_PX / FRAME_SIZE_PX.
-            # For export, the frame fills the full FBO (export_size), so we scale accordingly.
-            frame_scales, frame_offsets = self.get_frame_transform()
-            sx, sy = frame_scales
-            ox, oy = frame_offsets
-            
-            # CoA (0,0) and (1,1) in frame space
-            frame_tl_x = (0.0 - 0.5) * sx + 0.5 - ox * sx
-            frame_tl_y = (0.0 - 0.5) * sy + 0.5 - oy * sy
-            frame_br_x = (1.0 - 0.5) * sx + 0.5 - ox * sx
-            frame_br_y = (1.0 - 0.5) * sy + 0.5 - oy * sy
-            
-            # Account for frame-to-CoA size ratio (same as interactive denormalization)
-            # In the interactive renderer, denormalize_by_viewport uses COA_BASE_SIZE_PX,
-            # but the quad is FRAME_SIZE_PX. Scale the export bounds by the same ratio.
-            effective_coa_half = (COA_BASE_SIZE_PX * export_size / FRAME_SIZE_PX) / 2.0
-            fbo_center = export_size / 2.0
-            
-            # Frame space → export FBO pixels (same chain as interactive:
-            # frame→normalized→denormalize_by_COA_BASE→center_in_viewport→flip_Y)
-            export_coa_left = fbo_center + (frame_tl_x * 2.0 - 1.0) * effective_coa_half
-            export_coa_right = fbo_center + (frame_br_x * 2.0 - 1.0) * effective_coa_half
-            export_coa_top = fbo_center + (1.0 - frame_tl_y * 2.0) * effective_coa_half
-            export_coa_bottom = fbo_center + (1.0 - frame_br_y * 2.0) * effective_coa_half
-            
-            export_coa_bounds = (export_coa_left, export_coa_right, export_coa_bottom, export_coa_top)
+            export_coa_bounds = self._export_coa_bounds(export_size)
             
             # Composite to the export framebuffer
             # Center the 512x512 canvas in export viewport
@@ -800,6 +902,140 @@ class CoatOfArmsCanvas(CanvasRenderingMixin, CanvasCoordinateMixin, CanvasZoomPa
             traceback.print_exc()
             return False
     
+    def export_preview_batch(self, directory, variants, prefix="coa"):
+        """Export many government/title preview variants of the current CoA.
+        
+        Renders the CoA RTT once, then every variant through a pooled
+        framebuffer session (CanvasPreviewMixin.export_preview_variants);
+        PNG encoding and writes run on a background thread.
+        
+        Args:
+            directory: Output directory
+            variants: PreviewVariants (see services.preview_export)
+            prefix: File name prefix
+            
+        Returns:
+            Number of files written
+        """
+        from services.output_sinks import BackgroundWriter, DirectorySink
+        
+        self.makeCurrent()
+        try:
+            self._render_coa_to_framebuffer()
+            with BackgroundWriter(DirectorySink(directory)) as writer:
+                count = self.export_preview_variants(variants, writer, prefix=prefix)
+        finally:
+            gl.glClearColor(*self.clear_color)
+            self.doneCurrent()
+        return count
+    
+    def create_tiled_export(self, filename, export_size, supersample=1, tile_size=None):
+        """Start a tiled high-resolution PNG export of the current CoA.
+        
+        Renders the CoA RTT once into a dedicated render target sized for the
+        output (up to the largest RTT size), then returns a TiledExport whose
+        step() draws one tile of the composite and frame and reads it back.
+        The caller drives step()/finish() on the GUI thread (the GL context's
+        thread); downsampling and PNG encoding run on the export's worker.
+        
+        Args:
+            filename: Output PNG path
+            export_size: Output edge length in pixels (e.g. 16384)
+            supersample: Pixels rendered per output pixel in each direction
+            tile_size: Output tile edge (default: tiled_export.DEFAULT_TILE_SIZE)
+            
+        Returns:
+            TiledExport
+        """
+        from services.preview_export import FramebufferPool
+        from services.rtt_resolution import RTT_SIZES
+        from services.tiled_export import DEFAULT_TILE_SIZE, TiledExport
+        
+        self.makeCurrent()
+        try:
+            max_texture = int(gl.glGetIntegerv(gl.GL_MAX_TEXTURE_SIZE))
+            tile_size = max(1, min(tile_size or DEFAULT_TILE_SIZE, max_texture // supersample))
+            full_size = export_size * supersample
+            
+            # CoA RTT covering the CoA at full output resolution, as far as it helps
+            coa_px = COA_BASE_SIZE_PX * full_size / FRAME_SIZE_PX
+            policy = RTTResolutionPolicy(max_size=min(RTT_SIZES[-1], max_texture),
+                                         min_size=FramebufferRTT.COA_RTT_WIDTH)
+            export_rtt = FramebufferRTT(policy.target(coa_px))
+            export_rtt.initialize()
+            
+            screen_rtt, self.framebuffer_rtt = self.framebuffer_rtt, export_rtt
+            try:
+                self._render_coa_to_framebuffer()
+            finally:
+                self.framebuffer_rtt = screen_rtt
+            
+            fbo_pool = FramebufferPool(tile_size * supersample, count=1)
+            fbo = fbo_pool.acquire()
+        finally:
+            gl.glViewport(0, 0, self.width(), self.height())
+            self.doneCurrent()
+        
+        def render_tile(x, y, w, h):
+            self.makeCurrent()
+            try:
+                return self._render_export_tile(fbo, export_rtt, x * supersample, y * supersample,
+                                                w * supersample, h * supersample, full_size)
+            finally:
+                gl.glViewport(0, 0, self.width(), self.height())
+                gl.glClearColor(*self.clear_color)
+                self.doneCurrent()
+        
+        def release():
+            self.makeCurrent()
+            export_rtt.cleanup()
+            fbo_pool.release()
+            self.doneCurrent()
+        
+        return TiledExport(filename, export_size, render_tile, supersample=supersample,
+                           tile_size=tile_size, on_close=release)
+    
+    def _render_export_tile(self, fbo, export_rtt, tile_x, tile_y, tile_w, tile_h, full_size):
+        """Render one tile of a full_size export and read it back.
+        
+        Args:
+            fbo: Tile framebuffer (at least tile_w x tile_h)
+            export_rtt: FramebufferRTT holding the rendered CoA
+            tile_x, tile_y: Tile origin in full_size pixels (top-left origin)
+            tile_w, tile_h: Tile size in pixels
+            full_size: Edge length of the whole (supersampled) export
+            
+        Returns:
+            (tile_h, tile_w, 4) uint8 array, bottom row first
+        """
+        from services.tiled_export import tile_view
+        
+        fbo.bind()
+        gl.glViewport(0, 0, tile_w, tile_h)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+        
+        # Full-size quads, shifted so this tile's part lands in the viewport
+        position, coa_bounds = tile_view(tile_x, tile_y, tile_w, tile_h, full_size,
+                                         self._export_coa_bounds(full_size))
+        
+        screen_rtt, self.framebuffer_rtt = self.framebuffer_rtt, export_rtt
+        try:
+            self.vao.bind()
+            self._render_main_composite(tile_w, tile_h, full_size, full_size, *position, coa_bounds=coa_bounds)
+            if self.current_frame_name and self.current_frame_name != "None" and self.current_frame_name in self.frameTextures:
+                self._render_frame(viewport_size=(tile_w, tile_h), quad_size=full_size, position=position)
+            self.vao.release()
+        finally:
+            self.framebuffer_rtt = screen_rtt
+        
+        gl.glReadBuffer(gl.GL_COLOR_ATTACHMENT0)
+        pixels = gl.glReadPixels(0, 0, tile_w, tile_h, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        fbo.release()
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(tile_h, tile_w, 4)
+    
     # Note: Composite helpers and preview rendering methods
     # from the original file would continue here. This demonstrates the refactored
     # structure - original functionality preserved but using the new utility tools.
@@ -7,6 +7,11 @@ import numpy as np
 import OpenGL.GL as gl
 from PyQt5.QtGui import QVector2D
 
+from services.frame_texture_cache import neighbour_keys
+from services.preview_export import (
+    DEFAULT_EXPORT_SIZE, DEFAULT_POOL_SIZE, FramebufferPool, ReadbackImage,
+)
+
 
 # ========================================
 # Constants
@@ -106,6 +111,20 @@ class CanvasPreviewMixin:
         # For sizes in between, use closest
         return min(available_sizes, key=lambda x: abs(x - requested_size))
     
+    def _prefetch_preview_textures(self):
+        """Decode the overlays the previews will draw next, in the background.
+        
+        Covers the current government (and its neighbours in the list),
+        rank and size; textures are uploaded when first drawn.
+        """
+        size = self.preview_size
+        entries = []
+        for government in neighbour_keys(list(self.realm_frame_masks), self.preview_government):
+            entries += [('realm_frame_masks', government), ('realm_frame_frames', (government, size))]
+        crown_attribute = PREVIEW_CROWN_REPLACEMENT_RANKS.get(self.preview_rank, 'crown_strips')
+        entries += [(crown_attribute, size), ('topframes', size), ('title_frames', size)]
+        self.frame_texture_cache.prefetch(entries)
+    
     def _calculate_preview_dimensions(self, preview_size_px):
         """Calculate preview quad dimensions in pixels.
         
@@ -437,138 +456,139 @@ class CanvasPreviewMixin:
             filepath: Output file path (e.g., "output_government.png")
             export_size: Canvas size in pixels (default: self.preview_size)
         """
-        if export_size is None:
-            export_size = self.preview_size
+        self._export_single_preview(filepath, self._render_government_preview_at_px, export_size)
+    
+    def export_title_preview(self, filepath, export_size=None):
+        """Export title preview to PNG file.
         
+        Args:
+            filepath: Output file path (e.g., "output_title.png")
+            export_size: Canvas size in pixels (default: self.preview_size)
+        """
+        self._export_single_preview(filepath, self._render_title_preview_at_px, export_size)
+    
+    def _export_single_preview(self, filepath, render_fn, export_size=None):
+        """Render one preview centered at native 115px into a fresh FBO and save it."""
         # Canvas is square (e.g., 512x512)
-        canvas_size = export_size
-        
-        # Render at native texture size (115px for largest textures)
-        texture_size = 115  # Native size, no scaling
-        render_size = texture_size
-        
-        # Calculate actual render dimensions at native size
-        width_px, height_px, crown_height_px, total_height_px = self._calculate_preview_dimensions(render_size)
+        canvas_size = export_size or self.preview_size
         
-        # Center position in canvas
-        center_x = canvas_size / 2.0
-        center_y = canvas_size / 2.0
-        
-        # Top-left position (center the total height including crown)
-        left_px = center_x - width_px / 2.0
-        top_px = center_y - total_height_px / 2.0
-        
-        # Store original viewport and FBO
-        original_width = self.width()
-        original_height = self.height()
+        original_width, original_height = self.width(), self.height()
         original_fbo = gl.glGetIntegerv(gl.GL_FRAMEBUFFER_BINDING)
         
-        # Create square framebuffer for export
-        from PyQt5.QtGui import QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat
-        from PyQt5.QtCore import QSize
-        
-        fbo_format = QOpenGLFramebufferObjectFormat()
-        fbo_format.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
-        fbo_format.setInternalTextureFormat(0x8058)  # GL_RGBA8
-        
-        export_fbo = QOpenGLFramebufferObject(QSize(canvas_size, canvas_size), fbo_format)
-        if not export_fbo.isValid():
-            raise Exception("Failed to create export framebuffer")
-        
-        # Bind export framebuffer and set viewport
+        export_fbo = FramebufferPool(canvas_size, count=1).acquire()
         export_fbo.bind()
-        gl.glClearColor(0.0, 0.0, 0.0, 0.0)
-        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        gl.glViewport(0, 0, canvas_size, canvas_size)
-        
-        # Temporarily override width()/height() for coordinate calculations during export
-        self._export_viewport_override = (canvas_size, canvas_size)
-        
-        # Render government preview centered at native size
-        self._render_government_preview_at_px(left_px, top_px, render_size=render_size, texture_size=texture_size)
-        
-        # Clear override
-        self._export_viewport_override = None
+        # Render at native texture size (115px for largest textures), no scaling
+        self._render_preview_centered(render_fn, canvas_size, PREVIEW_LARGE_SIZE_PX)
         
-        # Read pixels and save (toImage() already returns correct orientation for FBO)
-        from PyQt5.QtGui import QImage
-        image = export_fbo.toImage()
-        image.save(filepath, "PNG")
+        # toImage() already returns correct orientation for FBO
+        export_fbo.toImage().save(filepath, "PNG")
         
         # Cleanup and restore
         export_fbo.release()
         gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, original_fbo)
         gl.glViewport(0, 0, original_width, original_height)
     
-    def export_title_preview(self, filepath, export_size=None):
-        """Export title preview to PNG file.
+    def _render_preview_centered(self, render_fn, canvas_size, render_size, texture_size=None):
+        """Clear the bound FBO and render one preview centered in it.
         
         Args:
-            filepath: Output file path (e.g., "output_title.png")
-            export_size: Canvas size in pixels (default: self.preview_size)
+            render_fn: _render_government_preview_at_px or _render_title_preview_at_px
+            canvas_size: Square FBO size in pixels
+            render_size: Preview size in pixels
+            texture_size: Size for texture lookups (uses render_size if None)
         """
-        if export_size is None:
-            export_size = self.preview_size
-        
-        # Canvas is square (e.g., 512x512)
-        canvas_size = export_size
-        
-        # Render at native texture size (115px for largest textures)
-        texture_size = 115  # Native size, no scaling
-        render_size = texture_size
-        
-        # Calculate actual render dimensions at native size
+        render_size = int(render_size)
         width_px, height_px, crown_height_px, total_height_px = self._calculate_preview_dimensions(render_size)
         
-        # Center position in canvas
-        center_x = canvas_size / 2.0
-        center_y = canvas_size / 2.0
-        
         # Top-left position (center the total height including crown)
-        left_px = center_x - width_px / 2.0
-        top_px = center_y - total_height_px / 2.0
-        
-        # Store original viewport and FBO
-        original_width = self.width()
-        original_height = self.height()
-        original_fbo = gl.glGetIntegerv(gl.GL_FRAMEBUFFER_BINDING)
-        
-        # Create square framebuffer for export
-        from PyQt5.QtGui import QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat
-        from PyQt5.QtCore import QSize
-        
-        fbo_format = QOpenGLFramebufferObjectFormat()
-        fbo_format.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
-        fbo_format.setInternalTextureFormat(0x8058)  # GL_RGBA8
-        
-        export_fbo = QOpenGLFramebufferObject(QSize(canvas_size, canvas_size), fbo_format)
-        if not export_fbo.isValid():
-            raise Exception("Failed to create export framebuffer")
+        left_px = canvas_size / 2.0 - width_px / 2.0
+        top_px = canvas_size / 2.0 - total_height_px / 2.0
         
-        # Bind export framebuffer and set viewport
-        export_fbo.bind()
         gl.glClearColor(0.0, 0.0, 0.0, 0.0)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
         gl.glViewport(0, 0, canvas_size, canvas_size)
         
         # Temporarily override width()/height() for coordinate calculations during export
         self._export_viewport_override = (canvas_size, canvas_size)
+        try:
+            render_fn(left_px, top_px, render_size=render_size, texture_size=texture_size or render_size)
+        finally:
+            self._export_viewport_override = None
+    
+    def _render_preview_variant(self, variant, canvas_size):
+        """Render one PreviewVariant centered into the bound FBO."""
+        self.preview_rank = variant.rank
+        if variant.kind == 'government':
+            self.preview_government = variant.government
+            render_fn = self._render_government_preview_at_px
+        else:
+            render_fn = self._render_title_preview_at_px
+        self._render_preview_centered(render_fn, canvas_size, variant.size)
+    
+    def export_preview_variants(self, variants, writer, prefix="coa",
+                                export_size=DEFAULT_EXPORT_SIZE, pool_size=DEFAULT_POOL_SIZE):
+        """Render many preview variants from the current CoA RTT in one GL session.
         
-        # Render title preview centered at native size
-        self._render_title_preview_at_px(left_px, top_px, render_size=render_size, texture_size=texture_size)
-        
-        # Clear override
-        self._export_viewport_override = None
-        
-        # Read pixels and save (toImage() already returns correct orientation for FBO)
-        from PyQt5.QtGui import QImage
-        image = export_fbo.toImage()
-        image.save(filepath, "PNG")
+        The CoA must already be in framebuffer_rtt and the GL context current.
+        Variants render into a pool of reused framebuffers; each full round
+        is read back together and handed to the writer, which converts and
+        PNG-encodes on its own thread while the next round renders.
         
-        # Cleanup and restore
-        export_fbo.release()
-        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, original_fbo)
-        gl.glViewport(0, 0, original_width, original_height)
+        Args:
+            variants: PreviewVariants (see services.preview_export.preview_variants)
+            writer: BackgroundWriter the images are submitted to
+            prefix: Output name prefix
+            export_size: Square output size in pixels
+            pool_size: Framebuffers rendered before the first is read back
+        
+        Returns:
+            Number of images submitted
+        """
+        variants = list(variants)
+        saved_state = (self.preview_government, self.preview_rank)
+        original_viewport = [int(v) for v in gl.glGetIntegerv(gl.GL_VIEWPORT)]
+        original_fbo = gl.glGetIntegerv(gl.GL_FRAMEBUFFER_BINDING)
+        pool = FramebufferPool(export_size, pool_size)
+        
+        try:
+            for start in range(0, len(variants), pool.count):
+                batch = variants[start:start + pool.count]
+                # Decode the next round's overlays while this one renders
+                upcoming = variants[start + pool.count:start + 2 * pool.count]
+                self._prefetch_variant_textures(upcoming)
+                
+                rendered = []
+                for variant in batch:
+                    fbo = pool.acquire()
+                    fbo.bind()
+                    self._render_preview_variant(variant, export_size)
+                    rendered.append((variant, fbo))
+                
+                for variant, fbo in rendered:
+                    gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, fbo.handle())
+                    pixels = gl.glReadPixels(0, 0, export_size, export_size, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+                    pixels = np.frombuffer(pixels, dtype=np.uint8).reshape(export_size, export_size, 4)
+                    writer.submit(variant.output_name(prefix), ReadbackImage(pixels))
+        finally:
+            self.preview_government, self.preview_rank = saved_state
+            gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, original_fbo)
+            gl.glViewport(*original_viewport)
+            pool.release()
+        return len(variants)
+    
+    def _prefetch_variant_textures(self, variants):
+        """Decode the overlays the given variants draw, in the background."""
+        entries = []
+        for variant in variants:
+            if variant.kind == 'government':
+                entries += [('realm_frame_masks', variant.government),
+                            ('realm_frame_frames', (variant.government, variant.size))]
+            else:
+                entries.append(('title_frames', variant.size))
+            crown_attribute = PREVIEW_CROWN_REPLACEMENT_RANKS.get(variant.rank, 'crown_strips')
+            entries += [(crown_attribute, variant.size), ('topframes', variant.size)]
+        if entries:
+            self.frame_texture_cache.prefetch(list(dict.fromkeys(entries)))
     
     def width(self):
         """Override to support export viewport override."""
@@ -2,12 +2,30 @@
 
 This mixin provides shared rendering methods for both normal CoA rendering
 and picker RTT rendering, eliminating duplicate transform calculations.
+
+Hosts that load tiles into texture arrays (texture_arrays,
+texture_layer_map, batched_design_shader, pattern_array_shader) get the
+batched path instead: the base pattern and all emblem instances are drawn
+in a couple of calls from a per-instance buffer (services/emblem_batch.py).
+
+Pixel-space uniforms (screenRes, position, scale) follow the CoA RTT's
+current size (framebuffer_rtt.width), which the canvas adapts to the zoom
+level; hosts without one render at the canonical emblem_batch.RTT_SIZE.
+
+Both emblem paths first drop instances that cannot change a pixel (off
+canvas or under an opaque emblem, services/emblem_culling.py) and report
+the counts to the host's render_profiler, if it has one.
 """
 
-import math
 import OpenGL.GL as gl
 from PyQt5.QtGui import QVector2D, QVector3D, QVector4D
 from models.coa import CoA
+from services.emblem_batch import (
+    INSTANCE_FIELDS, RTT_SIZE, build_emblem_batch, instance_transform_px, iter_layer_instances,
+    pattern_flag_from_mask,
+)
+from services.emblem_culling import cull_emblem_instances
+from utils.quad_renderer import QuadRenderer
 
 
 class CanvasRenderingMixin:
@@ -19,14 +37,18 @@ class CanvasRenderingMixin:
     
     def _render_base_pattern(self):
         """Render the base pattern layer."""
+        if self._uses_texture_arrays():
+            self._render_base_pattern_array()
+            return
         if not self.base_shader or not self.default_mask_texture:
             return
         
         # Get pattern texture
         u0, v0, u1, v1 = 0.0, 0.0, 1.0, 1.0
         pattern_texture_id = self.default_mask_texture
-        if self.base_texture and self.base_texture in self.texture_uv_map:
-            atlas_index, u0, v0, u1, v1 = self.texture_uv_map[self.base_texture]
+        slot = self.texture_uv_map.get(self.base_texture) if self.base_texture else None
+        if slot is not None:
+            atlas_index, u0, v0, u1, v1 = slot
             if 0 <= atlas_index < len(self.texture_atlases):
                 pattern_texture_id = self.texture_atlases[atlas_index]
         
@@ -56,27 +78,28 @@ class CanvasRenderingMixin:
     def _render_emblem_layers(self):
         """Render all emblem layers from CoA model."""
         coa = CoA.get_active() if CoA.has_active() else None
-        if not coa or not self.design_shader or coa.get_layer_count() == 0:
+        if not coa or coa.get_layer_count() == 0:
+            return
+        if self._uses_texture_arrays():
+            self._render_emblem_layers_batched(coa)
+            return
+        if not self.design_shader:
             return
         
+        rtt_size = self._coa_rtt_size()
+        culled = self._cull_emblems(coa, self._atlas_slot, rtt_size)
+        if not culled.layers:
+            return
         self.vao.bind()
         self.design_shader.bind()
+        self.design_shader.setUniformValue("rttSize", QVector2D(rtt_size, rtt_size))
         
         # Bind pattern texture once for mask channels
         self._bind_pattern_for_masks()
         
-        # Iterate through layers
-        for layer_uuid in coa.get_all_layer_uuids():
-            if not coa.get_layer_visible(layer_uuid):
-                continue
-            
-            filename = coa.get_layer_filename(layer_uuid)
-            if not filename or filename not in self.texture_uv_map:
-                continue
-            
-            atlas_idx, u0, v0, u1, v1 = self.texture_uv_map[filename]
-            if atlas_idx >= len(self.texture_atlases):
-                continue
+        # Iterate through layers with instances left to draw
+        for layer_uuid, instances in culled.layers.items():
+            atlas_idx, u0, v0, u1, v1 = self._atlas_slot(coa.get_layer_filename(layer_uuid))
             
             # Bind emblem texture
             gl.glActiveTexture(gl.GL_TEXTURE0)
@@ -93,15 +116,138 @@ class CanvasRenderingMixin:
             # Set layer properties
             self._set_layer_uniforms(coa, layer_uuid)
             
-            # Render all instances
-            self._render_layer_instances(coa, layer_uuid, (u0, v0, u1, v1), self.design_shader)
+            # Render the remaining instances
+            self._render_layer_instances(coa, layer_uuid, (u0, v0, u1, v1), self.design_shader, rtt_size,
+                                         instances=instances)
         self.design_shader.release()
         self.vao.release()
+    
+    def _atlas_slot(self, filename):
+        """Atlas slot (atlas_idx, u0, v0, u1, v1) of a texture, or None if not resident."""
+        slot = self.texture_uv_map.get(filename) if filename else None
+        if slot is None or slot[0] >= len(self.texture_atlases):
+            return None
+        return slot
+    
+    def _cull_emblems(self, coa, slot_for, rtt_size):
+        """Cull emblem instances before drawing and report the counts.
+        
+        Args:
+            coa: CoA model instance
+            slot_for: callable(filename) -> texture slot, or None if the
+                layer cannot be drawn
+            rtt_size: Edge length of the bound framebuffer in pixels
+            
+        Returns:
+            CullResult (see services/emblem_culling.py)
+        """
+        result = cull_emblem_instances(
+            coa, lambda layer_uuid: slot_for(coa.get_layer_filename(layer_uuid)) is not None,
+            rtt_size)
+        profiler = getattr(self, 'render_profiler', None)
+        if profiler is not None:
+            profiler.count_instances(result.total, result.culled)
+        return result
 
+    # ========================================
+    # Batched Rendering (texture arrays)
+    # ========================================
+    
+    def _coa_rtt_size(self):
+        """Edge length of the CoA RTT in pixels (canonical size if there is none)."""
+        framebuffer = getattr(self, 'framebuffer_rtt', None)
+        return float(framebuffer.width) if framebuffer is not None else RTT_SIZE
+    
+    def _uses_texture_arrays(self):
+        return bool(getattr(self, 'texture_arrays', None)) and \
+            getattr(self, 'batched_design_shader', None) is not None
+    
+    def _bind_pattern_array(self, shader, unit):
+        """Bind the array holding the base pattern and set patternLayer (-1 if none)."""
+        slot = self.texture_layer_map.get(self.base_texture) if self.base_texture else None
+        if slot is None or slot[0] >= len(self.texture_arrays):
+            shader.setUniformValue("patternLayer", -1)
+            return
+        gl.glActiveTexture(gl.GL_TEXTURE0 + unit)
+        gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_arrays[slot[0]])
+        shader.setUniformValue("patternArraySampler", unit)
+        shader.setUniformValue("patternLayer", slot[1])
+    
+    def _render_base_pattern_array(self):
+        """Render the base pattern layer from the texture arrays."""
+        shader = self.pattern_array_shader
+        if not shader:
+            return
+        self.vao.bind()
+        shader.bind()
+        self._bind_pattern_array(shader, 0)
+        shader.setUniformValue("color1", QVector3D(*self.base_colors[0].to_float3()))
+        shader.setUniformValue("color2", QVector3D(*self.base_colors[1].to_float3()))
+        shader.setUniformValue("color3", QVector3D(*self.base_colors[2].to_float3()))
+        gl.glDrawElements(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None)
+        shader.release()
+        self.vao.release()
+    
+    def _render_emblem_layers_batched(self, coa):
+        """Draw every visible emblem instance with one instanced call per array run."""
+        show_tint = self._should_show_selection_tint()
+        rtt_size = self._coa_rtt_size()
+        culled = self._cull_emblems(coa, self._array_slot, rtt_size)
+        batch = build_emblem_batch(coa, self.texture_layer_map,
+                                   is_tinted=self._is_layer_selected if show_tint else None,
+                                   rtt_size=rtt_size, layer_instances=culled.layers)
+        if not batch.instance_count:
+            return
+        
+        if getattr(self, '_instanced_quad', None) is None:
+            self._instanced_quad = QuadRenderer.create_instanced_unit_quad(INSTANCE_FIELDS)
+        vao, _, _, instance_vbo = self._instanced_quad
+        
+        shader = self.batched_design_shader
+        vao.bind()
+        shader.bind()
+        shader.setUniformValue("screenRes", QVector2D(rtt_size, rtt_size))
+        shader.setUniformValue("rttSize", QVector2D(rtt_size, rtt_size))
+        shader.setUniformValue("emblemArraySampler", 0)
+        self._bind_pattern_array(shader, 2)
+        
+        instance_vbo.bind()
+        instance_vbo.allocate(batch.data.tobytes(), batch.data.nbytes)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        for array_idx, first, count in batch.runs:
+            if array_idx >= len(self.texture_arrays):
+                continue
+            gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, self.texture_arrays[array_idx])
+            QuadRenderer.point_instance_attributes(INSTANCE_FIELDS, first)
+            gl.glDrawElementsInstanced(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None, count)
+        instance_vbo.release()
+        
+        shader.release()
+        vao.release()
+    
+    def _array_slot(self, filename):
+        """Array slot (array_idx, layer) of a texture, or None if not resident."""
+        slot = self.texture_layer_map.get(filename) if filename else None
+        if slot is None or slot[0] >= len(self.texture_arrays):
+            return None
+        return slot
+    
+    def _release_instanced_quad(self):
+        """Destroy the batched path's quad and instance buffer, if created."""
+        quad = getattr(self, '_instanced_quad', None)
+        if quad is None:
+            return
+        vao, vbo, ebo, instance_vbo = quad
+        for buffer in (instance_vbo, ebo, vbo):
+            buffer.destroy()
+        vao.destroy()
+        self._instanced_quad = None
+    
     def _bind_pattern_for_masks(self):
         """Bind pattern texture for emblem mask channels."""
-        if self.base_texture and self.base_texture in self.texture_uv_map:
-            pattern_atlas_idx, p_u0, p_v0, p_u1, p_v1 = self.texture_uv_map[self.base_texture]
+        slot = self.texture_uv_map.get(self.base_texture) if self.base_texture else None
+        if slot is not None:
+            pattern_atlas_idx, p_u0, p_v0, p_u1, p_v1 = slot
             if pattern_atlas_idx < len(self.texture_atlases):
                 gl.glActiveTexture(gl.GL_TEXTURE2)
                 gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_atlases[pattern_atlas_idx])
@@ -146,30 +292,13 @@ class CanvasRenderingMixin:
         Returns:
             int: Bitmask where bit 0=red, bit 1=green, bit 2=blue
         """
-        if mask is None:
-            return 0
-        
-        # Handle non-list types
-        if not isinstance(mask, (list, tuple)):
-            return 0
-            
-        if len(mask) == 0:
-            return 0
-            
-        pattern_flag = 0
-        if len(mask) > 0 and mask[0] != 0:
-            pattern_flag |= 1
-        if len(mask) > 1 and mask[1] != 0:
-            pattern_flag |= 2
-        if len(mask) > 2 and mask[2] != 0:
-            pattern_flag |= 4
-        return pattern_flag
+        return pattern_flag_from_mask(mask)
     
     # ========================================
     # Shared Instance Rendering
     # ========================================
     
-    def _render_layer_instances(self, coa, layer_uuid, uv_coords, shader):
+    def _render_layer_instances(self, coa, layer_uuid, uv_coords, shader, rtt_size=RTT_SIZE, instances=None):
         """Render all instances of a layer using the specified shader.
         
         Args:
@@ -177,111 +306,30 @@ class CanvasRenderingMixin:
             layer_uuid: UUID of the layer to render
             uv_coords: Tuple of (u0, v0, u1, v1) texture coordinates
             shader: Shader program to use for rendering
+            rtt_size: Edge length of the bound framebuffer in pixels
+            instances: Instances to draw instead of all of them (after culling)
         """
-        instance_count = coa.get_layer_instance_count(layer_uuid)
-        u0, v0, u1, v1 = uv_coords
-        
-        # Check if layer has symmetry
-        symmetry_type = coa.get_layer_symmetry_type(layer_uuid)
-        
-        for instance_idx in range(instance_count):
-            instance = coa.get_layer_instance(layer_uuid, instance_idx)
-            
-            if symmetry_type != 'none':
-                # Get transform plugin and calculate mirrors
-                from services.symmetry_transforms import get_transform
-                from models.transform import Transform, Vec2
-                
-                transform_plugin = get_transform(symmetry_type)
-                if transform_plugin:
-                    # Load properties from layer
-                    properties = coa.get_layer_symmetry_properties(layer_uuid)
-                    if properties:
-                        transform_plugin.set_properties(properties)
-                    
-                    # Create seed transform from instance
-                    seed_transform = Transform(
-                        Vec2(instance.pos.x, instance.pos.y),
-                        Vec2(instance.scale.x, instance.scale.y),
-                        instance.rotation
-                    )
-                    
-                    # Render seed
-                    self._render_single_instance(instance, shader)
-                    
-                    # Calculate and render mirrors
-                    mirror_transforms = transform_plugin.calculate_transforms(seed_transform)
-                    for mirror_transform in mirror_transforms:
-                        self._render_single_transform(mirror_transform, instance, shader)
-                else:
-                    # Fallback if plugin not found
-                    self._render_single_instance(instance, shader)
-            else:
-                # Normal rendering - just the instance
-                self._render_single_instance(instance, shader)
+        # Seeds followed by their symmetry mirrors, in draw order
+        if instances is None:
+            instances = iter_layer_instances(coa, layer_uuid)
+        for instance in instances:
+            self._render_single_instance(instance, shader, rtt_size)
     
-    def _render_single_instance(self, instance, shader):
+    def _render_single_instance(self, instance, shader, rtt_size=RTT_SIZE):
         """Render a single instance (extracted for reuse)
         
         Args:
             instance: Instance object with pos, scale, rotation, flip_x, flip_y
             shader: Shader program to use
+            rtt_size: Edge length of the bound framebuffer in pixels
         """
-        # quad.vert expects pixel-based coordinates in 512×512 framebuffer
-        # Convert CoA space (0-1) to pixel position (0-512)
-        center_x_coa = instance.pos.x - 0.5  # Center around 0
-        center_y_coa = instance.pos.y - 0.5  # Center around 0
-        
-        # Convert to pixels (CoA center is at 256, 256)
-        center_x_px = center_x_coa * 512.0  # Offset from center in pixels
-        center_y_px = -center_y_coa * 512.0  # Invert Y, offset from center in pixels
-        
-        # Scale is in CoA coordinates (0-1 range = full width/height)
-        # Convert to pixels: scale * 512
-        scale_x_px = instance.scale.x * 512.0
-        scale_y_px = instance.scale.y * 512.0
-        
-        # Negate rotation: CK3 uses Y-down (clockwise positive), OpenGL uses Y-up (counterclockwise positive)
-        rotation_rad = math.radians(-instance.rotation)
-        
-        # Apply per-instance flip via negative scale
-        if instance.flip_x:
-            scale_x_px = -scale_x_px
-        if instance.flip_y:
-            scale_y_px = -scale_y_px
+        # quad.vert expects pixel-based coordinates in the rtt_size² framebuffer
+        center_x_px, center_y_px, scale_x_px, scale_y_px, rotation_rad = instance_transform_px(instance, rtt_size)
         
         # Set transform uniforms for emblem.vert (pixel-based)
-        shader.setUniformValue("screenRes", QVector2D(512.0, 512.0))
+        shader.setUniformValue("screenRes", QVector2D(rtt_size, rtt_size))
         shader.setUniformValue("position", QVector2D(center_x_px, center_y_px))
         shader.setUniformValue("scale", QVector2D(scale_x_px, scale_y_px))
         shader.setUniformValue("rotation", rotation_rad)
         
         gl.glDrawElements(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None)
-    
-    def _render_single_transform(self, transform, seed_instance, shader):
-        """Render a transform (used for symmetry mirrors)
-        
-        Args:
-            transform: Transform object with pos, scale, rotation (may have flip_x/flip_y attributes)
-            seed_instance: Original instance (for flip_x, flip_y if not on transform)
-            shader: Shader program to use
-        """
-        from models.coa._internal.instance import Instance
-        
-        # Create temporary instance-like object for rendering
-        # Use transform's pos/scale/rotation
-        # Check if transform has flip overrides, otherwise use seed's flip
-        temp_data = {
-            'pos_x': transform.pos.x,
-            'pos_y': transform.pos.y,
-            'scale_x': transform.scale.x,
-            'scale_y': transform.scale.y,
-            'rotation': transform.rotation,
-            'flip_x': getattr(transform, 'flip_x', seed_instance.flip_x),
-            'flip_y': getattr(transform, 'flip_y', seed_instance.flip_y),
-            'depth': 0.0
-        }
-        temp_instance = Instance(temp_data)
-        
-        # Render using standard method
-        self._render_single_instance(temp_instance, shader)
@@ -1,75 +1,277 @@
 """Mixin for loading textures in the CoA canvas.
 
 Handles loading of:
-- Texture atlases (emblems, patterns)
-- Frame textures and masks
-- Material/noise masks
-- Preview frame textures (realm, title)
+- Emblem and pattern tiles, loaded on first use into a fixed atlas cache
+  (services/texture_residency.py; texture_uv_map is the TextureResidency)
+- Frame textures and masks, preview frame textures (realm, title):
+  only their paths are collected; each loads on first use through
+  services/frame_texture_cache.py
+- Material/noise masks, title mask
+
+Each eager loader is split into a _collect_*_jobs() step that only
+touches the filesystem and decodes images (safe on a worker thread) and
+_upload_texture_job(), which creates the GL texture. The synchronous
+_load_*() methods run both back to back; _load_textures_async() runs the
+collect steps on the startup pipeline and feeds uploads to the GUI thread
+one texture at a time. The lazy loaders' _collect_*_sources() steps only
+scan the filesystem.
 """
 
 import OpenGL.GL as gl
+from PyQt5.QtCore import QTimer
 import json
 from pathlib import Path
 import os
 
 from services.texture_loader import TextureLoader
-from utils.path_resolver import (
-    get_pattern_metadata_path, get_emblem_metadata_path,
-    get_pattern_source_dir, get_emblem_source_dir, 
-    get_frames_dir, get_assets_dir, get_resource_path
+from services.asset_catalog import get_catalog
+from services.texture_residency import TextureResidency, coa_texture_keys
+from services.frame_texture_cache import FrameTextureCache, neighbour_keys
+from utils.path_resolver import get_frames_dir, get_assets_dir, get_resource_path
+
+# Canvas attributes served by the frame texture cache (dict-like views)
+FRAME_TEXTURE_ATTRIBUTES = (
+    'frameTextures', 'frame_masks',
+    'realm_frame_masks', 'realm_frame_frames', 'realm_frame_shadows',
+    'crown_strips', 'title_frames', 'topframes',
+    'adventurer_topframes', 'holyorder_topframes', 'mercenary_topframes',
 )
 
 
 class CanvasTextureLoaderMixin:
     """Mixin providing texture loading functionality for canvas."""
     
+    # Texture tiles loaded per event-loop slice after a residency miss
+    TEXTURE_UPLOADS_PER_SLICE = 8
+    
     def _load_texture_atlases(self):
-        """Load emblem and pattern texture atlases."""
+        """Set up on-demand emblem and pattern textures (no tiles are loaded yet)."""
         try:
-            files = []
-            
-            # Load patterns
-            pattern_json_path = get_pattern_metadata_path()
-            if pattern_json_path.exists():
-                with open(pattern_json_path, 'r', encoding='utf-8') as f:
-                    pattern_data = json.load(f)
-                
-                for filename, props in pattern_data.items():
-                    if props is None or filename in ("\ufeff", ""):
-                        continue
-                    png_filename = filename.replace('.dds', '.png')
-                    image_path = get_pattern_source_dir() / png_filename
-                    if image_path.exists():
-                        files.append((filename, str(image_path)))
-            
-            # Load emblems
-            emblem_json_path = get_emblem_metadata_path()
-            if emblem_json_path.exists():
-                with open(emblem_json_path, 'r', encoding='utf-8') as f:
-                    emblem_data = json.load(f)
-                
-                for filename, props in emblem_data.items():
-                    if props is None or filename == "\ufeff":
-                        continue
-                    png_filename = filename.replace('.dds', '.png')
-                    image_path = get_emblem_source_dir() / png_filename
-                    if image_path.exists():
-                        files.append((filename, str(image_path)))
-            
-            # Build atlas using TextureLoader
-            self.texture_atlases, self.texture_uv_map = TextureLoader.load_texture_atlas(files)
-            
+            # Patterns first, then emblems (catalog resolves paths once)
+            self._apply_uv_map(TextureResidency(get_catalog().atlas_files()))
         except Exception as e:
             print(f"Error loading texture atlases: {e}")
             import traceback
             traceback.print_exc()
     
+    # ========================================
+    # Texture residency
+    # ========================================
+    
+    def _texture_residency(self):
+        """The TextureResidency behind texture_uv_map, or None before it exists."""
+        residency = self.texture_uv_map
+        return residency if isinstance(residency, TextureResidency) else None
+    
+    def _begin_texture_frame(self):
+        residency = self._texture_residency()
+        if residency is not None:
+            residency.begin_frame()
+    
+    def _end_texture_frame(self):
+        """Schedule loading of tiles the frame missed."""
+        residency = self._texture_residency()
+        if residency is not None and residency.pending:
+            self._schedule_texture_uploads()
+    
+    def prefetch_coa_textures(self, coa):
+        """Queue a parsed CoA's textures so they load before its first paint."""
+        residency = self._texture_residency()
+        if residency is not None:
+            residency.request(coa_texture_keys(coa))
+            self._schedule_texture_uploads()
+    
+    def reload_textures(self, filenames=None):
+        """Patch re-converted emblem/pattern tiles into the live atlas.
+
+        Re-reads the asset catalog, re-uploads the resident tiles in
+        place and repaints; textures not resident load the new image on
+        first use.
+
+        Args:
+            filenames: Changed DDS filenames (None for every resident tile)
+
+        Returns:
+            Number of tiles re-uploaded
+        """
+        residency = self._texture_residency()
+        if residency is None:
+            return 0
+        residency.set_files(get_catalog().atlas_files())
+        self.makeCurrent()
+        try:
+            reloaded = residency.reload(filenames)
+            if reloaded:
+                self.invalidate_picker_rtt()
+        finally:
+            self.doneCurrent()
+        if reloaded:
+            self.update()
+        return reloaded
+    
+    def _schedule_texture_uploads(self):
+        if not getattr(self, '_texture_uploads_scheduled', False):
+            self._texture_uploads_scheduled = True
+            QTimer.singleShot(0, self._upload_pending_textures)
+    
+    def _upload_pending_textures(self):
+        """Load a slice of queued tiles, then repaint (reschedules while any remain)."""
+        self._texture_uploads_scheduled = False
+        residency = self._texture_residency()
+        if residency is None or not residency.pending:
+            return
+        self.makeCurrent()
+        try:
+            loaded = residency.upload_pending(self.TEXTURE_UPLOADS_PER_SLICE)
+            if loaded:
+                # Layers whose tiles were missing are absent from the picker
+                self.invalidate_picker_rtt()
+        finally:
+            self.doneCurrent()
+        # Nothing loaded means every slot is in use by the current frame
+        if loaded:
+            if residency.pending:
+                self._schedule_texture_uploads()
+            self.update()
+    
+    # ========================================
+    # Asynchronous loading (startup pipeline)
+    # ========================================
+    
+    def _load_textures_async(self, pipeline):
+        """Decode textures on worker threads and upload them in GUI-thread slices.
+        
+        The canvas renders while this runs: emblems are skipped until the
+        texture index arrives (then load on first use, see
+        services/texture_residency.py), and frames appear once their
+        sources are found.
+        
+        Args:
+            pipeline: services.startup_pipeline.StartupPipeline
+        """
+        self.textures_loading = True
+        
+        # Cheap placeholders so every sampler is valid from the first frame
+        self._load_default_mask_texture()
+        self.texturedMask = TextureLoader.create_solid_texture((255, 255, 255, 255))
+        self.noiseMask = TextureLoader.create_solid_texture((255, 255, 255, 255), size=64)
+        
+        def index_atlases():
+            return TextureResidency(get_catalog().atlas_files())
+        
+        # Tiles load on first use; layers and the base pattern can be assigned once indexed
+        pipeline.run_in_background("index texture atlases", index_atlases, on_done=self._apply_uv_map)
+        
+        # (name, collect, lazy): lazy groups only register paths with the frame texture cache
+        groups = (
+            ("frame textures", self._collect_frame_texture_sources, True),
+            ("material mask", self._collect_material_mask_jobs, False),
+            ("noise texture", self._collect_noise_texture_jobs, False),
+            ("realm frames", self._collect_realm_frame_sources, True),
+            ("title mask", self._collect_title_mask_jobs, False),
+            ("title frames", self._collect_title_frame_sources, True),
+        )
+        self._texture_groups_pending = len(groups)
+        for name, collect, lazy in groups:
+            if lazy:
+                pipeline.run_in_background(f"scan {name}", collect, on_done=self._on_texture_sources_found)
+            else:
+                pipeline.run_in_background(
+                    f"decode {name}", collect,
+                    on_done=lambda jobs, name=name: self._queue_upload_jobs(pipeline, name, jobs)
+                )
+    
+    def _queue_upload_jobs(self, pipeline, name, jobs):
+        """Queue one GUI-thread upload per decoded texture."""
+        for job in jobs:
+            pipeline.run_on_gui(f"upload {name}", lambda job=job: self._upload_texture_job(job))
+        pipeline.run_on_gui(f"{name} ready", self._on_texture_group_loaded)
+    
+    def _apply_uv_map(self, uv_map):
+        self.texture_uv_map = uv_map
+        if isinstance(uv_map, TextureResidency):
+            self.texture_atlases = uv_map.pages
+        if self.base_texture is None and "pattern_solid.dds" in uv_map:
+            self.set_base_texture("pattern_solid.dds")
+        self.update()
+    
+    def _on_texture_sources_found(self, sources):
+        self._register_texture_sources(sources)
+        self._on_texture_group_loaded()
+    
+    def _upload_texture_job(self, job):
+        """Create the GL texture for a decoded (attribute, key, image, upload kwargs) job."""
+        self.makeCurrent()
+        try:
+            self._run_upload_jobs([job])
+        finally:
+            self.doneCurrent()
+    
+    def _on_texture_group_loaded(self):
+        self._texture_groups_pending -= 1
+        if self._texture_groups_pending <= 0:
+            self.textures_loading = False
+        # Frame masks drive scales/offsets; re-apply the selected frame
+        self._update_frame_transforms()
+        self.set_frame(self.current_frame_name)
+        self.update()
+    
+    def _run_upload_jobs(self, jobs):
+        """Upload decoded jobs immediately (context must be current)."""
+        for attribute, key, img_data, upload_kwargs in jobs:
+            texture_id = TextureLoader.upload_texture(img_data, **upload_kwargs)
+            if not texture_id:
+                continue
+            if key is None:
+                setattr(self, attribute, texture_id)
+            else:
+                getattr(self, attribute)[key] = texture_id
+    
+    @staticmethod
+    def _decode_job(jobs, attribute, key, path, resize=None, **upload_kwargs):
+        """Decode path and append an upload job; unreadable files are skipped."""
+        try:
+            jobs.append((attribute, key, TextureLoader.decode_image(path, resize), upload_kwargs))
+        except Exception as e:
+            print(f"Error loading texture from {path}: {e}")
+    
+    # ========================================
+    # Frame texture cache
+    # ========================================
+    
+    def _init_frame_texture_cache(self):
+        """Create the frame texture cache and its views (FRAME_TEXTURE_ATTRIBUTES)."""
+        self.frame_texture_cache = FrameTextureCache()
+        for attribute in FRAME_TEXTURE_ATTRIBUTES:
+            setattr(self, attribute, self.frame_texture_cache.view(attribute))
+    
+    @staticmethod
+    def _add_source(sources, attribute, key, path, resize=None, **upload_kwargs):
+        sources.append((attribute, key, path, resize, upload_kwargs))
+    
+    def _register_texture_sources(self, sources):
+        for attribute, key, path, resize, upload_kwargs in sources:
+            self.frame_texture_cache.add_source(attribute, key, path, resize, **upload_kwargs)
+    
+    def _prefetch_frame(self, frame_name):
+        """Decode a frame, its mask and the neighbouring frames in the background."""
+        entries = []
+        for name in neighbour_keys(list(self.frameTextures), frame_name):
+            entries += [('frameTextures', name), ('frame_masks', name)]
+        self.frame_texture_cache.prefetch(entries)
+    
     def _load_frame_textures(self):
-        """Load frame textures and masks."""
+        """Register frame textures and masks (loaded on first use)."""
+        self._register_texture_sources(self._collect_frame_texture_sources())
+        self._update_frame_transforms()
+    
+    def _collect_frame_texture_sources(self):
+        """List frame textures and masks (filesystem only)."""
+        sources = []
         try:
             frame_dir = get_frames_dir()
             if not frame_dir.exists():
-                return
+                return sources
             
             # Frame files to load
             frame_files = {"dynasty": "dynasty.png", "house": "house.png",
@@ -82,34 +284,30 @@ class CanvasTextureLoaderMixin:
                 if not path.exists():
                     continue
                 
-                # Load frame texture
-                texture_id = TextureLoader.load_texture(path)
-                if texture_id:
-                    self.frameTextures[name] = texture_id
+                # Frame texture
+                self._add_source(sources, 'frameTextures', name, path)
                 
-                # Load mask
+                # Mask
                 mask_path = frame_dir / filename.replace('.png', '_mask.png')
                 if mask_path.exists():
-                    mask_id = TextureLoader.load_texture(
-                        mask_path, 
-                        wrap_mode=gl.GL_CLAMP_TO_BORDER,
-                        resize=(800, 800)
-                    )
-                    if mask_id:
-                        self.frame_masks[name] = mask_id
-                        
-                        # Set frame scale/offset from official data
-                        if name in self.official_frame_scales:
-                            scale_data = self.official_frame_scales[name]
-                            self.frame_scales[name] = (scale_data[0]/1.05, scale_data[1]/1.05)
-                            offset_data = self.official_frame_offsets.get(name, [0.0, 0.0])
-                            self.frame_offsets[name] = (offset_data[0], offset_data[1])
-                        else:
-                            self.frame_scales[name] = (1.0, 1.0)
-                            self.frame_offsets[name] = (0.0, 0.0)
+                    self._add_source(sources, 'frame_masks', name, mask_path,
+                                     resize=(800, 800), wrap_mode=gl.GL_CLAMP_TO_BORDER)
         
         except Exception as e:
             print(f"Error loading frame textures: {e}")
+        return sources
+    
+    def _update_frame_transforms(self):
+        """Set scale/offset for every frame with a loaded mask from official data."""
+        for name in self.frame_masks:
+            if name in self.official_frame_scales:
+                scale_data = self.official_frame_scales[name]
+                self.frame_scales[name] = (scale_data[0]/1.05, scale_data[1]/1.05)
+                offset_data = self.official_frame_offsets.get(name, [0.0, 0.0])
+                self.frame_offsets[name] = (offset_data[0], offset_data[1])
+            else:
+                self.frame_scales[name] = (1.0, 1.0)
+                self.frame_offsets[name] = (0.0, 0.0)
     
     def _load_official_frame_transforms(self):
         """Load official frame scales and offsets from JSON."""
@@ -131,102 +329,117 @@ class CanvasTextureLoaderMixin:
     
     def _load_material_mask_texture(self):
         """Load CK3 material mask texture."""
+        jobs = self._collect_material_mask_jobs()
+        if jobs:
+            self._run_upload_jobs(jobs)
+        else:
+            self.texturedMask = TextureLoader.create_solid_texture((255, 255, 255, 255))
+    
+    def _collect_material_mask_jobs(self):
+        jobs = []
         try:
             material_path = get_assets_dir() / 'coa_mask_texture.png'
             if material_path.exists():
-                self.texturedMask = TextureLoader.load_texture(
-                    material_path,
-                    wrap_mode=gl.GL_REPEAT,
-                    min_filter=gl.GL_LINEAR_MIPMAP_LINEAR,
-                    generate_mipmaps=True,
-                    resize=(128, 128)
-                )
-            else:
-                self.texturedMask = TextureLoader.create_solid_texture((255, 255, 255, 255))
+                self._decode_job(jobs, 'texturedMask', None, material_path,
+                                 resize=(128, 128),
+                                 wrap_mode=gl.GL_REPEAT,
+                                 min_filter=gl.GL_LINEAR_MIPMAP_LINEAR,
+                                 generate_mipmaps=True)
         except Exception as e:
             print(f"Error loading material mask: {e}")
-            self.texturedMask = TextureLoader.create_solid_texture((255, 255, 255, 255))
+        return jobs
     
     def _load_noise_texture(self):
         """Load noise texture for grain effect."""
+        jobs = self._collect_noise_texture_jobs()
+        if jobs:
+            self._run_upload_jobs(jobs)
+        else:
+            self.noiseMask = TextureLoader.create_solid_texture((255, 255, 255, 255), size=64)
+    
+    def _collect_noise_texture_jobs(self):
+        jobs = []
         try:
             noise_path = get_resource_path('assets', 'noise.png')
             if os.path.exists(noise_path):
-                self.noiseMask = TextureLoader.load_texture(noise_path, wrap_mode=gl.GL_REPEAT)
-            else:
-                self.noiseMask = TextureLoader.create_solid_texture((255, 255, 255, 255), size=64)
+                self._decode_job(jobs, 'noiseMask', None, noise_path, wrap_mode=gl.GL_REPEAT)
         except Exception as e:
             print(f"Error loading noise texture: {e}")
-            self.noiseMask = TextureLoader.create_solid_texture((255, 255, 255, 255), size=64)
+        return jobs
     
     def _load_realm_frame_textures(self):
-        """Load government-specific realm frame textures."""
+        """Register government-specific realm frame textures (loaded on first use)."""
+        self._register_texture_sources(self._collect_realm_frame_sources())
+        print(f"Found {len(self.realm_frame_masks)} government masks")
+    
+    def _collect_realm_frame_sources(self):
+        """List realm frame masks, frames and shadows (filesystem only)."""
+        sources = []
         try:
             realm_frames_dir = get_assets_dir() / 'realm_frames'
             if not realm_frames_dir.exists():
-                return
+                return sources
             
-            # Load masks
+            # Masks
             for mask_file in Path(realm_frames_dir).glob("*_mask.png"):
                 gov_name = mask_file.stem.replace("_mask", "")
-                texture_id = TextureLoader.load_texture(mask_file)
-                if texture_id:
-                    self.realm_frame_masks[gov_name] = texture_id
-            
-            # Load frames and shadows
-            for frame_file in Path(realm_frames_dir).glob("*_frame.png"):
-                stem = frame_file.stem.replace("_frame", "")
-                parts = stem.rsplit("_", 1)
-                if len(parts) == 2:
-                    gov_name, size_str = parts
-                    try:
-                        size = int(size_str)
-                        texture_id = TextureLoader.load_texture(frame_file)
-                        if texture_id:
-                            self.realm_frame_frames[(gov_name, size)] = texture_id
-                    except ValueError:
-                        pass
-            
-            for shadow_file in Path(realm_frames_dir).glob("*_shadow.png"):
-                stem = shadow_file.stem.replace("_shadow", "")
-                parts = stem.rsplit("_", 1)
-                if len(parts) == 2:
-                    gov_name, size_str = parts
-                    try:
-                        size = int(size_str)
-                        texture_id = TextureLoader.load_texture(shadow_file)
-                        if texture_id:
-                            self.realm_frame_shadows[(gov_name, size)] = texture_id
-                    except ValueError:
-                        pass
+                self._add_source(sources, 'realm_frame_masks', gov_name, mask_file)
             
-            print(f"Loaded {len(self.realm_frame_masks)} government masks")
+            # Frames and shadows, keyed by (government, size)
+            for suffix, attribute in (("_frame", 'realm_frame_frames'), ("_shadow", 'realm_frame_shadows')):
+                for image_file in Path(realm_frames_dir).glob(f"*{suffix}.png"):
+                    stem = image_file.stem.replace(suffix, "")
+                    parts = stem.rsplit("_", 1)
+                    if len(parts) == 2:
+                        gov_name, size_str = parts
+                        try:
+                            size = int(size_str)
+                        except ValueError:
+                            continue
+                        self._add_source(sources, attribute, (gov_name, size), image_file)
         except Exception as e:
             print(f"Error loading realm frames: {e}")
+        return sources
     
     def _load_title_frame_textures(self):
-        """Load title frame assets."""
+        """Load the title mask; register crown strips, title frames and topframes."""
+        self._run_upload_jobs(self._collect_title_mask_jobs())
+        self._register_texture_sources(self._collect_title_frame_sources())
+        print(f"Loaded title textures")
+    
+    def _collect_title_mask_jobs(self):
+        jobs = []
+        try:
+            title_mask_path = get_assets_dir() / 'title_frames' / "title_mask.png"
+            if title_mask_path.exists():
+                self._decode_job(jobs, 'title_mask', None, title_mask_path)
+        except Exception as e:
+            print(f"Error loading title mask: {e}")
+        return jobs
+    
+    def _collect_title_frame_sources(self):
+        """List crown strips, title frames and topframes (filesystem only)."""
+        sources = []
         try:
             title_frames_dir = get_assets_dir() / 'title_frames'
             if not title_frames_dir.exists():
-                return
+                return sources
             
-            # Load title mask
-            title_mask_path = Path(title_frames_dir) / "title_mask.png"
-            if title_mask_path.exists():
-                self.title_mask = TextureLoader.load_texture(title_mask_path)
-            
-            # Load crown strips, title frames, topframes
+            # Crown strips, title frames, topframes, plus single-image
+            # topframe variants (not 7x1 atlas strips)
             sizes = [28, 44, 62, 86, 115]
-            self.crown_strips = TextureLoader.load_sized_textures(title_frames_dir, "crown_strip", sizes)
-            self.title_frames = TextureLoader.load_sized_textures(title_frames_dir, "title", sizes)
-            self.topframes = TextureLoader.load_sized_textures(title_frames_dir, "topframe", sizes)
-            
-            # Single-image topframe variants (not 7x1 atlas strips)
-            self.adventurer_topframes = TextureLoader.load_sized_textures(title_frames_dir, "landless_adventurer_topframe", sizes)
-            self.holyorder_topframes = TextureLoader.load_sized_textures(title_frames_dir, "holyorder_topframe", sizes)
-            self.mercenary_topframes = TextureLoader.load_sized_textures(title_frames_dir, "mercenary_topframe", sizes)
-            
-            print(f"Loaded title textures")
+            for attribute, base_name in (
+                ('crown_strips', "crown_strip"),
+                ('title_frames', "title"),
+                ('topframes', "topframe"),
+                ('adventurer_topframes', "landless_adventurer_topframe"),
+                ('holyorder_topframes', "holyorder_topframe"),
+                ('mercenary_topframes', "mercenary_topframe"),
+            ):
+                for size in sizes:
+                    file_path = Path(title_frames_dir) / f"{base_name}_{size}.png"
+                    if file_path.exists():
+                        self._add_source(sources, attribute, size, file_path)
         except Exception as e:
             print(f"Error loading title frames: {e}")
+        return sources
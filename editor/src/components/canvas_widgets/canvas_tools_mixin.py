@@ -1,6 +1,6 @@
 """Canvas tool mode system - layer picker, eyedropper, etc."""
 from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QCursor, QImage
+from PyQt5.QtGui import QCursor
 from PyQt5.QtWidgets import QToolTip
 
 
@@ -16,11 +16,14 @@ class CanvasToolsMixin:
         self.hovered_uuid = None  # UUID currently under mouse (for tooltip)
         self.last_picker_mouse_pos = None  # Last mouse position for UV calculation
         
-        # Picker RTT - rendered once, cached until CoA changes
-        self.picker_rtt = None  # QImage with UUID encoded as RGB
+        # Picker RTT - each layer in its own color, rendered on activation and
+        # kept until the CoA changes. Only the hover highlight samples it (on
+        # the GPU); hit tests use the CoA spatial index
         self.picker_rtt_valid = False
-        self.picker_uuid_map = {}  # RGB tuple -> UUID mapping
-        self.picker_texture_id = None  # OpenGL texture ID for picker RTT
+        
+        # Marquee select state (drag from empty space in picker mode)
+        self.marquee_origin = None  # QPoint where the drag started
+        self.marquee_band = None  # QRubberBand shown while dragging
         
         # Paint select state (ctrl+drag in picker mode)
         self.paint_selecting = False  # True when ctrl+dragging to paint select
@@ -116,13 +119,16 @@ class CanvasToolsMixin:
     
     def _deactivate_layer_picker(self):
         """Deactivate layer picker tool"""
-        # Keep picker RTT cached for reuse
-        pass
+        # Keep picker RTT cached for reuse; drop any marquee in progress
+        self.marquee_origin = None
+        if self.marquee_band is not None:
+            self.marquee_band.hide()
     
     def _generate_picker_rtt(self):
-        """Generate picker render target with UUID color coding
+        """Generate picker render target with per-layer color coding
         
-        Each layer rendered with unique RGB color encoding its UUID.
+        Each layer rendered with a unique RGB color, so the composite shader
+        can outline the hovered layer's exact pixels.
         Background = rgb(0, 0, 0) for "no layer"
         """
         # Import here to avoid circular dependency
@@ -133,9 +139,7 @@ class CanvasToolsMixin:
         
         coa = CoA.get_active()
         
-        # Build UUID -> RGB mapping AND index -> RGB mapping
-        # Store BOTH the int color (for lookup) and float color (for rendering)
-        self.picker_uuid_map = {}  # (r_int, g_int, b_int) -> UUID
+        # Build index -> RGB mapping
         self.picker_color_map = {}  # layer_index -> (r_float, g_float, b_float)
         layer_count = coa.get_layer_count()
         
@@ -151,21 +155,14 @@ class CanvasToolsMixin:
                 value = 0.55 + 0.45 * ((i * 0.754) % 1.0)
                 r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
                 
-                # Store float version for rendering
                 self.picker_color_map[i] = (r, g, b)
-                
-                # Convert to 0-255 range for lookup mapping
-                r_int = int(r * 255)
-                g_int = int(g * 255)
-                b_int = int(b * 255)
-                self.picker_uuid_map[(r_int, g_int, b_int)] = layer.uuid
         
         # Now actually render the picker RTT using OpenGL
         success = self._render_picker_to_framebuffer()
         self.picker_rtt_valid = success
         
         if success:
-            print(f"Generated picker RTT: {len(self.picker_uuid_map)} layers mapped")
+            print(f"Generated picker RTT: {len(self.picker_color_map)} layers")
         else:
             print("ERROR: Failed to generate picker RTT")
     
@@ -176,9 +173,7 @@ class CanvasToolsMixin:
             bool: True if rendering succeeded, False otherwise
         """
         import OpenGL.GL as gl
-        import numpy as np
         from models.coa import CoA
-        import math
         
         # Validation checks
         if not CoA.has_active():
@@ -246,10 +241,11 @@ class CanvasToolsMixin:
             
             # Get texture UV coordinates
             texture_filename = getattr(layer, 'texture', getattr(layer, 'path', None))
-            if not texture_filename or texture_filename not in self.texture_uv_map:
+            slot = self.texture_uv_map.get(texture_filename) if texture_filename else None
+            if slot is None:
                 continue
             
-            atlas_index, u0, v0, u1, v1 = self.texture_uv_map[texture_filename]
+            atlas_index, u0, v0, u1, v1 = slot
             
             # Bind emblem texture atlas for this layer
             if atlas_index >= len(self.texture_atlases):
@@ -271,8 +267,9 @@ class CanvasToolsMixin:
             if mask_data and len(mask_data) >= 4:
                 # mask_data is [r, g, b, texture_name]
                 pattern_mask = mask_data[3]
-                if pattern_mask in self.texture_uv_map:
-                    pattern_atlas_idx, pu0, pv0, pu1, pv1 = self.texture_uv_map[pattern_mask]
+                pattern_slot = self.texture_uv_map.get(pattern_mask)
+                if pattern_slot is not None:
+                    pattern_atlas_idx, pu0, pv0, pu1, pv1 = pattern_slot
                     
                     # Bind pattern mask texture atlas
                     if pattern_atlas_idx < len(self.texture_atlases):
@@ -300,26 +297,7 @@ class CanvasToolsMixin:
             self._render_layer_instances(coa, layer_uuid, (u0, v0, u1, v1), self.picker_shader)
         gl.glFlush()
         
-        # Read pixels from picker framebuffer
-        width = self.picker_framebuffer.COA_RTT_WIDTH
-        height = self.picker_framebuffer.COA_RTT_HEIGHT
-        pixels = gl.glReadPixels(0, 0, width, height, gl.GL_RGB, gl.GL_UNSIGNED_BYTE)
-        
-        # Convert to numpy array and save as PNG for debugging
-        pixel_array = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 3)
-        pixel_array = np.flipud(pixel_array)  # Flip vertically (OpenGL bottom-up to image top-down)
-        
-        # DEBUG: Save picker RTT as PNG (enable to debug picker visual artifacts)
-        from PIL import Image
-        import os
-        debug_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'picker_debug.png')
-        Image.fromarray(pixel_array, 'RGB').save(debug_path)
-        print(f"Saved picker RTT to: {debug_path}")
-        
-        # Convert to QImage for picker sampling (pixel() method)
-        from PyQt5.QtGui import QImage
-        self.picker_rtt = QImage(pixels, width, height, width * 3, QImage.Format_RGB888)
-        self.picker_rtt = self.picker_rtt.mirrored(False, True)
+        # No readback: the composite shader samples the texture directly
         
         # Unbind and restore blending
         self.vao.release()
@@ -361,37 +339,6 @@ class CanvasToolsMixin:
         r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
         return (r, g, b)
     
-    def _get_picker_texture_id(self):
-        """Get OpenGL texture ID for picker RTT
-        
-        Returns:
-            Texture ID or None if picker not active/valid
-        """
-        if not self.active_tool or not self.picker_rtt_valid or not self.picker_rtt:
-            return None
-        
-        # Create OpenGL texture from QImage if needed
-        if not hasattr(self, 'picker_texture_id') or not self.picker_texture_id:
-            import OpenGL.GL as gl
-            
-            self.picker_texture_id = gl.glGenTextures(1)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.picker_texture_id)
-            
-            # Use nearest-neighbor filtering to preserve exact colors
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-            
-            # Upload QImage data to texture
-            width = self.picker_rtt.width()
-            height = self.picker_rtt.height()
-            img_data = self.picker_rtt.bits().asstring(width * height * 3)
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, width, height, 0, 
-                            gl.GL_RGB, gl.GL_UNSIGNED_BYTE, img_data)
-        
-        return self.picker_texture_id
-    
     def _get_picker_mouse_uv(self):
         """Get normalized mouse UV coordinates for picker highlighting
         
@@ -413,28 +360,12 @@ class CanvasToolsMixin:
         return (-1.0, -1.0)
     
     def _cleanup_picker_resources(self):
-        """Clean up picker RTT OpenGL resources (call before widget destruction)"""
-        if hasattr(self, 'picker_texture_id') and self.picker_texture_id:
-            try:
-                import OpenGL.GL as gl
-                self.makeCurrent()  # Ensure context active
-                gl.glDeleteTextures([self.picker_texture_id])
-                self.picker_texture_id = None
-                self.picker_rtt = None
-                self.picker_rtt_valid = False
-                print("Cleaned up picker RTT resources")
-            except Exception as e:
-                print(f"WARNING: Error cleaning up picker resources: {e}")
+        """Clean up picker RTT state (call before widget destruction)"""
+        self.picker_rtt_valid = False
     
     def invalidate_picker_rtt(self):
         """Invalidate picker RTT (call when CoA changes)"""
         self.picker_rtt_valid = False
-        
-        # Delete old texture if it exists
-        if hasattr(self, 'picker_texture_id') and self.picker_texture_id:
-            import OpenGL.GL as gl
-            gl.glDeleteTextures([self.picker_texture_id])
-            self.picker_texture_id = None
     
     def on_coa_structure_changed(self):
         """Called when CoA structure changes (layers added/removed/reordered)
@@ -443,54 +374,45 @@ class CanvasToolsMixin:
         """
         self.invalidate_picker_rtt()
     
-    def _sample_picker_at_mouse(self, mouse_pos):
-        """Sample picker RTT at mouse position, return UUID or None
+    def _hit_test_layers(self, mouse_pos):
+        """Topmost visible layer whose emblem covers the mouse position
+        
+        Served by the CoA spatial index (shader-exact quads, symmetry mirrors
+        included, emblem occupancy masks), so hover and click never wait on a
+        picker render or a GPU readback.
         
         Args:
             mouse_pos: QPoint in widget coordinates
         
         Returns:
-            UUID string or None if no layer at position
+            UUID string or None
         """
-        if not self.picker_rtt or not self.picker_rtt_valid:
-            return None
-        
-        # Convert canvas pixels to CoA space using instance method
+        from models.coa import CoA
         from models.transform import Vec2
-        canvas_pos = Vec2(mouse_pos.x(), mouse_pos.y())
-        coa_pos = self.canvas_to_coa(canvas_pos)
-        coa_x, coa_y = coa_pos.x, coa_pos.y
-        
-        # Convert CoA space to RTT pixel coords
-        # Add 0.5 to round to nearest pixel (OpenGL texture centers are at pixel+0.5)
-        rtt_x = int(coa_x * self.picker_rtt.width() + 0.5) if coa_x < 1.0 else self.picker_rtt.width() - 1
-        rtt_y = int(coa_y * self.picker_rtt.height() + 0.5) if coa_y < 1.0 else self.picker_rtt.height() - 1
         
-        # Bounds check
-        if rtt_x < 0 or rtt_x >= self.picker_rtt.width() or rtt_y < 0 or rtt_y >= self.picker_rtt.height():
+        if not CoA.has_active():
             return None
+        coa_pos = self.canvas_to_coa(Vec2(mouse_pos.x(), mouse_pos.y()))
+        hits = CoA.get_active().get_layers_at_point(coa_pos.x, coa_pos.y)
+        return hits[0] if hits else None
+    
+    def _layers_in_marquee(self, rect):
+        """Visible layers whose emblem quads touch a widget-space rectangle
+        
+        Args:
+            rect: QRect in widget coordinates
+        
+        Returns:
+            List of layer UUIDs (bottom to top)
+        """
+        from models.coa import CoA
+        from models.transform import Vec2
         
-        # Sample pixel
-        pixel = self.picker_rtt.pixel(rtt_x, rtt_y)
-        r = (pixel >> 16) & 0xFF
-        g = (pixel >> 8) & 0xFF
-        b = pixel & 0xFF
-        
-        # Look up UUID with tolerance for precision errors (GPU float->int rounding)
-        # Try exact match first
-        if (r, g, b) in self.picker_uuid_map:
-            return self.picker_uuid_map[(r, g, b)]
-        
-        # If no exact match, find closest color within tolerance (±1 for each channel)
-        best_match = None
-        best_distance = float('inf')
-        for (mr, mg, mb), uuid in self.picker_uuid_map.items():
-            dist = abs(r - mr) + abs(g - mg) + abs(b - mb)  # Manhattan distance
-            if dist <= 3 and dist < best_distance:  # Tolerance: max 1 per channel
-                best_distance = dist
-                best_match = uuid
-        
-        return best_match
+        if not CoA.has_active():
+            return []
+        top_left = self.canvas_to_coa(Vec2(rect.left(), rect.top()))
+        bottom_right = self.canvas_to_coa(Vec2(rect.right(), rect.bottom()))
+        return CoA.get_active().get_layers_in_rect(top_left.x, top_left.y, bottom_right.x, bottom_right.y)
     
     def _on_tool_mouse_move(self, event):
         """Handle mouse move for active tool
@@ -505,8 +427,15 @@ class CanvasToolsMixin:
         self.last_picker_mouse_pos = mouse_pos  # Store for UV calculation
         
         if self.active_tool == 'layer_picker':
-            # Sample UUID at mouse position
-            uuid = self._sample_picker_at_mouse(mouse_pos)
+            # Marquee drag - just track the rectangle
+            if self.marquee_origin is not None:
+                from PyQt5.QtCore import QRect
+                if self.marquee_band is not None:
+                    self.marquee_band.setGeometry(QRect(self.marquee_origin, mouse_pos).normalized())
+                return
+            
+            # Layer under the mouse
+            uuid = self._hit_test_layers(mouse_pos)
             
             # Paint select mode - toggle layers as we drag over them
             if self.paint_selecting and uuid and uuid not in self.paint_selected_uuids:
@@ -573,8 +502,8 @@ class CanvasToolsMixin:
         modifiers = event.modifiers()
         
         if self.active_tool == 'layer_picker':
-            # Sample UUID at click position
-            uuid = self._sample_picker_at_mouse(mouse_pos)
+            # Layer under the click
+            uuid = self._hit_test_layers(mouse_pos)
             
             # Get modifiers
             ctrl_held = modifiers & Qt.ControlModifier
@@ -594,6 +523,16 @@ class CanvasToolsMixin:
                         # REGULAR SELECT - toggle layer selection
                         self._toggle_layer_selection(uuid, layer_list, main_window)
                         # Fall through to deactivation check below
+            elif not uuid and not ctrl_held:
+                # Empty space - start a marquee; selection and deactivation happen on release
+                from PyQt5.QtCore import QRect, QSize
+                from PyQt5.QtWidgets import QRubberBand
+                self.marquee_origin = mouse_pos
+                if self.marquee_band is None:
+                    self.marquee_band = QRubberBand(QRubberBand.Rectangle, self)
+                self.marquee_band.setGeometry(QRect(mouse_pos, QSize()))
+                self.marquee_band.show()
+                return True
             
             # Deactivation check (after selection is handled)
             if shift_held:
@@ -626,6 +565,11 @@ class CanvasToolsMixin:
             return False
         
         if self.active_tool == 'layer_picker':
+            # Finish marquee selection
+            if self.marquee_origin is not None:
+                self._finish_marquee(event)
+                return True
+            
             # End paint selection mode
             if self.paint_selecting:
                 self.paint_selecting = False
@@ -635,6 +579,37 @@ class CanvasToolsMixin:
         
         return False
     
+    def _finish_marquee(self, event):
+        """Select the layers inside the marquee (adds to the selection)
+        
+        A click without a drag is an empty-space click: it only ends
+        one-shot picking.
+        
+        Args:
+            event: QMouseEvent of the release
+        """
+        from PyQt5.QtCore import QRect
+        
+        rect = QRect(self.marquee_origin, event.pos()).normalized()
+        self.marquee_origin = None
+        if self.marquee_band is not None:
+            self.marquee_band.hide()
+        
+        if rect.width() > 3 or rect.height() > 3:
+            uuids = self._layers_in_marquee(rect)
+            if uuids and hasattr(self, 'canvas_area') and self.canvas_area:
+                main_window = getattr(self.canvas_area, 'main_window', None)
+                if main_window:
+                    layer_list = main_window.right_sidebar.layer_list_widget
+                    layer_list.selected_layer_uuids.update(uuids)
+                    layer_list.last_selected_uuid = uuids[-1]
+                    layer_list.update_selection_visuals()
+                    main_window.right_sidebar._on_layer_selection_changed()
+        
+        if not (event.modifiers() & Qt.ShiftModifier):
+            # ONE-SHOT MODE - deactivate picker
+            self._deactivate_picker()
+    
     def _start_paint_selection(self, uuid, layer_list, main_window):
         """Start ctrl+click paint selection mode
         
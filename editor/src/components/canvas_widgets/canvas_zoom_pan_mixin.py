@@ -164,5 +164,7 @@ class CanvasZoomPanMixin:
                 self.setCursor(Qt.OpenHandCursor)
             else:
                 self.setCursor(Qt.ArrowCursor)
+            # Re-render at full RTT resolution now the view has settled
+            self.update()
             return True
         return False
@@ -80,6 +80,28 @@ class ShaderManager:
         """
         return self.create_program(parent, 'coa/emblem.vert', 'coa/emblem.frag', 'Design')
     
+    def create_batched_design_shader(self, parent):
+        """Create instanced emblem shader for the texture-array path
+        
+        Args:
+            parent: Parent QObject
+            
+        Returns:
+            QOpenGLShaderProgram drawing every emblem instance of a CoA in one call
+        """
+        return self.create_program(parent, 'coa/emblem_batched.vert', 'coa/emblem_batched.frag', 'BatchedDesign')
+    
+    def create_pattern_array_shader(self, parent):
+        """Create base layer shader for the texture-array path
+        
+        Args:
+            parent: Parent QObject
+            
+        Returns:
+            QOpenGLShaderProgram for base layer rendering from a texture array
+        """
+        return self.create_program(parent, 'coa/pattern.vert', 'coa/pattern_array.frag', 'PatternArray')
+    
     def create_basic_shader(self, parent):
         """Create basic shader program for frame rendering
         
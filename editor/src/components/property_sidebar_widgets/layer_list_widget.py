@@ -16,6 +16,42 @@ from utils.atlas_compositor import composite_emblem_atlas, get_atlas_path
 from constants import HIGH_CONTRAST_DARK, HIGH_CONTRAST_LIGHT
 
 
+def longest_increasing_run(values):
+    """Positions of a longest strictly increasing subsequence of values
+
+    Used to keep as many layout rows in place as possible when reordering.
+
+    Args:
+        values: Sequence of distinct comparable values
+
+    Returns:
+        Set of positions into values
+    """
+    tails = []  # tails[k]: position ending the best subsequence of length k + 1
+    previous = [None] * len(values)
+    for position, value in enumerate(values):
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if values[tails[mid]] < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low > 0:
+            previous[position] = tails[low - 1]
+        if low == len(tails):
+            tails.append(position)
+        else:
+            tails[low] = position
+
+    run = set()
+    position = tails[-1] if tails else None
+    while position is not None:
+        run.add(position)
+        position = previous[position]
+    return run
+
+
 class LayerListWidget(QWidget):
     """Widget for displaying and managing the layer list with drag-drop support"""
     
@@ -33,7 +69,13 @@ class LayerListWidget(QWidget):
         self.active_drop_zone = None
         self.drag_start_uuid = None
         self.drag_start_pos = None
-        self.thumbnail_cache = {}  # uuid -> QPixmap cache
+        self.thumbnail_cache = {}  # (uuid, size) -> QPixmap cache
+        self._thumbnail_generation = 0  # Bumped by clear_thumbnail_cache()
+        # Rows kept between rebuilds for reconciliation
+        self._layer_widgets = {}  # uuid -> layer row widget
+        self._marker_widgets = {}  # container_uuid -> container marker
+        self._zone_widgets = {}  # drop zone key -> drop zone row widget
+        self.rebuild_stats = {}  # Counts from the last rebuild()
         self.property_sidebar = None  # Reference to parent PropertySidebar (for accessing base colors)
         self.main_window = None  # Reference to main window (for history snapshots)
         
@@ -68,144 +110,211 @@ class LayerListWidget(QWidget):
         """DEPRECATED: Kept for compatibility. Widget now reads from CoA directly."""
         pass
     
-    def rebuild(self):
-        """Rebuild the layer list UI from CoA model with container support"""
+    def rebuild(self, full=False):
+        """Bring the layer list UI in line with the CoA model
+
+        Widgets are reconciled by UUID: layer buttons and container markers
+        whose displayed data is unchanged are kept, and only added, removed,
+        changed or moved rows touch the layout. Cost follows the size of the
+        change rather than the layer count.
+
+        Args:
+            full: Recreate every widget and drop all cached thumbnails
+        """
         if not self.coa:
             return
-        
-        # Clear thumbnail cache to prevent stale thumbnails after undo/redo or rebuild
-        self.clear_thumbnail_cache()
-        
-        # Clear existing layer buttons, container markers, and drop zones
-        for uuid, btn in self.layer_buttons:
-            btn.deleteLater()
-        self.layer_buttons.clear()
-        
-        for container_uuid, marker in self.container_markers:
-            marker.deleteLater()
-        self.container_markers.clear()
-        
-        for zone in self.drop_zones:
-            zone.deleteLater()
-        self.drop_zones.clear()
-        
-        # Clear all widgets from layout
-        while self.layers_layout.count() > 0:
-            item = self.layers_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.spacerItem():
-                pass
-        
-        # Get all layer UUIDs and containers
+
+        self.rebuild_stats = dict.fromkeys(('created', 'reused', 'moved', 'removed'), 0)
+        if full:
+            self.clear_thumbnail_cache()
+            self._layer_widgets.clear()
+            self._marker_widgets.clear()
+            self._zone_widgets.clear()
+
         all_uuids = self.coa.get_all_layer_uuids()
-        all_containers = self.coa.get_all_containers()
-        
+        index_of = {uuid: i for i, uuid in enumerate(all_uuids)}
+
         # Build container structure: map container_uuid -> [layer_uuids in that container]
         container_map = {}
-        root_layers = []
-        
+        display_items = []  # ('root', uuid) or ('container', container_uuid)
         for uuid in all_uuids:
             container_uuid = self.coa.get_layer_container(uuid)
             if container_uuid is None:
-                root_layers.append(uuid)
+                display_items.append(('root', uuid))
             else:
                 if container_uuid not in container_map:
+                    # First layer in container - container marker goes here
                     container_map[container_uuid] = []
-                container_map[container_uuid].append(uuid)
-        
-        # Determine display order: containers and root layers interleaved by layer position
-        # Build display items list: each item is either ('root', uuid) or ('container', container_uuid)
-        display_items = []
-        for uuid in all_uuids:
-            container_uuid = self.coa.get_layer_container(uuid)
-            if container_uuid is None:
-                # Root layer
-                display_items.append(('root', uuid))
-            else:
-                # Check if this is the first layer in the container (add container marker once)
-                container_layers = container_map.get(container_uuid, [])
-                if container_layers and uuid == container_layers[0]:
-                    # First layer in container - add container marker here
                     display_items.append(('container', container_uuid))
-        
+                container_map[container_uuid].append(uuid)
+
         # Reverse for display (top to bottom)
         display_items.reverse()
-        
-        # Add drop zone at top
-        layout_pos = 0
-        self._add_drop_zone(len(all_uuids), layout_pos)
-        layout_pos += 1
-        
-        # Add display items (containers with their layers, and root layers)
+
+        layer_widgets = {}
+        marker_widgets = {}
+        zone_widgets = {}
+        rows = []  # Desired layout order
+        self.layer_buttons = []
+        self.container_markers = []
+        self.drop_zones = []
+
+        def add_zone(key, drop_index, indented=False, container_uuid=None):
+            row = self._reuse_drop_zone(key, drop_index, indented, container_uuid)
+            zone_widgets[key] = row
+            self.drop_zones.append(row.drop_zone)
+            rows.append(row)
+
+        def add_layer(uuid, indented):
+            row = self._reuse_layer_button(uuid, indented)
+            layer_widgets[uuid] = row
+            self.layer_buttons.append((uuid, row))
+            rows.append(row)
+
+        # Drop zone at top
+        add_zone(('top',), len(all_uuids))
+
         for item_type, item_id in display_items:
             if item_type == 'root':
-                # Add root layer
-                uuid = item_id
-                layer_btn = self._create_layer_button(uuid, indented=False)
-                self.layers_layout.insertWidget(layout_pos, layer_btn)
-                self.layer_buttons.append((uuid, layer_btn))
-                layout_pos += 1
-                
-                # Add drop zone after this layer
-                actual_index = all_uuids.index(uuid)
-                self._add_drop_zone(actual_index, layout_pos)
-                layout_pos += 1
-                
-            elif item_type == 'container':
-                # Add container marker
-                container_uuid = item_id
-                container_marker = self._create_container_marker(container_uuid)
-                self.layers_layout.insertWidget(layout_pos, container_marker)
-                self.container_markers.append((container_uuid, container_marker))
-                layout_pos += 1
-                
-                # Check if container is collapsed
-                is_collapsed = container_uuid in self.collapsed_containers
-                
-                if not is_collapsed:
-                    # Add container's layers (indented)
-                    container_layers = container_map.get(container_uuid, [])
-                    # Reverse the container layers for display
-                    container_layers_reversed = list(reversed(container_layers))
-                    
-                    # Add drop zone at the top of the container (before first layer)
-                    if container_layers:
-                        # Get the highest layer in the container (last in all_uuids)
-                        highest_layer_index = all_uuids.index(container_layers[-1])
-                        self._add_drop_zone(highest_layer_index + 1, layout_pos, indented=True, container_uuid=container_uuid)
-                        layout_pos += 1
-                    
-                    for layer_uuid in container_layers_reversed:
-                        layer_btn = self._create_layer_button(layer_uuid, indented=True)
-                        self.layers_layout.insertWidget(layout_pos, layer_btn)
-                        self.layer_buttons.append((layer_uuid, layer_btn))
-                        layout_pos += 1
-                        
-                        # Add drop zone after each sub-layer
-                        actual_index = all_uuids.index(layer_uuid)
-                        self._add_drop_zone(actual_index, layout_pos, indented=True, container_uuid=container_uuid)
-                        layout_pos += 1
-                    
-                    # Add root-level drop zone after the expanded container
-                    # This allows placing items below the container at root level
-                    if container_layers:
-                        lowest_layer_index = all_uuids.index(container_layers[0])
-                        self._add_drop_zone(lowest_layer_index, layout_pos, indented=False)
-                        layout_pos += 1
-                else:
-                    # Even when collapsed, add a drop zone below the container marker
-                    # This allows dropping at the root level after this container
-                    container_layers = container_map.get(container_uuid, [])
-                    if container_layers:
-                        # Get the lowest layer in the container (first in all_uuids)
-                        lowest_layer_index = all_uuids.index(container_layers[0])
-                        self._add_drop_zone(lowest_layer_index, layout_pos, indented=False)
-                        layout_pos += 1
-        
-        # Re-add stretch at the end
-        self.layers_layout.addStretch()
-    
+                add_layer(item_id, indented=False)
+                add_zone(('after', item_id), index_of[item_id])
+                continue
+
+            container_uuid = item_id
+            container_layers = container_map[container_uuid]
+            marker = self._reuse_container_marker(container_uuid)
+            marker_widgets[container_uuid] = marker
+            self.container_markers.append((container_uuid, marker))
+            rows.append(marker)
+
+            if container_uuid not in self.collapsed_containers:
+                # Drop zone at the top of the container (above its highest layer)
+                add_zone(('container_top', container_uuid), index_of[container_layers[-1]] + 1,
+                         indented=True, container_uuid=container_uuid)
+                for layer_uuid in reversed(container_layers):
+                    add_layer(layer_uuid, indented=True)
+                    add_zone(('after', layer_uuid), index_of[layer_uuid],
+                             indented=True, container_uuid=container_uuid)
+
+            # Root-level drop zone below the container (expanded or collapsed),
+            # for placing items under it at root level
+            add_zone(('after_container', container_uuid), index_of[container_layers[0]])
+
+        # Thumbnails of layers that no longer exist
+        stale = [key for key in self.thumbnail_cache if key[0] not in index_of]
+        for key in stale:
+            del self.thumbnail_cache[key]
+
+        self._layer_widgets = layer_widgets
+        self._marker_widgets = marker_widgets
+        self._zone_widgets = zone_widgets
+        self._apply_row_order(rows)
+
+        # Reused rows keep their checked state; make every row match the selection
+        for uuid, row in self.layer_buttons:
+            row.layer_button.setChecked(uuid in self.selected_layer_uuids)
+        for container_uuid, marker in self.container_markers:
+            marker.setChecked(container_uuid in self.selected_container_uuids)
+
+    def _layer_signature(self, uuid, indented):
+        """Everything a layer button displays, to tell when it must be rebuilt"""
+        colors = []
+        for color_index in (1, 2, 3):
+            color = self.coa.get_layer_color(uuid, color_index)
+            colors.append((color.to_hex(), color.name) if color else None)
+        pattern_color = getattr(self.coa, 'pattern_color1', None)
+        return (
+            indented,
+            self.coa.get_layer_filename(uuid),
+            self.coa.get_layer_name(uuid),
+            self.coa.get_layer_instance_count(uuid),
+            self.coa.get_layer_visible(uuid),
+            tuple(colors),
+            self.coa.get_layer_symmetry_type(uuid),
+            tuple(self.coa.get_layer_symmetry_properties(uuid) or ()),
+            pattern_color.to_hex() if pattern_color else None,
+            self._thumbnail_generation,
+        )
+
+    def _reuse_layer_button(self, uuid, indented):
+        """Return the existing row for a layer if still current, else a new one"""
+        signature = self._layer_signature(uuid, indented)
+        row = self._layer_widgets.get(uuid)
+        if row is not None and row.signature == signature:
+            self.rebuild_stats['reused'] += 1
+            return row
+        # Changed layers get a fresh thumbnail
+        self.invalidate_thumbnail(uuid)
+        row = self._create_layer_button(uuid, indented=indented)
+        row.signature = signature
+        self.rebuild_stats['created'] += 1
+        return row
+
+    def _reuse_container_marker(self, container_uuid):
+        """Return the existing marker for a container if still current, else a new one"""
+        container_layers = self.coa.get_layers_by_container(container_uuid)
+        signature = (container_uuid in self.collapsed_containers,
+                     any(self.coa.get_layer_visible(uuid) for uuid in container_layers))
+        marker = self._marker_widgets.get(container_uuid)
+        if marker is not None and marker.signature == signature:
+            self.rebuild_stats['reused'] += 1
+            return marker
+        marker = self._create_container_marker(container_uuid)
+        marker.signature = signature
+        self.rebuild_stats['created'] += 1
+        return marker
+
+    def _reuse_drop_zone(self, key, drop_index, indented, container_uuid):
+        """Return the existing drop zone row for key, updated in place, or a new one"""
+        row = self._zone_widgets.get(key)
+        if row is not None and row.drop_zone.property('indented') == indented:
+            row.drop_zone.setProperty('drop_index', drop_index)
+            row.drop_zone.setProperty('container_uuid', container_uuid)
+            self.rebuild_stats['reused'] += 1
+            return row
+        self.rebuild_stats['created'] += 1
+        return self._create_drop_zone(drop_index, indented, container_uuid)
+
+    def _apply_row_order(self, rows):
+        """Make the layout hold exactly rows (in order) plus the trailing stretch
+
+        Rows not in the list are deleted. Of the rows kept, the longest run
+        already in the right relative order stays put; the rest are moved.
+        """
+        layout = self.layers_layout
+        wanted = {row: i for i, row in enumerate(rows)}
+
+        kept = []
+        for i in range(layout.count() - 1, -1, -1):
+            widget = layout.itemAt(i).widget()
+            if widget is not None and widget in wanted:
+                kept.append(widget)
+                continue
+            layout.takeAt(i)  # Stale row, or the stretch (re-added below)
+            if widget is not None:
+                widget.hide()
+                widget.deleteLater()
+                self.rebuild_stats['removed'] += 1
+        kept.reverse()
+        kept_set = set(kept)
+
+        in_place = longest_increasing_run([wanted[widget] for widget in kept])
+        placed = set()
+        for position, widget in enumerate(kept):
+            if position in in_place:
+                placed.add(widget)
+            else:
+                layout.removeWidget(widget)
+
+        # Every row before i is in place, so insert at i
+        for i, row in enumerate(rows):
+            if row in placed:
+                continue
+            layout.insertWidget(i, row)
+            if row in kept_set:
+                self.rebuild_stats['moved'] += 1
+        layout.addStretch()
+
     # Known thumbnail geometry within layer_btn
     # btn_layout margins: (5, 5, 5, 5), icon_container: 48x48, button height: 60
     _ICON_X = 5
@@ -1102,8 +1211,8 @@ class LayerListWidget(QWidget):
         else:
             event.ignore()
     
-    def _add_drop_zone(self, drop_index, layout_position, indented=False, container_uuid=None):
-        """Add a drop zone separator at the specified position"""
+    def _create_drop_zone(self, drop_index, indented=False, container_uuid=None):
+        """Create a drop zone separator row (the zone itself is row.drop_zone)"""
         # Create container for indentation support
         container = QWidget()
         container_layout = QHBoxLayout(container)
@@ -1133,8 +1242,8 @@ class LayerListWidget(QWidget):
         """)
         
         container_layout.addWidget(drop_zone)
-        self.drop_zones.append(drop_zone)
-        self.layers_layout.insertWidget(layout_position, container)
+        container.drop_zone = drop_zone
+        return container
     
     def _get_preview_path(self, dds_path):
         """Convert .dds filename to .png preview path"""
@@ -1629,8 +1738,22 @@ class LayerListWidget(QWidget):
             del self.thumbnail_cache[key]
     
     def clear_thumbnail_cache(self):
-        """Clear all cached thumbnails"""
+        """Clear all cached thumbnails (layer buttons are recreated on the next rebuild)"""
         self.thumbnail_cache.clear()
+        self._thumbnail_generation += 1
+    
+    def refresh_textures(self, filenames=None):
+        """Regenerate thumbnails of layers whose texture was re-converted
+        
+        Args:
+            filenames: Changed DDS filenames (None to refresh every layer)
+        """
+        if not self.coa:
+            return
+        for uuid, _ in list(self.layer_buttons):
+            filename = self.coa.get_layer_filename(uuid)
+            if filename and (filenames is None or filename in filenames):
+                self.update_layer_button(uuid)
     
     def update_layer_button(self, uuid):
         """Update a single layer button's display by querying all data from UUID
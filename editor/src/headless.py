@@ -3,13 +3,24 @@
 Reads CK3 coat-of-arms text files (single or multi-CoA), renders each CoA
 to a 256x256 PNG of the raw CoA texture (pattern + emblems, no frame).
 
+PNGs are written through an output sink on a background thread: a plain
+directory (default), a zip/tar archive, or an SQLite blob table. With
+--cache, renders are keyed by the CoA content hash so duplicate CoAs (in one
+run or across runs) skip rendering. With --previews, each CoA's government
+and title preview variants (every requested government, rank and size) are
+exported alongside it from the same CoA render.
+
 Usage:
-    python -m editor.src.headless <input_file> [-o OUTPUT_DIR] [--use-filenames]
+    python -m editor.src.headless <input_file> [-o OUTPUT] [--sink KIND] [--use-filenames]
 
 Examples:
     python -m editor.src.headless examples/game_samples/coa_sample_1.txt
     python -m editor.src.headless my_coas.txt -o renders/
+    python -m editor.src.headless my_coas.txt -o renders.zip
+    python -m editor.src.headless my_coas.txt -o renders.sqlite --batch-size 256
+    python -m editor.src.headless my_coas.txt --cache ~/.cache/coa_renders.sqlite
     python -m editor.src.headless my_coas.txt --use-filenames
+    python -m editor.src.headless my_coas.txt -o showcase/ --previews --ranks King Emperor --preview-sizes 86 115
 """
 
 import sys
@@ -121,6 +132,13 @@ def _format_value(v) -> str:
 
 
 def main():
+    from functools import partial
+    from services.output_sinks import SINK_KINDS, BackgroundWriter, create_sink
+    from services.preview_export import (
+        DEFAULT_EXPORT_SIZE, DEFAULT_POOL_SIZE, PREVIEW_KINDS, PREVIEW_RANKS, PREVIEW_SIZES,
+        preview_variants,
+    )
+
     parser = argparse.ArgumentParser(
         description='Render CK3 coats of arms to PNG images (headless).',
     )
@@ -131,7 +149,90 @@ def main():
     parser.add_argument(
         '-o', '--output',
         default='./output',
-        help='Output directory for PNG files (default: ./output).',
+        help='Output directory, .zip/.tar/.tar.gz archive or .sqlite database (default: ./output).',
+    )
+    parser.add_argument(
+        '--sink',
+        choices=SINK_KINDS,
+        default='auto',
+        help='Output sink type (default: auto, chosen from the --output extension).',
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=64,
+        help='Renders written per sink batch / SQLite transaction (default: 64).',
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help='Render cache database; identical CoAs are rendered once and reused across runs.',
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=512,
+        metavar='MB',
+        help='Render cache size cap in megabytes, least recently used evicted first (default: 512).',
+    )
+    parser.add_argument(
+        '--texture-arrays',
+        action='store_true',
+        help='Load tiles into GL texture arrays and draw each CoA with batched instanced draws.',
+    )
+    parser.add_argument(
+        '--preload-textures',
+        action='store_true',
+        help='Load every emblem and pattern at startup instead of only those the input uses.',
+    )
+    parser.add_argument(
+        '--previews',
+        action='store_true',
+        help='Also export government/title preview variants of each CoA (<name>_gov_*/<name>_title_*).',
+    )
+    parser.add_argument(
+        '--preview-kinds',
+        nargs='+',
+        choices=PREVIEW_KINDS,
+        default=list(PREVIEW_KINDS),
+        help='Preview kinds to export (default: both).',
+    )
+    parser.add_argument(
+        '--governments',
+        nargs='+',
+        metavar='KEY',
+        help='Government keys (realm_frames mask names) for government previews (default: all).',
+    )
+    parser.add_argument(
+        '--ranks',
+        nargs='+',
+        choices=PREVIEW_RANKS,
+        default=list(PREVIEW_RANKS),
+        metavar='RANK',
+        help='Ranks to export (default: all; quote "Holy Order").',
+    )
+    parser.add_argument(
+        '--preview-sizes',
+        nargs='+',
+        type=int,
+        choices=PREVIEW_SIZES,
+        default=list(PREVIEW_SIZES),
+        metavar='PX',
+        help=f'Preview sizes to export (default: all of {", ".join(map(str, PREVIEW_SIZES))}).',
+    )
+    parser.add_argument(
+        '--preview-export-size',
+        type=int,
+        default=DEFAULT_EXPORT_SIZE,
+        metavar='PX',
+        help=f'Square canvas each preview is centred in (default: {DEFAULT_EXPORT_SIZE}).',
+    )
+    parser.add_argument(
+        '--preview-pool',
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        metavar='N',
+        help=f'Preview framebuffers rendered ahead of each readback (default: {DEFAULT_POOL_SIZE}).',
     )
     parser.add_argument(
         '-f', '--use-filenames',
@@ -154,7 +255,6 @@ def main():
     )
 
     input_path = os.path.abspath(args.input_file)
-    output_dir = os.path.abspath(args.output)
 
     if not os.path.isfile(input_path):
         print(f"Error: Input file not found: {input_path}")
@@ -192,8 +292,27 @@ def main():
     from services.headless_renderer import HeadlessRenderer
     from models.coa import CoA
 
-    renderer = HeadlessRenderer()
-    os.makedirs(output_dir, exist_ok=True)
+    renderer = HeadlessRenderer(texture_arrays=args.texture_arrays, preload=args.preload_textures)
+    sink = create_sink(args.output, args.sink)
+    writer = BackgroundWriter(sink, batch_size=args.batch_size)
+
+    cache = None
+    if args.cache:
+        from services.render_cache import RenderCache
+        cache = RenderCache(
+            args.cache,
+            max_bytes=args.cache_size * 1024 * 1024,
+            namespace=renderer.cache_namespace(),
+        )
+
+    variants = []
+    if args.previews:
+        governments = args.governments
+        if governments is None:
+            from services.government_discovery import GovernmentDiscovery
+            governments = list(GovernmentDiscovery.get_government_types()[1].values())
+        variants = preview_variants(governments, args.ranks, args.preview_sizes, args.preview_kinds)
+        print(f"Exporting {len(variants)} preview variant(s) per CoA.")
 
     # Determine output naming
     input_stem = os.path.splitext(os.path.basename(input_path))[0]
@@ -201,6 +320,8 @@ def main():
     rendered = 0
     failed = 0
     for idx, (name, data) in enumerate(coa_entries):
+        if writer.error is not None:
+            break  # Sink failed: close() below reports it once
         try:
             # Use 'coa_export' as the top-level key so CoA.parse() recognises it
             # (it only accepts coat_of_arms / coa_export / layers_export prefixes)
@@ -215,11 +336,29 @@ def main():
             else:
                 out_name = name
 
-            out_file = os.path.join(output_dir, f"{out_name}.png")
-            renderer.render_coa(coa, out_file)
+            if cache is None:
+                writer.submit(out_name, renderer.render_image(coa))
+            else:
+                key = cache.make_key(coa.get_content_hash())
+                cached = cache.get(key)
+                if cached is not None:
+                    writer.submit(out_name, cached)
+                else:
+                    image = renderer.render_image(coa)
+                    cache.reserve(key, image)
+                    writer.submit(out_name, image, on_encoded=partial(cache.put, key))
             rendered += 1
             print(f"  [{rendered}/{len(coa_entries)}] {out_name}.png")
+
+            if variants:
+                count = renderer.export_previews(
+                    coa, variants, writer, prefix=out_name,
+                    export_size=args.preview_export_size, pool_size=args.preview_pool,
+                )
+                print(f"      + {count} previews")
         except Exception as e:
+            if e is writer.error:
+                break
             failed += 1
             print(f"  [FAIL] {name}: {e}")
             if args.verbose:
@@ -228,9 +367,20 @@ def main():
 
     renderer.cleanup()
 
-    print(f"\nDone. Rendered {rendered} image(s) to {output_dir}/")
+    try:
+        writer.close()
+    except Exception as e:
+        print(f"Error: failed writing renders to {sink.describe()}: {e}")
+        sys.exit(1)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    print(f"\nDone. Rendered {rendered} image(s) to {sink.describe()}")
     if failed:
         print(f"  ({failed} failed)")
+    if cache is not None:
+        print(cache.summary())
 
 
 if __name__ == '__main__':
@@ -1,6 +1,11 @@
 import sys
 import os
+import time
 import logging
+import argparse
+
+# Origin of the startup timeline (--profile-startup)
+_PROCESS_START = time.perf_counter()
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +26,10 @@ if __name__ == "__main__":
     # Add it to the Python path
     if current_dir not in sys.path:
         sys.path.insert(0, current_dir)
+    # Also add project root so asset_converter is importable (shared output layout)
+    project_root = os.path.dirname(os.path.dirname(current_dir))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 # PyQt5 imports
 from PyQt5 import QtWidgets
@@ -34,6 +43,7 @@ from models.coa import CoA
 # Utility imports
 from utils.history_manager import HistoryManager
 from utils.logger import loggerRaise, set_main_window
+from utils.path_resolver import get_assets_dir
 
 from constants import MAX_HISTORY_ENTRIES
 
@@ -51,9 +61,19 @@ from main.asset_mixin import AssetMixin
 from main.generator_mixin import GeneratorMixin
 from main.ui_setup_mixin import UISetupMixin
 
+# Service imports
+from services.startup_pipeline import StartupPipeline, StartupTimeline
+from services.asset_hot_reload import AssetChangeMonitor, POLL_INTERVAL_MS as ASSET_POLL_INTERVAL_MS
+
+_IMPORTS_DONE = time.perf_counter()
+
 
 class CoatOfArmsEditor(MenuMixin, EventMixin, ConfigMixin, HistoryMixin, AssetMixin, GeneratorMixin, UISetupMixin, QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_pipeline=None):
+        """
+        Args:
+            startup_pipeline: StartupPipeline for background loading (created if None)
+        """
         super().__init__()
         self.setWindowTitle("Coat Of Arms Designer")
         self.resize(1280, 720)
@@ -108,18 +128,52 @@ class CoatOfArmsEditor(MenuMixin, EventMixin, ConfigMixin, HistoryMixin, AssetMi
         self.clipboard_actions = ClipboardActions(self)
         self.transform_actions = LayerTransformActions(self)
         
-        # Initialize layer generator - preload shapes before UI setup
+        # Staged startup: heavy loading runs on worker threads while the
+        # window is already shown (see services/startup_pipeline.py)
+        self.startup_pipeline = startup_pipeline or StartupPipeline(parent=self)
+        pipeline = self.startup_pipeline
+        
+        # Initialize layer generator - shapes parse in the background and the
+        # Shape menu is rebuilt when they arrive
         self.generator_popup = None  # Created on demand
-        try:
-            self._preload_shapes()
-        except Exception as e:
-            print(f"Warning: Failed to preload shapes: {e}")
+        self._shapes_loading = True
+        pipeline.run_in_background(
+            "preload SVG shapes", self._preload_shapes,
+            on_done=lambda _result: self._on_shapes_loaded()
+        )
+        
+        with pipeline.timeline.span("setup UI"):
+            self.setup_ui()
         
-        self.setup_ui()
+        # Asset catalog, search index and sidebar data; the canvas picks the
+        # pipeline up in initializeGL to decode and upload its textures
+        pipeline.run_in_background(
+            "index asset metadata", self._index_asset_metadata,
+            on_done=self.left_sidebar.set_asset_data
+        )
+        canvas = self.canvas_area.canvas_widget
+        canvas.startup_pipeline = pipeline
+        canvas.startup_gl_ready = pipeline.defer("wait for canvas GL")
+        
+        # Hot-reload of textures re-baked by `asset_converter.py --watch`
+        self.asset_change_monitor = AssetChangeMonitor(get_assets_dir())
+        self.asset_reload_timer = QTimer()
+        self.asset_reload_timer.timeout.connect(self._poll_asset_changes)
+        self.asset_reload_timer.start(ASSET_POLL_INTERVAL_MS)
         
         # Initialize menu action states
         QTimer.singleShot(100, self._update_menu_actions)
     
+    def _index_asset_metadata(self):
+        """Startup worker: warm the asset catalog and search index, build sidebar data"""
+        from services.asset_catalog import get_catalog
+        from services.emblem_search import get_search_index
+        get_catalog()
+        # Tight emblem geometry for bounds/hit tests; full quads until now
+        CoA.set_emblem_shape_provider(lambda filename: get_catalog().alpha_geometry(filename))
+        get_search_index()
+        return self.left_sidebar._load_asset_data()
+    
     # ========================================
     # COA Model Edit Lock
     # ========================================
@@ -160,9 +214,38 @@ class CoatOfArmsEditor(MenuMixin, EventMixin, ConfigMixin, HistoryMixin, AssetMi
         """
         return self._edit_lock_holder is not None
 
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="CK3 Coat of Arms Designer")
+    parser.add_argument(
+        '--profile-startup', nargs='?', const='', default=None, metavar='TRACE_JSON',
+        help="Print a startup timeline once loading finishes; optionally also write it as a Chrome trace"
+    )
+    args, _unknown = parser.parse_known_args(argv)
+    return args
+
+
+def _report_startup(timeline, trace_path):
+    """Print the startup timeline (and export it) - connected to pipeline.finished"""
+    timeline.mark("startup complete")
+    print("Startup timeline:")
+    print(timeline.report())
+    first = timeline.elapsed_ms("first interaction")
+    if first is not None:
+        print(f"Time to first interaction: {first:.1f} ms")
+    print(f"Time to fully loaded: {timeline.elapsed_ms('startup complete'):.1f} ms")
+    if trace_path:
+        timeline.export_chrome_trace(trace_path)
+        print(f"Startup trace written to {trace_path}")
+
+
 def main():
     """Main entry point for the Coat of Arms Designer application"""
-    app = QtWidgets.QApplication([])
+    args = _parse_args(sys.argv[1:])
+    timeline = StartupTimeline(origin=_PROCESS_START)
+    timeline.record("imports", _PROCESS_START, _IMPORTS_DONE)
+    
+    with timeline.span("create QApplication"):
+        app = QtWidgets.QApplication([])
     
     # Use Fusion style with dark palette
     app.setStyle("Fusion")
@@ -184,8 +267,19 @@ def main():
     
     app.setPalette(dark_palette)
     
-    window = CoatOfArmsEditor()
-    window.show()
+    pipeline = StartupPipeline(timeline)
+    if args.profile_startup is not None:
+        def on_finished():
+            pipeline.finished.disconnect(on_finished)
+            _report_startup(timeline, args.profile_startup)
+        pipeline.finished.connect(on_finished)
+    
+    with timeline.span("construct main window"):
+        window = CoatOfArmsEditor(startup_pipeline=pipeline)
+    with timeline.span("show window"):
+        window.show()
+    # First event loop turn after show: the window accepts input from here on
+    QTimer.singleShot(0, lambda: timeline.mark("first interaction"))
     app.exec_()
 
 
@@ -20,6 +20,42 @@ class AssetMixin:
             if hasattr(self, 'canvas_area'):
                 self.canvas_area.update_transform_widget_for_layer()
     
+    def _poll_asset_changes(self):
+        """Timer: apply textures re-baked by the converter's watch mode"""
+        changed = self.asset_change_monitor.poll()
+        if changed != []:
+            self._apply_asset_changes(changed)
+    
+    def _apply_asset_changes(self, filenames):
+        """Hot-reload re-converted emblem/pattern textures
+        
+        Re-reads the asset catalog, patches the changed tiles into the
+        canvas atlas and refreshes the sidebar and layer thumbnails that
+        show them.
+        
+        Args:
+            filenames: Changed DDS filenames (None if any may have changed)
+        """
+        from models.coa import CoA
+        from services.asset_catalog import get_catalog
+        from services.emblem_search import clear_search_index
+        from utils.metadata_cache import clear_cache
+        
+        known = {filename for filename, _ in get_catalog().atlas_files()}
+        clear_cache()
+        CoA.invalidate_emblem_shapes()  # Watch mode re-measures alpha bounds
+        reindex = known != {filename for filename, _ in get_catalog().atlas_files()}
+        if reindex:
+            clear_search_index()
+        
+        reloaded = self.canvas_area.canvas_widget.reload_textures(filenames)
+        self.left_sidebar.reload_assets(filenames, reindex=reindex)
+        if hasattr(self.right_sidebar, 'layer_list_widget') and self.right_sidebar.layer_list_widget:
+            self.right_sidebar.layer_list_widget.refresh_textures(filenames)
+        
+        count = "all" if filenames is None else len(filenames)
+        self.status_left.setText(f"Reloaded assets: {count} changed, {reloaded} resident tile(s) updated")
+    
     def _on_asset_selected(self, asset_data):
         """
         Handle asset selection from sidebar.
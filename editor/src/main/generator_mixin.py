@@ -19,13 +19,23 @@ class GeneratorMixin:
         # Preload shapes into ShapeGenerator
         ShapeGenerator.preload_shapes(str(svg_dir))
     
+    def _on_shapes_loaded(self):
+        """Startup pipeline callback: shapes are parsed, rebuild the menu."""
+        self._shapes_loading = False
+        self._populate_shape_menu()
+    
     def _populate_shape_menu(self):
-        """Populate the Shape submenu with loaded SVG shapes."""
+        """Populate the Shape submenu with loaded SVG shapes.
+        
+        Called again once the background shape preload finishes.
+        """
+        self.shape_menu.clear()
         shape_names = ShapeGenerator.get_shape_names()
         
         if not shape_names:
-            # No shapes available
-            no_shapes_action = self.shape_menu.addAction("(No shapes available)")
+            # No shapes available (yet)
+            label = "(Loading shapes...)" if getattr(self, '_shapes_loading', False) else "(No shapes available)"
+            no_shapes_action = self.shape_menu.addAction(label)
             no_shapes_action.setEnabled(False)
             return
         
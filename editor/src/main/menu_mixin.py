@@ -49,6 +49,12 @@ class MenuMixin:
         export_png_action.setShortcut("Ctrl+E")
         export_png_action.triggered.connect(self.file_actions.export_png)
         
+        export_hires_action = file_menu.addAction("Export &High Resolution PNG...")
+        export_hires_action.triggered.connect(self.file_actions.export_high_resolution_png)
+        
+        export_previews_action = file_menu.addAction("Export Preview &Variants...")
+        export_previews_action.triggered.connect(self.file_actions.export_preview_variants)
+        
         file_menu.addSeparator()
         
         copy_coa_action = file_menu.addAction("&Copy CoA to Clipboard")
@@ -354,6 +360,24 @@ class MenuMixin:
         self.grid_action_group.addAction(self.grid_off_action)
         self.grid_off_action.setChecked(True)  # Start with grid off
         
+        view_menu.addSeparator()
+        
+        # Render profiler (diagnostics)
+        self.render_profiler_action = view_menu.addAction("Render &Profiler")
+        self.render_profiler_action.setCheckable(True)
+        self.render_profiler_action.setShortcut("Ctrl+Shift+F12")
+        self.render_profiler_action.triggered.connect(self._toggle_render_profiler)
+        
+        export_trace_action = view_menu.addAction("Export Render &Trace...")
+        export_trace_action.triggered.connect(self._export_render_trace)
+        
+        self.model_instrumentation_action = view_menu.addAction("&Model Instrumentation")
+        self.model_instrumentation_action.setCheckable(True)
+        self.model_instrumentation_action.triggered.connect(self._toggle_model_instrumentation)
+        
+        export_model_trace_action = view_menu.addAction("Export Model Tr&ace...")
+        export_model_trace_action.triggered.connect(self._export_model_trace)
+        
         # Help Menu
         help_menu = menubar.addMenu("&Help")
         
@@ -488,6 +512,68 @@ class MenuMixin:
         if hasattr(self.canvas_area, 'canvas_widget'):
             self.canvas_area.canvas_widget.snap_to_grid = checked
     
+    def _toggle_render_profiler(self, checked):
+        """Toggle the per-frame render profiler overlay."""
+        if hasattr(self.canvas_area, 'canvas_widget'):
+            self.canvas_area.canvas_widget.set_profiling_enabled(checked)
+    
+    def _export_render_trace(self):
+        """Save recorded profiler frames as Chrome trace JSON."""
+        if not hasattr(self.canvas_area, 'canvas_widget'):
+            return
+        canvas = self.canvas_area.canvas_widget
+        if not canvas.render_profiler.frames:
+            QMessageBox.information(self, "Export Render Trace",
+                "No frames recorded yet. Enable View > Render Profiler and interact with the canvas first.")
+            return
+        
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Render Trace", "render_trace.json", "Chrome Trace (*.json)")
+        if not filename:
+            return
+        try:
+            frame_count = canvas.export_render_trace(filename)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Render Trace", f"Failed to write trace:\n{e}")
+            return
+        self.status_left.setText(f"Exported {frame_count} profiled frames to {filename}")
+    
+    def _toggle_model_instrumentation(self, checked):
+        """Start (fresh) or stop timing CoA model methods."""
+        from models.coa import CoAInstrumentation
+        if checked:
+            CoAInstrumentation.reset()
+            CoAInstrumentation.enable()
+            self.status_left.setText("Model instrumentation recording")
+        else:
+            CoAInstrumentation.disable()
+            self.status_left.setText("Model instrumentation stopped")
+            msg = QMessageBox(self)
+            msg.setIcon(QMessageBox.Information)
+            msg.setWindowTitle("Model Instrumentation")
+            msg.setText("Recording stopped. Per-method timings are in the details.")
+            msg.setDetailedText(CoAInstrumentation.report())
+            msg.exec_()
+    
+    def _export_model_trace(self):
+        """Save recorded CoA method timings as Chrome trace JSON."""
+        from models.coa import CoAInstrumentation
+        if not CoAInstrumentation.get_events():
+            QMessageBox.information(self, "Export Model Trace",
+                "No model calls recorded yet. Enable View > Model Instrumentation first.")
+            return
+        
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Model Trace", "model_trace.json", "Chrome Trace (*.json)")
+        if not filename:
+            return
+        try:
+            CoAInstrumentation.export_trace(filename)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Model Trace", f"Failed to write trace:\n{e}")
+            return
+        self.status_left.setText(f"Exported model trace to {filename}")
+    
     def _set_grid_size(self, divisions):
         """Set grid size (0 = off, 2/4/8/16/32 = grid divisions)"""
         if hasattr(self.canvas_area, 'canvas_widget'):
@@ -30,7 +30,8 @@ class UISetupMixin:
         splitter = QSplitter(Qt.Horizontal)
         
         # Left sidebar - scrollable assets
-        self.left_sidebar = AssetSidebar(self)
+        # Asset data arrives from the startup pipeline (see CoatOfArmsEditor.__init__)
+        self.left_sidebar = AssetSidebar(self, defer_load=True)
         self.left_sidebar.main_window = self  # Reference for CoA model access
         splitter.addWidget(self.left_sidebar)
         
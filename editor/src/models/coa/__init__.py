@@ -7,12 +7,14 @@ from .serialization_mixin import CoASerializationMixin
 from .container_mixin import CoAContainerMixin
 from .core import CoA
 from ._internal.layer import Layer, Layers, LayerTracker
+from .instrumentation import CoAInstrumentation
 
 __all__ = [
     'CoA',
     'Layer',
     'Layers',
     'LayerTracker',
+    'CoAInstrumentation',
     'CoAQueryMixin',
     'CoATransformMixin',
     'CoALayerMixin',
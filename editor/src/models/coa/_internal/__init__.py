@@ -3,6 +3,7 @@ CoA Internal Package - DO NOT IMPORT FROM HERE
 
 This package contains INTERNAL implementation for the CoA model:
 - layer.py: Layer and Layers data structures
+- spatial_index.py: Hit-test/bounds index over drawn instances
 - query_mixin.py: Query methods mixin
 - coa_parser.py: Parsing implementation
 - coa_serializer.py: Serialization implementation
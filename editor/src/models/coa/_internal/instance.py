@@ -1,5 +1,6 @@
 """Instance class for layer instances - encapsulates transform data for a single instance"""
 
+import weakref
 from typing import Dict, Any
 from constants import DEFAULT_POSITION_X, DEFAULT_POSITION_Y, DEFAULT_SCALE_X, DEFAULT_SCALE_Y, DEFAULT_ROTATION
 from models.transform import Vec2
@@ -40,6 +41,20 @@ class Instance:
         self._flip_x = bool(data.get('flip_x', False))
         self._flip_y = bool(data.get('flip_y', False))
         self._is_mirror = bool(data.get('is_mirror', False))
+        
+        # Weak reference to the owning Layer (set by Layer), notified of
+        # geometry changes so the spatial index re-indexes only that layer
+        self._owner = None
+    
+    def _set_owner(self, layer):
+        """Attach to the Layer whose geometry version this instance bumps"""
+        self._owner = weakref.ref(layer) if layer is not None else None
+    
+    def _geometry_changed(self):
+        """Bump the owning layer's geometry version"""
+        owner = self._owner() if self._owner is not None else None
+        if owner is not None:
+            owner._geometry_version += 1
     
     # ========================================
     # Primary Properties (Vec2)
@@ -57,6 +72,7 @@ class Instance:
             max(0.0, min(1.0, float(value.x))),
             max(0.0, min(1.0, float(value.y)))
         )
+        self._geometry_changed()
     
     @property
     def scale(self) -> Vec2:
@@ -70,6 +86,7 @@ class Instance:
             max(0.01, min(1.0, float(value.x))),
             max(0.01, min(1.0, float(value.y)))
         )
+        self._geometry_changed()
     
     # ========================================
     # Legacy Properties (backward compatibility)
@@ -84,6 +101,7 @@ class Instance:
     def pos_x(self, value: float):
         """Set X position with clamping - legacy access"""
         self._pos = Vec2(max(0.0, min(1.0, float(value))), self._pos.y)
+        self._geometry_changed()
     
     @property
     def pos_y(self) -> float:
@@ -94,6 +112,7 @@ class Instance:
     def pos_y(self, value: float):
         """Set Y position with clamping - legacy access"""
         self._pos = Vec2(self._pos.x, max(0.0, min(1.0, float(value))))
+        self._geometry_changed()
     
     @property
     def scale_x(self) -> float:
@@ -104,6 +123,7 @@ class Instance:
     def scale_x(self, value: float):
         """Set X scale factor - legacy access"""
         self._scale = Vec2(float(value), self._scale.y)
+        self._geometry_changed()
     
     @property
     def scale_y(self) -> float:
@@ -114,6 +134,7 @@ class Instance:
     def scale_y(self, value: float):
         """Set Y scale factor - legacy access"""
         self._scale = Vec2(self._scale.x, float(value))
+        self._geometry_changed()
     
     @property
     def rotation(self) -> float:
@@ -124,6 +145,7 @@ class Instance:
     def rotation(self, value: float):
         """Set rotation angle"""
         self._rotation = float(value)
+        self._geometry_changed()
     
     @property
     def depth(self) -> float:
@@ -144,6 +166,7 @@ class Instance:
     def flip_x(self, value: bool):
         """Set horizontal flip"""
         self._flip_x = bool(value)
+        self._geometry_changed()
     
     @property
     def flip_y(self) -> bool:
@@ -154,6 +177,7 @@ class Instance:
     def flip_y(self, value: bool):
         """Set vertical flip"""
         self._flip_y = bool(value)
+        self._geometry_changed()
     
     @property
     def is_mirror(self) -> bool:
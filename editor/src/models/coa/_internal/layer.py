@@ -27,6 +27,7 @@ Usage:
 
 import logging
 import uuid as uuid_module
+from collections import deque
 from typing import Dict, List, Optional, Any
 import sys
 import os
@@ -57,9 +58,10 @@ class LayerTracker:
     # Registered component keys (pre-register common internal callers)
     _registered_keys = {'CoA', 'Layer', 'Layers', 'query_mixin', 'CoA.merge'}
     
-    # Call log (limited size to prevent memory issues)
-    _call_log = []
+    # Call log: fixed-size ring buffer of (caller, layer_id, method, property, value)
+    # tuples. Entries are only expanded to dicts when read via get_log().
     _max_log_size = 1000
+    _call_log = deque(maxlen=_max_log_size)
     
     # Logger instance
     _logger = logging.getLogger('LayerTracker')
@@ -78,6 +80,9 @@ class LayerTracker:
     def log_call(cls, caller: str, layer_id: int, method: str, property_name: str = None, value: Any = None):
         """Log a method call
         
+        Hot path (called from every Layer/Layers operation): appends one tuple
+        and only formats a debug message when debug logging is enabled.
+        
         Args:
             caller: The registered key of the caller
             layer_id: ID of the layer being modified
@@ -86,27 +91,15 @@ class LayerTracker:
             value: New value being set (if applicable)
         """
         if caller not in cls._registered_keys:
-            cls._logger.warning(f"Unregistered caller: {caller}")
-        
-        log_entry = {
-            'caller': caller,
-            'layer_id': layer_id,
-            'method': method,
-            'property': property_name,
-            'value': value
-        }
+            cls._logger.warning("Unregistered caller: %s", caller)
         
-        cls._call_log.append(log_entry)
+        cls._call_log.append((caller, layer_id, method, property_name, value))
         
-        # Trim log if too large
-        if len(cls._call_log) > cls._max_log_size:
-            cls._call_log = cls._call_log[-cls._max_log_size:]
-        
-        # Log at debug level
-        if property_name:
-            cls._logger.debug(f"{caller}.{method}(layer={layer_id}, {property_name}={value})")
-        else:
-            cls._logger.debug(f"{caller}.{method}(layer={layer_id})")
+        if cls._logger.isEnabledFor(logging.DEBUG):
+            if property_name:
+                cls._logger.debug("%s.%s(layer=%s, %s=%s)", caller, method, layer_id, property_name, value)
+            else:
+                cls._logger.debug("%s.%s(layer=%s)", caller, method, layer_id)
     
     @classmethod
     def get_log(cls, caller: str = None, layer_id: int = None) -> List[Dict]:
@@ -117,17 +110,13 @@ class LayerTracker:
             layer_id: Filter by layer ID
             
         Returns:
-            List of log entries
+            List of log entries (oldest first, at most _max_log_size)
         """
-        log = cls._call_log
-        
-        if caller:
-            log = [e for e in log if e['caller'] == caller]
-        
-        if layer_id is not None:
-            log = [e for e in log if e['layer_id'] == layer_id]
-        
-        return log
+        return [
+            {'caller': c, 'layer_id': lid, 'method': m, 'property': p, 'value': v}
+            for c, lid, m, p, v in cls._call_log
+            if (not caller or c == caller) and (layer_id is None or lid == layer_id)
+        ]
     
     @classmethod
     def clear_log(cls):
@@ -194,6 +183,10 @@ class Layer:
             if instances and isinstance(instances[0], dict):
                 self._data['instances'] = [Instance(inst) if isinstance(inst, dict) else inst for inst in instances]
         
+        # Bumped on any instance transform or symmetry change (spatial index)
+        self._geometry_version = 0
+        self._adopt_instances()
+        
         LayerTracker.log_call(caller, self._id, '__init__')
     
     @property
@@ -206,6 +199,11 @@ class Layer:
         """Get UUID (stable identifier, persists across saves/loads)"""
         return self._data['uuid']
     
+    @property
+    def geometry_version(self) -> int:
+        """Counter bumped whenever instance transforms, instances, symmetry or texture change"""
+        return self._geometry_version
+    
     # ========================================
     # Instance Properties (per-instance)
     # ========================================
@@ -264,6 +262,7 @@ class Layer:
         """Set texture filename"""
         self._data['filename'] = value
         self._data['path'] = value  # Keep path in sync
+        self._geometry_version += 1  # Emblem shape may differ
     
     @property
     def path(self) -> str:
@@ -275,6 +274,7 @@ class Layer:
         """Set texture path"""
         self._data['path'] = value
         self._data['filename'] = value  # Keep filename in sync
+        self._geometry_version += 1  # Emblem shape may differ
     
     @property
     def colors(self) -> int:
@@ -469,6 +469,7 @@ class Layer:
         if value not in ('none', 'bisector', 'rotational', 'grid'):
             raise ValueError(f"Invalid symmetry type: {value}")
         self._data['symmetry_type'] = value
+        self._geometry_version += 1
     
     @property
     def symmetry_properties(self) -> List[float]:
@@ -490,6 +491,7 @@ class Layer:
             value: List of floats (type-specific parameters)
         """
         self._data['symmetry_properties'] = list(value) if value else []
+        self._geometry_version += 1
     
     # ========================================
     # Instance Management
@@ -564,6 +566,8 @@ class Layer:
         
         instances = self._data.setdefault('instances', [])
         instances.append(new_instance)
+        new_instance._set_owner(self)
+        self._geometry_version += 1
         
         return len(instances) - 1
     
@@ -588,7 +592,8 @@ class Layer:
         if not (0 <= index < len(instances)):
             raise IndexError(f"Instance index {index} out of range [0, {len(instances)})")
         
-        instances.pop(index)
+        instances.pop(index)._set_owner(None)
+        self._geometry_version += 1
         
         # Adjust selected_instance if needed
         if self.selected_instance >= len(instances):
@@ -635,12 +640,20 @@ class Layer:
         if not instances:
             instances.append(Instance())
             self._data['instances'] = instances
+            self._adopt_instances()
         
         if 0 <= selected < len(instances):
             inst = instances[selected]
             if isinstance(inst, Instance):
                 setattr(inst, prop_name, value)
     
+    def _adopt_instances(self):
+        """Make this layer the owner of its Instance objects"""
+        for inst in self._data.get('instances', []):
+            if isinstance(inst, Instance):
+                inst._set_owner(self)
+        self._geometry_version += 1
+    
     def _create_default(self) -> Dict:
         """Create default layer data"""
         return {
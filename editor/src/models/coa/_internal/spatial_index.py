@@ -0,0 +1,547 @@
+"""
+CK3 Coat of Arms Editor - Layer Spatial Index
+
+CPU-side index of where every emblem instance is drawn, so hit tests and
+bounds queries do not need the picker RTT or a walk over every instance.
+
+- Each drawn instance (seeds and symmetry mirrors) is stored as the
+  parallelogram its emblem tile covers plus that shape's AABB, in CoA
+  space (0-1, Y down). InstanceGeometry maps tile points to CoA space
+  exactly as emblem.vert does; drawn_box()/opaque_box() build the
+  conservative boxes the renderer culls with from the same map
+- AABBs are bucketed in a uniform grid (GRID_CELLS per axis over
+  GRID_MIN..GRID_MAX); point and rectangle queries visit only the cells
+  they touch, so their cost depends on what is near the query, not on
+  how many instances the CoA has
+- Layers are re-indexed lazily: refresh() compares each Layer object and
+  its geometry_version with what was indexed and re-inserts only the
+  layers that changed, were added or were removed
+- The drawn instances themselves (seeds each followed by their mirrors,
+  as plain Transforms) are cached with the layer's entry, so the render
+  paths reuse the symmetry expansion (CoA.get_layer_drawn_instances)
+- Quads cover only the visible part of the emblem when its shape is known:
+  the converter measures each emblem's tight alpha box and a coarse
+  occupancy mask, and the editor hands them in through
+  set_shape_provider(). Point hits also test the mask; emblems without a
+  shape keep the full unit quad
+
+This is part of the MODEL layer - pure data, no UI logic.
+
+Usage (through CoA):
+    coa.get_layers_at_point(0.5, 0.5)          # topmost first
+    coa.get_layers_in_rect(0.1, 0.1, 0.4, 0.4)
+    coa.get_layers_extent([uuid1, uuid2])      # rotated, mirrors included
+    coa.get_layer_drawn_instances(uuid)        # Transforms in draw order
+    coa.get_layer_instance_boxes(uuid, texel, pixel)  # for render culling
+"""
+
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.transform import Transform, Vec2
+
+from .instance import Instance
+
+# Grid covers CoA space plus room for quads hanging over the edges;
+# anything further out lands in the border cells
+GRID_MIN = -0.5
+GRID_MAX = 1.5
+GRID_CELLS = 32
+_CELL_SIZE = (GRID_MAX - GRID_MIN) / GRID_CELLS
+
+_FULL_TILE = (0.0, 0.0, 1.0, 1.0)
+
+Box = Tuple[float, float, float, float]
+
+
+class EmblemShape:
+    """Visible part of an emblem texture: tight alpha box plus occupancy mask
+
+    Coordinates are fractions of the texture tile (0-1, Y down).
+    """
+
+    __slots__ = ('bounds', 'mask', 'grid', 'opaque', '_opaque_rect')
+
+    def __init__(self, bounds: Tuple[float, float, float, float], mask: int, grid: int, opaque: int = 0):
+        """
+        Args:
+            bounds: (x0, y0, x1, y1) box around every visible texel
+            mask: Bit row * grid + col set when that cell has visible texels
+            grid: Mask cells per axis
+            opaque: Same layout, bit set when every texel of the cell is opaque
+        """
+        self.bounds = tuple(bounds)
+        self.mask = mask
+        self.grid = grid
+        self.opaque = opaque
+        self._opaque_rect = False  # not computed yet
+
+    @property
+    def opaque_rect(self) -> Optional[Tuple[float, float, float, float]]:
+        """Largest (x0, y0, x1, y1) box of opaque cells, or None if there are none"""
+        if self._opaque_rect is False:
+            self._opaque_rect = _largest_rect(self.opaque, self.grid)
+        return self._opaque_rect
+
+    def covers(self, u: float, v: float) -> bool:
+        """Whether the tile point (u, v) falls in an occupied mask cell"""
+        x0, y0, x1, y1 = self.bounds
+        if not (x0 <= u <= x1 and y0 <= v <= y1):
+            return False
+        col = min(max(int(u * self.grid), 0), self.grid - 1)
+        row = min(max(int(v * self.grid), 0), self.grid - 1)
+        return bool((self.mask >> (row * self.grid + col)) & 1)
+
+
+# filename -> (bounds, mask, grid[, opaque]) or None; set by the editor from the asset catalog
+_shape_provider: Optional[Callable[[str], Optional[tuple]]] = None
+_shape_cache: Dict[str, Optional[EmblemShape]] = {}
+_shape_generation = 0
+
+
+def set_shape_provider(provider: Optional[Callable[[str], Optional[tuple]]]) -> None:
+    """Install the lookup of emblem shapes (None: every emblem is a full quad)
+
+    Args:
+        provider: callable(filename) -> (bounds, mask, grid[, opaque]) or
+            None, e.g. AssetCatalog.alpha_geometry
+    """
+    global _shape_provider
+    _shape_provider = provider
+    invalidate_shapes()
+
+
+def invalidate_shapes() -> None:
+    """Forget cached shapes (assets were re-converted); indexes rebuild lazily"""
+    global _shape_generation
+    _shape_cache.clear()
+    _shape_generation += 1
+
+
+def emblem_shape(filename: str) -> Optional[EmblemShape]:
+    """Shape of an emblem texture, or None if unknown"""
+    if _shape_provider is None or not filename:
+        return None
+    if filename not in _shape_cache:
+        geometry = _shape_provider(filename)
+        _shape_cache[filename] = EmblemShape(*geometry) if geometry else None
+    return _shape_cache[filename]
+
+
+class InstanceGeometry:
+    """Where an instance's texture tile lands in CoA space, as emblem.vert draws it
+
+    The shader flips (flip_x/flip_y or negative scale), rotates, then
+    scales, so non-uniform scale turns a rotated tile into a parallelogram.
+    The map is affine: tile point (u, v) lands on origin + u * U + v * V.
+    """
+
+    __slots__ = ('ox', 'oy', 'ux', 'uy', 'vx', 'vy')
+
+    def __init__(self, instance):
+        """
+        Args:
+            instance: Anything with pos, scale, rotation, flip_x, flip_y
+                (Instance, Transform)
+        """
+        flip_x = (-1.0 if instance.scale.x < 0 else 1.0) * (-1.0 if instance.flip_x else 1.0)
+        flip_y = (-1.0 if instance.scale.y < 0 else 1.0) * (-1.0 if instance.flip_y else 1.0)
+        scale_x = abs(instance.scale.x)
+        scale_y = abs(instance.scale.y)
+        # CK3 rotation is clockwise in Y-down space
+        radians = math.radians(instance.rotation)
+        cos, sin = math.cos(radians), math.sin(radians)
+        self.ux = flip_x * cos * scale_x
+        self.uy = flip_x * sin * scale_y
+        self.vx = -flip_y * sin * scale_x
+        self.vy = flip_y * cos * scale_y
+        # Tile centre (0.5, 0.5) lands on the instance position
+        self.ox = instance.pos.x - (self.ux + self.vx) / 2.0
+        self.oy = instance.pos.y - (self.uy + self.vy) / 2.0
+
+    def to_coa(self, u: float, v: float) -> Tuple[float, float]:
+        """CoA point where tile point (u, v) is drawn"""
+        return self.ox + u * self.ux + v * self.vx, self.oy + u * self.uy + v * self.vy
+
+    def to_tile(self, x: float, y: float) -> Optional[Tuple[float, float]]:
+        """Tile point drawn at CoA point (x, y), or None for a zero-size instance"""
+        det = self.ux * self.vy - self.vx * self.uy
+        if abs(det) < 1e-18:
+            return None
+        dx = x - self.ox
+        dy = y - self.oy
+        return (dx * self.vy - dy * self.vx) / det, (self.ux * dy - self.uy * dx) / det
+
+    def corners(self, tile: Box) -> List[Tuple[float, float]]:
+        """CoA corners of a tile rectangle (u0, v0, u1, v1), in winding order"""
+        u0, v0, u1, v1 = tile
+        return [self.to_coa(u0, v0), self.to_coa(u1, v0), self.to_coa(u1, v1), self.to_coa(u0, v1)]
+
+    def box(self, tile: Box) -> Box:
+        """AABB (min_x, min_y, max_x, max_y) of a tile rectangle in CoA space"""
+        corners = self.corners(tile)
+        xs = [c[0] for c in corners]
+        ys = [c[1] for c in corners]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+
+def drawn_box(geometry: InstanceGeometry, shape: Optional[EmblemShape], texel: float, pixel: float) -> Box:
+    """Box around every pixel an instance can change
+
+    Args:
+        geometry: The instance's InstanceGeometry
+        shape: Emblem shape, or None to use the whole tile
+        texel: Tile texel size; visible bounds widen by one for bilinear filtering
+        pixel: Render target pixel size in CoA units, added for rasterization
+
+    Returns:
+        (min_x, min_y, max_x, max_y) in CoA space
+    """
+    if shape is None:
+        tile = _FULL_TILE
+    else:
+        x0, y0, x1, y1 = shape.bounds
+        tile = (max(x0 - texel, 0.0), max(y0 - texel, 0.0), min(x1 + texel, 1.0), min(y1 + texel, 1.0))
+    min_x, min_y, max_x, max_y = geometry.box(tile)
+    return (min_x - pixel, min_y - pixel, max_x + pixel, max_y + pixel)
+
+
+def opaque_box(geometry: InstanceGeometry, shape: Optional[EmblemShape], texel: float,
+               pixel: float) -> Optional[Box]:
+    """Box every pixel of which an instance overwrites, or None
+
+    Built from the shape's opaque rectangle, shrunk by one texel where it
+    borders non-opaque texels (tile edges are clamped, so they stay opaque)
+    and by one pixel where it ends inside the canvas. Sides past the canvas
+    edge are unbounded (nothing is drawn there).
+
+    Args:
+        geometry: The instance's InstanceGeometry
+        shape: Emblem shape, or None
+        texel: Tile texel size
+        pixel: Render target pixel size in CoA units
+
+    Returns:
+        (min_x, min_y, max_x, max_y), or None if the emblem has no opaque
+        rectangle, the instance is not axis-aligned or it covers nothing on
+        the canvas
+    """
+    rect = shape.opaque_rect if shape is not None else None
+    if rect is None:
+        return None
+    if abs(geometry.ux * geometry.vx) > 1e-12 or abs(geometry.uy * geometry.vy) > 1e-12:
+        return None  # Not axis-aligned
+    x0, y0, x1, y1 = rect
+    tile = (x0 + texel if x0 > 0.0 else 0.0, y0 + texel if y0 > 0.0 else 0.0,
+            x1 - texel if x1 < 1.0 else 1.0, y1 - texel if y1 < 1.0 else 1.0)
+    if tile[0] >= tile[2] or tile[1] >= tile[3]:
+        return None
+    min_x, min_y, max_x, max_y = geometry.box(tile)
+    box = (min_x + pixel if min_x > 0.0 else -math.inf,
+           min_y + pixel if min_y > 0.0 else -math.inf,
+           max_x - pixel if max_x < 1.0 else math.inf,
+           max_y - pixel if max_y < 1.0 else math.inf)
+    if max(box[0], 0.0) >= min(box[2], 1.0) or max(box[1], 0.0) >= min(box[3], 1.0):
+        return None  # Covers nothing on the canvas
+    return box
+
+
+class _Quad:
+    """One drawn instance: parallelogram around its visible part plus its AABB"""
+
+    __slots__ = ('geometry', 'shape', 'tile', 'corners', 'aabb')
+
+    def __init__(self, instance, shape: Optional[EmblemShape] = None):
+        self.geometry = InstanceGeometry(instance)
+        self.shape = shape
+        self.tile = shape.bounds if shape is not None else _FULL_TILE
+        self.corners = self.geometry.corners(self.tile)
+        xs = [c[0] for c in self.corners]
+        ys = [c[1] for c in self.corners]
+        self.aabb = (min(xs), min(ys), max(xs), max(ys))
+
+    def contains(self, x: float, y: float) -> bool:
+        a_min_x, a_min_y, a_max_x, a_max_y = self.aabb
+        if x < a_min_x or x > a_max_x or y < a_min_y or y > a_max_y:
+            return False
+        uv = self.geometry.to_tile(x, y)
+        if uv is None:
+            return False
+        u, v = uv
+        if self.shape is not None:
+            return self.shape.covers(u, v)
+        return 0.0 <= u <= 1.0 and 0.0 <= v <= 1.0
+
+    def intersects_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """Separating axis test against an axis-aligned rectangle"""
+        a_min_x, a_min_y, a_max_x, a_max_y = self.aabb
+        if a_max_x < min_x or a_min_x > max_x or a_max_y < min_y or a_min_y > max_y:
+            return False
+        # Remaining candidate axes: the normals of the parallelogram's edges
+        rect = ((min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y))
+        geometry = self.geometry
+        for ax, ay in ((-geometry.uy, geometry.ux), (-geometry.vy, geometry.vx)):
+            quad_proj = [x * ax + y * ay for x, y in self.corners]
+            rect_proj = [x * ax + y * ay for x, y in rect]
+            if max(quad_proj) < min(rect_proj) or min(quad_proj) > max(rect_proj):
+                return False
+        return True
+
+    def inside_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        a_min_x, a_min_y, a_max_x, a_max_y = self.aabb
+        return min_x <= a_min_x and a_max_x <= max_x and min_y <= a_min_y and a_max_y <= max_y
+
+
+class _LayerEntry:
+    """Indexed geometry of one layer"""
+
+    __slots__ = ('key', 'instances', 'quads', 'cells', 'seed_bounds', 'extent')
+
+    def __init__(self, key, instances: List[Transform], quads: List[_Quad], cells,
+                 seed_bounds: Optional[Dict[str, float]]):
+        self.key = key
+        self.instances = instances
+        self.quads = quads
+        self.cells = cells
+        self.seed_bounds = seed_bounds
+        self.extent = _union([q.aabb for q in quads])
+
+
+class LayerSpatialIndex:
+    """Uniform-grid index over the drawn instances of a Layers collection"""
+
+    def __init__(self):
+        self._entries: Dict[str, _LayerEntry] = {}
+        # (ix, iy) -> {layer uuid: [quad index, ...]}
+        self._grid: Dict[Tuple[int, int], Dict[str, List[int]]] = {}
+        self._order: Dict[str, int] = {}
+        self._visible: Dict[str, bool] = {}
+        self.reindexed = 0  # Layers (re)inserted since creation, for diagnostics
+
+    # ========================================
+    # Maintenance
+    # ========================================
+
+    def refresh(self, layers: Iterable) -> None:
+        """Bring the index up to date with the given layers (bottom to top)
+
+        Only layers whose object or geometry_version changed are re-indexed.
+
+        Args:
+            layers: Layer objects in draw order
+        """
+        order = {}
+        visible = {}
+        for index, layer in enumerate(layers):
+            uuid = layer.uuid
+            order[uuid] = index
+            visible[uuid] = layer.visible
+            entry = self._entries.get(uuid)
+            if entry is None or entry.key != _layer_key(layer):
+                self._insert(layer)
+        for uuid in [u for u in self._entries if u not in order]:
+            self._remove(uuid)
+        self._order = order
+        self._visible = visible
+
+    def layer_entry(self, layer) -> _LayerEntry:
+        """Up-to-date entry for one layer, re-indexing only that layer if needed"""
+        entry = self._entries.get(layer.uuid)
+        if entry is None or entry.key != _layer_key(layer):
+            entry = self._insert(layer)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._grid.clear()
+        self._order.clear()
+        self._visible.clear()
+
+    # ========================================
+    # Queries (call refresh() first)
+    # ========================================
+
+    def query_point(self, x: float, y: float, visible_only: bool = True) -> List[str]:
+        """UUIDs of layers with a drawn quad covering (x, y), topmost first"""
+        hits = []
+        for uuid, quad_indices in self._grid.get(self._cell(x, y), {}).items():
+            if visible_only and not self._visible.get(uuid, True):
+                continue
+            quads = self._entries[uuid].quads
+            if any(quads[i].contains(x, y) for i in quad_indices):
+                hits.append(uuid)
+        hits.sort(key=lambda u: self._order.get(u, -1), reverse=True)
+        return hits
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                   contained: bool = False, visible_only: bool = True) -> List[str]:
+        """UUIDs of layers touching a rectangle, bottom to top
+
+        Args:
+            min_x, min_y, max_x, max_y: Rectangle in CoA space
+            contained: Require a quad to lie entirely inside the rectangle
+                (otherwise any overlap counts)
+            visible_only: Skip hidden layers
+        """
+        min_x, max_x = min(min_x, max_x), max(min_x, max_x)
+        min_y, max_y = min(min_y, max_y), max(min_y, max_y)
+        x0, y0 = self._cell(min_x, min_y)
+        x1, y1 = self._cell(max_x, max_y)
+
+        checked = {}
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                for uuid, quad_indices in self._grid.get((ix, iy), {}).items():
+                    if checked.get(uuid) or (visible_only and not self._visible.get(uuid, True)):
+                        continue
+                    quads = self._entries[uuid].quads
+                    if contained:
+                        hit = any(quads[i].inside_rect(min_x, min_y, max_x, max_y) for i in quad_indices)
+                    else:
+                        hit = any(quads[i].intersects_rect(min_x, min_y, max_x, max_y) for i in quad_indices)
+                    if hit:
+                        checked[uuid] = True
+        return sorted(checked, key=lambda u: self._order.get(u, -1))
+
+    def extent(self, uuids: Iterable[str]) -> Optional[Tuple[float, float, float, float]]:
+        """Union AABB (min_x, min_y, max_x, max_y) of the drawn quads of some layers"""
+        return _union([self._entries[u].extent for u in uuids
+                       if u in self._entries and self._entries[u].extent is not None])
+
+    # ========================================
+    # Internal
+    # ========================================
+
+    def _insert(self, layer) -> _LayerEntry:
+        uuid = layer.uuid
+        self._remove(uuid)
+
+        seeds = [inst for inst in layer._data.get('instances', []) if isinstance(inst, Instance)]
+        shape = emblem_shape(layer.filename)
+        instances = drawn_instances(layer, seeds)
+        quads = [_Quad(inst, shape) for inst in instances]
+
+        cells = set()
+        for index, quad in enumerate(quads):
+            x0, y0 = self._cell(quad.aabb[0], quad.aabb[1])
+            x1, y1 = self._cell(quad.aabb[2], quad.aabb[3])
+            for ix in range(x0, x1 + 1):
+                for iy in range(y0, y1 + 1):
+                    self._grid.setdefault((ix, iy), {}).setdefault(uuid, []).append(index)
+                    cells.add((ix, iy))
+
+        entry = _LayerEntry(_layer_key(layer), instances, quads, cells, _seed_bounds(seeds, shape))
+        self._entries[uuid] = entry
+        self._visible.setdefault(uuid, layer.visible)
+        self.reindexed += 1
+        return entry
+
+    def _remove(self, uuid: str) -> None:
+        entry = self._entries.pop(uuid, None)
+        if entry is None:
+            return
+        for cell in entry.cells:
+            bucket = self._grid.get(cell)
+            if bucket is not None:
+                bucket.pop(uuid, None)
+                if not bucket:
+                    del self._grid[cell]
+
+    @staticmethod
+    def _cell(x: float, y: float) -> Tuple[int, int]:
+        ix = int((x - GRID_MIN) / _CELL_SIZE)
+        iy = int((y - GRID_MIN) / _CELL_SIZE)
+        return (min(max(ix, 0), GRID_CELLS - 1), min(max(iy, 0), GRID_CELLS - 1))
+
+
+def _layer_key(layer) -> tuple:
+    return (layer.id, layer.geometry_version, _shape_generation)
+
+
+def drawn_instances(layer, seeds) -> List[Transform]:
+    """Every instance the renderer draws for a layer, in draw order
+
+    Each seed instance is followed by its symmetry mirrors (when the layer
+    has a symmetry transform).
+
+    Args:
+        layer: Layer object
+        seeds: The layer's Instance objects
+
+    Returns:
+        Transforms (pos, scale, rotation, flip_x, flip_y) in CoA space
+    """
+    transform_plugin = None
+    if layer.symmetry_type != 'none' and seeds:
+        from services.symmetry_transforms import get_transform
+        transform_plugin = get_transform(layer.symmetry_type)
+        if transform_plugin:
+            properties = layer.symmetry_properties
+            if properties:
+                transform_plugin.set_properties(properties)
+
+    drawn = []
+    for inst in seeds:
+        pos = Vec2(inst.pos.x, inst.pos.y)
+        scale = Vec2(inst.scale.x, inst.scale.y)
+        drawn.append(Transform(pos, scale, inst.rotation, inst.flip_x, inst.flip_y))
+        if transform_plugin:
+            for transform in transform_plugin.calculate_transforms(Transform(pos, scale, inst.rotation)):
+                # Mirrors may override the seed's flips
+                drawn.append(Transform(transform.pos, transform.scale, transform.rotation,
+                                       getattr(transform, 'flip_x', inst.flip_x),
+                                       getattr(transform, 'flip_y', inst.flip_y)))
+    return drawn
+
+
+def _seed_bounds(seeds, shape: Optional[EmblemShape] = None) -> Optional[Dict[str, float]]:
+    """Unrotated AABB of the seed instances' visible boxes (CoA.get_layer_bounds semantics)"""
+    if not seeds:
+        return None
+    tile = shape.bounds if shape is not None else _FULL_TILE
+    boxes = [InstanceGeometry(Transform(inst.pos, inst.scale, 0.0, inst.flip_x, inst.flip_y)).box(tile)
+             for inst in seeds]
+    min_x, min_y, max_x, max_y = _union(boxes)
+    return {
+        'min_x': min_x,
+        'max_x': max_x,
+        'min_y': min_y,
+        'max_y': max_y,
+        'width': max_x - min_x,
+        'height': max_y - min_y,
+        'center_x': (min_x + max_x) / 2.0,
+        'center_y': (min_y + max_y) / 2.0
+    }
+
+
+def _largest_rect(mask: int, grid: int) -> Optional[Tuple[float, float, float, float]]:
+    """Largest-area rectangle of set cells (histogram method), in tile fractions"""
+    if not mask:
+        return None
+    best = None
+    best_area = 0
+    heights = [0] * grid
+    for row in range(grid):
+        for col in range(grid):
+            heights[col] = heights[col] + 1 if (mask >> (row * grid + col)) & 1 else 0
+        stack = []  # columns with increasing heights
+        for col in range(grid + 1):
+            height = heights[col] if col < grid else 0
+            while stack and heights[stack[-1]] >= height:
+                top = stack.pop()
+                left = stack[-1] + 1 if stack else 0
+                area = heights[top] * (col - left)
+                if area > best_area:
+                    best_area = area
+                    best = (left, row + 1 - heights[top], col, row + 1)
+            if col < grid:
+                stack.append(col)
+    x0, y0, x1, y1 = best
+    return (x0 / grid, y0 / grid, x1 / grid, y1 / grid)
+
+
+def _union(boxes) -> Optional[Tuple[float, float, float, float]]:
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
@@ -56,6 +56,7 @@ import inspect
 
 from ._internal.layer import Layer, Layers, LayerTracker
 from ._internal.instance import Instance
+from ._internal.spatial_index import LayerSpatialIndex, emblem_shape, invalidate_shapes, set_shape_provider
 from .query_mixin import CoAQueryMixin
 from .transform_mixin import CoATransformMixin
 from .layer_mixin import CoALayerMixin
@@ -85,6 +86,11 @@ class CoA(CoATransformMixin, CoALayerMixin, CoASerializationMixin, CoAContainerM
         CoA.get_active() - Get the active CoA instance
         CoA.has_active() - Check if active instance exists
     
+    Emblem Shapes (shared by all instances):
+        CoA.set_emblem_shape_provider(fn) - Tight emblem geometry for hit tests/bounds
+        CoA.invalidate_emblem_shapes() - Re-read it after assets were re-converted
+        CoA.get_emblem_shape(filename) - Cached shape (bounds, masks, opaque_rect) or None
+    
     Properties:
         pattern: Base pattern filename
         pattern_color1: Color object for pattern color 1
@@ -127,6 +133,38 @@ class CoA(CoATransformMixin, CoALayerMixin, CoASerializationMixin, CoAContainerM
         """
         return cls._active_instance is not None
     
+    @staticmethod
+    def set_emblem_shape_provider(provider):
+        """Set where the visible shape of emblem textures comes from
+        
+        With a provider, bounds, hit tests and rectangle queries use each
+        emblem's tight alpha box (and point hits its occupancy mask)
+        instead of the full unit quad.
+        
+        Args:
+            provider: callable(filename) -> (alpha_bounds, mask, grid) or
+                None (e.g. AssetCatalog.alpha_geometry); None to disable
+        """
+        set_shape_provider(provider)
+    
+    @staticmethod
+    def get_emblem_shape(filename: str):
+        """Get the visible shape of an emblem texture
+        
+        Args:
+            filename: Emblem texture filename
+            
+        Returns:
+            EmblemShape (bounds, mask, grid, opaque, opaque_rect; tile
+            fractions, Y down), or None if unknown
+        """
+        return emblem_shape(filename)
+    
+    @staticmethod
+    def invalidate_emblem_shapes():
+        """Drop cached emblem shapes so they are re-read from the provider"""
+        invalidate_shapes()
+    
     def __init__(self):
         """Create new CoA with defaults"""
         self._logger = logging.getLogger('CoA')
@@ -148,6 +186,9 @@ class CoA(CoATransformMixin, CoALayerMixin, CoASerializationMixin, CoAContainerM
         # Transform cache for group operations (prevents cumulative error)
         self._transform_cache = None  # Dict: {uuid: {pos_x, pos_y, scale_x, scale_y, rotation}}
         
+        # Hit-test/bounds index over drawn instances, refreshed lazily by queries
+        self._spatial_index = LayerSpatialIndex()
+        
         # Track last added layer UUID for auto-selection
         self._last_added_uuid = None
         self._last_added_uuids = []  # List of UUIDs from last add operation (for multi-paste)
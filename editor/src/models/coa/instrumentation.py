@@ -0,0 +1,233 @@
+"""
+CK3 Coat of Arms Editor - Model Instrumentation
+
+Low-overhead timing for the CoA model's public API (transform, layer,
+query, serialization and container mixins plus CoA itself).
+
+Disabled (the default) costs nothing: the mixin classes hold their original
+functions. enable() swaps every public method for a timing wrapper and
+disable() puts the originals back, so instrumentation is only paid for
+while a recording is running.
+
+While enabled, each call:
+- bumps per-method call count, cumulative and max wall time
+  (inclusive of nested CoA calls)
+- appends (start, duration, method, thread) to a fixed-size ring buffer
+
+The ring buffer exports as Chrome trace JSON, where nested calls show up
+as a flame chart - enough to see what dominates a drag or a paste.
+
+Usage:
+    CoAInstrumentation.enable()
+    ...  # drag, paste, etc.
+    CoAInstrumentation.disable()
+    print(CoAInstrumentation.report())
+    CoAInstrumentation.export_trace("model_trace.json")
+"""
+
+import json
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class CoAInstrumentation:
+    """Class-level recorder for CoA method timings (see module docstring)"""
+
+    DEFAULT_BUFFER_SIZE = 100_000
+
+    _enabled = False
+    _events = deque(maxlen=DEFAULT_BUFFER_SIZE)  # (start_ns, duration_ns, method, thread_id)
+    _stats = {}  # method -> [calls, total_ns, max_ns]
+    _originals = []  # (class, attribute name, original descriptor)
+    _logger = logging.getLogger('CoAInstrumentation')
+
+    # ========================================
+    # Enable / Disable
+    # ========================================
+
+    @classmethod
+    def enable(cls, buffer_size: int = None):
+        """Install timing wrappers on all public CoA methods
+
+        Args:
+            buffer_size: Ring buffer capacity in events (keeps the most recent)
+        """
+        if cls._enabled:
+            return
+        if buffer_size is not None and buffer_size != cls._events.maxlen:
+            cls._events = deque(cls._events, maxlen=max(1, buffer_size))
+
+        for klass in cls._instrumented_classes():
+            for name, attr in list(vars(klass).items()):
+                if name.startswith('_'):
+                    continue
+                wrapped = cls._wrap_attribute(attr)
+                if wrapped is not None:
+                    cls._originals.append((klass, name, attr))
+                    setattr(klass, name, wrapped)
+
+        cls._enabled = True
+        cls._logger.info(f"Instrumentation enabled ({len(cls._originals)} methods)")
+
+    @classmethod
+    def disable(cls):
+        """Restore the original, unwrapped methods (recorded data is kept)"""
+        while cls._originals:
+            klass, name, attr = cls._originals.pop()
+            setattr(klass, name, attr)
+        cls._enabled = False
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._enabled
+
+    @classmethod
+    @contextmanager
+    def recording(cls, reset: bool = True):
+        """Context manager enabling instrumentation for a block
+
+        Args:
+            reset: Clear previously recorded data first
+        """
+        if reset:
+            cls.reset()
+        was_enabled = cls._enabled
+        cls.enable()
+        try:
+            yield cls
+        finally:
+            if not was_enabled:
+                cls.disable()
+
+    @classmethod
+    def reset(cls):
+        """Clear stats and the event buffer (in place - wrappers hold references)"""
+        cls._events.clear()
+        cls._stats.clear()
+
+    # ========================================
+    # Results
+    # ========================================
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict]:
+        """Per-method totals, most expensive first
+
+        Returns:
+            Dict of method -> {'calls', 'total_ms', 'mean_ms', 'max_ms'}
+        """
+        rows = sorted(cls._stats.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            name: {
+                'calls': calls,
+                'total_ms': total / 1e6,
+                'mean_ms': total / calls / 1e6,
+                'max_ms': peak / 1e6,
+            }
+            for name, (calls, total, peak) in rows
+        }
+
+    @classmethod
+    def get_events(cls) -> List[Dict]:
+        """Recorded calls in order (oldest first, bounded by the ring buffer)"""
+        return [
+            {'start_ns': start, 'duration_ns': duration, 'method': method, 'thread': thread}
+            for start, duration, method, thread in cls._events
+        ]
+
+    @classmethod
+    def report(cls, top: int = 20) -> str:
+        """Text table of the most expensive methods"""
+        lines = [f"{'method':<55} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for name, s in list(cls.get_stats().items())[:top]:
+            lines.append(
+                f"{name:<55} {s['calls']:>8} {s['total_ms']:>10.3f} {s['mean_ms']:>9.4f} {s['max_ms']:>9.3f}"
+            )
+        return '\n'.join(lines)
+
+    @classmethod
+    def to_chrome_trace(cls) -> Dict:
+        """Ring buffer as a Chrome trace-event document"""
+        events = list(cls._events)
+        origin = events[0][0] if events else 0
+        return {
+            'traceEvents': [
+                {
+                    'name': method.rsplit('.', 1)[-1],
+                    'cat': method.split('.', 1)[0],
+                    'ph': 'X',
+                    'pid': 1,
+                    'tid': thread,
+                    'ts': (start - origin) / 1000.0,
+                    'dur': duration / 1000.0,
+                    'args': {'method': method},
+                }
+                for start, duration, method, thread in events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    @classmethod
+    def export_trace(cls, path: str):
+        """Write to_chrome_trace() as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cls.to_chrome_trace(), f)
+
+    # ========================================
+    # Internals
+    # ========================================
+
+    @staticmethod
+    def _instrumented_classes():
+        # Imported lazily: this module is imported by models.coa itself
+        from .core import CoA
+        from .query_mixin import CoAQueryMixin
+        from .transform_mixin import CoATransformMixin
+        from .layer_mixin import CoALayerMixin
+        from .serialization_mixin import CoASerializationMixin
+        from .container_mixin import CoAContainerMixin
+        return (CoA, CoATransformMixin, CoALayerMixin, CoASerializationMixin,
+                CoAContainerMixin, CoAQueryMixin)
+
+    @classmethod
+    def _wrap_attribute(cls, attr):
+        """Timing wrapper for a function/classmethod/staticmethod, else None"""
+        if isinstance(attr, classmethod):
+            return classmethod(cls._timed(attr.__func__))
+        if isinstance(attr, staticmethod):
+            return staticmethod(cls._timed(attr.__func__))
+        if callable(attr) and hasattr(attr, '__code__'):
+            return cls._timed(attr)
+        return None  # properties, constants
+
+    @classmethod
+    def _timed(cls, func):
+        name = func.__qualname__
+        stats = cls._stats
+        events = cls._events
+        clock = time.perf_counter_ns
+        get_ident = threading.get_ident
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                entry = stats.get(name)
+                if entry is None:
+                    stats[name] = [1, duration, duration]
+                else:
+                    entry[0] += 1
+                    entry[1] += duration
+                    if duration > entry[2]:
+                        entry[2] = duration
+                events.append((start, duration, name, get_ident()))
+
+        return timed
@@ -12,9 +12,10 @@ All query methods follow these conventions:
 - Return copies of mutable data (no direct access to internal state)
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from ._internal.layer import Layer
-from models.transform import Vec2
+from ._internal.spatial_index import drawn_box, opaque_box
+from models.transform import Transform, Vec2
 
 
 class CoAQueryMixin:
@@ -22,6 +23,7 @@ class CoAQueryMixin:
     
     This mixin assumes the class has:
     - self._layers: Layers collection
+    - self._spatial_index: LayerSpatialIndex
     - self._last_added_uuid: str tracking last added layer
     - self._last_added_uuids: List[str] tracking batch additions
     """
@@ -33,6 +35,9 @@ class CoAQueryMixin:
     def get_layer_bounds(self, uuid: str) -> Dict[str, float]:
         """Calculate layer bounds (AABB) including all instances
         
+        Boxes the visible part of the emblem when its shape is known (see
+        CoA.set_emblem_shape_provider), otherwise the full instance quads.
+        
         Args:
             uuid: Layer UUID
             
@@ -46,39 +51,21 @@ class CoAQueryMixin:
         if not layer:
             raise ValueError(f"Layer with UUID '{uuid}' not found")
         
-        # Calculate bounds for all instances
-        min_x = float('inf')
-        max_x = float('-inf')
-        min_y = float('inf')
-        max_y = float('-inf')
-        
-        for i in range(layer.instance_count):
-            instance = layer.get_instance(i, caller='CoA')
-            
-            # Get position and scale
-            x = instance.pos.x
-            y = instance.pos.y
-            sx = instance.scale.x
-            sy = instance.scale.y
-            half_w = abs(sx) / 2.0
-            half_h = abs(sy) / 2.0
-            
-            # Update bounds (AABB is axis-aligned, ignores rotation)
-            min_x = min(min_x, x - half_w)
-            max_x = max(max_x, x + half_w)
-            min_y = min(min_y, y - half_h)
-            max_y = max(max_y, y + half_h)
-        
-        return {
-            'min_x': min_x,
-            'max_x': max_x,
-            'min_y': min_y,
-            'max_y': max_y,
-            'width': max_x - min_x,
-            'height': max_y - min_y,
-            'center_x': (min_x + max_x) / 2.0,
-            'center_y': (min_y + max_y) / 2.0
-        }
+        # Cached per layer by the spatial index until its geometry changes
+        # (AABB of each instance's visible box, ignores rotation)
+        bounds = self._spatial_index.layer_entry(layer).seed_bounds
+        if bounds is None:
+            return {
+                'min_x': float('inf'),
+                'max_x': float('-inf'),
+                'min_y': float('inf'),
+                'max_y': float('-inf'),
+                'width': float('-inf'),
+                'height': float('-inf'),
+                'center_x': float('nan'),
+                'center_y': float('nan')
+            }
+        return dict(bounds)
     
     def get_layers_bounds(self, uuids: List[str]) -> Dict[str, float]:
         """Calculate combined bounds of multiple layers (AABB)
@@ -118,6 +105,137 @@ class CoAQueryMixin:
             'center_y': (min_y + max_y) / 2.0
         }
     
+    def get_layer_drawn_instances(self, uuid: str) -> List[Transform]:
+        """Get every instance a layer draws, symmetry mirrors included
+        
+        Each seed instance is followed by its mirrors, in draw order. Cached
+        by the spatial index until the layer's geometry changes.
+        
+        Args:
+            uuid: Layer UUID
+            
+        Returns:
+            List of Transforms (pos, scale, rotation, flip_x, flip_y) in CoA space
+            
+        Raises:
+            ValueError: If UUID not found
+        """
+        layer = self._layers.get_by_uuid(uuid)
+        if not layer:
+            raise ValueError(f"Layer with UUID '{uuid}' not found")
+        
+        return [Transform(Vec2(t.pos.x, t.pos.y), Vec2(t.scale.x, t.scale.y),
+                          t.rotation, t.flip_x, t.flip_y)
+                for t in self._spatial_index.layer_entry(layer).instances]
+    
+    def get_layer_instance_boxes(self, uuid: str, texel: float, pixel: float,
+                                 opaque: bool = True) -> List[Tuple[Transform, tuple, Optional[tuple]]]:
+        """Get the drawn instances of a layer with the boxes they can touch
+        
+        Boxes follow the emblem shaders' transform around the emblem's visible
+        texels (the whole tile when its shape is unknown). The drawn box holds
+        every pixel an instance can change; the opaque box only pixels it
+        certainly overwrites.
+        
+        Args:
+            uuid: Layer UUID
+            texel: Emblem tile texel size (filtering margin)
+            pixel: Render target pixel size in CoA units (rasterization margin)
+            opaque: Compute opaque boxes (False: always None, e.g. when a
+                pattern mask lowers the layer's alpha)
+            
+        Returns:
+            List of (instance Transform, drawn box, opaque box or None) in draw
+            order; boxes are (min_x, min_y, max_x, max_y) in CoA space
+            
+        Raises:
+            ValueError: If UUID not found
+        """
+        instances = self.get_layer_drawn_instances(uuid)
+        # Same geometry the spatial index hit-tests with
+        quads = self._spatial_index.layer_entry(self._layers.get_by_uuid(uuid)).quads
+        boxes = []
+        for instance, quad in zip(instances, quads):
+            drawn = drawn_box(quad.geometry, quad.shape, texel, pixel)
+            covered = opaque_box(quad.geometry, quad.shape, texel, pixel) if opaque else None
+            boxes.append((instance, drawn, covered))
+        return boxes
+    
+    # ========================================
+    # Spatial Queries (hit-testing)
+    # ========================================
+    
+    def get_layers_at_point(self, x: float, y: float, visible_only: bool = True) -> List[str]:
+        """Get layers whose drawn emblem quads cover a point
+        
+        Uses the spatial index (rotated quads, symmetry mirrors included),
+        re-indexing only layers that changed since the last query. Quads of
+        emblems with a known shape only hit where the occupancy mask is set.
+        
+        Args:
+            x, y: Point in CoA space (0-1)
+            visible_only: Skip hidden layers
+            
+        Returns:
+            List of layer UUIDs, topmost first
+        """
+        self._spatial_index.refresh(self._layers)
+        return self._spatial_index.query_point(x, y, visible_only=visible_only)
+    
+    def get_layers_in_rect(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                           contained: bool = False, visible_only: bool = True) -> List[str]:
+        """Get layers whose drawn emblem quads touch a rectangle (marquee selection)
+        
+        Args:
+            min_x, min_y, max_x, max_y: Rectangle corners in CoA space
+            contained: Only count quads entirely inside the rectangle
+            visible_only: Skip hidden layers
+            
+        Returns:
+            List of layer UUIDs (bottom to top order)
+        """
+        self._spatial_index.refresh(self._layers)
+        return self._spatial_index.query_rect(min_x, min_y, max_x, max_y,
+                                              contained=contained, visible_only=visible_only)
+    
+    def get_layers_extent(self, uuids: List[str]) -> Dict[str, float]:
+        """Get the drawn extent of layers: rotated quads, symmetry mirrors included
+        
+        Unlike get_layers_bounds(), which boxes the seed instances' unrotated
+        scale, this covers everything the layers draw.
+        
+        Args:
+            uuids: List of layer UUIDs
+            
+        Returns:
+            Dict with 'min_x', 'max_x', 'min_y', 'max_y', 'width', 'height', 'center_x', 'center_y'
+            
+        Raises:
+            ValueError: If any UUID not found or list is empty
+        """
+        if not uuids:
+            raise ValueError("Need at least one layer UUID")
+        for uuid in uuids:
+            layer = self._layers.get_by_uuid(uuid)
+            if not layer:
+                raise ValueError(f"Layer with UUID '{uuid}' not found")
+            self._spatial_index.layer_entry(layer)
+        
+        extent = self._spatial_index.extent(uuids)
+        if extent is None:
+            raise ValueError("Layers have no instances")
+        min_x, min_y, max_x, max_y = extent
+        return {
+            'min_x': min_x,
+            'max_x': max_x,
+            'min_y': min_y,
+            'max_y': max_y,
+            'width': max_x - min_x,
+            'height': max_y - min_y,
+            'center_x': (min_x + max_x) / 2.0,
+            'center_y': (min_y + max_y) / 2.0
+        }
+    
     # ========================================
     # Layer Collection Queries
     # ========================================
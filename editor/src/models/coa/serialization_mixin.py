@@ -5,11 +5,13 @@ Provides serialization and parsing methods for the CoA model:
 - Parsing CK3 format strings into CoA data
 - Serializing CoA data to CK3 format strings
 - Layer-specific serialization for clipboard operations
+- Canonical form and content hash (render cache keys)
 
 Extracted from coa.py to improve code organization and maintainability.
 """
 
 import re
+import hashlib
 import logging
 from typing import List, Optional
 import uuid as uuid_module
@@ -410,6 +412,83 @@ class CoASerializationMixin:
         """
         return self.serialize()
     
+    def to_canonical_string(self) -> str:
+        """Export the render-relevant content of the CoA in normalized form
+        
+        Two CoAs with the same canonical string render identically. The form
+        is not CK3 syntax and is never parsed back; it only feeds
+        get_content_hash(). Normalization:
+        - Floats use fixed 6-decimal formatting (-0 folded to 0)
+        - Colors always use RGB (named palette colors fold onto their RGB)
+        - Rotation wrapped to [0, 360); flips folded into signed scale
+        - Masks reduced to per-channel on/off
+        - Symmetry expanded to the instances actually drawn
+        - Hidden layers, depth and editor-only metadata (UUIDs, names,
+          containers, selected instance) are dropped
+        
+        Returns:
+            Canonical multi-line string
+        """
+        lines = [f'pattern={self._pattern}']
+        for index, color in enumerate((self._pattern_color1, self._pattern_color2, self._pattern_color3), 1):
+            lines.append(f'color{index}={color.to_ck3_string(force_rgb=True)}')
+        
+        for layer in self._layers:
+            if not layer.visible:
+                continue
+            lines.append(f'emblem={layer.filename}')
+            lines.append(f'colors={layer.color1.to_ck3_string(force_rgb=True)} '
+                         f'{layer.color2.to_ck3_string(force_rgb=True)} '
+                         f'{layer.color3.to_ck3_string(force_rgb=True)}')
+            mask = list(layer.mask) if isinstance(layer.mask, (list, tuple)) else []
+            mask_bits = ' '.join('1' if i < len(mask) and mask[i] != 0 else '0' for i in range(3))
+            lines.append(f'mask={mask_bits}')
+            for pos, scale, rotation, flip_x, flip_y in self._iter_drawn_transforms(layer):
+                sx = -scale.x if flip_x else scale.x
+                sy = -scale.y if flip_y else scale.y
+                lines.append('instance=' + ' '.join(_canonical_float(v) for v in (
+                    pos.x, pos.y, sx, sy, rotation % 360.0
+                )))
+        
+        return '\n'.join(lines)
+    
+    def get_content_hash(self) -> str:
+        """Get a stable hash of the rendered content of this CoA
+        
+        Identical hashes mean identical renders, so the value can key render
+        caches across runs. See to_canonical_string() for what is normalized.
+        
+        Returns:
+            SHA-256 hex digest
+        """
+        return hashlib.sha256(self.to_canonical_string().encode('utf-8')).hexdigest()
+    
+    def _iter_drawn_transforms(self, layer: Layer):
+        """Yield (pos, scale, rotation, flip_x, flip_y) for every drawn instance
+        
+        Seeds are followed by their symmetry mirrors, matching the expansion
+        done by Layer.serialize() and the renderer.
+        """
+        instances = [layer.get_instance(i, caller='CoA') for i in range(layer.instance_count)]
+        
+        transform_plugin = None
+        if layer.symmetry_type != 'none':
+            from services.symmetry_transforms import get_transform
+            transform_plugin = get_transform(layer.symmetry_type)
+            if transform_plugin:
+                transform_plugin.set_properties(layer.symmetry_properties)
+        
+        for inst in instances:
+            yield inst.pos, inst.scale, inst.rotation, inst.flip_x, inst.flip_y
+            if transform_plugin is None:
+                continue
+            from models.transform import Transform
+            seed_transform = Transform(inst.pos, inst.scale, inst.rotation)
+            for mirror in transform_plugin.calculate_transforms(seed_transform):
+                yield (mirror.pos, mirror.scale, mirror.rotation,
+                       getattr(mirror, 'flip_x', inst.flip_x),
+                       getattr(mirror, 'flip_y', inst.flip_y))
+    
     def serialize_layers_to_string(self, uuids: list, strip_container_uuid: bool = True) -> str:
         """Export specific layers to CK3 format string
         
@@ -444,3 +523,9 @@ class CoASerializationMixin:
             lines.append(layer_string)
         
         return '\n'.join(lines)
+
+
+def _canonical_float(value: float) -> str:
+    """Fixed 6-decimal float formatting with negative zero folded to zero"""
+    text = f'{value:.6f}'
+    return '0.000000' if text == '-0.000000' else text
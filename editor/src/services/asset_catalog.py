@@ -0,0 +1,378 @@
+"""Indexed catalog of converted emblem and pattern assets.
+
+Single source of truth for the converted asset metadata. Previously the
+asset sidebar, the canvas and headless atlas loaders and
+utils/metadata_cache each decoded the metadata JSON themselves and called
+Path.exists() on every source PNG. The catalog does that work once:
+
+- decodes both metadata JSON files
+- lists each source PNG directory with a single scandir instead of one
+  stat per asset
+- keeps pre-resolved PNG paths, categories, color counts, category
+  indexes and the atlas UV slot of every texture
+- parses each emblem's tight alpha bounds, occupancy mask and opaque
+  cell mask, measured by the converter (asset_converter/src/emblem_geometry.py)
+
+The result is persisted next to the assets as a precompiled index
+(asset_catalog.idx) keyed to the metadata files, the converter's content
+manifest and the source directories. Warm starts unpickle the index
+without touching the JSON or listing directories; re-running the converter
+changes the key and the index is rebuilt on next load.
+
+Usage:
+    from services.asset_catalog import get_catalog
+    catalog = get_catalog()
+    files = catalog.atlas_files()            # [(dds filename, png path), ...]
+    colors = catalog.color_count("ce_fleur.dds")
+    by_category = catalog.emblems_by_category()
+    geometry = catalog.alpha_geometry("ce_fleur.dds")  # (bounds, mask, grid, opaque) or None
+"""
+
+import os
+import json
+import pickle
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "asset_catalog.idx"
+INDEX_VERSION = 3
+
+# Atlas packing used by TextureLoader.load_texture_atlas
+ATLAS_TILE_SIZE = 256
+ATLAS_SIZE = 8192
+
+# Keys that appear in converted metadata but are not assets
+_SKIP_KEYS = ("\ufeff", "")
+
+
+@dataclass
+class AssetEntry:
+    """One converted texture (emblem or pattern)."""
+    filename: str  # .dds name as referenced by CoA files
+    kind: str  # 'emblem' or 'pattern'
+    path: str  # resolved source PNG
+    category: Optional[str]
+    colors: Optional[int]  # None when metadata omits it
+    visible: bool
+    properties: dict  # raw metadata entry
+    # Tight (x0, y0, x1, y1) of visible pixels in tile fractions, Y down
+    alpha_bounds: Optional[Tuple[float, float, float, float]] = None
+    occupancy: Optional[Tuple[int, int]] = None  # (bitmask, cells per axis)
+    opaque: Optional[Tuple[int, int]] = None  # cells with only alpha 255, same layout
+
+    @property
+    def png_filename(self) -> str:
+        return self.filename.replace('.dds', '.png')
+
+
+def compute_atlas_slots(keys, tile_size: int = ATLAS_TILE_SIZE,
+                        atlas_size: int = ATLAS_SIZE) -> Dict[str, Tuple[int, float, float, float, float]]:
+    """Atlas placement for keys packed in order.
+
+    Args:
+        keys: Texture keys in packing order.
+        tile_size: Tile edge in pixels.
+        atlas_size: Atlas edge in pixels.
+
+    Returns:
+        Dict mapping key -> (atlas_idx, u0, v0, u1, v1).
+    """
+    tiles_per_row = atlas_size // tile_size
+    tiles_per_atlas = tiles_per_row * tiles_per_row
+    slots = {}
+    for i, key in enumerate(keys):
+        atlas_idx, local_idx = divmod(i, tiles_per_atlas)
+        row, col = divmod(local_idx, tiles_per_row)
+        x = col * tile_size
+        y = row * tile_size
+        slots[key] = (
+            atlas_idx,
+            x / atlas_size,
+            y / atlas_size,
+            (x + tile_size) / atlas_size,
+            (y + tile_size) / atlas_size,
+        )
+    return slots
+
+
+
+def compute_array_layers(keys, max_layers: int) -> Dict[str, Tuple[int, int]]:
+    """Texture array placement for keys packed in order.
+
+    Args:
+        keys: Texture keys in packing order.
+        max_layers: Layers per array (GL_MAX_ARRAY_TEXTURE_LAYERS).
+
+    Returns:
+        Dict mapping key -> (array_idx, layer).
+    """
+    return {key: divmod(i, max_layers) for i, key in enumerate(keys)}
+
+
+class AssetCatalog:
+    """In-memory asset index (see module docstring)."""
+
+    def __init__(self, emblem_metadata: dict, pattern_metadata: dict,
+                 emblems: Dict[str, AssetEntry], patterns: Dict[str, AssetEntry]):
+        self._emblem_metadata = emblem_metadata
+        self._pattern_metadata = pattern_metadata
+        self.emblems = emblems
+        self.patterns = patterns
+
+        self._categories = {}
+        for entry in emblems.values():
+            if entry.category:
+                self._categories.setdefault(entry.category.title(), []).append(entry)
+        self._atlas_slots = compute_atlas_slots(f for f, _ in self.atlas_files())
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, emblem_json: Path, pattern_json: Path,
+              emblem_dir: Path, pattern_dir: Path) -> 'AssetCatalog':
+        """Build the catalog from metadata JSON and source PNG directories."""
+        emblem_metadata = _read_json(emblem_json)
+        pattern_metadata = _read_json(pattern_json)
+        emblems = _index_entries(emblem_metadata, 'emblem', emblem_dir)
+        patterns = _index_entries(pattern_metadata, 'pattern', pattern_dir)
+        return cls(emblem_metadata, pattern_metadata, emblems, patterns)
+
+    @classmethod
+    def load(cls, assets_dir: Path = None, use_index: bool = True) -> 'AssetCatalog':
+        """Load from the precompiled index, rebuilding it if stale or missing.
+
+        Args:
+            assets_dir: ck3_assets directory (default: path_resolver.get_assets_dir()).
+            use_index: Read/write the on-disk index.
+        """
+        from utils.path_resolver import (
+            get_assets_dir, get_emblem_metadata_path, get_emblem_source_dir,
+            get_pattern_metadata_path, get_pattern_source_dir,
+        )
+        assets_dir = Path(assets_dir) if assets_dir is not None else get_assets_dir()
+
+        emblem_json = get_emblem_metadata_path(assets_dir)
+        pattern_json = get_pattern_metadata_path(assets_dir)
+        emblem_dir = get_emblem_source_dir(assets_dir)
+        pattern_dir = get_pattern_source_dir(assets_dir)
+        index_path = assets_dir / INDEX_FILENAME
+
+        key = _fingerprint(emblem_json, pattern_json, emblem_dir, pattern_dir,
+                           assets_dir / "content_manifest.json")
+
+        if use_index:
+            catalog = _read_index(index_path, key)
+            if catalog is not None:
+                return catalog
+
+        catalog = cls.build(emblem_json, pattern_json, emblem_dir, pattern_dir)
+        if use_index and (catalog.emblems or catalog.patterns):
+            _write_index(index_path, key, catalog)
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def emblem_metadata(self) -> dict:
+        """Raw emblem metadata JSON (as decoded)."""
+        return self._emblem_metadata
+
+    def pattern_metadata(self) -> dict:
+        """Raw pattern metadata JSON (as decoded)."""
+        return self._pattern_metadata
+
+    def get(self, filename: str) -> Optional[AssetEntry]:
+        """Entry for a texture filename (emblems take precedence)."""
+        return self.emblems.get(filename) or self.patterns.get(filename)
+
+    def color_count(self, filename: str, default: int = 3) -> int:
+        """Color count from metadata (emblems first, then patterns).
+
+        Unlike get(), this also covers metadata entries whose PNG is missing.
+        """
+        for metadata in (self._emblem_metadata, self._pattern_metadata):
+            props = metadata.get(filename)
+            if isinstance(props, dict):
+                return props.get('colors', default)
+        return default
+
+    def category(self, filename: str) -> Optional[str]:
+        """Raw category from metadata, or None."""
+        for metadata in (self._emblem_metadata, self._pattern_metadata):
+            props = metadata.get(filename)
+            if isinstance(props, dict):
+                return props.get('category')
+        return None
+
+    def alpha_geometry(self, filename: str) -> Optional[Tuple[Tuple[float, float, float, float], int, int, int]]:
+        """Tight alpha bounds and cell masks measured by the converter.
+
+        Returns:
+            (alpha_bounds, occupancy bitmask, cells per axis, opaque bitmask),
+            or None when the asset is unknown or was converted without
+            geometry. Bit row * cells + col of the occupancy mask is set
+            when that cell of the tile has visible pixels, of the opaque
+            mask when all of its pixels are fully opaque (0 if unknown).
+        """
+        entry = self.emblems.get(filename)
+        if entry is None or entry.alpha_bounds is None or entry.occupancy is None:
+            return None
+        mask, grid = entry.occupancy
+        opaque = entry.opaque[0] if entry.opaque and entry.opaque[1] == grid else 0
+        return entry.alpha_bounds, mask, grid, opaque
+
+    def emblems_by_category(self) -> Dict[str, List[AssetEntry]]:
+        """Emblems with a category, grouped by title-cased category name."""
+        return self._categories
+
+    def atlas_files(self) -> List[Tuple[str, str]]:
+        """(dds filename, png path) pairs in atlas packing order (patterns first)."""
+        return ([(f, e.path) for f, e in self.patterns.items()] +
+                [(f, e.path) for f, e in self.emblems.items()])
+
+    def atlas_slot(self, filename: str) -> Optional[Tuple[int, float, float, float, float]]:
+        """(atlas_idx, u0, v0, u1, v1) the texture gets in the loaded atlases."""
+        return self._atlas_slots.get(filename)
+
+    def __len__(self) -> int:
+        return len(self.emblems) + len(self.patterns)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Process-wide instance
+# ══════════════════════════════════════════════════════════════════════════
+
+_CATALOG: Optional[AssetCatalog] = None
+_CATALOG_LOCK = threading.Lock()  # startup workers and the GUI may race to load
+
+
+def get_catalog() -> AssetCatalog:
+    """Shared catalog, loaded on first use."""
+    global _CATALOG
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            _CATALOG = AssetCatalog.load()
+        return _CATALOG
+
+
+def clear_catalog():
+    """Forget the shared catalog (next get_catalog() reloads)."""
+    global _CATALOG
+    _CATALOG = None
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Helpers
+# ══════════════════════════════════════════════════════════════════════════
+
+def _read_json(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(data, dict):
+        logger.warning("Invalid metadata format in %s", path)
+        return {}
+    return data
+
+
+def _list_pngs(directory: Path) -> set:
+    """Names of PNG files in a directory, from a single scandir."""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if e.name.endswith('.png')}
+    except OSError:
+        return set()
+
+
+def _index_entries(metadata: dict, kind: str, source_dir: Path) -> Dict[str, AssetEntry]:
+    existing = _list_pngs(source_dir)
+    entries = {}
+    for filename, props in metadata.items():
+        if filename in _SKIP_KEYS or not isinstance(props, dict):
+            continue
+        png = filename.replace('.dds', '.png')
+        if png not in existing:
+            continue
+        entries[filename] = AssetEntry(
+            filename=filename,
+            kind=kind,
+            path=str(source_dir / png),
+            category=props.get('category'),
+            colors=props.get('colors'),
+            visible=props.get('visible', True),
+            properties=props,
+            alpha_bounds=_parse_alpha_bounds(props.get('alpha_bounds')),
+            occupancy=_parse_occupancy(props.get('occupancy')),
+            opaque=_parse_occupancy(props.get('opaque')),
+        )
+    return entries
+
+
+def _parse_alpha_bounds(value) -> Optional[Tuple[float, float, float, float]]:
+    try:
+        x0, y0, x1, y1 = (float(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    if not (0.0 <= x0 < x1 <= 1.0 and 0.0 <= y0 < y1 <= 1.0):
+        return None
+    return (x0, y0, x1, y1)
+
+
+def _parse_occupancy(value) -> Optional[Tuple[int, int]]:
+    """(bitmask, cells per axis) from the converter's hex string."""
+    if not isinstance(value, str) or not value:
+        return None
+    grid = math.isqrt(len(value) * 4)
+    if grid * grid != len(value) * 4:
+        return None
+    try:
+        return int(value, 16), grid
+    except ValueError:
+        return None
+
+
+def _fingerprint(*paths: Path) -> tuple:
+    """(mtime_ns, size) per input; directories change mtime when files are added/removed."""
+    key = [INDEX_VERSION]
+    for path in paths:
+        try:
+            st = os.stat(path)
+            key.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            key.append((str(path), None, None))
+    return tuple(key)
+
+
+def _read_index(index_path: Path, key: tuple) -> Optional[AssetCatalog]:
+    try:
+        with open(index_path, 'rb') as f:
+            stored_key, catalog = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.info("Ignoring unreadable asset index %s: %s", index_path, e)
+        return None
+    if stored_key != key or not isinstance(catalog, AssetCatalog):
+        return None
+    return catalog
+
+
+def _write_index(index_path: Path, key: tuple, catalog: AssetCatalog):
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, catalog), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.info("Could not write asset index %s: %s", index_path, e)
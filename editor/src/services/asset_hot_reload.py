@@ -0,0 +1,86 @@
+"""Pick up emblem and pattern textures re-baked by the converter's watch mode.
+
+`asset_converter.py --watch` converts only the DDS files that changed and
+appends each batch to hot_reload.json in the assets directory:
+
+    {"sequence": 7, "batches": [{"sequence": 7, "time": "...",
+                                 "files": ["ce_lion.dds", ...]}, ...]}
+
+AssetChangeMonitor.poll() is cheap enough for a GUI timer: it stats the
+log and only reads it when it changed. The editor then patches just those
+tiles in the live atlas (TextureResidency.reload) and refreshes the
+sidebar and layer thumbnails that show them (AssetMixin._apply_asset_changes).
+
+Usage:
+    monitor = AssetChangeMonitor(get_assets_dir())
+    changed = monitor.poll()   # [] nothing new, None everything may have changed
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+# Written by asset_converter/src/watch_mode.py
+from asset_converter.src.output_layout import CHANGE_LOG_FILENAME
+
+# How often the editor polls the change log
+POLL_INTERVAL_MS = 500
+
+
+class AssetChangeMonitor:
+    """Reports DDS filenames re-baked since the last poll."""
+
+    def __init__(self, assets_dir: Path):
+        """
+        Args:
+            assets_dir: ck3_assets directory (see path_resolver.get_assets_dir)
+        """
+        self.path = Path(assets_dir) / CHANGE_LOG_FILENAME
+        self._stat = None
+        self.sequence = 0
+        # Batches written before the editor started are already on disk
+        self.sequence = self._read_log()[0]
+
+    def poll(self) -> Optional[List[str]]:
+        """DDS filenames re-baked since the last poll.
+
+        Returns:
+            Unique filenames in batch order, [] if nothing changed, or None
+            when batches were missed (the log was trimmed or recreated) and
+            any texture may have changed
+        """
+        sequence, batches = self._read_log()
+        if sequence == self.sequence:
+            return []
+        previous, self.sequence = self.sequence, sequence
+
+        new_batches = [batch for batch in batches if batch.get('sequence', 0) > previous]
+        if sequence < previous or not new_batches or new_batches[0].get('sequence') != previous + 1:
+            return None
+        filenames = {}
+        for batch in new_batches:
+            filenames.update(dict.fromkeys(batch.get('files', ())))
+        return list(filenames)
+
+    def _read_log(self):
+        """(sequence, batches) from the change log; re-read only if its stat changed."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._stat = None
+            return 0, []
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key == self._stat:
+            return self.sequence, []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                log = json.load(f)
+        except (OSError, ValueError) as e:
+            # Retried on the next poll
+            print(f"Warning: could not read {self.path}: {e}")
+            return self.sequence, []
+        if not isinstance(log, dict) or not isinstance(log.get('batches'), list):
+            return self.sequence, []
+        self._stat = stat_key
+        return int(log.get('sequence', 0)), log['batches']
@@ -0,0 +1,194 @@
+"""Per-instance draw data for batched emblem rendering.
+
+The per-layer path (CanvasRenderingMixin._render_emblem_layers) binds an
+atlas page, looks up tile and color uniforms and issues one draw per
+instance. With every tile in a GL_TEXTURE_2D_ARRAY, everything that varies
+per draw fits in a per-instance vertex attribute record instead, so a whole
+CoA - all layers, all instances, symmetry mirrors included - is drawn with
+one glDrawElementsInstanced per texture array run (normally one).
+
+This module builds that attribute buffer on the CPU and has no GL calls.
+It also owns the instance transform math and symmetry expansion shared
+with the per-layer path, so the two cannot drift apart.
+
+Record layout (float32, see INSTANCE_FIELDS):
+    position (2)   centre offset from the RTT centre in pixels, Y up
+    scale (2)      full size in pixels, negative = flipped
+    rotation (1)   radians, counter-clockwise
+    layer (1)      texture array layer of the emblem tile
+    pattern_flag (1), selection_tint (1)
+    primary, secondary, tertiary (3 each)   layer colors, 0-1
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Canonical RTT framebuffer edge (quad.vert screenRes); the canvas may
+# render at another size (services/rtt_resolution.py) and passes rtt_size
+RTT_SIZE = 512.0
+
+INSTANCE_FIELDS = (
+    ('position', 2),
+    ('scale', 2),
+    ('rotation', 1),
+    ('layer', 1),
+    ('pattern_flag', 1),
+    ('selection_tint', 1),
+    ('primary', 3),
+    ('secondary', 3),
+    ('tertiary', 3),
+)
+INSTANCE_FLOATS = sum(size for _, size in INSTANCE_FIELDS)
+INSTANCE_STRIDE = INSTANCE_FLOATS * 4
+
+# Float offset of each field within a record
+FIELD_OFFSETS = {}
+_offset = 0
+for _name, _size in INSTANCE_FIELDS:
+    FIELD_OFFSETS[_name] = _offset
+    _offset += _size
+del _offset, _name, _size
+
+
+def pattern_flag_from_mask(mask) -> int:
+    """Pattern flag from a layer mask.
+
+    Args:
+        mask: List of mask channel values [r, g, b] or None
+
+    Returns:
+        int: Bitmask where bit 0=red, bit 1=green, bit 2=blue
+    """
+    if not isinstance(mask, (list, tuple)):
+        return 0
+    pattern_flag = 0
+    for bit, value in enumerate(mask[:3]):
+        if value != 0:
+            pattern_flag |= 1 << bit
+    return pattern_flag
+
+
+def instance_transform_px(instance, rtt_size: float = RTT_SIZE) -> Tuple[float, float, float, float, float]:
+    """RTT-space transform of an instance, as quad.vert/emblem.vert take it.
+
+    Args:
+        instance: Object with pos, scale, rotation, flip_x, flip_y
+        rtt_size: Edge length of the RTT being rendered, in pixels
+
+    Returns:
+        (center_x, center_y, scale_x, scale_y, rotation_rad) in pixels
+    """
+    # CoA space (0-1, Y down) to pixels from the RTT centre (Y up)
+    center_x_px = (instance.pos.x - 0.5) * rtt_size
+    center_y_px = -(instance.pos.y - 0.5) * rtt_size
+
+    # Scale is in CoA coordinates (0-1 range = full width/height)
+    scale_x_px = instance.scale.x * rtt_size
+    scale_y_px = instance.scale.y * rtt_size
+
+    # Negate rotation: CK3 uses Y-down (clockwise positive), OpenGL uses Y-up (counterclockwise positive)
+    rotation_rad = math.radians(-instance.rotation)
+
+    # Apply per-instance flip via negative scale
+    if instance.flip_x:
+        scale_x_px = -scale_x_px
+    if instance.flip_y:
+        scale_y_px = -scale_y_px
+    return center_x_px, center_y_px, scale_x_px, scale_y_px, rotation_rad
+
+
+def iter_layer_instances(coa, layer_uuid) -> Iterator:
+    """Yield every drawn instance of a layer, symmetry mirrors included.
+
+    Each seed instance is followed by its mirrors (when the layer has a
+    symmetry transform), in draw order.
+
+    Args:
+        coa: CoA model instance
+        layer_uuid: UUID of the layer
+
+    Yields:
+        Transforms with pos, scale, rotation, flip_x, flip_y
+    """
+    return iter(coa.get_layer_drawn_instances(layer_uuid))
+
+
+@dataclass
+class EmblemBatch:
+    """Instance records for one CoA plus the draw runs over them.
+
+    Attributes:
+        data: (N, INSTANCE_FLOATS) float32 records in draw order
+        runs: (array_idx, first, count) - consecutive records whose tiles
+            live in the same texture array; one instanced draw each
+    """
+    data: np.ndarray
+    runs: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @property
+    def instance_count(self) -> int:
+        return len(self.data)
+
+
+def build_emblem_batch(coa, layer_map: Dict[str, Tuple[int, int]],
+                       is_tinted: Optional[Callable[[str], bool]] = None,
+                       rtt_size: float = RTT_SIZE,
+                       layer_instances: Optional[Dict[str, list]] = None) -> EmblemBatch:
+    """Flatten a CoA's visible layers into instance records.
+
+    Layers that are hidden, have no texture or whose texture is not in
+    layer_map are skipped, as in the per-layer path.
+
+    Args:
+        coa: CoA model instance
+        layer_map: Texture key -> (array_idx, layer), see TextureLoader.load_texture_arrays
+        is_tinted: Optional callable(layer_uuid) -> True to apply the selection tint
+        rtt_size: Edge length of the RTT being rendered, in pixels
+        layer_instances: Optional layer uuid -> instances to draw (see
+            emblem_culling.cull_emblem_instances); layers missing from it
+            are skipped. None draws every instance of every visible layer.
+
+    Returns:
+        EmblemBatch
+    """
+    records = []
+    runs = []
+    for layer_uuid in coa.get_all_layer_uuids():
+        if not coa.get_layer_visible(layer_uuid):
+            continue
+        slot = layer_map.get(coa.get_layer_filename(layer_uuid) or "")
+        if slot is None:
+            continue
+        array_idx, layer = slot
+
+        colors = []
+        for index in (1, 2, 3):
+            color = coa.get_layer_color(layer_uuid, index)
+            colors.extend((color.r / 255.0, color.g / 255.0, color.b / 255.0))
+        shared = (
+            float(layer),
+            float(pattern_flag_from_mask(coa.get_layer_mask(layer_uuid))),
+            1.0 if is_tinted and is_tinted(layer_uuid) else 0.0,
+            *colors,
+        )
+
+        first = len(records)
+        if layer_instances is None:
+            instances = iter_layer_instances(coa, layer_uuid)
+        else:
+            instances = layer_instances.get(layer_uuid, ())
+        for instance in instances:
+            records.append(instance_transform_px(instance, rtt_size) + shared)
+        count = len(records) - first
+        if not count:
+            continue
+        if runs and runs[-1][0] == array_idx:
+            runs[-1] = (array_idx, runs[-1][1], runs[-1][2] + count)
+        else:
+            runs.append((array_idx, first, count))
+
+    data = np.array(records, dtype=np.float32).reshape(-1, INSTANCE_FLOATS)
+    return EmblemBatch(data, runs)
@@ -0,0 +1,119 @@
+"""Skip emblem instances that cannot change a pixel of the CoA render.
+
+Imported game CoAs often stack full-coverage emblems, and symmetry or
+careless dragging leaves instances far outside the shield. Both render
+paths used to draw every visible instance anyway. cull_emblem_instances()
+runs before drawing and drops instances that are:
+
+- off canvas: the box around everything they can draw lies outside the
+  0-1 CoA square (the RTT viewport)
+- occluded: that box lies inside the opaque area of a single instance
+  drawn later, so every pixel they touch is overwritten
+
+Both tests are conservative, so the output stays pixel-identical. The
+boxes come from the CoA model (CoA.get_layer_instance_boxes), which maps
+instances exactly as the emblem shaders draw them, around the emblem's
+alpha bounds, with one texel of bilinear filtering margin (emblem
+textures are sampled without mipmaps) and one RTT pixel of rasterization
+margin. Occluders also need an unmasked layer (pattern masks lower the
+alpha) and a rotation that is a multiple of 90 degrees.
+
+This module has no GL calls and no geometry; it only keeps the occluder
+list.
+
+Usage:
+    result = cull_emblem_instances(coa, is_drawn, rtt_size)
+    for layer_uuid, instances in result.layers.items():
+        ...
+    profiler.count_instances(result.total, result.culled)
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from services.emblem_batch import RTT_SIZE, pattern_flag_from_mask
+
+# Emblem tiles are 256x256 (asset_catalog.ATLAS_TILE_SIZE), sampled GL_LINEAR
+TEXEL = 1.0 / 256.0
+
+# Occluders kept for testing (largest first); a few cover the common cases
+MAX_OCCLUDERS = 8
+
+Box = Tuple[float, float, float, float]
+
+
+@dataclass
+class CullResult:
+    """Instances left to draw after culling.
+
+    Attributes:
+        layers: Layer uuid -> [instance, ...] to draw, in draw order;
+            layers with nothing left are omitted
+        total: Instances considered (visible, drawable layers)
+        culled: Instances dropped
+        off_canvas: Of those, dropped for lying outside the CoA
+    """
+    layers: Dict[str, list] = field(default_factory=dict)
+    total: int = 0
+    culled: int = 0
+    off_canvas: int = 0
+
+
+def cull_emblem_instances(coa, is_drawn: Callable[[str], bool],
+                          rtt_size: float = RTT_SIZE) -> CullResult:
+    """Drop instances that cannot contribute a pixel.
+
+    Args:
+        coa: CoA model instance
+        is_drawn: callable(layer_uuid) -> True if the renderer will draw the
+            layer (texture resident etc.); hidden layers are skipped anyway
+        rtt_size: Edge length of the RTT being rendered, in pixels
+
+    Returns:
+        CullResult
+    """
+    pixel = 1.0 / rtt_size
+    draws = []  # (layer index, instance, drawn box, opaque box or None)
+    layer_uuids = []
+    for layer_uuid in coa.get_all_layer_uuids():
+        if not coa.get_layer_visible(layer_uuid) or not is_drawn(layer_uuid):
+            continue
+        # Pattern masks scale the emblem's alpha, so masked layers never occlude
+        unmasked = pattern_flag_from_mask(coa.get_layer_mask(layer_uuid)) & 7 in (0, 7)
+        index = len(layer_uuids)
+        layer_uuids.append(layer_uuid)
+        for instance, box, opaque in coa.get_layer_instance_boxes(layer_uuid, TEXEL, pixel, opaque=unmasked):
+            draws.append((index, instance, box, opaque))
+
+    result = CullResult(total=len(draws))
+    keep = [False] * len(draws)
+    occluders: List[Box] = []
+    # Top-down: an instance can only be hidden by instances drawn after it
+    for i in range(len(draws) - 1, -1, -1):
+        _, _, box, opaque = draws[i]
+        clipped = (max(box[0], 0.0), max(box[1], 0.0), min(box[2], 1.0), min(box[3], 1.0))
+        if clipped[0] >= clipped[2] or clipped[1] >= clipped[3]:
+            result.off_canvas += 1
+            continue
+        if any(_inside(clipped, occluder) for occluder in occluders):
+            continue
+        keep[i] = True
+        if opaque is not None:
+            occluders.append(opaque)
+            occluders.sort(key=_area, reverse=True)
+            del occluders[MAX_OCCLUDERS:]
+
+    result.culled = result.total - sum(keep)
+    for i, (index, instance, _, _) in enumerate(draws):
+        if not keep[i]:
+            continue
+        result.layers.setdefault(layer_uuids[index], []).append(instance)
+    return result
+
+
+def _inside(box: Box, outer: Box) -> bool:
+    return outer[0] <= box[0] and outer[1] <= box[1] and box[2] <= outer[2] and box[3] <= outer[3]
+
+
+def _area(box: Box) -> float:
+    return (min(box[2], 1.0) - max(box[0], 0.0)) * (min(box[3], 1.0) - max(box[1], 0.0))
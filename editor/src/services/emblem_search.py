@@ -0,0 +1,333 @@
+"""Full-text and faceted search over converted emblems.
+
+The asset converter writes coa_emblems/metadata/emblem_search.db
+(asset_converter/src/search_index.py, which owns the layout): an SQLite
+FTS5 trigram index over emblem filenames, categories and source mods,
+with category, color count and source as facet columns. The sidebar runs
+a query per keystroke, so the database is copied into memory on load and
+every query is a single indexed SELECT - a few milliseconds for 20k
+emblems.
+
+This module only reads that database. When it cannot be used - older
+conversions without it, another schema version, or an SQLite build
+without the trigram tokenizer (< 3.34) - SubstringEmblemSearch answers
+the same queries with a plain in-memory substring filter.
+
+Query syntax (free text plus optional facets, all case-insensitive):
+    lion                  substring of filename, category or source mod
+    lion cross            both terms must match
+    category:animals      exact category
+    colors:2              exact color count
+    mod:heraldry          substring of the source mod name
+
+Usage:
+    from services.emblem_search import get_search_index
+    filenames = get_search_index().search("lion colors:2")
+"""
+
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Layout version this reader understands (search_index.SCHEMA_VERSION)
+SCHEMA_VERSION = 1
+INDEX_FILENAME = "emblem_search.db"
+
+_ROW_QUERY = "SELECT filename, category, colors, source, visible FROM emblems"
+
+# Trigram tokenizer cannot match shorter terms; those fall back to LIKE
+_MIN_FTS_TERM = 3
+
+_FACET_ALIASES = {
+    'category': 'category', 'cat': 'category',
+    'colors': 'colors', 'colours': 'colors', 'color': 'colors',
+    'mod': 'source', 'source': 'source',
+}
+
+
+def parse_query(text: str) -> Tuple[List[str], Dict[str, str]]:
+    """Split a query into free-text terms and facet filters.
+
+    Args:
+        text: Raw search box text
+
+    Returns:
+        (terms, facets) where facets maps 'category'/'colors'/'source' to a value
+    """
+    terms = []
+    facets = {}
+    for token in (text or '').split():
+        key, sep, value = token.partition(':')
+        facet = _FACET_ALIASES.get(key.lower()) if sep else None
+        if facet and value:
+            facets[facet] = value
+        elif not (facet and not value):  # drop half-typed "colors:"
+            terms.append(token)
+    return terms, facets
+
+
+def _resolve_query(text, category, colors, source) -> Tuple[List[str], Dict[str, object]]:
+    """parse_query() with explicit facet arguments taking precedence."""
+    terms, facets = parse_query(text)
+    if category is not None:
+        facets['category'] = category
+    if colors is not None:
+        facets['colors'] = colors
+    if source is not None:
+        facets['source'] = source
+    return terms, facets
+
+
+class EmblemSearchIndex:
+    """In-memory copy of the converter's SQLite emblem index (see module docstring)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._fallback = None  # SubstringEmblemSearch once FTS queries fail
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def open(cls, db_path: Path):
+        """Copy a converter-built database into memory.
+
+        Returns:
+            EmblemSearchIndex; SubstringEmblemSearch over the database rows
+            if its full-text table is missing or unusable here; None if the
+            file is missing, unreadable or another schema
+        """
+        db_path = Path(db_path)
+        if not db_path.is_file():
+            return None
+        try:
+            source = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+            try:
+                if source.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    logger.info("Ignoring emblem search index with old schema: %s", db_path)
+                    return None
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+                source.backup(conn)
+            finally:
+                source.close()
+            rows = conn.execute(_ROW_QUERY).fetchall()
+        except sqlite3.Error as e:
+            logger.info("Ignoring unreadable emblem search index %s: %s", db_path, e)
+            return None
+        try:
+            # Fails without the table, or without the trigram tokenizer (SQLite < 3.34)
+            conn.execute("SELECT rowid FROM emblems_fts WHERE emblems_fts MATCH 'abc' LIMIT 1").fetchall()
+        except sqlite3.Error as e:
+            logger.info("Emblem full-text search unavailable, using substring search: %s", e)
+            conn.close()
+            return SubstringEmblemSearch(rows)
+        return cls(conn)
+
+    @classmethod
+    def load(cls, assets_dir: Path = None):
+        """Prebuilt index from assets_dir, else a substring search over the asset catalog."""
+        from utils.path_resolver import get_assets_dir, get_emblem_metadata_path
+        from services.asset_catalog import AssetCatalog, get_catalog
+
+        shared = assets_dir is None
+        assets_dir = get_assets_dir() if shared else Path(assets_dir)
+
+        index = cls.open(get_emblem_metadata_path(assets_dir).parent / INDEX_FILENAME)
+        if index is None:
+            catalog = get_catalog() if shared else AssetCatalog.load(assets_dir)
+            index = SubstringEmblemSearch.from_catalog(catalog)
+        return index
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, text: str = '', category: str = None, colors: int = None,
+               source: str = None, limit: int = None, include_hidden: bool = False) -> List[str]:
+        """Emblem filenames (.dds) matching a query, sorted by filename.
+
+        Args:
+            text: Free text, may contain facet tokens (see parse_query)
+            category: Exact category (case-insensitive); overrides a category: token
+            colors: Exact color count; overrides a colors: token
+            source: Source mod substring; overrides a mod: token
+            limit: Maximum number of results
+            include_hidden: Also return emblems marked visible = no
+        """
+        if self._fallback is not None:
+            return self._fallback.search(text, category, colors, source, limit, include_hidden)
+        terms, facets = _resolve_query(text, category, colors, source)
+
+        where = []
+        params = []
+        if not include_hidden:
+            where.append("e.visible = 1")
+
+        fts_terms = [t for t in terms if len(t) >= _MIN_FTS_TERM]
+        if fts_terms:
+            where.append("e.id IN (SELECT rowid FROM emblems_fts WHERE emblems_fts MATCH ?)")
+            params.append(' AND '.join('"' + t.replace('"', '""') + '"' for t in fts_terms))
+        for term in terms:
+            if len(term) < _MIN_FTS_TERM:
+                where.append("(e.filename LIKE ? ESCAPE '\\' OR e.category LIKE ? ESCAPE '\\' "
+                             "OR e.source LIKE ? ESCAPE '\\')")
+                params.extend([_like_pattern(term)] * 3)
+
+        if 'category' in facets:
+            where.append("e.category = ? COLLATE NOCASE")
+            params.append(facets['category'])
+        if 'colors' in facets:
+            try:
+                params.append(int(facets['colors']))
+            except (TypeError, ValueError):
+                return []
+            where.append("e.colors = ?")
+        if 'source' in facets:
+            where.append("e.source LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(facets['source']))
+
+        sql = "SELECT e.filename FROM emblems e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.filename"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        try:
+            return [row[0] for row in self._conn.execute(sql, params)]
+        except sqlite3.OperationalError as e:
+            logger.warning("Emblem full-text search failed, using substring search: %s", e)
+            self._fallback = SubstringEmblemSearch(self._conn.execute(_ROW_QUERY).fetchall())
+            return self._fallback.search(text, category, colors, source, limit, include_hidden)
+
+    def facets(self, include_hidden: bool = False) -> Dict[str, Counter]:
+        """Emblem counts per category, color count and source mod."""
+        visible = "" if include_hidden else " WHERE visible = 1"
+        result = {}
+        for column in ('category', 'colors', 'source'):
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*) FROM emblems{visible} GROUP BY {column}"
+            )
+            result[column] = Counter(dict(rows))
+        return result
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM emblems").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+class SubstringEmblemSearch:
+    """Same queries as EmblemSearchIndex, as a plain filter over rows in memory.
+
+    Used when the converter's database is missing or its full-text table
+    cannot be used.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str, int, str, int]]):
+        """
+        Args:
+            rows: (filename, category, colors, source, visible) per emblem
+        """
+        self._rows = sorted(rows)
+        self._haystacks = [
+            f"{filename}\n{category}\n{source}".casefold()
+            for filename, category, _, source, _ in self._rows
+        ]
+
+    @classmethod
+    def from_catalog(cls, catalog) -> 'SubstringEmblemSearch':
+        """Rows from the asset catalog's emblems (entries with a source PNG)."""
+        rows = []
+        for entry in catalog.emblems.values():
+            rows.append((
+                entry.filename,
+                str(entry.category or ''),
+                int(entry.colors or 1),
+                str(entry.properties.get('_source') or 'Base Game'),
+                0 if entry.visible is False else 1,
+            ))
+        return cls(rows)
+
+    def search(self, text: str = '', category: str = None, colors: int = None,
+               source: str = None, limit: int = None, include_hidden: bool = False) -> List[str]:
+        """See EmblemSearchIndex.search()."""
+        terms, facets = _resolve_query(text, category, colors, source)
+        needles = [term.casefold() for term in terms]
+        want_category = str(facets['category']).casefold() if 'category' in facets else None
+        want_source = str(facets['source']).casefold() if 'source' in facets else None
+        want_colors = None
+        if 'colors' in facets:
+            try:
+                want_colors = int(facets['colors'])
+            except (TypeError, ValueError):
+                return []
+
+        results = []
+        for row, haystack in zip(self._rows, self._haystacks):
+            filename, row_category, row_colors, row_source, visible = row
+            if not visible and not include_hidden:
+                continue
+            if want_category is not None and row_category.casefold() != want_category:
+                continue
+            if want_colors is not None and row_colors != want_colors:
+                continue
+            if want_source is not None and want_source not in row_source.casefold():
+                continue
+            if all(needle in haystack for needle in needles):
+                results.append(filename)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def facets(self, include_hidden: bool = False) -> Dict[str, Counter]:
+        """Emblem counts per category, color count and source mod."""
+        rows = [row for row in self._rows if include_hidden or row[4]]
+        return {
+            'category': Counter(row[1] for row in rows),
+            'colors': Counter(row[2] for row in rows),
+            'source': Counter(row[3] for row in rows),
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def close(self):
+        pass
+
+
+def _like_pattern(term: str) -> str:
+    escaped = str(term).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Process-wide instance
+# ══════════════════════════════════════════════════════════════════════════
+
+_INDEX = None  # EmblemSearchIndex or SubstringEmblemSearch
+_INDEX_LOCK = threading.Lock()
+
+
+def get_search_index():
+    """Shared search index, loaded on first use (e.g. by a startup worker)."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = EmblemSearchIndex.load()
+        return _INDEX
+
+
+def clear_search_index():
+    """Forget the shared index (next get_search_index() reloads)."""
+    global _INDEX
+    if _INDEX is not None:
+        _INDEX.close()
+    _INDEX = None
@@ -0,0 +1,122 @@
+"""Coalesce high-rate input into at most one update per displayed frame.
+
+Transform-widget drags emit transformChanged on every mouse move, and a
+1000 Hz mouse produces many moves per display frame. Applying each one
+mutates the CoA model and schedules a repaint, most of which is never
+seen. FrameCoalescer keeps only the latest submitted state and applies it
+once per frame:
+
+- The first submit() after an idle period is applied at once, so a drag
+  starts without latency
+- Later submits only replace the pending state until the next frame: the
+  canvas' frameSwapped signal (emitted after each buffer swap, so aligned
+  to vsync) or, if no frame is presented, a fallback timer at the display
+  refresh interval
+- flush() applies the pending state synchronously, e.g. on drag end, so
+  the final position is never dropped
+
+Usage:
+    coalescer = FrameCoalescer(apply_transform, frame_signal=canvas.frameSwapped)
+    transform_widget.transformChanged.connect(coalescer.submit)
+    # on drag end:
+    coalescer.flush()
+"""
+
+from typing import Callable
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+from PyQt5.QtGui import QGuiApplication
+
+# Used when the refresh rate cannot be queried
+DEFAULT_REFRESH_HZ = 60.0
+
+_NOTHING = object()
+
+
+def frame_interval_ms(widget=None) -> int:
+    """Display refresh interval in whole milliseconds (at least 1).
+
+    Args:
+        widget: Widget whose screen to use (primary screen if None or unknown)
+    """
+    screen = None
+    if widget is not None:
+        handle = widget.window().windowHandle()
+        screen = handle.screen() if handle is not None else None
+    if screen is None:
+        screen = QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0.0
+    if not rate or rate <= 0:
+        rate = DEFAULT_REFRESH_HZ
+    return max(1, int(1000.0 / rate))
+
+
+class FrameCoalescer(QObject):
+    """Applies the latest submitted state at most once per frame."""
+
+    def __init__(self, apply: Callable[[object], None], frame_signal=None,
+                 interval_ms: int = None, parent=None):
+        """
+        Args:
+            apply: Called with a submitted state (on the GUI thread)
+            frame_signal: Optional signal emitted once per presented frame
+                (QOpenGLWidget.frameSwapped)
+            interval_ms: Fallback frame interval (default: primary screen refresh)
+            parent: Qt parent
+        """
+        super().__init__(parent)
+        self._apply = apply
+        self._pending = _NOTHING
+        self._awaiting_frame = False
+        self.interval_ms = interval_ms or frame_interval_ms()
+        self.submitted = 0
+        self.applied = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_frame)
+        if frame_signal is not None:
+            frame_signal.connect(self._on_frame)
+
+    @property
+    def has_pending(self) -> bool:
+        """True while a submitted state waits for the next frame."""
+        return self._pending is not _NOTHING
+
+    def submit(self, state):
+        """Queue a state; replaces any state not applied yet."""
+        self.submitted += 1
+        self._pending = state
+        if not self._awaiting_frame:
+            self._apply_pending()
+
+    def flush(self):
+        """Apply the pending state now (if any) and end frame pacing."""
+        self._timer.stop()
+        self._awaiting_frame = False
+        if self.has_pending:
+            state, self._pending = self._pending, _NOTHING
+            self.applied += 1
+            self._apply(state)
+
+    def cancel(self):
+        """Drop the pending state without applying it."""
+        self._timer.stop()
+        self._awaiting_frame = False
+        self._pending = _NOTHING
+
+    def _apply_pending(self):
+        state, self._pending = self._pending, _NOTHING
+        self._awaiting_frame = True
+        self._timer.start(self.interval_ms)
+        self.applied += 1
+        self._apply(state)
+
+    def _on_frame(self):
+        if not self._awaiting_frame:
+            return
+        self._timer.stop()
+        self._awaiting_frame = False
+        if self.has_pending:
+            self._apply_pending()
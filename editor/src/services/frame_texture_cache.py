@@ -0,0 +1,207 @@
+"""Lazily loaded frame and preview-overlay textures with a bounded LRU.
+
+The canvas used to decode and upload every house frame and mask, every
+realm frame, mask and shadow, and every crown strip, title frame and
+topframe size at startup, though a session typically shows one frame
+and one preview government.
+
+FrameTextureCache keeps only the source paths up front. Each canvas
+attribute (frameTextures, realm_frame_masks, crown_strips, ...) becomes a
+FrameTextureView, which reads like the dict it replaces:
+
+    key in view         a source is registered for key
+    view.get(key)       GL texture id, decoded and uploaded on first use
+                        (GL context must be current), or None
+
+At most `capacity` textures stay on the GPU; the least recently used is
+deleted first. prefetch() decodes sources on a worker thread so the
+later get() only uploads.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, Iterable, Optional, Tuple
+
+import OpenGL.GL as gl
+
+from services.texture_loader import TextureLoader
+
+DEFAULT_CAPACITY = 32
+
+
+def neighbour_keys(keys, key, radius: int = 1) -> list:
+    """key followed by the keys within radius of it in keys (nearest first).
+
+    Args:
+        keys: Ordered keys, e.g. frames in menu order
+        key: Selected key; if absent from keys only [key] is returned
+
+    Returns:
+        List starting with key
+    """
+    keys = list(keys)
+    if key not in keys:
+        return [key]
+    index = keys.index(key)
+    result = [key]
+    for offset in range(1, radius + 1):
+        for i in (index - offset, index + offset):
+            if 0 <= i < len(keys):
+                result.append(keys[i])
+    return result
+
+
+class FrameTextureCache:
+    """Bounded LRU of frame/overlay GL textures, loaded on first request."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: GL textures kept alive across all views
+        """
+        self.capacity = max(1, int(capacity))
+        self.loads = 0
+        self.evictions = 0
+
+        self._sources = {}  # (attribute, key) -> (path, resize, upload_kwargs)
+        self._keys = {}  # attribute -> {key: None} in registration order
+        self._textures = OrderedDict()  # (attribute, key) -> texture id, least recent first
+        self._decoded = OrderedDict()  # (attribute, key) -> Future from prefetch()
+        self._failed = set()
+        self._executor = None
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def add_source(self, attribute: str, key: Hashable, path, resize=None, **upload_kwargs):
+        """Register a texture without loading it.
+
+        Args:
+            attribute: View name (the canvas attribute), e.g. 'frameTextures'
+            key: Key within the view
+            path: Image file
+            resize: Optional (width, height) applied on decode
+            **upload_kwargs: Passed to TextureLoader.upload_texture
+        """
+        entry = (attribute, key)
+        self._sources[entry] = (path, resize, upload_kwargs)
+        self._keys.setdefault(attribute, {})[key] = None
+        self._failed.discard(entry)
+
+    def view(self, attribute: str) -> 'FrameTextureView':
+        return FrameTextureView(self, attribute)
+
+    def has(self, attribute: str, key: Hashable) -> bool:
+        return (attribute, key) in self._sources
+
+    def keys(self, attribute: str):
+        return self._keys.get(attribute, {}).keys()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def is_resident(self, attribute: str, key: Hashable) -> bool:
+        return (attribute, key) in self._textures
+
+    def get(self, attribute: str, key: Hashable) -> Optional[int]:
+        """Texture id for a source, loading it if needed (GL context must be current).
+
+        Returns:
+            GL texture id, or None if there is no such source or it failed to load
+        """
+        entry = (attribute, key)
+        texture_id = self._textures.get(entry)
+        if texture_id is not None:
+            self._textures.move_to_end(entry)
+            return texture_id
+        if entry not in self._sources or entry in self._failed:
+            return None
+
+        path, resize, upload_kwargs = self._sources[entry]
+        try:
+            future = self._decoded.pop(entry, None)
+            img_data = future.result() if future else TextureLoader.decode_image(path, resize)
+            texture_id = TextureLoader.upload_texture(img_data, **upload_kwargs)
+        except Exception as e:
+            print(f"Error loading texture from {path}: {e}")
+            texture_id = None
+        if not texture_id:
+            self._failed.add(entry)
+            return None
+
+        self._textures[entry] = texture_id
+        self.loads += 1
+        while len(self._textures) > self.capacity:
+            _, evicted = self._textures.popitem(last=False)
+            gl.glDeleteTextures([evicted])
+            self.evictions += 1
+        return texture_id
+
+    def prefetch(self, entries: Iterable[Tuple[str, Hashable]]):
+        """Decode sources on a worker thread so a later get() only uploads.
+
+        Resident, failed, unknown and already queued entries are skipped.
+        At most `capacity` decoded images are held; the oldest are dropped.
+
+        Args:
+            entries: (attribute, key) pairs
+        """
+        for entry in entries:
+            if (entry not in self._sources or entry in self._textures
+                    or entry in self._decoded or entry in self._failed):
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-prefetch")
+            path, resize, _ = self._sources[entry]
+            self._decoded[entry] = self._executor.submit(TextureLoader.decode_image, path, resize)
+            while len(self._decoded) > self.capacity:
+                self._decoded.popitem(last=False)[1].cancel()
+
+    def release(self):
+        """Delete every loaded texture and drop pending decodes (sources are kept)."""
+        if self._textures:
+            gl.glDeleteTextures(list(self._textures.values()))
+        self._textures.clear()
+        for future in self._decoded.values():
+            future.cancel()
+        self._decoded.clear()
+        self._failed.clear()
+
+    def shutdown(self):
+        """release() and stop the prefetch worker."""
+        self.release()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class FrameTextureView:
+    """Dict-like view of one attribute's textures in a FrameTextureCache."""
+
+    def __init__(self, cache: FrameTextureCache, attribute: str):
+        self._cache = cache
+        self.attribute = attribute
+
+    def __contains__(self, key) -> bool:
+        return self._cache.has(self.attribute, key)
+
+    def __iter__(self):
+        return iter(list(self._cache.keys(self.attribute)))
+
+    def __len__(self) -> int:
+        return len(self._cache.keys(self.attribute))
+
+    def keys(self):
+        return self._cache.keys(self.attribute)
+
+    def get(self, key, default=None):
+        texture_id = self._cache.get(self.attribute, key)
+        return default if texture_id is None else texture_id
+
+    def __getitem__(self, key) -> int:
+        texture_id = self._cache.get(self.attribute, key)
+        if texture_id is None:
+            raise KeyError(key)
+        return texture_id
@@ -16,6 +16,9 @@ Benefits:
 - Consistent mask coordinate space (always 0.0-1.0)
 - Clean separation between CoA rendering and viewport display
 - High-quality rendering independent of viewport size
+
+The canvas resizes its RTT with the on-screen CoA size
+(services/rtt_resolution.py); 512×512 stays the canonical and default size.
 """
 
 from OpenGL.GL import *
@@ -25,19 +28,26 @@ class FramebufferRTT:
     """
     Manages an offscreen framebuffer for render-to-texture operations.
     
-    The framebuffer contains a single RGBA texture at canonical CoA resolution
-    (512×512 pixels = 2× mask resolution for quality).
+    The framebuffer contains a single RGBA texture, by default at canonical
+    CoA resolution (512×512 pixels = 2× mask resolution for quality).
+    width/height hold the current size; see resize().
     """
     
     # Canonical CoA resolution (2× mask texture resolution for quality)
     COA_RTT_WIDTH = 512
     COA_RTT_HEIGHT = 512
     
-    def __init__(self):
-        """Initialize framebuffer (lazy - actual creation on first use)."""
+    def __init__(self, size=None):
+        """Initialize framebuffer (lazy - actual creation on first use).
+        
+        Args:
+            size: Square edge length in pixels (default: COA_RTT_WIDTH)
+        """
         self.fbo = None
         self.texture = None
         self.initialized = False
+        self.width = size or self.COA_RTT_WIDTH
+        self.height = size or self.COA_RTT_HEIGHT
     
     def initialize(self):
         """Create framebuffer and texture attachment."""
@@ -52,12 +62,8 @@ class FramebufferRTT:
         self.texture = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         
-        # Allocate texture storage (RGBA8, 512×512)
-        glTexImage2D(
-            GL_TEXTURE_2D, 0, GL_RGBA8,
-            self.COA_RTT_WIDTH, self.COA_RTT_HEIGHT, 0,
-            GL_RGBA, GL_UNSIGNED_BYTE, None
-        )
+        # Allocate texture storage (RGBA8)
+        self._allocate_storage()
         
         # Texture parameters (no mipmaps, linear filtering for quality)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -97,7 +103,37 @@ class FramebufferRTT:
             self.initialize()
         
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
-        glViewport(0, 0, self.COA_RTT_WIDTH, self.COA_RTT_HEIGHT)
+        glViewport(0, 0, self.width, self.height)
+    
+    def resize(self, size):
+        """
+        Change the square texture size, keeping the framebuffer and texture ids.
+        
+        Args:
+            size: New edge length in pixels
+        
+        Returns:
+            bool: True if the storage was reallocated
+        
+        Contents are undefined afterwards; the caller re-renders.
+        """
+        if (size, size) == (self.width, self.height):
+            return False
+        self.width = self.height = size
+        if not self.initialized:
+            return False
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        self._allocate_storage()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return True
+    
+    def _allocate_storage(self):
+        """(Re)allocate RGBA8 storage for the bound texture at the current size."""
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, GL_RGBA8,
+            self.width, self.height, 0,
+            GL_RGBA, GL_UNSIGNED_BYTE, None
+        )
     
     def unbind(self, default_fbo=0):
         """
@@ -5,6 +5,8 @@ Uses QOffscreenSurface for headless GL context, then reuses the same shader
 pipeline as the interactive editor (CanvasRenderingMixin).
 
 Output is the raw RTT framebuffer: pattern + emblems only, no frame compositing.
+export_previews() additionally renders government/title preview variants
+through the editor's preview pipeline (CanvasPreviewMixin).
 """
 
 import sys
@@ -23,19 +25,25 @@ from PyQt5.QtGui import QOffscreenSurface
 from models.coa import CoA
 from models.color import Color
 from services.texture_loader import TextureLoader
+from services.texture_residency import TextureResidency, coa_texture_keys
 from services.framebuffer_rtt import FramebufferRTT
+from services.preview_export import DEFAULT_EXPORT_SIZE, DEFAULT_POOL_SIZE
 from components.canvas_widgets.shader_manager import ShaderManager
 from components.canvas_widgets.canvas_rendering_mixin import CanvasRenderingMixin
+from components.canvas_widgets.canvas_preview_mixin import CanvasPreviewMixin
+from components.canvas_widgets.canvas_texture_loader_mixin import CanvasTextureLoaderMixin
+from services.render_cache import stat_stamp, tree_digest
+from services.asset_hot_reload import CHANGE_LOG_FILENAME
 from utils.path_resolver import (
-    get_pattern_metadata_path, get_emblem_metadata_path,
-    get_pattern_source_dir, get_emblem_source_dir
+    get_assets_dir, get_shader_dir, get_pattern_metadata_path, get_emblem_metadata_path,
+    get_pattern_atlas_dir, get_emblem_atlas_dir, get_pattern_source_dir, get_emblem_source_dir,
 )
 from constants import DEFAULT_BASE_COLOR1, DEFAULT_BASE_COLOR2, DEFAULT_BASE_COLOR3
 
 logger = logging.getLogger(__name__)
 
 
-class HeadlessRenderer(CanvasRenderingMixin):
+class HeadlessRenderer(CanvasRenderingMixin, CanvasPreviewMixin, CanvasTextureLoaderMixin):
     """Offscreen renderer that produces raw CoA textures as PNG files.
 
     Inherits CanvasRenderingMixin to reuse the exact same shader uniform
@@ -45,13 +53,32 @@ class HeadlessRenderer(CanvasRenderingMixin):
     Provides the self.* attributes the mixin expects:
         base_shader, design_shader, vao, base_texture, base_colors,
         texture_uv_map, texture_atlases, default_mask_texture
+
+    By default texture_uv_map is a TextureResidency: only the textures a
+    CoA uses are loaded, prefetched before each render, so boot time does
+    not grow with the asset catalog. preload=True packs every tile into
+    atlas pages up front instead.
+
+    With texture_arrays=True the tiles are loaded into GL_TEXTURE_2D_ARRAY
+    textures instead of atlas pages and each CoA is drawn through the
+    mixin's batched path (texture_arrays, texture_layer_map,
+    batched_design_shader, pattern_array_shader).
+
+    Preview overlays (realm frames, crowns, title frames) and their shaders
+    are only loaded by the first export_previews() call.
     """
 
     # Output resolution (downsampled from 512x512 RTT)
     OUTPUT_SIZE = 256
 
-    def __init__(self):
-        """Boot headless OpenGL context, compile shaders, load atlases."""
+    def __init__(self, texture_arrays: bool = False, preload: bool = False):
+        """Boot headless OpenGL context, compile shaders, load atlases.
+
+        Args:
+            texture_arrays: Load tiles into texture arrays and draw each CoA
+                with batched instanced draws instead of per-layer draws.
+            preload: Load every atlas tile at boot instead of on demand.
+        """
         self._app = self._ensure_qapp()
         self._surface = None
         self._gl_context = None
@@ -65,8 +92,27 @@ class HeadlessRenderer(CanvasRenderingMixin):
         self.framebuffer_rtt = None
         self.texture_atlases = []
         self.texture_uv_map = {}
+        self.use_texture_arrays = texture_arrays
+        self.preload_textures = preload
+        self.texture_arrays = []
+        self.texture_layer_map = {}
+        self.batched_design_shader = None
+        self.pattern_array_shader = None
         self.default_mask_texture = None
         self.base_texture = None
+
+        # Preview export state (CanvasPreviewMixin), loaded on first use
+        self.preview_resources_loaded = False
+        self.preview_composite_shader = None
+        self.tilesheet_shader = None
+        self.preview_government = "_default"
+        self.preview_rank = "Duke"
+        self.preview_size = 86
+        self.title_mask = None
+        self.texturedMask = None
+        self.noiseMask = None
+        self.frame_texture_cache = None
+        self._export_viewport_override = None
         self.base_colors = [
             Color.from_name(DEFAULT_BASE_COLOR1),
             Color.from_name(DEFAULT_BASE_COLOR2),
@@ -140,6 +186,11 @@ class HeadlessRenderer(CanvasRenderingMixin):
         self.design_shader = shader_mgr.create_design_shader(None)
         if not self.base_shader or not self.design_shader:
             raise RuntimeError("Shader compilation failed")
+        if self.use_texture_arrays:
+            self.batched_design_shader = shader_mgr.create_batched_design_shader(None)
+            self.pattern_array_shader = shader_mgr.create_pattern_array_shader(None)
+            if not self.batched_design_shader or not self.pattern_array_shader:
+                raise RuntimeError("Shader compilation failed")
 
         # Unit quad VAO/VBO/EBO
         from utils.quad_renderer import QuadRenderer
@@ -159,38 +210,23 @@ class HeadlessRenderer(CanvasRenderingMixin):
 
     def _load_texture_atlases(self):
         """Load pattern + emblem atlases into GL textures (same logic as canvas)."""
-        import json
-
-        files = []
-
-        # Patterns
-        pattern_json = get_pattern_metadata_path()
-        if pattern_json.exists():
-            with open(pattern_json, "r", encoding="utf-8") as f:
-                pattern_data = json.load(f)
-            for filename, props in pattern_data.items():
-                if props is None or filename in ("\ufeff", ""):
-                    continue
-                png = filename.replace(".dds", ".png")
-                path = get_pattern_source_dir() / png
-                if path.exists():
-                    files.append((filename, str(path)))
-
-        # Emblems
-        emblem_json = get_emblem_metadata_path()
-        if emblem_json.exists():
-            with open(emblem_json, "r", encoding="utf-8") as f:
-                emblem_data = json.load(f)
-            for filename, props in emblem_data.items():
-                if props is None or filename == "\ufeff":
-                    continue
-                png = filename.replace(".dds", ".png")
-                path = get_emblem_source_dir() / png
-                if path.exists():
-                    files.append((filename, str(path)))
-
-        self.texture_atlases, self.texture_uv_map = TextureLoader.load_texture_atlas(files)
-        logger.info("Loaded %d textures into %d atlas(es)", len(files), len(self.texture_atlases))
+        from services.asset_catalog import get_catalog
+
+        files = get_catalog().atlas_files()
+        # Emblem shapes let the render pass cull hidden instances
+        CoA.set_emblem_shape_provider(lambda filename: get_catalog().alpha_geometry(filename))
+
+        if self.use_texture_arrays:
+            self.texture_arrays, self.texture_layer_map = TextureLoader.load_texture_arrays(files)
+            logger.info("Loaded %d textures into %d texture array(s)", len(files), len(self.texture_arrays))
+            return
+        if self.preload_textures:
+            self.texture_atlases, self.texture_uv_map = TextureLoader.load_texture_atlas(files)
+            logger.info("Loaded %d textures into %d atlas(es)", len(files), len(self.texture_atlases))
+            return
+        self.texture_uv_map = TextureResidency(files)
+        self.texture_atlases = self.texture_uv_map.pages
+        logger.info("Indexed %d textures for on-demand loading", len(files))
 
     # ------------------------------------------------------------------
     # Public API
@@ -203,12 +239,77 @@ class HeadlessRenderer(CanvasRenderingMixin):
             coa: Populated CoA model instance.
             output_path: Destination PNG file path.
         """
+        img = self.render_image(coa)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        img.save(output_path, "PNG")
+
+    def render_image(self, coa: CoA) -> Image.Image:
+        """Render a CoA to the RTT framebuffer and return it as a 256×256 image.
+
+        Used by the headless CLI to hand renders to an output sink without
+        touching the filesystem on the render thread.
+
+        Args:
+            coa: Populated CoA model instance.
+
+        Returns:
+            RGBA PIL image.
+        """
+        self._render_rtt(coa)
+
+        # --- Read pixels ---
+        width = FramebufferRTT.COA_RTT_WIDTH
+        height = FramebufferRTT.COA_RTT_HEIGHT
+        pixels = gl.glReadPixels(0, 0, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        pixel_array = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+
+        # OpenGL reads bottom-up; flip vertically
+        pixel_array = np.flipud(pixel_array)
+
+        self.framebuffer_rtt.unbind(0)
+
+        # --- Downsample ---
+        img = Image.fromarray(pixel_array, "RGBA")
+        return img.resize((self.OUTPUT_SIZE, self.OUTPUT_SIZE), Image.Resampling.LANCZOS)
+
+    def export_previews(self, coa: CoA, variants, writer, prefix: str = "coa",
+                        export_size: int = DEFAULT_EXPORT_SIZE,
+                        pool_size: int = DEFAULT_POOL_SIZE) -> int:
+        """Render a CoA once and submit its government/title preview variants.
+
+        Args:
+            coa: Populated CoA model instance.
+            variants: PreviewVariants (see services.preview_export.preview_variants).
+            writer: BackgroundWriter the PNGs are submitted to.
+            prefix: Output name prefix.
+            export_size: Square output size in pixels.
+            pool_size: Framebuffers rendered before the first is read back.
+
+        Returns:
+            Number of images submitted.
+        """
+        self._render_rtt(coa)
+        self.framebuffer_rtt.unbind(0)
+        self._init_preview_resources()
+        return self.export_preview_variants(variants, writer, prefix=prefix,
+                                            export_size=export_size, pool_size=pool_size)
+
+    def _render_rtt(self, coa: CoA):
+        """Render a CoA into the RTT framebuffer (left bound).
+
+        Args:
+            coa: Populated CoA model instance.
+        """
         # Make sure GL context is current
         self._gl_context.makeCurrent(self._surface)
 
         # Set as the active CoA so the rendering mixin can query it
         CoA.set_active(coa)
 
+        # Load the tiles this CoA uses before drawing it
+        if isinstance(self.texture_uv_map, TextureResidency):
+            self.texture_uv_map.prefetch(coa_texture_keys(coa))
+
         # Sync render state from model
         self.base_texture = coa.pattern
         self.base_colors = [coa.pattern_color1, coa.pattern_color2, coa.pattern_color3]
@@ -228,23 +329,50 @@ class HeadlessRenderer(CanvasRenderingMixin):
 
         gl.glFlush()
 
-        # --- Read pixels ---
-        width = FramebufferRTT.COA_RTT_WIDTH
-        height = FramebufferRTT.COA_RTT_HEIGHT
-        pixels = gl.glReadPixels(0, 0, width, height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
-        pixel_array = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
-
-        # OpenGL reads bottom-up; flip vertically
-        pixel_array = np.flipud(pixel_array)
+    def _init_preview_resources(self):
+        """Compile preview shaders and register preview overlay textures (once)."""
+        if self.preview_resources_loaded:
+            return
+        shader_mgr = ShaderManager()
+        self.tilesheet_shader = shader_mgr.create_tilesheet_shader(None)
+        self.preview_composite_shader = shader_mgr.create_preview_composite_shader(None)
+        if not self.tilesheet_shader or not self.preview_composite_shader:
+            raise RuntimeError("Shader compilation failed")
 
-        self.framebuffer_rtt.unbind(0)
+        self._init_frame_texture_cache()
+        self._load_realm_frame_textures()
+        self._load_title_frame_textures()
+        self._load_material_mask_texture()
+        self._load_noise_texture()
+        self.preview_resources_loaded = True
 
-        # --- Save PNG ---
-        img = Image.fromarray(pixel_array, "RGBA")
-        img = img.resize((self.OUTPUT_SIZE, self.OUTPUT_SIZE), Image.Resampling.LANCZOS)
+    def cache_namespace(self) -> str:
+        """Identity of this renderer's output for render cache keys.
 
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        img.save(output_path, "PNG")
+        Covers output/RTT resolution, the shader sources, the converted asset
+        metadata and the atlas/source PNG directories, and the watch mode
+        change log, so cached renders are invalidated when assets are
+        re-converted or hot re-baked.
+        """
+        parts = [
+            f"size={self.OUTPUT_SIZE}",
+            f"rtt={FramebufferRTT.COA_RTT_WIDTH}x{FramebufferRTT.COA_RTT_HEIGHT}",
+            f"shaders={tree_digest(get_shader_dir())}",
+        ]
+        if self.use_texture_arrays:
+            # Tile edges sample slightly differently from atlas pages
+            parts.append("textures=array")
+        elif not self.preload_textures:
+            # Tile neighbours in the atlas cache depend on load order
+            parts.append("textures=resident")
+        # Watch mode re-bakes PNGs without necessarily touching the metadata;
+        # every batch rewrites the change log
+        for path in (get_pattern_metadata_path(), get_emblem_metadata_path(),
+                     get_pattern_atlas_dir(), get_emblem_atlas_dir(),
+                     get_pattern_source_dir(), get_emblem_source_dir(),
+                     get_assets_dir() / CHANGE_LOG_FILENAME):
+            parts.append(stat_stamp(path))
+        return ";".join(parts)
 
     # ------------------------------------------------------------------
     # Cleanup
@@ -257,14 +385,23 @@ class HeadlessRenderer(CanvasRenderingMixin):
         if self.framebuffer_rtt:
             self.framebuffer_rtt.cleanup()
 
-        for tex_id in self.texture_atlases:
+        for tex_id in self.texture_atlases + self.texture_arrays:
             gl.glDeleteTextures([tex_id])
         self.texture_atlases.clear()
+        self.texture_arrays.clear()
+        self._release_instanced_quad()
 
         if self.default_mask_texture:
             gl.glDeleteTextures([self.default_mask_texture])
             self.default_mask_texture = None
 
+        if self.frame_texture_cache is not None:
+            self.frame_texture_cache.shutdown()
+        for attribute in ('title_mask', 'texturedMask', 'noiseMask'):
+            if getattr(self, attribute):
+                gl.glDeleteTextures([getattr(self, attribute)])
+                setattr(self, attribute, None)
+
         if self._ebo is not None:
             self._ebo.destroy()
         if self._vbo is not None:
@@ -274,6 +411,11 @@ class HeadlessRenderer(CanvasRenderingMixin):
 
         self.base_shader = None
         self.design_shader = None
+        self.batched_design_shader = None
+        self.pattern_array_shader = None
+        self.tilesheet_shader = None
+        self.preview_composite_shader = None
+        self.preview_resources_loaded = False
 
         self._gl_context.doneCurrent()
 
@@ -35,30 +35,30 @@ class ShapeGenerator(BaseGenerator):
         Args:
             svg_directory: Path to directory containing .svg files
         """
-        cls._loaded_shapes.clear()
-        cls._shape_names.clear()
+        # Parse into locals and publish at the end: this runs on a startup
+        # worker thread while the GUI may already be reading the shape list
+        loaded = {}
         
         if not os.path.exists(svg_directory):
             print(f"Warning: SVG directory not found: {svg_directory}")
-            return
-        
-        for filename in os.listdir(svg_directory):
-            if not filename.endswith('.svg'):
-                continue
-            
-            shape_name = os.path.splitext(filename)[0]
-            filepath = os.path.join(svg_directory, filename)
-            
-            try:
-                path_sampler = PathSampler(filepath)
-                cls._loaded_shapes[shape_name] = path_sampler
-                cls._shape_names.append(shape_name)
-                print(f"Loaded shape: {shape_name}")
-            except Exception as e:
-                print(f"Warning: Failed to load shape {shape_name}: {e}")
-                # Skip this shape - continue loading others
+        else:
+            for filename in os.listdir(svg_directory):
+                if not filename.endswith('.svg'):
+                    continue
+                
+                shape_name = os.path.splitext(filename)[0]
+                filepath = os.path.join(svg_directory, filename)
+                
+                try:
+                    loaded[shape_name] = PathSampler(filepath)
+                    print(f"Loaded shape: {shape_name}")
+                except Exception as e:
+                    print(f"Warning: Failed to load shape {shape_name}: {e}")
+                    # Skip this shape - continue loading others
         
-        cls._shape_names.sort()
+        cls._loaded_shapes.clear()
+        cls._loaded_shapes.update(loaded)
+        cls._shape_names[:] = sorted(loaded)
     
     @classmethod
     def get_shape_names(cls):
@@ -0,0 +1,349 @@
+"""Output sinks for headless renders.
+
+A sink is the destination for rendered PNGs. The headless CLI used to write
+one ``<name>.png`` per CoA straight into a directory; on network filesystems
+that means tens of thousands of small-file creates. Sinks let the same render
+loop write into a directory, a single streaming zip/tar archive, or an SQLite
+blob table keyed by CoA name. The archive and database modules are only
+imported by the sink that uses them, so ``headless --help`` stays cheap.
+
+Writes are decoupled from rendering by BackgroundWriter: the render loop
+submits images to a bounded queue, and a worker thread encodes them to PNG
+and hands them to the sink in batches (one transaction per batch for SQLite).
+
+Usage:
+    sink = create_sink("renders.sqlite")
+    with BackgroundWriter(sink, batch_size=64) as writer:
+        for name, coa in coas:
+            writer.submit(name, renderer.render_image(coa))
+"""
+
+import io
+import os
+import queue
+import threading
+import time
+import logging
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Sink kinds accepted by create_sink() (and the headless --sink option)
+SINK_KINDS = ('auto', 'dir', 'zip', 'tar', 'sqlite')
+
+_TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz')
+_SQLITE_SUFFIXES = ('.sqlite', '.sqlite3', '.db')
+
+
+class OutputSink:
+    """Base class for render destinations.
+
+    Subclasses implement write(). open() and close() are called on the
+    writer thread, so sinks holding thread-bound handles (sqlite3) must
+    create them in open() rather than in __init__().
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+
+    def open(self):
+        """Acquire file handles / connections."""
+
+    def write(self, name: str, data: bytes):
+        """Store one encoded PNG under the given CoA name."""
+        raise NotImplementedError
+
+    def write_batch(self, items: List[Tuple[str, bytes]]):
+        """Store several encoded PNGs. Default: one write() per item."""
+        for name, data in items:
+            self.write(name, data)
+
+    def close(self):
+        """Flush and release file handles / connections."""
+
+    def describe(self) -> str:
+        """Human-readable destination for CLI summaries."""
+        return self.path
+
+
+class DirectorySink(OutputSink):
+    """Writes one ``<name>.png`` file per render (the original behaviour)."""
+
+    def open(self):
+        os.makedirs(self.path, exist_ok=True)
+
+    def write(self, name: str, data: bytes):
+        with open(os.path.join(self.path, f"{name}.png"), "wb") as f:
+            f.write(data)
+
+    def describe(self) -> str:
+        return f"{self.path}/"
+
+
+class ZipSink(OutputSink):
+    """Streams renders into a single zip archive.
+
+    PNG data is already deflated, so members are STORED to avoid paying
+    for a second compression pass.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._zip = None
+
+    def open(self):
+        import zipfile
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, name: str, data: bytes):
+        self._zip.writestr(f"{name}.png", data)
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class TarSink(OutputSink):
+    """Streams renders into a single tar archive (gzip for .tar.gz/.tgz)."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._tar = None
+
+    def open(self):
+        import tarfile
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        mode = "w:gz" if self.path.endswith(('.tar.gz', '.tgz')) else "w"
+        self._tar = tarfile.open(self.path, mode)
+
+    def write(self, name: str, data: bytes):
+        import tarfile
+
+        info = tarfile.TarInfo(f"{name}.png")
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+
+class SQLiteSink(OutputSink):
+    """Stores renders as blobs in an SQLite table keyed by CoA name.
+
+    Each write_batch() is a single transaction. Re-rendering a name
+    replaces the previous blob.
+    """
+
+    TABLE = "renders"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._conn = None
+
+    def open(self):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} "
+            f"(name TEXT PRIMARY KEY, png BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def write(self, name: str, data: bytes):
+        self.write_batch([(name, data)])
+
+    def write_batch(self, items: List[Tuple[str, bytes]]):
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.TABLE} (name, png) VALUES (?, ?)",
+                [(name, memoryview(data)) for name, data in items],
+            )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_sink(output: str, kind: str = 'auto') -> OutputSink:
+    """Create a sink for an output path.
+
+    Args:
+        output: Directory, archive or database path.
+        kind: One of SINK_KINDS. 'auto' picks from the file extension
+              (.zip, .tar/.tar.gz/.tgz, .sqlite/.sqlite3/.db), otherwise
+              treats the path as a directory.
+
+    Returns:
+        Unopened OutputSink.
+
+    Raises:
+        ValueError: If kind is not recognised.
+    """
+    if kind not in SINK_KINDS:
+        raise ValueError(f"Unknown sink kind '{kind}' (expected one of {', '.join(SINK_KINDS)})")
+
+    if kind == 'auto':
+        lower = output.lower()
+        if lower.endswith('.zip'):
+            kind = 'zip'
+        elif lower.endswith(_TAR_SUFFIXES):
+            kind = 'tar'
+        elif lower.endswith(_SQLITE_SUFFIXES):
+            kind = 'sqlite'
+        else:
+            kind = 'dir'
+
+    return {
+        'dir': DirectorySink,
+        'zip': ZipSink,
+        'tar': TarSink,
+        'sqlite': SQLiteSink,
+    }[kind](output)
+
+
+def encode_png(image) -> bytes:
+    """Encode a PIL image to PNG bytes (bytes pass through unchanged)."""
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    buf = io.BytesIO()
+    image.save(buf, "PNG")
+    return buf.getvalue()
+
+
+class BackgroundWriter:
+    """Feeds an OutputSink from a worker thread.
+
+    submit() only enqueues; PNG encoding and sink I/O happen on the worker.
+    The queue is bounded so a stalled filesystem applies back-pressure
+    instead of buffering an entire run in memory.
+
+    The first error raised on the worker stops further writes and is
+    re-raised from every later submit() and from close(); callers can
+    poll it through `error` to stop producing renders early.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink: OutputSink, batch_size: int = 64, max_pending: int = 256):
+        """
+        Args:
+            sink: Destination sink (opened and closed by the worker thread).
+            batch_size: Maximum renders handed to the sink per write_batch().
+            max_pending: Maximum queued, not-yet-written renders.
+        """
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="render-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def error(self):
+        """The first error raised on the worker thread, or None."""
+        return self._error
+
+    def submit(self, name: str, image, on_encoded: Callable[[bytes], None] = None):
+        """Queue a render for writing.
+
+        Args:
+            name: CoA name (file stem / archive member / table key).
+            image: PIL image or already-encoded PNG bytes.
+            on_encoded: Optional callback receiving the PNG bytes on the
+                        worker thread after they are written (e.g. to fill
+                        a render cache). Its errors are logged, not raised.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+            Exception: Any error previously raised on the worker thread.
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        self._raise_pending_error()
+        self._queue.put((name, image, on_encoded))
+
+    def close(self):
+        """Flush queued renders, close the sink and stop the worker."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        try:
+            self.sink.open()
+        except Exception as e:
+            self._error = e
+            self._drain()
+            return
+
+        try:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if batch[-1] is self._STOP:
+                    batch.pop()
+                    stop = True
+
+                if batch and self._error is None:
+                    try:
+                        encoded = [(name, encode_png(image)) for name, image, _ in batch]
+                        self.sink.write_batch(encoded)
+                        self.written += len(encoded)
+                    except Exception as e:
+                        logger.error("Render sink write failed: %s", e)
+                        self._error = e
+                    else:
+                        self._notify_encoded(batch, encoded)
+        finally:
+            try:
+                self.sink.close()
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+
+    @staticmethod
+    def _notify_encoded(batch, encoded):
+        for (_, _, on_encoded), (name, data) in zip(batch, encoded):
+            if on_encoded is None:
+                continue
+            try:
+                on_encoded(data)
+            except Exception as e:
+                logger.warning("on_encoded callback failed for %s: %s", name, e)
+
+    def _drain(self):
+        """Consume the queue until the stop marker so submit() never blocks forever."""
+        while self._queue.get() is not self._STOP:
+            pass
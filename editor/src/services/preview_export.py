@@ -0,0 +1,157 @@
+"""Batch export of government/title preview variants in one GL session.
+
+Exporting a mod's showcase (every government x rank x size) through
+export_government_preview()/export_title_preview() allocated a
+framebuffer, rendered and saved synchronously once per image.
+CanvasPreviewMixin.export_preview_variants() instead renders the CoA RTT
+once and draws every variant into a small pool of reused framebuffers.
+Each full round of the pool is read back together, so the GPU renders
+ahead of the first glReadPixels. The raw pixels go to a BackgroundWriter,
+whose worker thread flips, converts and PNG-encodes them while the next
+round renders.
+
+This module holds the GL-free parts (variant lists, naming, deferred
+encoding) and the framebuffer pool. It imports no GUI or imaging
+libraries at module level, so headless --help stays cheap.
+
+Usage:
+    variants = preview_variants(governments, PREVIEW_RANKS, PREVIEW_SIZES)
+    with BackgroundWriter(create_sink("showcase/")) as writer:
+        canvas.export_preview_variants(variants, writer, prefix="my_coa")
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+PREVIEW_KINDS = ('government', 'title')
+
+# Preview bar choices (components/canvas_area_helpers/preview_bar.py)
+PREVIEW_RANKS = ("Baron", "Count", "Duke", "King", "Emperor", "Hegemon",
+                 "Adventurer", "Holy Order", "Mercenary")
+PREVIEW_SIZES = (28, 44, 62, 86, 115)
+
+# Square canvas each variant is centred in (fits the 115px preview and crown)
+DEFAULT_EXPORT_SIZE = 256
+
+# Framebuffers rendered ahead before the first of them is read back
+DEFAULT_POOL_SIZE = 4
+
+
+@dataclass(frozen=True)
+class PreviewVariant:
+    """One exported preview image.
+
+    Attributes:
+        kind: 'government' or 'title'
+        rank: Rank name (see PREVIEW_RANKS)
+        size: Preview size in pixels; also selects the overlay textures
+        government: Government key (realm_frames file stem), government previews only
+    """
+    kind: str
+    rank: str
+    size: int
+    government: Optional[str] = None
+
+    def output_name(self, prefix: str) -> str:
+        """Sink name, e.g. 'my_coa_gov_clan_government_holy_order_86'."""
+        rank = _slug(self.rank)
+        if self.kind == 'government':
+            return f"{prefix}_gov_{_slug(self.government)}_{rank}_{self.size}"
+        return f"{prefix}_title_{rank}_{self.size}"
+
+
+def preview_variants(governments: Iterable[str], ranks: Iterable[str] = PREVIEW_RANKS,
+                     sizes: Iterable[int] = PREVIEW_SIZES,
+                     kinds: Iterable[str] = PREVIEW_KINDS) -> List[PreviewVariant]:
+    """Every requested combination, grouped so overlay textures are reused.
+
+    Title previews do not depend on the government, so there is one per
+    rank and size.
+
+    Args:
+        governments: Government keys
+        ranks: Rank names
+        sizes: Preview sizes in pixels
+        kinds: Subset of PREVIEW_KINDS
+
+    Returns:
+        Government variants (government-major), then title variants
+    """
+    ranks, sizes, kinds = list(ranks), list(sizes), list(kinds)
+    for kind in kinds:
+        if kind not in PREVIEW_KINDS:
+            raise ValueError(f"Unknown preview kind: {kind!r}")
+    variants = []
+    if 'government' in kinds:
+        variants += [PreviewVariant('government', rank, size, government)
+                     for government in governments for size in sizes for rank in ranks]
+    if 'title' in kinds:
+        variants += [PreviewVariant('title', rank, size) for size in sizes for rank in ranks]
+    return variants
+
+
+class ReadbackImage:
+    """Bottom-up RGBA pixels from glReadPixels, converted when saved.
+
+    BackgroundWriter encodes through image.save(buf, "PNG"), so the flip,
+    PIL conversion and encoding all happen on its worker thread.
+    """
+
+    def __init__(self, pixels):
+        """
+        Args:
+            pixels: (height, width, 4) uint8 array, first row at the bottom
+        """
+        self.pixels = pixels
+
+    def to_image(self):
+        import numpy as np
+        from PIL import Image
+        return Image.fromarray(np.ascontiguousarray(self.pixels[::-1]), "RGBA")
+
+    def save(self, fp, format=None):
+        self.to_image().save(fp, format)
+
+
+class FramebufferPool:
+    """Fixed set of same-size RGBA8 export framebuffers, handed out round robin.
+
+    Framebuffers are created on first use; the GL context must be current
+    for acquire() and release().
+    """
+
+    def __init__(self, size: int, count: int = DEFAULT_POOL_SIZE):
+        self.size = size
+        self.count = max(1, int(count))
+        self._fbos = []
+        self._next = 0
+
+    def acquire(self):
+        """Next framebuffer in the pool (bound state is left to the caller)."""
+        if len(self._fbos) < self.count:
+            self._fbos.append(self._create())
+            return self._fbos[-1]
+        fbo = self._fbos[self._next]
+        self._next = (self._next + 1) % self.count
+        return fbo
+
+    def release(self):
+        self._fbos.clear()
+        self._next = 0
+
+    def _create(self):
+        from PyQt5.QtCore import QSize
+        from PyQt5.QtGui import QOpenGLFramebufferObject, QOpenGLFramebufferObjectFormat
+
+        fbo_format = QOpenGLFramebufferObjectFormat()
+        fbo_format.setAttachment(QOpenGLFramebufferObject.CombinedDepthStencil)
+        fbo_format.setInternalTextureFormat(0x8058)  # GL_RGBA8
+        fbo = QOpenGLFramebufferObject(QSize(self.size, self.size), fbo_format)
+        if not fbo.isValid():
+            raise RuntimeError("Failed to create export framebuffer")
+        return fbo
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', str(text).lower()).strip('_')
@@ -0,0 +1,234 @@
+"""Content-addressed render cache for headless renders.
+
+Large CK3 dumps repeat the same arms many times (shared dynasty CoAs,
+default title CoAs). The headless CLI keys each render by
+CoA.get_content_hash() plus a renderer namespace, and keeps finished PNGs
+in a single SQLite file with least-recently-used eviction under a size cap.
+
+Duplicates within one run are served from renders still waiting in the
+output writer (see reserve()), and repeat runs are served from disk.
+
+Usage:
+    cache = RenderCache("renders.cache", max_bytes=512 * 1024 * 1024,
+                        namespace=renderer.cache_namespace())
+    key = cache.make_key(coa.get_content_hash())
+    png = cache.get(key)
+    if png is None:
+        image = renderer.render_image(coa)
+        cache.reserve(key, image)
+        writer.submit(name, image, on_encoded=lambda data: cache.put(key, data))
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """On-disk LRU cache of encoded PNG renders.
+
+    Thread-safe: get()/reserve() run on the render thread while put() is
+    called from the output writer thread once a render has been encoded.
+    """
+
+    # After exceeding the cap, evict down to this fraction of it so that
+    # eviction runs in occasional sweeps instead of on every insert.
+    EVICT_TARGET = 0.9
+
+    def __init__(self, path: str, max_bytes: int, namespace: str = ""):
+        """
+        Args:
+            path: SQLite cache file (created if missing).
+            max_bytes: Size cap for stored PNG data.
+            namespace: Renderer/asset identity mixed into every key, so a
+                       different output size or re-converted assets never
+                       serve stale renders.
+        """
+        self.path = os.path.abspath(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> image submitted but not yet put()
+        self._touched = set()  # keys hit since the last flush
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, png BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Lookup / insert
+    # ------------------------------------------------------------------
+
+    def make_key(self, content_hash: str) -> str:
+        """Combine a CoA content hash with the cache namespace."""
+        return hashlib.sha256(f"{self.namespace}\n{content_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Look up a render and count the hit or miss.
+
+        Returns:
+            Encoded PNG bytes, the pending image of an in-flight duplicate,
+            or None on a miss.
+        """
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending
+
+            row = self._conn.execute("SELECT png FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touched.add(key)
+            return bytes(row[0])
+
+    def reserve(self, key: str, image):
+        """Remember an in-flight render so duplicates in this run can reuse it.
+
+        The entry is dropped once put() stores the encoded PNG.
+        """
+        with self._lock:
+            self._pending[key] = image
+
+    def put(self, key: str, png: bytes):
+        """Store an encoded render, evicting least-recently-used entries over the cap."""
+        size = len(png)
+        with self._lock:
+            self._pending.pop(key, None)
+            if size > self.max_bytes:
+                return
+
+            with self._conn:
+                self._flush_touched()
+                old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, png, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, sqlite3.Binary(png), size, time.time()),
+                )
+                self._total_bytes += size - (old[0] if old else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(int(self.max_bytes * self.EVICT_TARGET))
+
+    # ------------------------------------------------------------------
+    # Stats / lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of PNG data currently stored."""
+        return self._total_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when unused)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        """One-line hit-rate report for CLI output."""
+        return (
+            f"Render cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({self.hit_rate:.1%} hit rate), {self._total_bytes / (1024 * 1024):.1f} MB stored"
+        )
+
+    def close(self):
+        """Persist LRU timestamps for hits and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            with self._conn:
+                self._flush_touched()
+            self._conn.close()
+            self._conn = None
+            self._pending.clear()
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self._lock inside a transaction)
+    # ------------------------------------------------------------------
+
+    def _flush_touched(self):
+        """Write deferred last_used updates for cache hits."""
+        if not self._touched:
+            return
+        now = time.time()
+        self._conn.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(now, key) for key in self._touched],
+        )
+        self._touched.clear()
+
+    def _evict(self, target_bytes: int):
+        """Delete oldest entries until stored data fits in target_bytes."""
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC"):
+            if self._total_bytes <= target_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.debug("Render cache evicted %d entries", len(evicted))
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Namespace helpers
+# ══════════════════════════════════════════════════════════════════════════
+
+def stat_stamp(path) -> str:
+    """'name=size:mtime_ns' for a file or directory ('name=missing' if absent).
+
+    Directory mtimes change when entries are added, removed or replaced by
+    rename, which is how the converter writes its PNGs.
+    """
+    name = os.path.basename(os.fspath(path))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{name}=missing"
+    return f"{name}={stat.st_size}:{stat.st_mtime_ns}"
+
+
+def tree_digest(directory, suffixes=('.vert', '.frag', '.glsl')) -> str:
+    """Short SHA-1 over the relative paths and contents of matching files.
+
+    Args:
+        directory: Root directory (walked recursively)
+        suffixes: File suffixes to include
+
+    Returns:
+        12 hex digits ('missing' if the directory does not exist)
+    """
+    if not os.path.isdir(directory):
+        return "missing"
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(tuple(suffixes)):
+                continue
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, directory).replace(os.sep, '/').encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
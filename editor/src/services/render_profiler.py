@@ -0,0 +1,416 @@
+"""Per-frame render profiler for the editor canvas.
+
+Opt-in instrumentation for CoatOfArmsCanvas.paintGL. While enabled it
+records, for every frame:
+
+- CPU wall time per stage (coa_rtt, composite, frame, previews)
+- GPU time per stage from GL_TIME_ELAPSED queries (read back one or more
+  frames later so the CPU never stalls waiting on the GPU)
+- Draw calls, uniform updates and texture binds
+- Emblem instances considered and culled (reported by the render pass)
+
+Call counts come from wrapping glDrawElements/glDrawArrays, glBindTexture,
+glUniform* and QOpenGLShaderProgram.setUniformValue for the duration of
+each profiled frame only. frame() restores the originals in a finally
+block, and calls from other threads (headless renders, startup workers)
+are not counted. A disabled profiler adds nothing to the render path
+beyond one attribute check per stage.
+
+Recent frames are kept in a ring buffer and can be summarised for the
+on-canvas overlay or exported as Chrome trace JSON (chrome://tracing,
+Perfetto).
+
+Usage:
+    profiler = RenderProfiler()
+    profiler.set_enabled(True)
+    with profiler.frame():
+        with profiler.stage("coa_rtt"):
+            ...
+    profiler.export_chrome_trace("frame_trace.json")
+"""
+
+import json
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Trace thread ids: CPU stages and GPU stages get separate tracks
+_CPU_TID = 1
+_GPU_TID = 2
+
+# OpenGL.GL functions counted while profiling (missing names are skipped)
+_DRAW_FUNCS = ('glDrawElements', 'glDrawArrays', 'glDrawElementsInstanced', 'glDrawArraysInstanced')
+_BIND_FUNCS = ('glBindTexture',)
+_UNIFORM_FUNCS = (
+    'glUniform1i', 'glUniform1f', 'glUniform2f', 'glUniform3f', 'glUniform4f',
+    'glUniform1ui', 'glUniform2ui', 'glUniform2i',
+)
+
+
+@dataclass
+class FrameStats:
+    """Measurements for one profiled frame."""
+    index: int
+    start: float  # perf_counter() seconds at begin_frame
+    cpu_ms: float = 0.0
+    stage_cpu_ms: Dict[str, float] = field(default_factory=dict)
+    stage_start: Dict[str, float] = field(default_factory=dict)  # ms from frame start
+    stage_gpu_ms: Dict[str, float] = field(default_factory=dict)  # filled in later
+    draw_calls: int = 0
+    uniform_updates: int = 0
+    texture_binds: int = 0
+    instances: int = 0
+    culled_instances: int = 0
+
+    @property
+    def gpu_ms(self) -> Optional[float]:
+        """Summed GPU time, or None if no query results arrived yet."""
+        return sum(self.stage_gpu_ms.values()) if self.stage_gpu_ms else None
+
+
+class _NullStage:
+    """Context manager used for stages while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Times one stage on the CPU and, if supported, on the GPU."""
+
+    __slots__ = ('_profiler', '_name', '_start', '_query')
+
+    def __init__(self, profiler: 'RenderProfiler', name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._query = self._profiler._begin_gpu_query()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        profiler = self._profiler
+        frame = profiler._frame
+        if frame is not None:
+            frame.stage_cpu_ms[self._name] = frame.stage_cpu_ms.get(self._name, 0.0) + (end - self._start) * 1000.0
+            frame.stage_start.setdefault(self._name, (self._start - frame.start) * 1000.0)
+        if self._query is not None:
+            profiler._end_gpu_query(self._query, frame, self._name)
+        return False
+
+
+class RenderProfiler:
+    """Collects per-stage CPU/GPU timings and GL call counts per frame."""
+
+    def __init__(self, history: int = 600, gpu_timing: bool = True):
+        """
+        Args:
+            history: Number of recent frames kept for summaries and export.
+            gpu_timing: Issue GL_TIME_ELAPSED queries (needs a current GL
+                        3.3+ context; disabled automatically if unsupported).
+        """
+        self.enabled = False
+        self.frames = deque(maxlen=max(1, history))
+        self._gpu_timing = gpu_timing
+        self._gpu_supported = None  # decided on first query
+        self._frame = None
+        self._frame_thread = None
+        self._frame_index = 0
+        self._pending_queries = deque()  # (query_id, frame, stage)
+        self._free_queries = []
+        self._installed = []  # (owner, attr name, original)
+
+    # ------------------------------------------------------------------
+    # Enable / disable
+    # ------------------------------------------------------------------
+
+    def set_enabled(self, enabled: bool):
+        """Turn profiling on or off."""
+        enabled = bool(enabled)
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        self._frame = None
+        self._uninstall_counters()
+
+    @property
+    def gpu_timing_available(self) -> bool:
+        """True once a GL_TIME_ELAPSED query has been issued successfully."""
+        return bool(self._gpu_supported)
+
+    # ------------------------------------------------------------------
+    # Frame recording
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def frame(self):
+        """Record one frame; the GL call counters are removed even if drawing raises."""
+        self.begin_frame()
+        try:
+            yield self
+        except BaseException:
+            self._frame = None  # Incomplete frame: not recorded
+            raise
+        finally:
+            self.end_frame()
+
+    def begin_frame(self):
+        """Start a frame and install the GL call counters until end_frame().
+
+        Also collects finished GPU queries from earlier frames. Prefer
+        frame(), which guarantees end_frame() runs.
+        """
+        if not self.enabled:
+            return
+        self._collect_gpu_results()
+        self._frame = FrameStats(index=self._frame_index, start=time.perf_counter())
+        self._frame_thread = threading.get_ident()
+        self._frame_index += 1
+        if not self._installed:
+            self._install_counters()
+
+    def stage(self, name: str):
+        """Context manager timing one render stage of the current frame."""
+        if not self.enabled or self._frame is None:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def end_frame(self):
+        """Finish the current frame, push it into the history ring and remove the counters."""
+        self._uninstall_counters()
+        frame = self._frame
+        if frame is None:
+            return
+        frame.cpu_ms = (time.perf_counter() - frame.start) * 1000.0
+        self.frames.append(frame)
+        self._frame = None
+
+    def count_instances(self, total: int, culled: int):
+        """Record emblem instances considered and culled in the current frame."""
+        frame = self._frame
+        if frame is None:
+            return
+        frame.instances += total
+        frame.culled_instances += culled
+
+    def clear(self):
+        """Drop recorded frames."""
+        self.frames.clear()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def summary(self, last: int = 60) -> Dict:
+        """Average the most recent frames.
+
+        Returns:
+            Dict with frames, cpu_ms, gpu_ms (None when unavailable),
+            draw_calls, uniform_updates, texture_binds, instances,
+            culled_instances and per-stage
+            {'cpu_ms', 'gpu_ms'} averages under 'stages'.
+        """
+        frames = list(self.frames)[-last:]
+        if not frames:
+            return {'frames': 0, 'cpu_ms': 0.0, 'gpu_ms': None, 'draw_calls': 0,
+                    'uniform_updates': 0, 'texture_binds': 0, 'instances': 0,
+                    'culled_instances': 0, 'stages': {}}
+
+        n = len(frames)
+        gpu_frames = [f for f in frames if f.gpu_ms is not None]
+        stages = {}
+        for f in frames:
+            for name, ms in f.stage_cpu_ms.items():
+                stages.setdefault(name, {'cpu': [], 'gpu': []})['cpu'].append(ms)
+            for name, ms in f.stage_gpu_ms.items():
+                stages.setdefault(name, {'cpu': [], 'gpu': []})['gpu'].append(ms)
+
+        return {
+            'frames': n,
+            'cpu_ms': sum(f.cpu_ms for f in frames) / n,
+            'gpu_ms': sum(f.gpu_ms for f in gpu_frames) / len(gpu_frames) if gpu_frames else None,
+            'draw_calls': sum(f.draw_calls for f in frames) / n,
+            'uniform_updates': sum(f.uniform_updates for f in frames) / n,
+            'texture_binds': sum(f.texture_binds for f in frames) / n,
+            'instances': sum(f.instances for f in frames) / n,
+            'culled_instances': sum(f.culled_instances for f in frames) / n,
+            'stages': {
+                name: {
+                    'cpu_ms': sum(v['cpu']) / len(v['cpu']) if v['cpu'] else 0.0,
+                    'gpu_ms': sum(v['gpu']) / len(v['gpu']) if v['gpu'] else None,
+                }
+                for name, v in stages.items()
+            },
+        }
+
+    def overlay_lines(self, last: int = 60) -> List[str]:
+        """Short text readout for the on-canvas overlay."""
+        s = self.summary(last)
+        if not s['frames']:
+            return ["Render profiler: waiting for frames..."]
+
+        gpu = f"{s['gpu_ms']:.2f} ms" if s['gpu_ms'] is not None else "n/a"
+        lines = [
+            f"frame  cpu {s['cpu_ms']:.2f} ms  gpu {gpu}",
+            f"draws {s['draw_calls']:.0f}  uniforms {s['uniform_updates']:.0f}  binds {s['texture_binds']:.0f}",
+            f"instances {s['instances']:.0f}  culled {s['culled_instances']:.0f}",
+        ]
+        for name, stage in s['stages'].items():
+            stage_gpu = f"{stage['gpu_ms']:.2f}" if stage['gpu_ms'] is not None else "-"
+            lines.append(f"  {name:<10} cpu {stage['cpu_ms']:.2f}  gpu {stage_gpu}")
+        return lines
+
+    def to_chrome_trace(self) -> Dict:
+        """Recorded frames as a Chrome trace-event document.
+
+        CPU stages are on one track, GPU stage durations on another (placed
+        at the CPU submit time, since GL_TIME_ELAPSED has no timestamp), and
+        per-frame call and instance counts as counter events.
+        """
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': _CPU_TID, 'args': {'name': 'CPU'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': _GPU_TID, 'args': {'name': 'GPU'}},
+        ]
+        if not self.frames:
+            return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+        origin = self.frames[0].start
+        for f in self.frames:
+            frame_ts = (f.start - origin) * 1e6
+            events.append({
+                'name': f'frame {f.index}', 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': _CPU_TID,
+                'ts': frame_ts, 'dur': f.cpu_ms * 1000.0,
+            })
+            for name, ms in f.stage_cpu_ms.items():
+                ts = frame_ts + f.stage_start.get(name, 0.0) * 1000.0
+                events.append({
+                    'name': name, 'cat': 'cpu', 'ph': 'X', 'pid': 1, 'tid': _CPU_TID,
+                    'ts': ts, 'dur': ms * 1000.0,
+                })
+                if name in f.stage_gpu_ms:
+                    events.append({
+                        'name': name, 'cat': 'gpu', 'ph': 'X', 'pid': 1, 'tid': _GPU_TID,
+                        'ts': ts, 'dur': f.stage_gpu_ms[name] * 1000.0,
+                    })
+            events.append({
+                'name': 'gl_calls', 'ph': 'C', 'pid': 1, 'ts': frame_ts,
+                'args': {
+                    'draw_calls': f.draw_calls,
+                    'uniform_updates': f.uniform_updates,
+                    'texture_binds': f.texture_binds,
+                },
+            })
+            events.append({
+                'name': 'emblem_instances', 'ph': 'C', 'pid': 1, 'ts': frame_ts,
+                'args': {'drawn': f.instances - f.culled_instances, 'culled': f.culled_instances},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        """Write to_chrome_trace() to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    # ------------------------------------------------------------------
+    # GPU timer queries (require a current GL context)
+    # ------------------------------------------------------------------
+
+    def _begin_gpu_query(self):
+        if not self._gpu_timing or self._gpu_supported is False:
+            return None
+        import OpenGL.GL as gl
+        try:
+            query = self._free_queries.pop() if self._free_queries else int(gl.glGenQueries(1))
+            gl.glBeginQuery(gl.GL_TIME_ELAPSED, query)
+        except Exception as e:
+            logger.info("GPU timer queries unavailable, profiling CPU only: %s", e)
+            self._gpu_supported = False
+            return None
+        self._gpu_supported = True
+        return query
+
+    def _end_gpu_query(self, query, frame, stage):
+        import OpenGL.GL as gl
+        gl.glEndQuery(gl.GL_TIME_ELAPSED)
+        if frame is None:
+            self._free_queries.append(query)
+        else:
+            self._pending_queries.append((query, frame, stage))
+
+    def _collect_gpu_results(self):
+        """Read back finished queries without blocking (results arrive in order)."""
+        if not self._pending_queries:
+            return
+        import OpenGL.GL as gl
+        while self._pending_queries:
+            query, frame, stage = self._pending_queries[0]
+            if not gl.glGetQueryObjectiv(query, gl.GL_QUERY_RESULT_AVAILABLE):
+                break
+            elapsed_ns = gl.glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT)
+            frame.stage_gpu_ms[stage] = frame.stage_gpu_ms.get(stage, 0.0) + int(elapsed_ns) / 1e6
+            self._pending_queries.popleft()
+            self._free_queries.append(query)
+
+    def release_gl_resources(self):
+        """Delete query objects (call with the GL context current)."""
+        queries = self._free_queries + [q for q, _, _ in self._pending_queries]
+        self._free_queries = []
+        self._pending_queries.clear()
+        if queries:
+            import OpenGL.GL as gl
+            try:
+                gl.glDeleteQueries(len(queries), queries)
+            except Exception as e:
+                logger.debug("Failed to delete timer queries: %s", e)
+
+    # ------------------------------------------------------------------
+    # GL call counters
+    # ------------------------------------------------------------------
+
+    def _install_counters(self):
+        import OpenGL.GL as gl
+        from PyQt5.QtGui import QOpenGLShaderProgram
+
+        for names, counter in ((_DRAW_FUNCS, 'draw_calls'),
+                               (_BIND_FUNCS, 'texture_binds'),
+                               (_UNIFORM_FUNCS, 'uniform_updates')):
+            for name in names:
+                original = getattr(gl, name, None)
+                if original is not None:
+                    self._wrap(gl, name, original, counter)
+
+        self._wrap(QOpenGLShaderProgram, 'setUniformValue',
+                   QOpenGLShaderProgram.setUniformValue, 'uniform_updates')
+
+    def _wrap(self, owner, name, original, counter):
+        profiler = self
+
+        def counted(*args, **kwargs):
+            frame = profiler._frame
+            # Only the profiled renderer's own calls (its frame runs on one thread)
+            if frame is not None and threading.get_ident() == profiler._frame_thread:
+                setattr(frame, counter, getattr(frame, counter) + 1)
+            return original(*args, **kwargs)
+
+        counted.__wrapped__ = original
+        setattr(owner, name, counted)
+        self._installed.append((owner, name, original))
+
+    def _uninstall_counters(self):
+        while self._installed:
+            owner, name, original = self._installed.pop()
+            setattr(owner, name, original)
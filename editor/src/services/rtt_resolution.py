@@ -0,0 +1,96 @@
+"""Choose the CoA render target resolution from how large it is on screen.
+
+The canvas used to render every CoA into a fixed 512x512 RTT and let
+the composite pass scale it to the viewport. Zoomed in on a large monitor
+that upscales (blurry); at small sizes it shades several times more
+pixels than are shown.
+
+RTTResolutionPolicy picks a power-of-two size that covers the CoA's
+on-screen size in device pixels:
+
+- While the user drags or pans, it aims one step lower (the image is
+  moving and is re-rendered on release)
+- It upsizes as soon as the RTT is too small, but only downsizes once
+  the target fits the smaller size with margin (DOWNSIZE_MARGIN), so zoom
+  steps around a boundary do not reallocate the texture every frame
+
+Emblem transforms are expressed in RTT pixels (emblem_batch.RTT_SIZE is
+the canonical 512), so everything but the sampling density is unchanged.
+
+Usage:
+    policy = RTTResolutionPolicy(max_size=gl_max_texture_size)
+    size = policy.choose(displayed_px, interactive=is_dragging)
+    framebuffer_rtt.resize(size)
+"""
+
+from typing import Sequence
+
+# Allowed RTT edge lengths; 512 is the canonical size
+RTT_SIZES = (256, 512, 1024, 2048, 4096)
+
+# Largest RTT used unless the caller allows more (4096 costs 64 MB)
+DEFAULT_MAX_RTT_SIZE = 2048
+
+# Fraction of the on-screen size rendered while dragging or panning
+INTERACTIVE_SCALE = 0.5
+
+# Downsize only when the target is below this fraction of the smaller size
+DOWNSIZE_MARGIN = 0.8
+
+
+class RTTResolutionPolicy:
+    """Tracks the current RTT size and decides when to change it."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_RTT_SIZE, min_size: int = RTT_SIZES[0],
+                 sizes: Sequence[int] = RTT_SIZES, initial: int = 512):
+        """
+        Args:
+            max_size: Largest size to choose (e.g. clamp to GL_MAX_TEXTURE_SIZE)
+            min_size: Smallest size to choose
+            sizes: Allowed sizes in ascending order
+            initial: Size the RTT starts at
+        """
+        self.sizes = tuple(sizes)
+        self.set_limits(min_size, max_size)
+        self.current = self._clamp(initial)
+        self.changes = 0
+
+    def set_limits(self, min_size: int, max_size: int):
+        """Restrict the allowed sizes (at least one size is always kept)."""
+        self.min_size, self.max_size = min_size, max_size
+        allowed = [s for s in self.sizes if min_size <= s <= max_size]
+        self.allowed = tuple(allowed) or (min(self.sizes, key=lambda s: abs(s - max_size)),)
+        if hasattr(self, 'current'):
+            self.current = self._clamp(self.current)
+
+    def target(self, displayed_px: float, interactive: bool = False) -> int:
+        """Smallest allowed size covering displayed_px, without hysteresis."""
+        needed = displayed_px * (INTERACTIVE_SCALE if interactive else 1.0)
+        for size in self.allowed:
+            if size >= needed:
+                return size
+        return self.allowed[-1]
+
+    def choose(self, displayed_px: float, interactive: bool = False) -> int:
+        """Size to render at this frame; updates current.
+
+        Args:
+            displayed_px: Edge length of the CoA on screen, in device pixels
+            interactive: True while dragging or panning
+
+        Returns:
+            RTT edge length in pixels
+        """
+        target = self.target(displayed_px, interactive)
+        if target < self.current:
+            needed = displayed_px * (INTERACTIVE_SCALE if interactive else 1.0)
+            # Dropping into interactive mode always takes the lower size
+            if not interactive and needed > target * DOWNSIZE_MARGIN:
+                return self.current
+        if target != self.current:
+            self.current = target
+            self.changes += 1
+        return self.current
+
+    def _clamp(self, size: int) -> int:
+        return min(self.allowed, key=lambda s: abs(s - size))
@@ -0,0 +1,266 @@
+"""Staged, asynchronous editor startup.
+
+The window used to appear only after every texture atlas, frame texture
+and SVG shape had been loaded on the GUI thread. StartupPipeline splits
+that work in two:
+
+- run_in_background(): file IO, image decoding, SVG parsing and metadata
+  indexing on a small thread pool
+- run_on_gui(): work that must happen on the GUI thread (GL uploads,
+  widget updates), drained from a FIFO queue in time slices of a few
+  milliseconds so input and paint events are handled between slices
+
+Both are recorded on a StartupTimeline. With --profile-startup the editor
+prints the timeline once loading finishes (and can export it as a Chrome
+trace), which is how time-to-first-interaction is tracked.
+
+Usage:
+    pipeline = StartupPipeline()
+    pipeline.run_in_background("decode atlas", decode, on_done=upload)
+    pipeline.finished.connect(lambda: print(pipeline.timeline.report()))
+"""
+
+import json
+import time
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal
+
+
+class StartupTimeline:
+    """Thread-safe list of timed startup stages relative to an origin"""
+
+    def __init__(self, origin: float = None):
+        """
+        Args:
+            origin: time.perf_counter() value treated as t=0 (default: now)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self._events = []  # (name, start_s, end_s, thread name)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float = None):
+        """Add a stage; end=None records an instant marker"""
+        thread = threading.current_thread().name
+        with self._lock:
+            self._events.append((name, start, start if end is None else end, thread))
+
+    def mark(self, name: str):
+        """Record an instant marker at the current time"""
+        self.record(name, time.perf_counter())
+
+    @contextmanager
+    def span(self, name: str):
+        """Record the duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def events(self) -> List[Dict]:
+        """Stages sorted by start time, in milliseconds from the origin"""
+        with self._lock:
+            events = sorted(self._events, key=lambda e: e[1])
+        return [
+            {
+                'name': name,
+                'start_ms': (start - self.origin) * 1000.0,
+                'duration_ms': (end - start) * 1000.0,
+                'thread': thread,
+            }
+            for name, start, end, thread in events
+        ]
+
+    def elapsed_ms(self, name: str) -> Optional[float]:
+        """End time (ms from origin) of the first stage called name, or None"""
+        for event in self.events():
+            if event['name'] == name:
+                return event['start_ms'] + event['duration_ms']
+        return None
+
+    def report(self) -> str:
+        """Text timeline, one stage per line"""
+        lines = [f"{'start ms':>9} {'dur ms':>8}  {'thread':<22} stage"]
+        for e in self.events():
+            duration = f"{e['duration_ms']:8.1f}" if e['duration_ms'] else f"{'-':>8}"
+            lines.append(f"{e['start_ms']:9.1f} {duration}  {e['thread'][:22]:<22} {e['name']}")
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self) -> Dict:
+        """Timeline as a Chrome trace-event document (one track per thread)"""
+        threads = {}
+        trace = []
+        for e in self.events():
+            tid = threads.setdefault(e['thread'], len(threads) + 1)
+            event = {'name': e['name'], 'pid': 1, 'tid': tid, 'ts': e['start_ms'] * 1000.0}
+            if e['duration_ms']:
+                event.update(ph='X', dur=e['duration_ms'] * 1000.0)
+            else:
+                event.update(ph='i', s='g')
+            trace.append(event)
+        for name, tid in threads.items():
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        """Write to_chrome_trace() as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+class StartupPipeline(QObject):
+    """Background loading plus time-sliced GUI-thread work (see module docstring)"""
+
+    DEFAULT_SLICE_MS = 8.0
+
+    # Emitted each time all submitted work has completed
+    finished = pyqtSignal()
+
+    # Cross-thread hand-off: emitted from workers, delivered on the GUI thread
+    _posted = pyqtSignal(object)
+
+    def __init__(self, timeline: StartupTimeline = None, max_workers: int = 2,
+                 slice_ms: float = DEFAULT_SLICE_MS, parent=None):
+        super().__init__(parent)
+        self.timeline = timeline or StartupTimeline()
+        self.slice_ms = slice_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self._queue = deque()  # (name, fn) waiting for the GUI thread
+        self._pending = 0  # background jobs + queued GUI jobs
+        self._lock = threading.Lock()
+
+        self._posted.connect(self._enqueue)
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+
+    # ------------------------------------------------------------------
+    # Submitting work
+    # ------------------------------------------------------------------
+
+    def run_in_background(self, name: str, fn: Callable, on_done: Callable = None):
+        """Run fn() on a worker thread
+
+        Args:
+            name: Stage name for the timeline
+            fn: Callable without GUI or GL access
+            on_done: Called with fn's result on the GUI thread (queued like run_on_gui)
+        """
+        self._add_pending(1)
+
+        def job():
+            try:
+                with self.timeline.span(name):
+                    result = fn()
+            except Exception:
+                print(f"Warning: startup stage '{name}' failed:\n{traceback.format_exc()}")
+            else:
+                if on_done is not None:
+                    self.run_on_gui(f"{name} (apply)", lambda: on_done(result))
+            finally:
+                self._posted.emit(None)  # balances _add_pending on the GUI thread
+
+        self._executor.submit(job)
+
+    def run_on_gui(self, name: str, fn: Callable):
+        """Queue fn() for the GUI thread (callable from any thread)"""
+        self._add_pending(1)
+        self._posted.emit((name, fn))
+
+    def defer(self, name: str) -> Callable:
+        """Keep the pipeline busy until the returned callable is invoked
+
+        For stages started by Qt rather than by us (e.g. the canvas's
+        initializeGL), so finished is not emitted before they begin.
+
+        Args:
+            name: Stage name; the wait is recorded on the timeline
+
+        Returns:
+            done() to call once on the GUI thread
+        """
+        self._add_pending(1)
+        start = time.perf_counter()
+        state = {'done': False}
+
+        def done():
+            if state['done']:
+                return
+            state['done'] = True
+            self.timeline.record(name, start, time.perf_counter())
+            self._add_pending(-1)
+            self._check_finished()
+
+        return done
+
+    def is_idle(self) -> bool:
+        with self._lock:
+            return self._pending == 0
+
+    def wait_until_idle(self, timeout: float = 30.0) -> bool:
+        """Process events until all work is done (for tests and headless use)
+
+        Returns:
+            True if idle before the timeout
+        """
+        deadline = time.perf_counter() + timeout
+        app = QCoreApplication.instance()
+        while not self.is_idle():
+            if time.perf_counter() > deadline:
+                return False
+            app.processEvents()
+            time.sleep(0.001)
+        return True
+
+    def shutdown(self):
+        """Stop accepting work; running background jobs finish, queued GUI jobs are dropped"""
+        self._executor.shutdown(wait=False)
+        self._timer.stop()
+        with self._lock:
+            self._pending -= len(self._queue)
+        self._queue.clear()
+
+    # ------------------------------------------------------------------
+    # GUI thread
+    # ------------------------------------------------------------------
+
+    def _add_pending(self, count: int):
+        with self._lock:
+            self._pending += count
+
+    def _enqueue(self, item):
+        if item is None:  # background job finished
+            self._add_pending(-1)
+            self._check_finished()
+            return
+        self._queue.append(item)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _run_slice(self):
+        """Run queued GUI jobs until the slice budget is used (at least one)"""
+        deadline = time.perf_counter() + self.slice_ms / 1000.0
+        while self._queue:
+            name, fn = self._queue.popleft()
+            try:
+                with self.timeline.span(name):
+                    fn()
+            except Exception:
+                print(f"Warning: startup step '{name}' failed:\n{traceback.format_exc()}")
+            finally:
+                self._add_pending(-1)
+            if time.perf_counter() >= deadline:
+                break
+        if not self._queue:
+            self._timer.stop()
+            self._check_finished()
+
+    def _check_finished(self):
+        if self.is_idle():
+            self.finished.emit()
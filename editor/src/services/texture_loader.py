@@ -2,6 +2,11 @@
 
 Provides methods to load individual textures and texture atlases from files.
 All methods return OpenGL texture IDs and associated metadata.
+
+Loading is split into a decode step (file IO and PIL/numpy only, safe on a
+worker thread) and an upload step (GL calls, needs a current context) so
+startup can decode in the background and upload in small slices on the
+GUI thread. The load_* methods do both back to back.
 """
 
 import OpenGL.GL as gl
@@ -10,6 +15,8 @@ from PIL import Image
 from pathlib import Path
 import json
 
+from services.asset_catalog import compute_array_layers, compute_atlas_slots
+
 
 class TextureLoader:
     """Utility for loading OpenGL textures from files."""
@@ -30,12 +37,41 @@ class TextureLoader:
             int: OpenGL texture ID, or None if loading failed
         """
         try:
-            img = Image.open(image_path).convert('RGBA')
+            img_data = TextureLoader.decode_image(image_path, resize)
+        except Exception as e:
+            print(f"Error loading texture from {image_path}: {e}")
+            return None
+        return TextureLoader.upload_texture(img_data, wrap_mode, min_filter, mag_filter, generate_mipmaps)
+    
+    @staticmethod
+    def decode_image(image_path, resize=None):
+        """Decode an image file to an RGBA array (no GL calls).
+        
+        Args:
+            image_path: Path to image file
+            resize: Optional (width, height) to resize to
             
-            if resize:
-                img = img.resize(resize, Image.Resampling.LANCZOS)
+        Returns:
+            np.ndarray: (height, width, 4) uint8
+        """
+        img = Image.open(image_path).convert('RGBA')
+        if resize:
+            img = img.resize(resize, Image.Resampling.LANCZOS)
+        return np.array(img)
+    
+    @staticmethod
+    def upload_texture(img_data, wrap_mode=gl.GL_CLAMP_TO_EDGE, min_filter=gl.GL_LINEAR, mag_filter=gl.GL_LINEAR, generate_mipmaps=False):
+        """Create a texture from a decoded RGBA array.
+        
+        Args:
+            img_data: (height, width, 4) uint8 array from decode_image
+            wrap_mode, min_filter, mag_filter, generate_mipmaps: As load_texture
             
-            img_data = np.array(img)
+        Returns:
+            int: OpenGL texture ID, or None if the upload failed
+        """
+        try:
+            height, width = img_data.shape[:2]
             
             texture_id = gl.glGenTextures(1)
             gl.glBindTexture(gl.GL_TEXTURE_2D, texture_id)
@@ -48,7 +84,7 @@ class TextureLoader:
             if wrap_mode == gl.GL_CLAMP_TO_BORDER:
                 gl.glTexParameterfv(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_BORDER_COLOR, [0.0, 0.0, 0.0, 0.0])
             
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, img.width, img.height,
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, width, height,
                            0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, img_data.tobytes())
             
             if generate_mipmaps:
@@ -57,7 +93,7 @@ class TextureLoader:
             return texture_id
             
         except Exception as e:
-            print(f"Error loading texture from {image_path}: {e}")
+            print(f"Error uploading texture: {e}")
             return None
     
     @staticmethod
@@ -90,6 +126,10 @@ class TextureLoader:
     def load_texture_atlas(files, tile_size=256, atlas_size=8192):
         """Build texture atlas from multiple image files.
         
+        GL storage for each page is allocated once and tiles are decoded
+        into a single staging buffer and copied in with glTexSubImage2D,
+        so host memory stays at one tile regardless of page size.
+        
         Args:
             files: List of (key, filepath) tuples
             tile_size: Size of each tile in pixels (default 256)
@@ -100,73 +140,219 @@ class TextureLoader:
                 - atlas_textures: List of OpenGL texture IDs
                 - uv_map: Dict mapping keys to (atlas_idx, u0, v0, u1, v1)
         """
+        # UV coordinates (same packing the asset catalog reports)
+        uv_map = compute_atlas_slots([key for key, _ in files], tile_size, atlas_size)
+        
+        staging = np.empty((tile_size, tile_size, 4), dtype=np.uint8)
+        atlas_textures = []
+        for i, (key, image_path) in enumerate(files):
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(i, tile_size, atlas_size)
+            if atlas_idx == len(atlas_textures):
+                atlas_textures.append(TextureLoader.create_atlas_texture(atlas_size))
+            tile = TextureLoader.decode_atlas_tile_or_blank(image_path, tile_size, out=staging)
+            TextureLoader.upload_atlas_tile(atlas_textures[atlas_idx], x, y, tile)
+        
+        staging.fill(0)
+        for i in TextureLoader.atlas_blank_slots(len(files), tile_size, atlas_size):
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(i, tile_size, atlas_size)
+            TextureLoader.upload_atlas_tile(atlas_textures[atlas_idx], x, y, staging)
+        return atlas_textures, uv_map
+    
+    @staticmethod
+    def atlas_tile_position(index, tile_size=256, atlas_size=8192):
+        """Page and pixel offset of the index-th tile (compute_atlas_slots packing).
+        
+        Returns:
+            tuple: (atlas_idx, x, y)
+        """
+        tiles_per_row = atlas_size // tile_size
+        atlas_idx, local_idx = divmod(index, tiles_per_row * tiles_per_row)
+        row, col = divmod(local_idx, tiles_per_row)
+        return atlas_idx, col * tile_size, row * tile_size
+    
+    @staticmethod
+    def atlas_blank_slots(count, tile_size=256, atlas_size=8192):
+        """Unused slots after the last tile that must be cleared.
+        
+        Page storage is allocated uninitialised, and tiles have no gutter,
+        so linear filtering at a tile edge reads its right and lower
+        neighbours. The next row's worth of slots after the last tile
+        covers every unused neighbour of a used tile on the final page.
+        
+        Args:
+            count: Number of tiles packed
+            
+        Returns:
+            range: Tile indices to upload as transparent black
+        """
         tiles_per_row = atlas_size // tile_size
         tiles_per_atlas = tiles_per_row * tiles_per_row
-        num_atlases = (len(files) + tiles_per_atlas - 1) // tiles_per_atlas
+        page_end = -(-count // tiles_per_atlas) * tiles_per_atlas
+        return range(count, min(count + tiles_per_row, page_end))
+    
+    @staticmethod
+    def iter_atlas_arrays(files, tile_size=256, atlas_size=8192):
+        """Decode and pack whole atlas pages one at a time (no GL calls).
         
-        atlas_textures = []
-        uv_map = {}
-        
-        for atlas_idx in range(num_atlases):
-            # Create atlas texture
-            atlas_data = np.zeros((atlas_size, atlas_size, 4), dtype=np.uint8)
-            
-            start_idx = atlas_idx * tiles_per_atlas
-            end_idx = min((atlas_idx + 1) * tiles_per_atlas, len(files))
-            
-            # Pack textures into atlas
-            for i in range(start_idx, end_idx):
-                key, image_path = files[i]
-                local_idx = i - start_idx
-                
-                # Calculate position in atlas
-                row = local_idx // tiles_per_row
-                col = local_idx % tiles_per_row
-                x = col * tile_size
-                y = row * tile_size
-                
-                # Load and resize image
-                img = Image.open(image_path).convert('RGBA')
-                img = img.resize((tile_size, tile_size), Image.Resampling.LANCZOS)
-                img_array = np.array(img, dtype=np.float32)
-                
-                # DXT block compression corrupts RGB at semi-transparent
-                # edge pixels (alpha 1-254).  All three channels carry
-                # noise: R/G (color selection masks) and B (overlay shading)
-                # can spike to 0 or 255 at edges.  Premultiply all RGB by
-                # alpha so bilinear filtering blends toward zero at edges.
-                # The shader un-premultiplies after sampling to recover
-                # correct values in opaque regions.
-                alpha = img_array[:, :, 3:4] / 255.0
-                img_array[:, :, 0:3] *= alpha
-                img_array = np.clip(img_array, 0, 255).astype(np.uint8)
-                
-                # Place in atlas
-                atlas_data[y:y+tile_size, x:x+tile_size, :] = img_array
-                
-                # Calculate UV coordinates
-                u0 = x / atlas_size
-                v0 = y / atlas_size
-                u1 = (x + tile_size) / atlas_size
-                v1 = (y + tile_size) / atlas_size
-                
-                uv_map[key] = (atlas_idx, u0, v0, u1, v1)
-            
-            # Create OpenGL texture
-            texture_id = gl.glGenTextures(1)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, texture_id)
+        The GL loaders stream tiles instead; this is for callers that need
+        a page on the host.
+        
+        Args:
+            files: List of (key, filepath) tuples in packing order
+            tile_size: Size of each tile in pixels
+            atlas_size: Atlas edge in pixels
             
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        Yields:
+            (atlas_idx, atlas_data) with atlas_data an (atlas_size, atlas_size, 4) uint8 array
+        """
+        atlas_data = None
+        current = -1
+        for i, (key, image_path) in enumerate(files):
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(i, tile_size, atlas_size)
+            if atlas_idx != current:
+                if atlas_data is not None:
+                    yield current, atlas_data
+                atlas_data = np.zeros((atlas_size, atlas_size, 4), dtype=np.uint8)
+                current = atlas_idx
+            TextureLoader.decode_atlas_tile(image_path, tile_size,
+                                            out=atlas_data[y:y+tile_size, x:x+tile_size])
+        if atlas_data is not None:
+            yield current, atlas_data
+    
+    @staticmethod
+    def decode_atlas_tile(image_path, tile_size=256, out=None):
+        """Decode one emblem/pattern tile as stored in atlases (no GL calls).
+        
+        Args:
+            image_path: Path to the source PNG
+            tile_size: Tile edge in pixels
+            out: Optional (tile_size, tile_size, 4) uint8 array to decode into,
+                so one staging buffer can be reused for every tile
             
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, atlas_size, atlas_size,
-                           0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, atlas_data.tobytes())
+        Returns:
+            np.ndarray: (tile_size, tile_size, 4) uint8, RGB premultiplied by alpha
+        """
+        img = Image.open(image_path).convert('RGBA')
+        img = img.resize((tile_size, tile_size), Image.Resampling.LANCZOS)
+        rgba = np.asarray(img)
+        if out is None:
+            out = np.empty(rgba.shape, dtype=np.uint8)
+        
+        # DXT block compression corrupts RGB at semi-transparent
+        # edge pixels (alpha 1-254).  All three channels carry
+        # noise: R/G (color selection masks) and B (overlay shading)
+        # can spike to 0 or 255 at edges.  Premultiply all RGB by
+        # alpha so bilinear filtering blends toward zero at edges.
+        # The shader un-premultiplies after sampling to recover
+        # correct values in opaque regions.
+        alpha = rgba[:, :, 3:4].astype(np.float32) / 255.0
+        np.multiply(rgba[:, :, 0:3], alpha, out=out[:, :, 0:3], casting='unsafe')
+        out[:, :, 3] = rgba[:, :, 3]
+        return out
+    
+    @staticmethod
+    def decode_atlas_tile_or_blank(image_path, tile_size=256, out=None):
+        """decode_atlas_tile(), but an unreadable file gives a transparent tile.
+        
+        Storage is allocated before tiles are copied in, so a slot that
+        failed to decode still has to be written.
+        """
+        try:
+            return TextureLoader.decode_atlas_tile(image_path, tile_size, out=out)
+        except Exception as e:
+            print(f"Error loading texture from {image_path}: {e}")
+            if out is None:
+                return np.zeros((tile_size, tile_size, 4), dtype=np.uint8)
+            out.fill(0)
+            return out
+    
+    @staticmethod
+    def load_texture_arrays(files, tile_size=256, max_layers=None):
+        """Load tiles into GL_TEXTURE_2D_ARRAY textures, one layer per tile.
+        
+        Used by the batched emblem path (services/emblem_batch.py): a
+        draw can reach any tile in the array through its layer index, so
+        no per-layer texture binds are needed. Tiles are decoded and
+        uploaded one at a time into storage allocated up front, so no
+        full host-side copy of the array is built.
+        
+        Args:
+            files: List of (key, filepath) tuples
+            tile_size: Size of each tile in pixels (default 256)
+            max_layers: Layers per array; defaults to GL_MAX_ARRAY_TEXTURE_LAYERS
+            
+        Returns:
+            tuple: (array_textures, layer_map) where:
+                - array_textures: List of OpenGL texture IDs
+                - layer_map: Dict mapping keys to (array_idx, layer)
+        """
+        if max_layers is None:
+            max_layers = int(gl.glGetIntegerv(gl.GL_MAX_ARRAY_TEXTURE_LAYERS))
+        layer_map = compute_array_layers([key for key, _ in files], max_layers)
+        
+        staging = np.empty((tile_size, tile_size, 4), dtype=np.uint8)
+        array_textures = []
+        for start in range(0, len(files), max_layers):
+            chunk = files[start:start + max_layers]
+            texture_id = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D_ARRAY, texture_id)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D_ARRAY, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+            gl.glTexImage3D(gl.GL_TEXTURE_2D_ARRAY, 0, gl.GL_RGBA, tile_size, tile_size, len(chunk),
+                            0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
             
-            atlas_textures.append(texture_id)
+            for layer, (key, image_path) in enumerate(chunk):
+                tile = TextureLoader.decode_atlas_tile_or_blank(image_path, tile_size, out=staging)
+                gl.glTexSubImage3D(gl.GL_TEXTURE_2D_ARRAY, 0, 0, 0, layer, tile_size, tile_size, 1,
+                                   gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, tile)
+            array_textures.append(texture_id)
         
-        return atlas_textures, uv_map
+        return array_textures, layer_map
+    
+    @staticmethod
+    def create_atlas_texture(atlas_size=8192, clear=False):
+        """Allocate an empty atlas page for upload_atlas_tile().
+        
+        Args:
+            atlas_size: Page edge in pixels
+            clear: Zero the storage (in 256-row strips) instead of leaving
+                it undefined, for pages whose slots fill in arbitrary order
+            
+        Returns:
+            int: OpenGL texture ID
+        """
+        texture_id = gl.glGenTextures(1)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, texture_id)
+        
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, atlas_size, atlas_size,
+                       0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+        
+        if clear:
+            strip = np.zeros((min(256, atlas_size), atlas_size, 4), dtype=np.uint8)
+            for y in range(0, atlas_size, len(strip)):
+                TextureLoader.upload_atlas_tile(texture_id, 0, y, strip[:atlas_size - y])
+        
+        return texture_id
+    
+    @staticmethod
+    def upload_atlas_tile(texture_id, x, y, tile):
+        """Copy one decoded tile into an atlas page at pixel offset (x, y).
+        
+        Args:
+            texture_id: Page from create_atlas_texture()
+            tile: Contiguous (h, w, 4) uint8 array, passed to GL without a copy
+        """
+        height, width = tile.shape[:2]
+        gl.glBindTexture(gl.GL_TEXTURE_2D, texture_id)
+        gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, x, y, width, height,
+                          gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, tile)
     
     @staticmethod
     def load_texture_strip(directory, file_pattern, wrap_mode=gl.GL_CLAMP_TO_EDGE):
@@ -0,0 +1,244 @@
+"""On-demand residency of emblem and pattern tiles in a fixed atlas cache.
+
+Loading every converted emblem and pattern into atlas pages makes startup
+time and VRAM scale with the catalog, while a CoA typically uses fewer
+than twenty textures. TextureResidency stands in for the texture_uv_map
+dict the renderers read:
+
+    key in residency        the key is in the catalog (can be loaded)
+    residency.get(key)      (atlas_idx, u0, v0, u1, v1) if the tile is
+                            resident, else None - and the tile is queued
+
+so a miss draws like a texture that has not loaded yet: the base pattern
+falls back to the default mask and emblem layers are skipped. Queued
+tiles are decoded and copied into a fixed number of atlas slots by
+upload_pending() (GL context current), evicting the least recently used
+tile once every slot is taken. Tiles used in the current frame (see
+begin_frame()) are never evicted, so a frame cannot thrash its own
+textures.
+
+Slots use the same 32x32-tile page layout as TextureLoader.load_texture_atlas,
+so the shaders and tile-index math are unchanged.
+
+Usage:
+    residency = TextureResidency(get_catalog().atlas_files())
+    texture_uv_map, texture_atlases = residency, residency.pages
+    residency.prefetch(coa_texture_keys(coa))  # before rendering a CoA
+    residency.reload(changed_keys)              # after assets were re-converted
+"""
+
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import OpenGL.GL as gl
+import numpy as np
+
+from services.asset_catalog import ATLAS_SIZE, ATLAS_TILE_SIZE
+from services.texture_loader import TextureLoader
+
+# Slots in one atlas page (32x32 grid)
+ATLAS_TILES_PER_PAGE = (ATLAS_SIZE // ATLAS_TILE_SIZE) ** 2
+
+
+def coa_texture_keys(coa) -> List[str]:
+    """Texture keys a CoA draws with: its pattern, then each layer's emblem.
+
+    Args:
+        coa: CoA model instance
+
+    Returns:
+        List of unique keys in draw order
+    """
+    keys = [coa.pattern] if coa.pattern else []
+    for layer_uuid in coa.get_all_layer_uuids():
+        filename = coa.get_layer_filename(layer_uuid)
+        if filename:
+            keys.append(filename)
+    return list(dict.fromkeys(keys))
+
+
+class TextureResidency:
+    """Fixed-size LRU cache of atlas tiles, loaded on first use."""
+
+    def __init__(self, files, capacity: int = ATLAS_TILES_PER_PAGE,
+                 tile_size: int = ATLAS_TILE_SIZE, atlas_size: int = ATLAS_SIZE):
+        """
+        Args:
+            files: (key, path) tuples, e.g. AssetCatalog.atlas_files()
+            capacity: Tiles kept resident; pages are allocated as slots fill
+            tile_size: Tile edge in pixels
+            atlas_size: Page edge in pixels
+        """
+        self.capacity = max(1, int(capacity))
+        self.tile_size = tile_size
+        self.atlas_size = atlas_size
+        self.pages = []  # GL atlas textures, shared as the host's texture_atlases
+        self.loads = 0
+        self.evictions = 0
+
+        self._paths = dict(files)
+        self._slots = OrderedDict()  # resident key -> slot, least recently used first
+        self._used = {}  # key -> frame it was last drawn or loaded in
+        self._pending = OrderedDict()  # keys waiting for upload_pending()
+        self._frame = 0
+        self._next_slot = 0
+        self._staging = None
+
+    # ------------------------------------------------------------------
+    # texture_uv_map interface
+    # ------------------------------------------------------------------
+
+    def __contains__(self, key) -> bool:
+        return key in self._paths
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def keys(self):
+        return self._paths.keys()
+
+    def get(self, key, default=None) -> Optional[Tuple[int, float, float, float, float]]:
+        """UV slot of a resident tile; a known key that is not resident is queued.
+
+        Returns:
+            (atlas_idx, u0, v0, u1, v1), or default if not resident
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            if key in self._paths:
+                self._pending[key] = None
+            return default
+        self._slots.move_to_end(key)
+        self._used[key] = self._frame
+        atlas_idx, x, y = TextureLoader.atlas_tile_position(slot, self.tile_size, self.atlas_size)
+        return (
+            atlas_idx,
+            x / self.atlas_size,
+            y / self.atlas_size,
+            (x + self.tile_size) / self.atlas_size,
+            (y + self.tile_size) / self.atlas_size,
+        )
+
+    # ------------------------------------------------------------------
+    # Residency
+    # ------------------------------------------------------------------
+
+    def is_resident(self, key) -> bool:
+        return key in self._slots
+
+    @property
+    def pending(self) -> List[str]:
+        return list(self._pending)
+
+    def begin_frame(self):
+        """Start a new frame: tiles used before it become evictable."""
+        self._frame += 1
+
+    def request(self, keys: Iterable[str]):
+        """Queue keys for loading; unknown and resident keys are ignored."""
+        for key in keys:
+            if key in self._paths and key not in self._slots:
+                self._pending[key] = None
+
+    def upload_pending(self, limit: int = None) -> int:
+        """Decode and upload queued tiles (GL context must be current).
+
+        Stops early when every slot holds a tile used in the current
+        frame; those requests stay queued.
+
+        Args:
+            limit: Maximum tiles to load in this call (None for all)
+
+        Returns:
+            Number of tiles loaded
+        """
+        loaded = 0
+        while self._pending and (limit is None or loaded < limit):
+            slot = self._take_slot()
+            if slot is None:
+                break
+            key, _ = self._pending.popitem(last=False)
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(slot, self.tile_size, self.atlas_size)
+            while len(self.pages) <= atlas_idx:
+                # Cleared so tile-edge filtering never reads uninitialised texels
+                self.pages.append(TextureLoader.create_atlas_texture(self.atlas_size, clear=True))
+            tile = TextureLoader.decode_atlas_tile_or_blank(self._paths[key], self.tile_size,
+                                                            out=self._staging_buffer())
+            TextureLoader.upload_atlas_tile(self.pages[atlas_idx], x, y, tile)
+            self._slots[key] = slot
+            self._used[key] = self._frame
+            self.loads += 1
+            loaded += 1
+        return loaded
+
+    def prefetch(self, keys: Iterable[str]) -> int:
+        """Make keys resident before a render (GL context must be current).
+
+        Starts a new frame, so the prefetched tiles cannot evict each other.
+
+        Returns:
+            Number of tiles loaded
+        """
+        self.begin_frame()
+        self.request(keys)
+        return self.upload_pending()
+
+    def set_files(self, files):
+        """Replace the catalog, e.g. after assets were re-converted.
+
+        Resident tiles stay where they are; call reload() for the ones
+        whose images changed.
+
+        Args:
+            files: (key, path) tuples, as for the constructor
+        """
+        self._paths = dict(files)
+
+    def reload(self, keys: Iterable[str] = None) -> int:
+        """Re-decode resident tiles into their existing slots (GL context must be current).
+
+        Non-resident keys need nothing: they load the new image on first use.
+
+        Args:
+            keys: Keys whose images changed (None for every resident tile)
+
+        Returns:
+            Number of tiles re-uploaded
+        """
+        keys = list(self._slots) if keys is None else [key for key in keys if key in self._slots]
+        reloaded = 0
+        for key in keys:
+            if key not in self._paths:
+                continue
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(self._slots[key], self.tile_size, self.atlas_size)
+            tile = TextureLoader.decode_atlas_tile_or_blank(self._paths[key], self.tile_size,
+                                                            out=self._staging_buffer())
+            TextureLoader.upload_atlas_tile(self.pages[atlas_idx], x, y, tile)
+            reloaded += 1
+        return reloaded
+
+    def release(self):
+        """Delete the atlas pages; every tile becomes non-resident."""
+        if self.pages:
+            gl.glDeleteTextures(self.pages)
+        self.pages.clear()
+        self._slots.clear()
+        self._used.clear()
+        self._next_slot = 0
+
+    def _take_slot(self) -> Optional[int]:
+        if self._next_slot < self.capacity:
+            self._next_slot += 1
+            return self._next_slot - 1
+        for key, slot in self._slots.items():
+            if self._used.get(key) != self._frame:
+                del self._slots[key]
+                self._used.pop(key, None)
+                self.evictions += 1
+                return slot
+        return None
+
+    def _staging_buffer(self) -> np.ndarray:
+        if self._staging is None:
+            self._staging = np.empty((self.tile_size, self.tile_size, 4), dtype=np.uint8)
+        return self._staging
@@ -0,0 +1,376 @@
+"""Tiled, supersampled high-resolution PNG export.
+
+CoatOfArmsCanvas.export_to_png() renders into one export_size framebuffer
+and reads it back in one go. That caps the output at GL_MAX_TEXTURE_SIZE,
+and a 16384x16384 readback alone is 1 GB of host memory. TiledExport
+instead renders the composite and frame one tile at a time and streams
+finished rows into a PNG:
+
+- render_tile(x, y, w, h) draws one tile of the output, supersampled by
+  `supersample` in each direction, and returns the bottom-up RGBA pixels
+  (glReadPixels order). It runs on the calling thread, which for the
+  canvas is the GUI thread that owns the GL context; step() renders one
+  tile so the caller can interleave it with the event loop
+- A worker thread flips and box-filters each tile and places it in the
+  current band (one row of tiles). Completed bands are written through
+  StreamingPNGWriter and dropped, so host memory stays around one band
+  plus a few queued tiles regardless of the output size
+
+This module has no GL or Qt code and imports numpy only when exporting.
+
+Usage:
+    export = TiledExport("poster.png", 16384, canvas_render_tile, supersample=2)
+    while export.step():
+        progress.setValue(export.tiles_done)
+    export.finish()
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+# Output tile edge in final (downsampled) pixels
+DEFAULT_TILE_SIZE = 512
+
+# Largest output edge offered; tiles make this independent of GL limits
+MAX_EXPORT_SIZE = 32768
+
+MAX_SUPERSAMPLE = 4
+
+# Tiles rendered ahead of the writer before step() blocks
+DEFAULT_MAX_PENDING = 4
+
+# Compressed bytes collected before an IDAT chunk is emitted
+IDAT_CHUNK_SIZE = 1 << 20
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+_DONE = object()
+
+
+def tile_grid(width: int, height: int, tile_size: int) -> List[List[Tuple[int, int, int, int]]]:
+    """Split an image into tiles, row by row from the top.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        tile_size: Tile edge; the last row/column is clipped to the image
+
+    Returns:
+        Rows of (x, y, w, h) tiles with a top-left origin
+    """
+    if tile_size <= 0:
+        raise ValueError(f"Tile size must be positive, got {tile_size}")
+    return [[(x, y, min(tile_size, width - x), min(tile_size, height - y))
+             for x in range(0, width, tile_size)]
+            for y in range(0, height, tile_size)]
+
+
+def tile_view(x: float, y: float, w: float, h: float, full_size: float,
+              coa_bounds: Tuple[float, float, float, float]):
+    """Where full-image quads and CoA bounds fall in one tile's viewport.
+
+    The canvas quads take a position relative to the viewport centre (GL y
+    up) and the composite takes CoA bounds in viewport pixels from the
+    bottom-left, so a tile is drawn by shifting both.
+
+    Args:
+        x, y: Tile origin in the full image (top-left origin)
+        w, h: Tile size
+        full_size: Edge length of the full image
+        coa_bounds: (left, right, bottom, top) in full-image GL pixels
+
+    Returns:
+        ((position_x, position_y), tile_coa_bounds)
+    """
+    position = (full_size / 2.0 - (x + w / 2.0), (y + h / 2.0) - full_size / 2.0)
+    origin_x, origin_y = x, full_size - y - h
+    left, right, bottom, top = coa_bounds
+    return position, (left - origin_x, right - origin_x, bottom - origin_y, top - origin_y)
+
+
+def downsample(pixels, factor: int):
+    """Box-filter RGBA pixels by an integer factor.
+
+    Colour is averaged premultiplied by alpha, so transparent pixels (black
+    after clearing) do not darken antialiased edges.
+
+    Args:
+        pixels: (h*factor, w*factor, 4) uint8 array
+        factor: Supersampling factor
+
+    Returns:
+        (h, w, 4) uint8 array
+    """
+    import numpy as np
+
+    if factor == 1:
+        return pixels
+    h, w = pixels.shape[0] // factor, pixels.shape[1] // factor
+    blocks = pixels[:h * factor, :w * factor].astype(np.float32).reshape(h, factor, w, factor, 4)
+    alpha = blocks[..., 3:4]
+    premultiplied = (blocks[..., :3] * alpha).sum(axis=(1, 3))
+    alpha_sum = alpha.sum(axis=(1, 3))
+    out = np.empty((h, w, 4), dtype=np.float32)
+    out[..., :3] = np.divide(premultiplied, alpha_sum, out=np.zeros_like(premultiplied), where=alpha_sum > 0)
+    out[..., 3:] = alpha_sum / (factor * factor)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+
+class StreamingPNGWriter:
+    """Writes an 8-bit RGBA PNG row by row without holding the image.
+
+    Rows are deflated as they arrive and flushed as IDAT chunks every
+    IDAT_CHUNK_SIZE compressed bytes.
+    """
+
+    def __init__(self, path: str, width: int, height: int, compress_level: int = 6):
+        """
+        Args:
+            path: Output file
+            width: Image width in pixels
+            height: Image height in pixels
+            compress_level: zlib level (0-9)
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = []
+        self._pending_size = 0
+        self._file = open(path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        # Bit depth 8, colour type 6 (RGBA), deflate, adaptive filtering, no interlace
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+
+    def write_rows(self, rows):
+        """Append rows from the top down.
+
+        Args:
+            rows: (n, width, 4) uint8 array
+        """
+        import numpy as np
+
+        n = rows.shape[0]
+        if rows.shape[1:] != (self.width, 4):
+            raise ValueError(f"Expected rows of shape (n, {self.width}, 4), got {rows.shape}")
+        if self.rows_written + n > self.height:
+            raise ValueError("More rows written than the image height")
+        # Filter type 0 (None) byte in front of every scanline
+        scanlines = np.zeros((n, 1 + self.width * 4), dtype=np.uint8)
+        scanlines[:, 1:] = rows.reshape(n, -1)
+        self._add(self._compressor.compress(scanlines.tobytes()))
+        self.rows_written += n
+
+    def close(self):
+        """Finish the stream; raises ValueError if rows are missing."""
+        if self._file is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"PNG has {self.rows_written} of {self.height} rows")
+            self._add(self._compressor.flush(), force=True)
+            self._chunk(b'IEND', b'')
+        finally:
+            self._file.close()
+            self._file = None
+
+    def abort(self):
+        """Close the file without finishing it."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _add(self, data: bytes, force: bool = False):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= IDAT_CHUNK_SIZE or (force and self._pending_size):
+            self._chunk(b'IDAT', b''.join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class TiledExport:
+    """One tiled export in progress.
+
+    The PNG is written to a temporary file next to the target and moved
+    into place by finish(); cancel() or an error removes it.
+    """
+
+    def __init__(self, path: str, size: int, render_tile: Callable, supersample: int = 1,
+                 tile_size: int = DEFAULT_TILE_SIZE, max_pending: int = DEFAULT_MAX_PENDING,
+                 on_close: Optional[Callable] = None):
+        """
+        Args:
+            path: Output PNG
+            size: Output edge length in pixels (square)
+            render_tile: render_tile(x, y, w, h) -> (h*ss, w*ss, 4) uint8
+                bottom-up pixels of the output tile at (x, y) (top-left origin)
+            supersample: Pixels rendered per output pixel, in each direction
+            tile_size: Output tile edge in pixels
+            max_pending: Rendered tiles queued for the worker before step() blocks
+            on_close: Called once on the calling thread after the last tile,
+                on cancel or on error (e.g. to free GL resources)
+        """
+        if not 1 <= size <= MAX_EXPORT_SIZE:
+            raise ValueError(f"Export size must be 1-{MAX_EXPORT_SIZE}, got {size}")
+        if not 1 <= supersample <= MAX_SUPERSAMPLE:
+            raise ValueError(f"Supersample must be 1-{MAX_SUPERSAMPLE}, got {supersample}")
+        self.path = path
+        self.size = size
+        self.supersample = supersample
+        self.tile_size = tile_size
+        self._render_tile = render_tile
+        self._on_close = on_close
+        self._rows = tile_grid(size, size, tile_size)
+        self._tiles = [tile for row in self._rows for tile in row]
+        self.tiles_total = len(self._tiles)
+        self.tiles_done = 0
+        self.cancelled = False
+        self._error = None
+        self._temp_path = path + ".part"
+        self._writer = StreamingPNGWriter(self._temp_path, size, size)
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = threading.Thread(target=self._assemble, name="tiled-export", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self.tiles_done >= self.tiles_total
+
+    def step(self) -> bool:
+        """Render the next tile and hand it to the worker.
+
+        Returns:
+            True while tiles remain
+        """
+        if self.cancelled:
+            raise RuntimeError("Export was cancelled")
+        self._raise_worker_error()
+        if self.done:
+            return False
+        x, y, w, h = self._tiles[self.tiles_done]
+        try:
+            pixels = self._render_tile(x, y, w, h)
+        except Exception:
+            self.cancel()
+            raise
+        self._put((x, y, w, h, pixels))
+        self.tiles_done += 1
+        if self.done:
+            self._close_resources()
+        return not self.done
+
+    def finish(self) -> str:
+        """Render any remaining tiles, wait for the writer and move the file into place.
+
+        Returns:
+            The output path
+        """
+        while self.step():
+            pass
+        self._put(_DONE)
+        self._thread.join()
+        self._raise_worker_error()
+        os.replace(self._temp_path, self.path)
+        return self.path
+
+    def run(self) -> str:
+        """Render every tile and finish (blocking)."""
+        return self.finish()
+
+    def cancel(self):
+        """Stop the export and delete the partial file."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self._close_resources()
+        # Unblock the worker: drop queued tiles and tell it to stop
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(_DONE)
+        self._thread.join()
+        self._writer.abort()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+    def _put(self, item):
+        # Poll so a failed worker does not leave step() blocked on a full queue
+        while True:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if not self._thread.is_alive():
+                    self._raise_worker_error()
+                    raise RuntimeError("Tiled export writer stopped")
+
+    def _raise_worker_error(self):
+        if self._error is not None:
+            error = self._error
+            if not self.cancelled:
+                self.cancel()
+            raise RuntimeError(f"Tiled export failed: {error}") from error
+
+    def _close_resources(self):
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close()
+
+    def _assemble(self):
+        """Worker: downsample tiles into bands and write finished bands."""
+        import numpy as np
+
+        band = None
+        band_y = None
+        band_tiles = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE or self.cancelled:
+                    return
+                x, y, w, h, pixels = item
+                if band is None:
+                    band = np.zeros((h, self.size, 4), dtype=np.uint8)
+                    band_y, band_tiles = y, 0
+                tile = downsample(np.asarray(pixels, dtype=np.uint8)[::-1], self.supersample)
+                if tile.shape != (h, w, 4):
+                    raise ValueError(f"Tile at ({x}, {y}) is {tile.shape}, expected {(h, w, 4)}")
+                band[:, x:x + w] = tile
+                band_tiles += 1
+                if band_tiles == len(self._rows[band_y // self.tile_size]):
+                    self._writer.write_rows(band)
+                    band = None
+        except Exception as e:
+            self._error = e
+        finally:
+            if self._error is None and not self.cancelled:
+                try:
+                    self._writer.close()
+                except Exception as e:
+                    self._error = e
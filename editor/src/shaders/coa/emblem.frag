@@ -18,7 +18,8 @@ uniform float selectionTint; // 0.0 = no tint, 1.0 = full red tint for selected
 
 const float TILE_SIZE = 1.0 / 32.0;    // 0.03125 for 32×32 grid
 const float TILE_INSET = 0.0001;       // ~0.8 pixels at 8192 resolution
-const vec2 RTT_SIZE = vec2(512.0);     // CoA RTT framebuffer size
+uniform vec2 rttSize;                  // CoA RTT framebuffer size in pixels (adapts to zoom)
+const vec2 CANONICAL_RTT_SIZE = vec2(512.0);  // Size the stripe spacing is tuned for
 
 // ============================================================================
 // Blending Functions
@@ -51,7 +52,7 @@ vec2 calculateAtlasUV(vec2 localUV, uvec2 tileIndex) {
 }
 
 vec2 getCoaUV() {
-	vec2 uv = gl_FragCoord.xy / RTT_SIZE;
+	vec2 uv = gl_FragCoord.xy / rttSize;
 	uv.y = 1.0 - uv.y;  // Flip Y (OpenGL bottom-up to texture top-down)
 	return uv;
 }
@@ -77,7 +78,7 @@ vec3 applySelectionTint(vec3 color, vec2 atlasUV, float alpha) {
 	vec3 fillColor = vec3(1.0, 0.2, 0.2);   // Red tint for fill
 	
 	// Diagonal stripes (screen-space for consistent width)
-	vec2 screenPos = gl_FragCoord.xy;
+	vec2 screenPos = gl_FragCoord.xy * (CANONICAL_RTT_SIZE / rttSize);  // Same stripes at any RTT size
 	float stripe = fract((screenPos.x + screenPos.y) * 0.02);  // 0.02 = ~10px stripes at 512 resolution
 	float stripeMask = step(0.9, stripe);  // 10% stripe width, aligned to screen diagonals
 	
@@ -0,0 +1,149 @@
+#version 330 core
+
+// Batched emblem path (see emblem_batched.vert). Same shading as emblem.frag,
+// with tiles in texture arrays and per-layer values from instance attributes.
+
+in vec2 fragUV;  // Per-instance UV from vertex shader (0-1 range)
+flat in float emblemLayer;
+flat in int patternFlag;
+flat in float selectionTint; // 0.0 = no tint, 1.0 = full red tint for selected layers
+flat in vec3 primaryColor;
+flat in vec3 secondaryColor;
+flat in vec3 tertiaryColor;
+out vec4 FragColor;
+
+uniform sampler2DArray emblemArraySampler;  // One 256×256 tile per layer
+uniform sampler2DArray patternArraySampler; // Array holding the CoA pattern
+uniform int patternLayer;                   // Pattern tile layer, -1 = no pattern (full mask)
+
+const float TEXEL_SIZE = 1.0 / 256.0;  // One texel of a tile
+uniform vec2 rttSize;                  // CoA RTT framebuffer size in pixels (adapts to zoom)
+const vec2 CANONICAL_RTT_SIZE = vec2(512.0);  // Size the stripe spacing is tuned for
+
+// ============================================================================
+// Blending Functions
+// ============================================================================
+
+float overlayBlend(float base, float blend) {
+	return (blend < 0.5) 
+		? (2.0 * base * blend) 
+		: (1.0 - 2.0 * (1.0 - base) * (1.0 - blend));
+}
+
+vec3 applyOverlay(vec3 base, vec3 blend, float strength) {
+	vec3 result = vec3(
+		overlayBlend(base.r, blend.r),
+		overlayBlend(base.g, blend.g),
+		overlayBlend(base.b, blend.b)
+	);
+	return mix(base, result, strength);
+}
+
+// ============================================================================
+// Screen UV
+// ============================================================================
+
+vec2 getCoaUV() {
+	vec2 uv = gl_FragCoord.xy / rttSize;
+	uv.y = 1.0 - uv.y;  // Flip Y (OpenGL bottom-up to texture top-down)
+	return uv;
+}
+
+// ============================================================================
+// Color Computation
+// ============================================================================
+
+vec3 computeEmblemColor(vec4 mask) {
+	vec3 color = mix(primaryColor, secondaryColor, mask.g);
+	color = mix(color, tertiaryColor, mask.r);
+	// Blue channel = overlay shading (CK3 uses ~0.7 strength)
+	// Scale strength by alpha: B extends past alpha boundary (DXT artifact),
+	// so fade overlay to zero at transparent edges to prevent fringing
+	return applyOverlay(color, vec3(mask.b), 0.7);
+}
+
+vec3 applySelectionTint(vec3 color, vec3 tileUV, float alpha) {
+	if (selectionTint < 0.01 || alpha < 0.01) return color;
+	
+	// Colors
+	vec3 cageColor = vec3(1.0, 0.7, 0.7);   // Bright pink for edges + stripes
+	vec3 fillColor = vec3(1.0, 0.2, 0.2);   // Red tint for fill
+	
+	// Diagonal stripes (screen-space for consistent width)
+	vec2 screenPos = gl_FragCoord.xy * (CANONICAL_RTT_SIZE / rttSize);  // Same stripes at any RTT size
+	float stripe = fract((screenPos.x + screenPos.y) * 0.02);  // 0.02 = ~10px stripes at 512 resolution
+	float stripeMask = step(0.9, stripe);  // 10% stripe width, aligned to screen diagonals
+	
+	stripe = fract((screenPos.x - screenPos.y) * 0.02);  // 0.02 = ~10px stripes at 512 resolution
+	stripeMask = max(stripeMask, step(0.9, stripe));  // 10% stripe width, aligned to screen diagonals
+	
+	// Edge detection: sample 4 neighbors from emblem alpha
+	float alphaL = texture(emblemArraySampler, tileUV + vec3(-TEXEL_SIZE, 0.0, 0.0)).a;
+	float alphaR = texture(emblemArraySampler, tileUV + vec3( TEXEL_SIZE, 0.0, 0.0)).a;
+	float alphaU = texture(emblemArraySampler, tileUV + vec3(0.0,  TEXEL_SIZE, 0.0)).a;
+	float alphaD = texture(emblemArraySampler, tileUV + vec3(0.0, -TEXEL_SIZE, 0.0)).a;
+	
+	// Edge where any neighbor has significantly different alpha
+	float maxDiff = max(max(abs(alpha - alphaL), abs(alpha - alphaR)),
+	                    max(abs(alpha - alphaU), abs(alpha - alphaD)));
+	float isEdge = step(0.1, maxDiff);
+	
+	// Combine: cage = stripes OR edges (both bright pink)
+	float cageMask = max(stripeMask, isEdge);
+	
+	// Fill gets red tint, cage gets pink
+	vec3 tinted = mix(color, fillColor, 0.35);        // Red fill base
+	tinted = mix(tinted, cageColor, cageMask * 0.9);  // Pink cage on top
+	
+	return mix(color, tinted, selectionTint);
+}
+
+// ============================================================================
+// Pattern Mask Calculation
+// ============================================================================
+
+float computePatternMask(vec4 patternSample) {
+	// Pattern flag bits: 1=R, 2=G, 4=B
+	// 0 or 7 = all channels (full mask)
+	int channels = patternFlag & 7;
+	
+	if (channels == 0 || channels == 7) {
+		return 1.0;  // No masking or all channels = full opacity
+	}
+	
+	float mask = 0.0;
+	if ((channels & 1) != 0) mask += max(0.0, patternSample.r - patternSample.g);
+	if ((channels & 2) != 0) mask += max(0.0, patternSample.g - patternSample.b);
+	if ((channels & 4) != 0) mask += patternSample.b;
+	
+	return clamp(mask, 0.0, 1.0);
+}
+
+// ============================================================================
+// Main
+// ============================================================================
+
+void main() {
+	// Sample emblem mask (RGB stored premultiplied by alpha)
+	vec3 emblemUV = vec3(fragUV, emblemLayer);
+	vec4 emblemMask = texture(emblemArraySampler, emblemUV);
+	
+	// Un-premultiply all RGB to recover original mask values
+	if (emblemMask.a > 0.001) {
+		emblemMask.rgb *= 1.0 / emblemMask.a;
+	}
+	
+	// Compute base color from emblem channels
+	vec3 color = computeEmblemColor(emblemMask);
+	
+	// Sample pattern mask and compute alpha multiplier
+	vec4 patternSample = patternLayer < 0
+		? vec4(1.0)
+		: texture(patternArraySampler, vec3(getCoaUV(), float(patternLayer)));
+	float patternAlpha = computePatternMask(patternSample);
+	
+	// Final output
+	float finalAlpha = emblemMask.a * patternAlpha;
+	color = applySelectionTint(color, emblemUV, emblemMask.a);
+	FragColor = vec4(color, finalAlpha);
+}
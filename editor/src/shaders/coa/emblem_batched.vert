@@ -0,0 +1,60 @@
+#version 330 core
+
+// Batched emblem path: one instanced draw per CoA. Per-instance records are
+// built by services/emblem_batch.py (INSTANCE_FIELDS, same order).
+
+layout(location = 0) in vec3 vertexPosition;
+layout(location = 1) in vec2 vertexUV;
+
+layout(location = 2) in vec2 instancePosition;   // Center in pixels from RTT center
+layout(location = 3) in vec2 instanceScale;      // Full width/height in pixels, negative = flip
+layout(location = 4) in float instanceRotation;  // Radians
+layout(location = 5) in float instanceLayer;     // Emblem tile layer in the texture array
+layout(location = 6) in float instancePatternFlag;
+layout(location = 7) in float instanceSelectionTint;
+layout(location = 8) in vec3 instancePrimaryColor;
+layout(location = 9) in vec3 instanceSecondaryColor;
+layout(location = 10) in vec3 instanceTertiaryColor;
+
+out vec2 fragUV;
+flat out float emblemLayer;
+flat out int patternFlag;
+flat out float selectionTint;
+flat out vec3 primaryColor;
+flat out vec3 secondaryColor;
+flat out vec3 tertiaryColor;
+
+uniform vec2 screenRes;   // Viewport dimensions in pixels (width, height)
+
+void main() {
+	// Same transform as emblem.vert: FLIP → ROTATE → SCALE → TRANSLATE
+	vec2 vertex = vertexPosition.xy;
+	vec2 normalizedScale = abs(instanceScale) / (screenRes / 2.0);
+	vec2 normalizedPosition = instancePosition / (screenRes / 2.0);
+	
+	vertex *= vec2(
+		instanceScale.x >= 0.0 ? 1.0 : -1.0,
+		instanceScale.y >= 0.0 ? 1.0 : -1.0
+	);
+	
+	if (instanceRotation != 0.0) {
+		float cosR = cos(instanceRotation);
+		float sinR = sin(instanceRotation);
+		vertex = vec2(
+			vertex.x * cosR - vertex.y * sinR,
+			vertex.x * sinR + vertex.y * cosR
+		);
+	}
+	
+	vertex *= normalizedScale;
+	vertex += normalizedPosition;
+	gl_Position = vec4(vertex, 0.0, 1.0);
+	
+	fragUV = vertexUV;
+	emblemLayer = instanceLayer;
+	patternFlag = int(instancePatternFlag);
+	selectionTint = instanceSelectionTint;
+	primaryColor = instancePrimaryColor;
+	secondaryColor = instanceSecondaryColor;
+	tertiaryColor = instanceTertiaryColor;
+}
@@ -0,0 +1,26 @@
+#version 330 core
+
+// Base pattern for the batched path: pattern.frag with the tile in a texture array.
+
+in vec2 vTexCoord;  // 0-1 range from pattern.vert
+out vec4 fragColor;
+
+uniform sampler2DArray patternArraySampler;  // One 256×256 tile per layer
+uniform int patternLayer;                    // Pattern tile layer, -1 = solid white mask
+uniform vec3 color1;
+uniform vec3 color2;
+uniform vec3 color3;
+
+void main()
+{
+	vec4 textureMask = patternLayer < 0
+		? vec4(1.0)
+		: texture(patternArraySampler, vec3(vTexCoord, float(patternLayer)));
+	
+	// Mix colors based on mask channels
+	vec3 outputColor = vec3(0.0);
+	outputColor = mix(color1, color2, textureMask.g);
+	outputColor = mix(outputColor, color3, textureMask.b);
+	
+	fragColor = vec4(outputColor, textureMask.a);
+}
@@ -1,11 +1,11 @@
 """Global metadata cache for emblem and pattern color information.
 
 This module provides globally accessible metadata for assets, loaded once
-and cached for the entire application lifecycle.
+and cached for the entire application lifecycle. The data comes from the
+shared AssetCatalog (services/asset_catalog.py), so the metadata JSON is
+only decoded once per process.
 """
 
-import json
-from pathlib import Path
 from typing import Optional, Dict
 
 # Global cache
@@ -14,26 +14,15 @@ _PATTERN_METADATA: Optional[Dict[str, dict]] = None
 
 
 def load_metadata():
-    """Load metadata from JSON files into global cache."""
+    """Load metadata into the global cache (from the shared asset catalog)."""
     global _EMBLEM_METADATA, _PATTERN_METADATA
     
     if _EMBLEM_METADATA is None or _PATTERN_METADATA is None:
-        from utils.path_resolver import get_emblem_metadata_path, get_pattern_metadata_path
+        from services.asset_catalog import get_catalog
         
-        _EMBLEM_METADATA = {}
-        _PATTERN_METADATA = {}
-        
-        # Load emblems
-        emblem_json = get_emblem_metadata_path()
-        if emblem_json.exists():
-            with open(emblem_json, 'r', encoding='utf-8') as f:
-                _EMBLEM_METADATA = json.load(f)
-        
-        # Load patterns
-        pattern_json = get_pattern_metadata_path()
-        if pattern_json.exists():
-            with open(pattern_json, 'r', encoding='utf-8') as f:
-                _PATTERN_METADATA = json.load(f)
+        catalog = get_catalog()
+        _EMBLEM_METADATA = catalog.emblem_metadata()
+        _PATTERN_METADATA = catalog.pattern_metadata()
 
 
 def get_texture_color_count(filename: str) -> int:
@@ -104,5 +93,7 @@ def get_pattern_metadata() -> Dict[str, dict]:
 def clear_cache():
     """Clear the metadata cache (useful for testing or reloading)."""
     global _EMBLEM_METADATA, _PATTERN_METADATA
+    from services.asset_catalog import clear_catalog
+    clear_catalog()
     _EMBLEM_METADATA = None
     _PATTERN_METADATA = None
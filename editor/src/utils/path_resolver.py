@@ -8,6 +8,8 @@ import sys
 import os
 from pathlib import Path
 
+from asset_converter.src import output_layout
+
 
 def get_base_dir() -> Path:
     """Get the base directory for the application.
@@ -42,6 +44,10 @@ def get_assets_dir() -> Path:
     return get_base_dir() / "ck3_assets"
 
 
+def _assets(assets_dir) -> Path:
+    return Path(assets_dir) if assets_dir is not None else get_assets_dir()
+
+
 def get_shader_dir() -> Path:
     """Get the shader directory path.
     
@@ -60,58 +66,76 @@ def get_shader_dir() -> Path:
         return Path(__file__).resolve().parent.parent / "shaders"
 
 
-def get_emblem_metadata_path() -> Path:
+def get_emblem_metadata_path(assets_dir: Path = None) -> Path:
     """Get path to emblem metadata JSON file.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Full path to 50_coa_designer_emblems.json
     """
-    return get_assets_dir() / "coa_emblems" / "metadata" / "50_coa_designer_emblems.json"
+    return _assets(assets_dir) / output_layout.EMBLEM_METADATA_PATH
 
 
-def get_pattern_metadata_path() -> Path:
+def get_pattern_metadata_path(assets_dir: Path = None) -> Path:
     """Get path to pattern metadata JSON file.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Full path to 50_coa_designer_patterns.json
     """
-    return get_assets_dir() / "coa_patterns" / "metadata" / "50_coa_designer_patterns.json"
+    return _assets(assets_dir) / output_layout.PATTERN_METADATA_PATH
 
 
-def get_emblem_atlas_dir() -> Path:
+def get_emblem_atlas_dir(assets_dir: Path = None) -> Path:
     """Get directory containing emblem atlas PNGs.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Path to emblem atlases directory
     """
-    return get_assets_dir() / "coa_emblems" / "atlases"
+    return _assets(assets_dir) / output_layout.EMBLEM_ATLAS_DIR
 
 
-def get_pattern_atlas_dir() -> Path:
+def get_pattern_atlas_dir(assets_dir: Path = None) -> Path:
     """Get directory containing pattern atlas PNGs.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Path to pattern atlases directory
     """
-    return get_assets_dir() / "coa_patterns" / "atlases"
+    return _assets(assets_dir) / output_layout.PATTERN_ATLAS_DIR
 
 
-def get_emblem_source_dir() -> Path:
+def get_emblem_source_dir(assets_dir: Path = None) -> Path:
     """Get directory containing flat emblem PNGs for thumbnails.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Path to emblem source images directory
     """
-    return get_assets_dir() / "coa_emblems" / "source"
+    return _assets(assets_dir) / output_layout.EMBLEM_SOURCE_DIR
 
 
-def get_pattern_source_dir() -> Path:
+def get_pattern_source_dir(assets_dir: Path = None) -> Path:
     """Get directory containing flat pattern PNGs for thumbnails.
     
+    Args:
+        assets_dir: ck3_assets directory (default: get_assets_dir())
+    
     Returns:
         Path: Path to pattern source images directory
     """
-    return get_assets_dir() / "coa_patterns" / "source"
+    return _assets(assets_dir) / output_layout.PATTERN_SOURCE_DIR
 
 
 def get_frames_dir() -> Path:
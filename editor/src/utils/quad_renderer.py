@@ -58,6 +58,55 @@ class QuadRenderer:
         
         return vao, vbo, ebo
     
+    # First attribute location used for per-instance data (0/1 are the quad)
+    INSTANCE_ATTRIBUTE_BASE = 2
+    
+    @staticmethod
+    def create_instanced_unit_quad(instance_fields):
+        """Create the unit quad plus a per-instance attribute buffer.
+        
+        Per-instance attributes start at location INSTANCE_ATTRIBUTE_BASE,
+        one location per field, with divisor 1.
+        
+        Args:
+            instance_fields: Sequence of (name, float count) describing one
+                float32 instance record (e.g. emblem_batch.INSTANCE_FIELDS)
+            
+        Returns:
+            tuple: (vao, vbo, ebo, instance_vbo)
+        """
+        vao, vbo, ebo = QuadRenderer.create_unit_quad()
+        
+        vao.bind()
+        instance_vbo = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        instance_vbo.create()
+        instance_vbo.setUsagePattern(QOpenGLBuffer.StreamDraw)
+        instance_vbo.bind()
+        for i in range(len(instance_fields)):
+            location = QuadRenderer.INSTANCE_ATTRIBUTE_BASE + i
+            gl.glEnableVertexAttribArray(location)
+            gl.glVertexAttribDivisor(location, 1)
+        QuadRenderer.point_instance_attributes(instance_fields, 0)
+        vao.release()
+        instance_vbo.release()
+        
+        return vao, vbo, ebo, instance_vbo
+    
+    @staticmethod
+    def point_instance_attributes(instance_fields, first_instance):
+        """Point the per-instance attributes at record first_instance.
+        
+        GL 3.3 has no base-instance draw, so each instanced draw over a
+        sub-range re-points the attributes instead. The VAO and instance
+        buffer must be bound.
+        """
+        stride = sum(size for _, size in instance_fields) * 4
+        offset = first_instance * stride
+        for i, (_, size) in enumerate(instance_fields):
+            gl.glVertexAttribPointer(QuadRenderer.INSTANCE_ATTRIBUTE_BASE + i, size, gl.GL_FLOAT,
+                                     gl.GL_FALSE, stride, gl.ctypes.c_void_p(offset))
+            offset += size * 4
+    
     @staticmethod
     def render_textured_quad(vbo, bounds, uv_coords, flip_v=False):
         """Render a simple textured quad.
@@ -0,0 +1,148 @@
+"""
+Tests for the shared asset catalog (services/asset_catalog.py).
+
+Covers:
+- Entries only for metadata with an existing source PNG
+- Category index, color counts and atlas slots
+- Precompiled index reused on warm load and rebuilt when inputs change
+- utils.metadata_cache reads through the shared catalog
+"""
+import json
+import os
+
+import pytest
+
+from services import asset_catalog
+from services.asset_catalog import AssetCatalog, compute_atlas_slots
+
+
+EMBLEMS = {
+    "\ufeff": None,
+    "ce_fleur.dds": {"category": "flowers", "colors": 1},
+    "ce_lion.dds": {"category": "animals", "colors": 2},
+    "ce_missing_png.dds": {"category": "animals", "colors": 3},
+    "ce_blank.dds": {"colors": 0},
+}
+PATTERNS = {
+    "pattern_solid.dds": {"colors": 1},
+    "pattern_hidden.dds": {"colors": 2, "visible": False},
+}
+
+
+def _write_assets(root, emblems=EMBLEMS, patterns=PATTERNS):
+    for kind, metadata, name in (("coa_emblems", emblems, "50_coa_designer_emblems.json"),
+                                 ("coa_patterns", patterns, "50_coa_designer_patterns.json")):
+        (root / kind / "metadata").mkdir(parents=True, exist_ok=True)
+        (root / kind / "source").mkdir(parents=True, exist_ok=True)
+        (root / kind / "metadata" / name).write_text(json.dumps(metadata), encoding="utf-8")
+        for filename in metadata:
+            if filename.endswith(".dds") and "missing" not in filename:
+                (root / kind / "source" / filename.replace(".dds", ".png")).write_bytes(b"png")
+
+
+@pytest.fixture
+def assets_dir(tmp_path):
+    _write_assets(tmp_path)
+    return tmp_path
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Catalog contents
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestCatalogContents:
+
+    def test_entries_require_source_png(self, assets_dir):
+        catalog = AssetCatalog.load(assets_dir, use_index=False)
+        assert list(catalog.emblems) == ["ce_fleur.dds", "ce_lion.dds", "ce_blank.dds"]
+        assert list(catalog.patterns) == ["pattern_solid.dds", "pattern_hidden.dds"]
+        entry = catalog.get("ce_lion.dds")
+        assert entry.path == str(assets_dir / "coa_emblems" / "source" / "ce_lion.png")
+        assert entry.png_filename == "ce_lion.png"
+        assert catalog.get("pattern_hidden.dds").visible is False
+
+    def test_category_index(self, assets_dir):
+        catalog = AssetCatalog.load(assets_dir, use_index=False)
+        by_category = catalog.emblems_by_category()
+        assert sorted(by_category) == ["Animals", "Flowers"]
+        assert [e.filename for e in by_category["Animals"]] == ["ce_lion.dds"]
+
+    def test_color_count_and_category_cover_all_metadata(self, assets_dir):
+        catalog = AssetCatalog.load(assets_dir, use_index=False)
+        assert catalog.color_count("ce_lion.dds") == 2
+        assert catalog.color_count("ce_missing_png.dds") == 3
+        assert catalog.color_count("pattern_hidden.dds") == 2
+        assert catalog.color_count("unknown.dds") == 3
+        assert catalog.category("ce_fleur.dds") == "flowers"
+        assert catalog.category("unknown.dds") is None
+
+    def test_atlas_slots_follow_packing_order(self, assets_dir):
+        catalog = AssetCatalog.load(assets_dir, use_index=False)
+        files = catalog.atlas_files()
+        assert [f for f, _ in files][:2] == ["pattern_solid.dds", "pattern_hidden.dds"]
+        slots = compute_atlas_slots([f for f, _ in files])
+        for filename, _ in files:
+            assert catalog.atlas_slot(filename) == slots[filename]
+        assert catalog.atlas_slot("pattern_solid.dds") == (0, 0.0, 0.0, 256 / 8192, 256 / 8192)
+
+    def test_atlas_slots_wrap_to_next_atlas(self):
+        slots = compute_atlas_slots(range(5), tile_size=2, atlas_size=4)
+        assert slots[3] == (0, 0.5, 0.5, 1.0, 1.0)
+        assert slots[4] == (1, 0.0, 0.0, 0.5, 0.5)
+
+    def test_missing_assets_dir_is_empty(self, tmp_path):
+        catalog = AssetCatalog.load(tmp_path / "nope")
+        assert len(catalog) == 0
+        assert catalog.emblem_metadata() == {}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Precompiled index
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestIndex:
+
+    def test_warm_load_skips_json(self, assets_dir, monkeypatch):
+        AssetCatalog.load(assets_dir)
+        assert (assets_dir / asset_catalog.INDEX_FILENAME).exists()
+
+        def fail(path):
+            raise AssertionError(f"metadata decoded on warm load: {path}")
+        monkeypatch.setattr(asset_catalog, "_read_json", fail)
+        catalog = AssetCatalog.load(assets_dir)
+        assert list(catalog.emblems) == ["ce_fleur.dds", "ce_lion.dds", "ce_blank.dds"]
+
+    def test_index_rebuilt_when_metadata_changes(self, assets_dir):
+        AssetCatalog.load(assets_dir)
+        emblems = dict(EMBLEMS, **{"ce_new.dds": {"category": "new", "colors": 1}})
+        _write_assets(assets_dir, emblems=emblems)
+        # Guarantee a different mtime even on coarse filesystem clocks
+        metadata = assets_dir / "coa_emblems" / "metadata" / "50_coa_designer_emblems.json"
+        st = os.stat(metadata)
+        os.utime(metadata, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        catalog = AssetCatalog.load(assets_dir)
+        assert "ce_new.dds" in catalog.emblems
+
+    def test_corrupt_index_ignored(self, assets_dir):
+        (assets_dir / asset_catalog.INDEX_FILENAME).write_bytes(b"not a pickle")
+        catalog = AssetCatalog.load(assets_dir)
+        assert len(catalog) == 5
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Shared instance
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_metadata_cache_uses_shared_catalog(assets_dir, monkeypatch):
+    from utils import metadata_cache
+
+    metadata_cache.clear_cache()
+    monkeypatch.setattr(asset_catalog, "_CATALOG", AssetCatalog.load(assets_dir, use_index=False))
+    try:
+        assert metadata_cache.get_texture_color_count("ce_lion.dds") == 2
+        assert metadata_cache.get_texture_category("ce_fleur.dds") == "flowers"
+        assert metadata_cache.get_emblem_metadata()["ce_fleur.dds"]["colors"] == 1
+    finally:
+        metadata_cache._EMBLEM_METADATA = None
+        metadata_cache._PATTERN_METADATA = None
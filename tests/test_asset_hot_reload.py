@@ -0,0 +1,196 @@
+"""
+Tests for asset hot-reload: the converter's watch mode
+(asset_converter/src/watch_mode.py) and the editor's change monitor
+(services/asset_hot_reload.py).
+
+Covers:
+- Only changed emblem/pattern DDS files are re-baked, with the same
+  output as a full conversion
+- Re-baked emblems get their alpha geometry re-measured in the metadata
+- Files overridden by a later source are baked from that source
+- Change log batches: appended, trimmed, atomically replaced
+- The editor monitor ignores batches from before it started, merges
+  batches since the last poll and reports missed batches
+"""
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from asset_converter.src.atlas_baking import create_emblem_atlas
+from asset_converter.src.dds_loading import convert_dds_file
+from asset_converter.src.emblem_geometry import compute_alpha_geometry
+from asset_converter.src.mod_support import build_asset_sources
+from asset_converter.src import watch_mode
+from asset_converter.src.watch_mode import AssetWatcher, read_change_log, write_change_log
+from benchmarks.synthetic import make_dds_bytes
+from services.asset_hot_reload import AssetChangeMonitor
+
+_EMBLEMS = ("gfx", "coat_of_arms", "colored_emblems")
+_PATTERNS = ("gfx", "coat_of_arms", "patterns")
+
+
+def _write_dds(root, parts, name, seed, mtime=None):
+    directory = root.joinpath(*parts)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_bytes(make_dds_bytes('bgra', 16, 16, seed=seed))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def _pixels(path):
+    with Image.open(path) as img:
+        return np.asarray(img)
+
+
+def _game(tmp_path):
+    ck3 = tmp_path / "ck3"
+    _write_dds(ck3 / "game", _EMBLEMS, "ce_lion.dds", seed=1, mtime=10**18)
+    _write_dds(ck3 / "game", _EMBLEMS, "ce_cross.dds", seed=2, mtime=10**18)
+    _write_dds(ck3 / "game", _PATTERNS, "pattern_solid.dds", seed=3, mtime=10**18)
+    return ck3
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Converter watch mode
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestAssetWatcher:
+
+    def test_nothing_changed(self, tmp_path):
+        watcher = AssetWatcher(build_asset_sources(_game(tmp_path)), tmp_path / "out", log=lambda m: None)
+        assert watcher.poll() == []
+        assert not (tmp_path / "out" / watch_mode.CHANGE_LOG_FILENAME).exists()
+
+    def test_only_changed_files_rebaked(self, tmp_path):
+        ck3 = _game(tmp_path)
+        out = tmp_path / "out"
+        watcher = AssetWatcher(build_asset_sources(ck3), out, log=lambda m: None)
+        lion = _write_dds(ck3 / "game", _EMBLEMS, "ce_lion.dds", seed=9, mtime=2 * 10**18)
+
+        assert watcher.poll() == ["ce_lion.dds"]
+        assert sorted(p.name for p in (out / "coa_emblems" / "source").iterdir()) == ["ce_lion.png"]
+        assert not (out / "coa_patterns").exists()
+
+        # Same bytes as a full conversion of that file
+        expected_source, expected_atlas = tmp_path / "full.png", tmp_path / "full_atlas.png"
+        assert convert_dds_file(lion, expected_source, expected_atlas, create_emblem_atlas)
+        np.testing.assert_array_equal(_pixels(out / "coa_emblems" / "source" / "ce_lion.png"),
+                                      _pixels(expected_source))
+        np.testing.assert_array_equal(_pixels(out / "coa_emblems" / "atlases" / "ce_lion_atlas.png"),
+                                      _pixels(expected_atlas))
+
+        assert watcher.poll() == []
+        assert read_change_log(out)['batches'][0]['files'] == ["ce_lion.dds"]
+
+    def test_emblem_geometry_patched_into_metadata(self, tmp_path):
+        ck3 = _game(tmp_path)
+        out = tmp_path / "out"
+        metadata_path = out / "coa_emblems" / "metadata" / "50_coa_designer_emblems.json"
+        metadata_path.parent.mkdir(parents=True)
+        metadata_path.write_text(json.dumps({"ce_lion.dds": {"colors": 2}}), encoding="utf-8")
+        watcher = AssetWatcher(build_asset_sources(ck3), out, log=lambda m: None)
+        lion = _write_dds(ck3 / "game", _EMBLEMS, "ce_lion.dds", seed=9, mtime=2 * 10**18)
+
+        assert watcher.poll() == ["ce_lion.dds"]
+        measured = []
+        convert_dds_file(lion, tmp_path / "full.png", source_fn=lambda pixels: measured.append(
+            compute_alpha_geometry(pixels)))
+        entry = json.loads(metadata_path.read_text(encoding="utf-8"))["ce_lion.dds"]
+        assert entry == {"colors": 2, **measured[0]}
+
+    def test_pattern_change(self, tmp_path):
+        ck3 = _game(tmp_path)
+        out = tmp_path / "out"
+        watcher = AssetWatcher(build_asset_sources(ck3), out, log=lambda m: None)
+        _write_dds(ck3 / "game", _PATTERNS, "pattern_solid.dds", seed=4, mtime=2 * 10**18)
+        assert watcher.poll() == ["pattern_solid.dds"]
+        assert (out / "coa_patterns" / "atlases" / "pattern_solid_atlas.png").exists()
+
+    def test_mod_override_wins(self, tmp_path):
+        ck3 = _game(tmp_path)
+        mod_dir = tmp_path / "mods"
+        mod = mod_dir / "heraldry"
+        _write_dds(mod, _EMBLEMS, "ce_lion.dds", seed=5, mtime=10**18)
+        (mod_dir / "heraldry.mod").write_text('name = "Heraldry"\npath = "{}"\n'.format(mod.as_posix()))
+        out = tmp_path / "out"
+        watcher = AssetWatcher(build_asset_sources(ck3, mod_dir), out, log=lambda m: None)
+
+        # Editing the overridden base game file bakes nothing new
+        _write_dds(ck3 / "game", _EMBLEMS, "ce_lion.dds", seed=6, mtime=2 * 10**18)
+        assert watcher.poll() == []
+
+        mod_lion = _write_dds(mod, _EMBLEMS, "ce_lion.dds", seed=7, mtime=2 * 10**18)
+        assert watcher.poll() == ["ce_lion.dds"]
+        convert_dds_file(mod_lion, tmp_path / "mod.png")
+        np.testing.assert_array_equal(_pixels(out / "coa_emblems" / "source" / "ce_lion.png"),
+                                      _pixels(tmp_path / "mod.png"))
+
+    def test_unreadable_file_logged_and_skipped(self, tmp_path):
+        ck3 = _game(tmp_path)
+        messages = []
+        watcher = AssetWatcher(build_asset_sources(ck3), tmp_path / "out", log=messages.append)
+        broken = ck3 / "game" / "gfx" / "coat_of_arms" / "colored_emblems" / "ce_broken.dds"
+        broken.write_bytes(b"not a dds")
+        assert watcher.poll() == []
+        assert any("ce_broken.dds" in m for m in messages)
+        # Not retried until it changes again
+        messages.clear()
+        assert watcher.poll() == [] and messages == []
+
+
+class TestChangeLog:
+
+    def test_batches_are_numbered_and_trimmed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(watch_mode, "CHANGE_LOG_LIMIT", 2)
+        for i in range(3):
+            assert write_change_log(tmp_path, [f"ce_{i}.dds"]) == i + 1
+        log = read_change_log(tmp_path)
+        assert log['sequence'] == 3
+        assert [b['sequence'] for b in log['batches']] == [2, 3]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_corrupt_log_restarts(self, tmp_path):
+        (tmp_path / watch_mode.CHANGE_LOG_FILENAME).write_text("{")
+        assert read_change_log(tmp_path) == {'sequence': 0, 'batches': []}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Editor change monitor
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestAssetChangeMonitor:
+
+    def test_earlier_batches_ignored(self, tmp_path):
+        write_change_log(tmp_path, ["ce_old.dds"])
+        monitor = AssetChangeMonitor(tmp_path)
+        assert monitor.sequence == 1
+        assert monitor.poll() == []
+
+    def test_batches_since_last_poll(self, tmp_path):
+        monitor = AssetChangeMonitor(tmp_path)
+        assert monitor.poll() == []  # no log yet
+        write_change_log(tmp_path, ["ce_lion.dds", "ce_cross.dds"])
+        write_change_log(tmp_path, ["ce_lion.dds", "pattern_solid.dds"])
+        assert monitor.poll() == ["ce_cross.dds", "ce_lion.dds", "pattern_solid.dds"]
+        assert monitor.poll() == []
+
+    def test_missed_batches_reload_everything(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(watch_mode, "CHANGE_LOG_LIMIT", 1)
+        monitor = AssetChangeMonitor(tmp_path)
+        write_change_log(tmp_path, ["ce_a.dds"])
+        write_change_log(tmp_path, ["ce_b.dds"])
+        assert monitor.poll() is None
+        assert monitor.poll() == []
+
+    def test_unreadable_log_retried(self, tmp_path, capsys):
+        monitor = AssetChangeMonitor(tmp_path)
+        path = tmp_path / watch_mode.CHANGE_LOG_FILENAME
+        path.write_text("{")
+        assert monitor.poll() == []
+        assert "could not read" in capsys.readouterr().out
+        path.write_text(json.dumps({'sequence': 1, 'batches': [{'sequence': 1, 'files': ["ce_a.dds"]}]}))
+        assert monitor.poll() == ["ce_a.dds"]
@@ -0,0 +1,81 @@
+"""
+Tests for atlas baking (asset_converter/src/atlas_baking.py).
+
+The reference is the per-quadrant extract-and-paste path the baking engine
+replaced (kept in benchmarks/converter.py for timing).
+
+Covers:
+- create_emblem_atlas / create_pattern_atlas are bit-exact with the
+  reference for RGBA, RGB, grayscale and off-size sources
+- Every (channel, alpha) pair of the multiply quadrants
+- Batched stacks match per-tile baking and fill a preallocated output
+- Shape and dtype validation
+"""
+import numpy as np
+import pytest
+
+from asset_converter.src.atlas_baking import (
+    bake_emblem_atlases, bake_pattern_atlases, create_emblem_atlas, create_pattern_atlas, resize_to_tile,
+)
+from benchmarks.converter import paste_emblem_atlas, paste_pattern_atlas
+
+
+def _random(shape, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Bit-exact with the paste path
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("shape", [(256, 256, 4), (256, 256, 3), (256, 256), (300, 200, 4), (64, 64)],
+                         ids=["rgba", "rgb", "gray", "resized-rgba", "resized-gray"])
+def test_matches_reference(shape):
+    img = _random(shape)
+    # The reference expects tiles; resize the same way the old functions did
+    tile = resize_to_tile(img)
+    np.testing.assert_array_equal(np.asarray(create_emblem_atlas(img)), np.asarray(paste_emblem_atlas(tile)))
+    np.testing.assert_array_equal(np.asarray(create_pattern_atlas(img)), np.asarray(paste_pattern_atlas(tile)))
+
+
+def test_every_channel_alpha_pair():
+    ramp = np.arange(256, dtype=np.uint8)
+    tile = np.empty((256, 256, 4), dtype=np.uint8)
+    tile[..., 0] = ramp[:, np.newaxis]
+    tile[..., 1] = ramp[:, np.newaxis]
+    tile[..., 2] = ramp[:, np.newaxis]
+    tile[..., 3] = ramp[np.newaxis, :]
+    np.testing.assert_array_equal(np.asarray(create_emblem_atlas(tile)), np.asarray(paste_emblem_atlas(tile)))
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Batches
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_batch_matches_single():
+    tiles = _random((3, 256, 256, 4), seed=5)
+    emblems = bake_emblem_atlases(tiles)
+    patterns = bake_pattern_atlases(tiles)
+    assert emblems.shape == (3, 512, 512, 4)
+    assert patterns.shape == (3, 256, 512, 4)
+    for tile, emblem, pattern in zip(tiles, emblems, patterns):
+        np.testing.assert_array_equal(emblem, np.asarray(create_emblem_atlas(tile)))
+        np.testing.assert_array_equal(pattern, np.asarray(create_pattern_atlas(tile)))
+
+
+def test_fills_preallocated_output():
+    tiles = _random((2, 256, 256), seed=1)
+    out = np.zeros((2, 512, 512, 4), dtype=np.uint8)
+    assert bake_emblem_atlases(tiles, out=out) is out
+    np.testing.assert_array_equal(out[1], np.asarray(create_emblem_atlas(tiles[1])))
+
+
+@pytest.mark.parametrize("images, out", [
+    (np.zeros((1, 128, 128, 4), np.uint8), None),
+    (np.zeros((256, 256, 4), np.uint8), None),
+    (np.zeros((1, 256, 256, 4), np.float32), None),
+    (np.zeros((1, 256, 256, 4), np.uint8), np.zeros((2, 512, 512, 4), np.uint8)),
+], ids=["tile-size", "missing-batch-axis", "dtype", "out-shape"])
+def test_rejects_bad_input(images, out):
+    with pytest.raises(ValueError):
+        bake_emblem_atlases(images, out=out)
@@ -0,0 +1,176 @@
+"""
+Tests for the benchmark suite plumbing (benchmarks/).
+
+Covers:
+- Synthetic CoA generation is deterministic and produces the requested size
+- Baseline comparison flags only real slowdowns
+- run_suite() produces a results dict for a tiny smoke run
+- Only environment errors skip a stage; skipped stages with a baseline are reported
+- Shared CLI tail (finish) saves, compares and sets the exit status
+- Converter suite: per-format DDS decoder comparison
+"""
+import argparse
+
+import pytest
+
+from benchmarks import run_benchmarks
+from benchmarks.converter import compare_decoders
+from benchmarks.run_benchmarks import compare, finish, run_suite, skipped_with_baseline
+from benchmarks.synthetic import make_coa_text
+from models.coa import CoA
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Synthetic CoAs
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestSyntheticCoA:
+
+    def test_deterministic(self):
+        assert make_coa_text(20, 3, seed=7) == make_coa_text(20, 3, seed=7)
+        assert make_coa_text(20, 3, seed=7) != make_coa_text(20, 3, seed=8)
+
+    def test_layer_and_instance_counts(self):
+        coa = CoA.from_string(make_coa_text(12, 4))
+        assert coa.get_layer_count() == 12
+        uuid = coa.get_all_layer_uuids()[0]
+        assert coa.get_layer_instance_count(uuid) == 4
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Baseline comparison
+# ══════════════════════════════════════════════════════════════════════════
+
+def _results(**medians):
+    return {'cases': {key: {'median_ms': ms} for key, ms in medians.items()}}
+
+
+class TestCompare:
+
+    def test_within_tolerance_passes(self):
+        assert compare(_results(a=11.0), _results(a=10.0), tolerance=0.25) == []
+
+    def test_slowdown_flagged(self):
+        regressions = compare(_results(a=20.0), _results(a=10.0), tolerance=0.25)
+        assert [r['key'] for r in regressions] == ['a']
+        assert regressions[0]['ratio'] == 2.0
+
+    def test_tiny_absolute_delta_ignored(self):
+        assert compare(_results(a=0.2), _results(a=0.05), tolerance=0.25) == []
+
+    def test_cases_missing_from_baseline_ignored(self):
+        assert compare(_results(a=50.0, b=1.0), _results(b=1.0)) == []
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Smoke run
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_run_suite_smoke():
+    results = run_suite(
+        stages=('parse', 'serialize'),
+        scales=[('layers=5', 5, 1)],
+        repeat=1,
+        include_samples=False,
+    )
+    assert set(results['cases']) == {'parse/layers=5', 'serialize/layers=5'}
+    case = results['cases']['parse/layers=5']
+    assert case['runs'] == 1
+    assert case['median_ms'] >= 0.0 and case['peak_kib'] > 0.0
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Skipped stages
+# ══════════════════════════════════════════════════════════════════════════
+
+def _failing_stage(error):
+    def factory(texts, ctx):
+        raise error
+    return factory
+
+
+class TestSkippedStages:
+
+    def test_environment_error_skips_stage(self, monkeypatch):
+        monkeypatch.setitem(run_benchmarks.STAGE_FACTORIES, 'render',
+                            _failing_stage(RuntimeError("Failed to create QOpenGLContext")))
+        results = run_suite(stages=('render',), scales=[('layers=5', 5, 1)],
+                            repeat=1, include_samples=False)
+        assert results['cases'] == {}
+        assert 'QOpenGLContext' in results['skipped']['render']
+
+    def test_bug_in_stage_propagates(self, monkeypatch):
+        monkeypatch.setitem(run_benchmarks.STAGE_FACTORIES, 'parse',
+                            _failing_stage(KeyError('layers')))
+        with pytest.raises(KeyError):
+            run_suite(stages=('parse',), scales=[('layers=5', 5, 1)],
+                      repeat=1, include_samples=False)
+
+    def test_skipped_with_baseline(self):
+        results = {'cases': {}, 'skipped': {'render': 'RuntimeError: no GL', 'undo': 'x'}}
+        baseline = {'cases': {'render/layers=10': {'stage': 'render', 'median_ms': 5.0}}}
+        assert skipped_with_baseline(results, baseline) == ['render']
+        assert skipped_with_baseline(results, {'cases': {}}) == []
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Shared CLI
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestFinish:
+
+    def _args(self, tmp_path, save=False):
+        return argparse.Namespace(output=None, baseline=str(tmp_path / 'baseline.json'),
+                                  tolerance=0.25, save_baseline=save)
+
+    def test_save_then_compare(self, tmp_path):
+        results = {'cases': {'parse/a': {'stage': 'parse', 'median_ms': 10.0}}, 'skipped': {}}
+        assert finish(results, self._args(tmp_path, save=True)) == 0
+        assert finish(results, self._args(tmp_path)) == 0
+        slower = {'cases': {'parse/a': {'stage': 'parse', 'median_ms': 30.0}}, 'skipped': {}}
+        assert finish(slower, self._args(tmp_path)) == 1
+
+    def test_no_baseline_passes(self, tmp_path):
+        assert finish({'cases': {}, 'skipped': {}}, self._args(tmp_path)) == 0
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Converter suite
+# ══════════════════════════════════════════════════════════════════════════
+
+def _dds_results(**medians):
+    cases = {}
+    for case, ms in medians.items():
+        fmt, size, path = case.split('_')
+        cases[f"dds/{fmt} {size} {path}"] = {'stage': 'dds', 'median_ms': ms}
+    return {'cases': cases}
+
+
+def test_converter_suite_smoke():
+    from benchmarks.converter import run_suite as run_converter_suite
+    results = run_converter_suite(stages=('dds',), quick=True, repeat=1)
+    assert 'dds/bc7 64 native' in results['cases']
+    assert 'dds/bc7 64 loader' in results['cases']
+    assert results['cases']['dds/bgra 64 native']['runs'] == 1
+
+
+class TestCompareDecoders:
+
+    def test_loader_matching_best_passes(self):
+        rows = compare_decoders(_dds_results(bc7_256_native=14.0, bc7_256_imageio=2.5,
+                                             bc7_256_loader=2.6))
+        assert rows == [{'case': 'bc7 256', 'native_ms': 14.0, 'imageio_ms': 2.5,
+                         'loader_ms': 2.6, 'best': 'imageio', 'slow': False}]
+
+    def test_loader_on_slower_decoder_flagged(self):
+        rows = compare_decoders(_dds_results(bc7_256_native=14.0, bc7_256_imageio=2.5,
+                                             bc7_256_loader=14.1,
+                                             bgra_256_native=0.8, bgra_256_imageio=290.0,
+                                             bgra_256_loader=0.9))
+        assert {row['case']: row['slow'] for row in rows} == {'bc7 256': True, 'bgra 256': False}
+
+    def test_without_imageio(self):
+        rows = compare_decoders(_dds_results(bc1_64_native=1.0, bc1_64_loader=1.1))
+        assert rows[0]['imageio_ms'] is None
+        assert rows[0]['best'] == 'native'
+        assert not rows[0]['slow']
@@ -0,0 +1,152 @@
+"""
+Tests for the built-in DDS reader (asset_converter/src/dds_loading.py).
+
+Pillow's DDS plugin is the reference decoder: every format the reader
+supports must match it bit for bit.
+
+Covers:
+- BC1-BC5, BC7 and uncompressed 24/32 bpp against Pillow, including
+  sizes that are not a multiple of the block size
+- BC7 reserved mode decodes to opaque black
+- load_dds_image() routing: BCn through imageio, uncompressed through the
+  built-in reader, and the built-in reader when imageio is missing
+- Truncated files and unsupported formats
+"""
+import struct
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from asset_converter.src import dds_loading
+from asset_converter.src.dds_loading import (
+    UnsupportedDDSFormat, load_dds_image, read_dds, read_dds_info)
+from benchmarks.synthetic import DDS_FORMATS, make_dds_bytes
+
+
+def _write(tmp_path, data, name="test.dds"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def _pillow_rgba(path):
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGBA"))
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Bit-exact decoding
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("size", [(64, 64), (30, 18)], ids=["64x64", "30x18"])
+@pytest.mark.parametrize("fmt", DDS_FORMATS)
+def test_matches_pillow(tmp_path, fmt, size):
+    path = _write(tmp_path, make_dds_bytes(fmt, *size, seed=3))
+    rgba = read_dds(path)
+    assert rgba.shape == (size[1], size[0], 4)
+    assert rgba.dtype == np.uint8
+    np.testing.assert_array_equal(rgba, _pillow_rgba(path))
+
+
+def test_bc7_reserved_mode_is_opaque_black(tmp_path):
+    data = bytearray(make_dds_bytes('bc7', 4, 4))
+    data[-16:] = bytes(16)  # no mode bit set
+    rgba = read_dds(_write(tmp_path, bytes(data)))
+    assert (rgba == [0, 0, 0, 255]).all()
+
+
+def test_extra_mip_data_ignored(tmp_path):
+    data = make_dds_bytes('bc1', 8, 8, seed=1)
+    path = _write(tmp_path, data + bytes(64), "mips.dds")
+    np.testing.assert_array_equal(read_dds(path), read_dds(_write(tmp_path, data)))
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Decoder routing
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def decoder_calls(monkeypatch):
+    """Record which decoder load_dds_image() uses"""
+    calls = []
+
+    def spy(name, fn):
+        def wrapper(path):
+            calls.append(name)
+            return fn(path)
+        monkeypatch.setattr(dds_loading, name, wrapper)
+
+    spy('read_dds', dds_loading.read_dds)
+    spy('_read_dds_imageio', dds_loading._read_dds_imageio)
+    return calls
+
+
+@pytest.mark.parametrize("fmt,decoder", [
+    ('bc1', '_read_dds_imageio'), ('bc7', '_read_dds_imageio'),
+    ('bgra', 'read_dds'), ('bgr', 'read_dds'),
+])
+def test_routes_by_format(tmp_path, decoder_calls, fmt, decoder):
+    pytest.importorskip("imageio")
+    path = _write(tmp_path, make_dds_bytes(fmt, 16, 16, seed=2))
+    np.testing.assert_array_equal(load_dds_image(path), _pillow_rgba(path))
+    assert decoder_calls == [decoder]
+
+
+def test_without_imageio_uses_builtin_reader(tmp_path, decoder_calls, monkeypatch):
+    monkeypatch.setattr(dds_loading, 'HAS_IMAGEIO', False)
+    path = _write(tmp_path, make_dds_bytes('bc3', 16, 16, seed=2))
+    np.testing.assert_array_equal(load_dds_image(path), _pillow_rgba(path))
+    assert decoder_calls == ['read_dds']
+
+
+def test_imageio_failure_falls_back(tmp_path, monkeypatch):
+    def broken(path):
+        raise OSError("decoder unavailable")
+    monkeypatch.setattr(dds_loading, 'HAS_IMAGEIO', True)
+    monkeypatch.setattr(dds_loading, '_read_dds_imageio', broken)
+    path = _write(tmp_path, make_dds_bytes('bc1', 16, 16, seed=2))
+    np.testing.assert_array_equal(load_dds_image(path), read_dds(path))
+
+
+def test_read_dds_info(tmp_path):
+    assert 'codec' in read_dds_info(_write(tmp_path, make_dds_bytes('bc5', 8, 4), "bc5.dds"))
+    info = read_dds_info(_write(tmp_path, make_dds_bytes('bgra', 8, 4), "bgra.dds"))
+    assert 'codec' not in info
+    assert (info['width'], info['height']) == (8, 4)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Failures
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_truncated_file(tmp_path, capsys):
+    path = _write(tmp_path, make_dds_bytes('bc3', 16, 16)[:-10])
+    with pytest.raises(ValueError, match="truncated"):
+        read_dds(path)
+    assert load_dds_image(path) is None
+    assert "ERROR loading DDS" in capsys.readouterr().out
+
+
+def test_not_a_dds_file(tmp_path):
+    with pytest.raises(UnsupportedDDSFormat):
+        read_dds(_write(tmp_path, b"PNG"))
+
+
+def test_unsupported_fourcc(tmp_path, capsys):
+    data = bytearray(make_dds_bytes('bc1', 4, 4))
+    fourcc_offset = 4 + 72 + 8  # magic, header fields, pixel format size and flags
+    data[fourcc_offset:fourcc_offset + 4] = b"ABCD"
+    path = _write(tmp_path, bytes(data))
+    with pytest.raises(UnsupportedDDSFormat):
+        read_dds(path)
+    # Falls back to imageio when installed, which cannot read it either
+    assert load_dds_image(path) is None
+    assert "ERROR loading DDS" in capsys.readouterr().out
+
+
+def test_unsupported_dxgi_format(tmp_path):
+    data = bytearray(make_dds_bytes('bc7', 4, 4))
+    struct.pack_into("<I", data, 4 + 124, 95)  # BC6H_UF16
+    with pytest.raises(UnsupportedDDSFormat):
+        read_dds(_write(tmp_path, bytes(data)))
@@ -0,0 +1,119 @@
+"""
+Tests for batched emblem draw data (services/emblem_batch.py).
+
+Covers:
+- One record per drawn instance, in layer order, with the same transform
+  the per-layer path sets as uniforms, at any RTT size
+- Layer colors, pattern flags, selection tint and tile layers per record
+- Hidden layers and textures missing from the layer map are skipped
+- Symmetry mirrors are expanded into extra records
+- Draw runs split only where the texture array changes
+- compute_array_layers placement
+"""
+import numpy as np
+import pytest
+
+from services.asset_catalog import compute_array_layers
+from services.emblem_batch import (
+    FIELD_OFFSETS, INSTANCE_FLOATS, build_emblem_batch, instance_transform_px,
+    iter_layer_instances, pattern_flag_from_mask,
+)
+
+
+def _field(batch, name, size=1):
+    start = FIELD_OFFSETS[name]
+    return batch.data[:, start:start + size]
+
+
+@pytest.fixture
+def layer_map(parsed_multi_coa):
+    textures = [parsed_multi_coa.get_layer_filename(uuid) for uuid in parsed_multi_coa.get_all_layer_uuids()]
+    return {name: (0, i + 5) for i, name in enumerate(textures)}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Records
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestRecords:
+
+    def test_one_record_per_instance(self, parsed_multi_coa, layer_map):
+        batch = build_emblem_batch(parsed_multi_coa, layer_map)
+        assert batch.data.shape == (4, INSTANCE_FLOATS)
+        assert batch.data.dtype == np.float32
+        assert batch.runs == [(0, 0, 4)]
+
+    def test_transforms_match_per_layer_path(self, parsed_multi_coa, layer_map):
+        batch = build_emblem_batch(parsed_multi_coa, layer_map)
+        expected = [instance_transform_px(instance)
+                    for uuid in parsed_multi_coa.get_all_layer_uuids()
+                    for instance in iter_layer_instances(parsed_multi_coa, uuid)]
+        np.testing.assert_allclose(batch.data[:, :5], np.array(expected, dtype=np.float32))
+
+    def test_rtt_size_scales_pixels_not_ndc(self, parsed_multi_coa, layer_map):
+        canonical = build_emblem_batch(parsed_multi_coa, layer_map)
+        large = build_emblem_batch(parsed_multi_coa, layer_map, rtt_size=2048.0)
+        # quad.vert divides position/scale by screenRes / 2
+        np.testing.assert_allclose(large.data[:, :4] / 1024.0, canonical.data[:, :4] / 256.0, rtol=1e-6)
+        np.testing.assert_array_equal(large.data[:, 4:], canonical.data[:, 4:])
+
+    def test_layer_values(self, parsed_multi_coa, layer_map):
+        coa = parsed_multi_coa
+        first = coa.get_all_layer_uuids()[0]
+        coa.set_layer_mask(first, [1, 0, 1])
+        batch = build_emblem_batch(coa, layer_map, is_tinted=lambda uuid: uuid == first)
+
+        counts = [coa.get_layer_instance_count(uuid) for uuid in coa.get_all_layer_uuids()]
+        first_only = [1.0] * counts[0] + [0.0] * (counts[1] + counts[2])
+        assert _field(batch, 'layer')[:, 0].tolist() == [5] * counts[0] + [6] * counts[1] + [7] * counts[2]
+        assert _field(batch, 'pattern_flag')[:, 0].tolist() == [5 * f for f in first_only]
+        assert _field(batch, 'selection_tint')[:, 0].tolist() == first_only
+        color = coa.get_layer_color(first, 1)
+        np.testing.assert_allclose(_field(batch, 'primary', 3)[0],
+                                   [color.r / 255.0, color.g / 255.0, color.b / 255.0], rtol=1e-6)
+
+    def test_hidden_and_unloaded_layers_skipped(self, parsed_multi_coa, layer_map):
+        coa = parsed_multi_coa
+        first, second, third = coa.get_all_layer_uuids()
+        coa.set_layer_visible(first, False)
+        del layer_map[coa.get_layer_filename(third)]
+        batch = build_emblem_batch(coa, layer_map)
+        assert _field(batch, 'layer')[:, 0].tolist() == [6] * coa.get_layer_instance_count(second)
+
+    def test_empty(self, fresh_coa):
+        batch = build_emblem_batch(fresh_coa, {})
+        assert batch.instance_count == 0
+        assert batch.runs == []
+
+    def test_symmetry_mirrors_expanded(self, parsed_simple_coa):
+        coa = parsed_simple_coa
+        uuid = coa.get_all_layer_uuids()[0]
+        coa.set_layer_symmetry_type(uuid, 'bisector')
+        mirrors = list(iter_layer_instances(coa, uuid))
+        assert len(mirrors) > 1
+        batch = build_emblem_batch(coa, {coa.get_layer_filename(uuid): (0, 0)})
+        assert batch.instance_count == len(mirrors)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Runs and array placement
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_runs_split_on_array_change(parsed_multi_coa):
+    coa = parsed_multi_coa
+    names = [coa.get_layer_filename(uuid) for uuid in coa.get_all_layer_uuids()]
+    counts = [coa.get_layer_instance_count(uuid) for uuid in coa.get_all_layer_uuids()]
+    batch = build_emblem_batch(coa, {names[0]: (0, 1), names[1]: (1, 0), names[2]: (1, 3)})
+    assert batch.runs == [(0, 0, counts[0]), (1, counts[0], counts[1] + counts[2])]
+
+
+def test_compute_array_layers():
+    layers = compute_array_layers(["a", "b", "c", "d", "e"], max_layers=2)
+    assert layers == {"a": (0, 0), "b": (0, 1), "c": (1, 0), "d": (1, 1), "e": (2, 0)}
+
+
+@pytest.mark.parametrize("mask, flag", [
+    (None, 0), ([], 0), ([1], 1), ([0, 2], 2), ([1, 1, 1], 7), ("rgb", 0),
+])
+def test_pattern_flag_from_mask(mask, flag):
+    assert pattern_flag_from_mask(mask) == flag
@@ -0,0 +1,187 @@
+"""
+Tests for emblem instance culling (services/emblem_culling.py) and the
+batched path's use of it (services/emblem_batch.py).
+
+Covers:
+- Instances outside the CoA square are dropped; edge-touching ones are kept
+- Instances under a fully opaque emblem drawn later are dropped
+- No occlusion through pattern masks, non-axis rotation, partial cover,
+  translucent emblems, hidden or undrawable layers
+- Flips and quarter turns map the opaque rectangle like the shader
+- build_emblem_batch draws only the kept instances
+"""
+import numpy as np
+import pytest
+
+from models.coa import CoA
+from models.transform import Vec2
+from services.emblem_batch import build_emblem_batch
+from services.emblem_culling import cull_emblem_instances
+
+_ALL = (1 << 256) - 1
+
+
+def _cells(rows, cols, grid=16):
+    return sum(1 << (r * grid + c) for r in rows for c in cols)
+
+
+SHAPES = {
+    # Opaque everywhere
+    "ce_solid.dds": ((0.0, 0.0, 1.0, 1.0), _ALL, 16, _ALL),
+    # Visible everywhere, opaque only in the top half
+    "ce_top_half.dds": ((0.0, 0.0, 1.0, 1.0), _ALL, 16, _cells(range(8), range(16))),
+    # Visible everywhere, nothing opaque
+    "ce_glass.dds": ((0.0, 0.0, 1.0, 1.0), _ALL, 16, 0),
+    # Only the centre quarter is visible
+    "ce_dot.dds": ((0.375, 0.375, 0.625, 0.625), _cells(range(6, 10), range(6, 10)), 16, 0),
+    # Only the top-left corner is visible
+    "ce_corner.dds": ((0.0, 0.0, 0.25, 0.25), _cells(range(4), range(4)), 16, 0),
+}
+
+
+@pytest.fixture
+def shapes():
+    CoA.set_emblem_shape_provider(SHAPES.get)
+    yield SHAPES
+    CoA.set_emblem_shape_provider(None)
+
+
+def _layer(coa, emblem, x=0.5, y=0.5, scale=1.0, rotation=0.0):
+    uuid = coa.add_layer(emblem_path=emblem)
+    coa.set_layer_position(uuid, x, y)
+    coa.set_layer_scale(uuid, scale, scale)
+    if rotation:
+        coa.get_layer_by_uuid(uuid).rotation = rotation
+    return uuid
+
+
+def _cull(coa, is_drawn=lambda uuid: True, rtt_size=512):
+    return cull_emblem_instances(coa, is_drawn, rtt_size)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Off canvas
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestOffCanvas:
+
+    def test_outside_dropped_edge_kept(self, fresh_coa, shapes):
+        # Visible corner spans x -0.5..-0.25 (positions are clamped to 0-1)
+        outside = _layer(fresh_coa, "ce_corner.dds", x=0.0)
+        # Still reaches x = +0.001 once filtering is accounted for
+        touching = _layer(fresh_coa, "ce_corner.dds", x=0.249)
+        result = _cull(fresh_coa)
+        assert list(result.layers) == [touching]
+        assert (result.total, result.culled, result.off_canvas) == (2, 1, 1)
+        assert outside not in result.layers
+
+    def test_full_quad_without_shapes(self, fresh_coa, shapes):
+        _layer(fresh_coa, "ce_corner.dds", x=0.0)
+        assert _cull(fresh_coa).off_canvas == 1
+        CoA.set_emblem_shape_provider(None)
+        assert _cull(fresh_coa).culled == 0
+
+    def test_single_instance_of_layer(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_corner.dds", x=0.6, scale=0.4)
+        fresh_coa.add_instance(uuid, 0.0, 0.5)
+        fresh_coa.get_layer_instance(uuid, 1).scale = Vec2(0.4, 0.4)
+        result = _cull(fresh_coa)
+        assert [inst.pos.x for inst in result.layers[uuid]] == [pytest.approx(0.6)]
+
+    def test_game_coa_unaffected(self, parsed_multi_coa):
+        result = _cull(parsed_multi_coa)
+        assert result.culled == 0
+        assert result.total == sum(len(v) for v in result.layers.values())
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Occlusion
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestOcclusion:
+
+    def test_hidden_under_opaque_layer(self, fresh_coa, shapes):
+        below = [_layer(fresh_coa, "ce_glass.dds", x=0.3, scale=0.3),
+                 _layer(fresh_coa, "ce_solid.dds", scale=0.9)]
+        top = _layer(fresh_coa, "ce_solid.dds")
+        result = _cull(fresh_coa)
+        assert list(result.layers) == [top]
+        assert (result.culled, result.off_canvas) == (2, 0)
+        assert all(uuid not in result.layers for uuid in below)
+
+    def test_layers_above_kept(self, fresh_coa, shapes):
+        bottom = _layer(fresh_coa, "ce_solid.dds")
+        above = _layer(fresh_coa, "ce_glass.dds", scale=0.3)
+        assert list(_cull(fresh_coa).layers) == [bottom, above]
+
+    def test_partial_cover_kept(self, fresh_coa, shapes):
+        below = _layer(fresh_coa, "ce_glass.dds", x=0.5, y=0.45, scale=0.3)
+        _layer(fresh_coa, "ce_top_half.dds")
+        assert below in _cull(fresh_coa).layers
+        # Fully inside the opaque top half
+        fresh_coa.set_layer_position(below, 0.5, 0.2)
+        assert below not in _cull(fresh_coa).layers
+
+    def test_opaque_edge_inset(self, fresh_coa, shapes):
+        # Ends exactly at the opaque half's edge: filtering blends across it
+        below = _layer(fresh_coa, "ce_glass.dds", x=0.5, y=0.35, scale=0.3)
+        _layer(fresh_coa, "ce_top_half.dds")
+        assert below in _cull(fresh_coa).layers
+
+    @pytest.mark.parametrize("emblem, mask, rotation", [
+        ("ce_glass.dds", None, 0.0),      # not opaque
+        ("ce_solid.dds", [1, 0, 0], 0.0),  # pattern mask lowers alpha
+        ("ce_solid.dds", None, 45.0),     # not axis-aligned
+    ])
+    def test_no_occluder(self, fresh_coa, shapes, emblem, mask, rotation):
+        _layer(fresh_coa, "ce_glass.dds", scale=0.1)
+        top = _layer(fresh_coa, emblem, scale=1.5, rotation=rotation)
+        if mask:
+            fresh_coa.set_layer_mask(top, mask)
+        assert _cull(fresh_coa).culled == 0
+
+    def test_all_channel_mask_still_occludes(self, fresh_coa, shapes):
+        _layer(fresh_coa, "ce_glass.dds", scale=0.1)
+        top = _layer(fresh_coa, "ce_solid.dds")
+        fresh_coa.set_layer_mask(top, [1, 2, 3])
+        assert _cull(fresh_coa).culled == 1
+
+    def test_hidden_or_undrawable_occluder(self, fresh_coa, shapes):
+        _layer(fresh_coa, "ce_glass.dds", scale=0.1)
+        top = _layer(fresh_coa, "ce_solid.dds")
+        assert _cull(fresh_coa, is_drawn=lambda uuid: uuid != top).culled == 0
+        fresh_coa.set_layer_visible(top, False)
+        result = _cull(fresh_coa)
+        assert (result.total, result.culled) == (1, 0)
+
+    @pytest.mark.parametrize("flip_y, rotation, position, hidden", [
+        (False, 0.0, (0.5, 0.2), True),
+        (True, 0.0, (0.5, 0.2), False),   # opaque half now at the bottom
+        (True, 0.0, (0.5, 0.8), True),
+        (False, 90.0, (0.8, 0.5), True),  # clockwise: top half to the right
+        (False, 90.0, (0.2, 0.5), False),
+        (False, 180.0, (0.5, 0.8), True),
+    ])
+    def test_flips_and_quarter_turns(self, fresh_coa, shapes, flip_y, rotation, position, hidden):
+        below = _layer(fresh_coa, "ce_glass.dds", *position, scale=0.2)
+        top = _layer(fresh_coa, "ce_top_half.dds", rotation=rotation)
+        if flip_y:
+            fresh_coa.flip_layer(top, flip_y=True)
+        assert (below not in _cull(fresh_coa).layers) == hidden
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Batched path
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_batch_draws_kept_instances(fresh_coa, shapes):
+    _layer(fresh_coa, "ce_glass.dds", scale=0.3)
+    kept = _layer(fresh_coa, "ce_solid.dds")
+    fresh_coa.add_instance(kept, 2.0, 2.0)
+    layer_map = {name: (0, i) for i, name in enumerate(SHAPES)}
+
+    full = build_emblem_batch(fresh_coa, layer_map)
+    culled = build_emblem_batch(fresh_coa, layer_map, layer_instances=_cull(fresh_coa).layers)
+    assert (full.instance_count, culled.instance_count) == (3, 1)
+    assert culled.runs == [(0, 0, 1)]
+    np.testing.assert_array_equal(culled.data[0], full.data[1])
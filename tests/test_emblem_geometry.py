@@ -0,0 +1,232 @@
+"""
+Tests for tight emblem geometry: measured by the converter
+(asset_converter/src/emblem_geometry.py), read through the asset catalog
+and used by the CoA spatial index.
+
+Covers:
+- Alpha bounds at texel edges, the occupancy bitmask layout and opaque cells
+- Metadata entries gain/lose geometry; watch mode patches the JSON
+- Catalog parses the keys and ignores malformed values
+- Bounds, point hits (occupancy mask) and rectangle queries use the
+  visible part of the emblem, including flips, rotation and mirrors
+- Layers re-index when the emblem changes or shapes are invalidated
+- Largest opaque rectangle of a shape
+"""
+import json
+
+import numpy as np
+import pytest
+
+from asset_converter.src.emblem_geometry import (
+    apply_alpha_geometry, compute_alpha_geometry, update_metadata_file,
+)
+from models.coa import CoA
+from models.coa._internal.spatial_index import EmblemShape
+from services.asset_catalog import AssetCatalog
+
+
+def _rgba(size, covered):
+    """RGBA tile with alpha 255 on covered[y0:y1, x0:x1] slices."""
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    for ys, xs in covered:
+        pixels[ys, xs, 3] = 255
+    return pixels
+
+
+def _mask(cells, grid=16):
+    return sum(1 << (row * grid + col) for row, col in cells)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Converter
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestComputeAlphaGeometry:
+
+    def test_bounds_and_mask(self):
+        pixels = _rgba(256, [(slice(16, 48), slice(64, 80))])
+        geometry = compute_alpha_geometry(pixels)
+        assert geometry["alpha_bounds"] == [0.25, 0.0625, 0.3125, 0.1875]
+        # Rows 1-2, column 4 of the 16x16 grid
+        assert int(geometry["occupancy"], 16) == _mask([(1, 4), (2, 4)])
+        assert len(geometry["occupancy"]) == 64
+        assert int(geometry["opaque"], 16) == _mask([(1, 4), (2, 4)])
+
+    def test_opaque_needs_every_texel(self):
+        pixels = _rgba(256, [(slice(0, 32), slice(0, 32))])
+        pixels[20, 20, 3] = 254
+        geometry = compute_alpha_geometry(pixels)
+        assert int(geometry["occupancy"], 16) == _mask([(0, 0), (0, 1), (1, 0), (1, 1)])
+        assert int(geometry["opaque"], 16) == _mask([(0, 0), (0, 1), (1, 0)])
+
+    def test_single_texel_marks_its_cell(self):
+        geometry = compute_alpha_geometry(_rgba(256, [(255, 0)]))
+        assert geometry["alpha_bounds"] == [0.0, 255 / 256, 1 / 256, 1.0]
+        assert int(geometry["occupancy"], 16) == _mask([(15, 0)])
+
+    def test_transparent_and_opaque(self):
+        assert compute_alpha_geometry(np.zeros((8, 8, 4), dtype=np.uint8)) is None
+        opaque = compute_alpha_geometry(np.zeros((8, 8, 3), dtype=np.uint8))
+        assert opaque["alpha_bounds"] == [0.0, 0.0, 1.0, 1.0]
+        assert int(opaque["occupancy"], 16) == (1 << 256) - 1
+        assert int(opaque["opaque"], 16) == (1 << 256) - 1
+
+    def test_apply_to_metadata(self):
+        metadata = {"ce_a.dds": {"colors": 1},
+                    "ce_b.dds": {"alpha_bounds": [0, 0, 1, 1], "occupancy": "ff"},
+                    "ce_c.dds": {"colors": 2}}
+        geometry = {"ce_a.dds": compute_alpha_geometry(_rgba(16, [(0, 0)])), "ce_b.dds": None}
+        assert apply_alpha_geometry(metadata, geometry) == 1
+        assert metadata["ce_a.dds"]["alpha_bounds"] == [0.0, 0.0, 0.0625, 0.0625]
+        assert metadata["ce_b.dds"] == {}
+        assert metadata["ce_c.dds"] == {"colors": 2}
+
+    def test_update_metadata_file(self, tmp_path):
+        path = tmp_path / "emblems.json"
+        path.write_text(json.dumps({"ce_a.dds": {"colors": 1}}), encoding="utf-8")
+        geometry = {"ce_a.dds": compute_alpha_geometry(_rgba(16, [(0, 0)])),
+                    "ce_unlisted.dds": compute_alpha_geometry(_rgba(16, [(0, 0)]))}
+        assert update_metadata_file(path, geometry)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert set(data) == {"ce_a.dds"} and data["ce_a.dds"]["colors"] == 1
+        assert "occupancy" in data["ce_a.dds"]
+        # Unchanged geometry does not rewrite the file
+        assert not update_metadata_file(path, geometry)
+        assert not update_metadata_file(tmp_path / "missing.json", geometry)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Catalog
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestCatalogGeometry:
+
+    def test_parsed_from_metadata(self, tmp_path):
+        emblems = {
+            "ce_good.dds": {"alpha_bounds": [0.25, 0.0, 0.75, 0.5], "occupancy": "0" * 63 + "1"},
+            "ce_solid.dds": {"alpha_bounds": [0.0, 0.0, 1.0, 1.0], "occupancy": "f" * 64,
+                             "opaque": "0" * 63 + "3"},
+            "ce_bad_bounds.dds": {"alpha_bounds": [0.5, 0.0, 0.25, 1.0], "occupancy": "1" * 64},
+            "ce_bad_mask.dds": {"alpha_bounds": [0.0, 0.0, 1.0, 1.0], "occupancy": "xyz"},
+            "ce_plain.dds": {"colors": 1},
+        }
+        metadata_dir = tmp_path / "coa_emblems" / "metadata"
+        source_dir = tmp_path / "coa_emblems" / "source"
+        metadata_dir.mkdir(parents=True)
+        source_dir.mkdir(parents=True)
+        (metadata_dir / "50_coa_designer_emblems.json").write_text(json.dumps(emblems), encoding="utf-8")
+        for filename in emblems:
+            (source_dir / filename.replace(".dds", ".png")).write_bytes(b"png")
+
+        catalog = AssetCatalog.load(tmp_path, use_index=False)
+        assert catalog.alpha_geometry("ce_good.dds") == ((0.25, 0.0, 0.75, 0.5), 1, 16, 0)
+        assert catalog.alpha_geometry("ce_solid.dds") == ((0.0, 0.0, 1.0, 1.0), (1 << 256) - 1, 16, 3)
+        assert catalog.alpha_geometry("ce_bad_bounds.dds") is None
+        assert catalog.alpha_geometry("ce_bad_mask.dds") is None
+        assert catalog.alpha_geometry("ce_plain.dds") is None
+        assert catalog.alpha_geometry("ce_unknown.dds") is None
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Spatial index
+# ══════════════════════════════════════════════════════════════════════════
+
+# Top-left quadrant of the tile
+_QUADRANT = ((0.0, 0.0, 0.5, 0.5), _mask([(r, c) for r in range(8) for c in range(8)]), 16)
+# Full box, bottom-right quadrant empty
+_NOTCHED = ((0.0, 0.0, 1.0, 1.0),
+            _mask([(r, c) for r in range(16) for c in range(16) if r < 8 or c < 8]), 16)
+SHAPES = {"ce_quadrant.dds": _QUADRANT, "ce_notched.dds": _NOTCHED}
+
+
+@pytest.fixture
+def shapes():
+    provided = dict(SHAPES)
+    CoA.set_emblem_shape_provider(provided.get)
+    yield provided
+    CoA.set_emblem_shape_provider(None)
+
+
+def _layer(coa, emblem, rotation=0.0):
+    uuid = coa.add_layer(emblem_path=emblem)
+    coa.set_layer_position(uuid, 0.5, 0.5)
+    coa.set_layer_scale(uuid, 0.4, 0.4)
+    if rotation:
+        coa.get_layer_by_uuid(uuid).rotation = rotation
+    return uuid
+
+
+class TestShapedIndex:
+
+    def test_bounds_are_tight(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_quadrant.dds")
+        bounds = fresh_coa.get_layer_bounds(uuid)
+        assert (bounds['min_x'], bounds['max_x']) == pytest.approx((0.3, 0.5))
+        assert (bounds['min_y'], bounds['max_y']) == pytest.approx((0.3, 0.5))
+        assert fresh_coa.get_layers_extent([uuid])['max_x'] == pytest.approx(0.5)
+
+    def test_point_and_rect_hits(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_quadrant.dds")
+        assert fresh_coa.get_layers_at_point(0.4, 0.4) == [uuid]
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == []
+        assert fresh_coa.get_layers_in_rect(0.55, 0.55, 0.7, 0.7) == []
+        assert fresh_coa.get_layers_in_rect(0.25, 0.25, 0.55, 0.55, contained=True) == [uuid]
+
+    def test_occupancy_mask(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_notched.dds")
+        assert fresh_coa.get_layers_at_point(0.4, 0.6) == [uuid]
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == []
+        # The box is still the full quad
+        assert fresh_coa.get_layer_bounds(uuid)['max_x'] == pytest.approx(0.7)
+
+    def test_flip_and_rotation(self, fresh_coa, shapes):
+        flipped = _layer(fresh_coa, "ce_quadrant.dds")
+        fresh_coa.flip_layer(flipped, flip_x=True)
+        assert fresh_coa.get_layers_at_point(0.6, 0.4) == [flipped]
+        assert fresh_coa.get_layer_bounds(flipped)['min_x'] == pytest.approx(0.5)
+        fresh_coa.remove_layer(flipped)
+
+        # Clockwise quarter turn moves the top-left quadrant to the top right
+        rotated = _layer(fresh_coa, "ce_quadrant.dds", rotation=90)
+        assert fresh_coa.get_layers_at_point(0.6, 0.4) == [rotated]
+        assert fresh_coa.get_layers_at_point(0.4, 0.4) == []
+
+    def test_mirrors_use_shape(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_quadrant.dds")
+        fresh_coa.set_layer_symmetry_type(uuid, 'rotational')
+        extent = fresh_coa.get_layers_extent([uuid])
+        # Seed visible box plus mirrors, still inside the seed's full quad span
+        assert extent['width'] > 0.2
+        assert fresh_coa.get_layer_bounds(uuid)['width'] == pytest.approx(0.2)
+
+    def test_reindex_on_emblem_change_and_invalidate(self, fresh_coa, shapes):
+        uuid = _layer(fresh_coa, "ce_quadrant.dds")
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == []
+        fresh_coa.get_layer_by_uuid(uuid).filename = "ce_unknown.dds"
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == [uuid]
+
+        fresh_coa.get_layer_by_uuid(uuid).filename = "ce_quadrant.dds"
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == []
+        shapes["ce_quadrant.dds"] = _NOTCHED  # re-converted
+        assert fresh_coa.get_layers_at_point(0.4, 0.6) == []  # cached
+        CoA.invalidate_emblem_shapes()
+        assert fresh_coa.get_layers_at_point(0.4, 0.6) == [uuid]
+
+    def test_no_provider_is_full_quad(self, fresh_coa):
+        uuid = _layer(fresh_coa, "ce_quadrant.dds")
+        assert fresh_coa.get_layers_at_point(0.6, 0.6) == [uuid]
+
+
+class TestOpaqueRect:
+
+    def test_largest_rectangle(self):
+        # Full rows 0-3 plus a taller but narrower block in columns 0-1
+        opaque = _mask([(r, c) for r in range(4) for c in range(16)] +
+                       [(r, c) for r in range(4, 12) for c in range(2)])
+        shape = EmblemShape((0.0, 0.0, 1.0, 1.0), opaque, 16, opaque)
+        assert shape.opaque_rect == (0.0, 0.0, 1.0, 0.25)
+
+    def test_none_without_opaque_cells(self, shapes):
+        assert EmblemShape(*_QUADRANT).opaque_rect is None
+        assert CoA.get_emblem_shape("ce_quadrant.dds").opaque_rect is None
+        assert CoA.get_emblem_shape("ce_unknown.dds") is None
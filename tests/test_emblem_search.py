@@ -0,0 +1,218 @@
+"""
+Tests for the emblem search index (services/emblem_search.py and
+asset_converter/src/search_index.py).
+
+Covers:
+- Query parsing (free text and facet tokens)
+- Substring search over filename, category and source mod
+- Facet filters and facet counts
+- Converter-built database is read by the editor; stale schemas ignored
+- Null colour counts in the metadata do not abort the database build
+- Substring fallback without the database or without FTS5 trigram support
+- As-you-type latency at 20k emblems
+- AssetSidebar search filtering
+"""
+import sqlite3
+import time
+
+import pytest
+
+from asset_converter.src.search_index import build_search_index
+from services import emblem_search
+from services.emblem_search import EmblemSearchIndex, SubstringEmblemSearch, parse_query
+
+
+METADATA = {
+    "\ufeff": None,
+    "ce_lion_rampant.dds": {"category": "animals", "colors": 2, "_source": "Base Game"},
+    "ce_lion_passant.dds": {"category": "animals", "colors": 1, "_source": "Heraldry Expanded"},
+    "ce_cross_pattee.dds": {"category": "crosses", "colors": 1, "_source": "Base Game"},
+    "ce_ox.dds": {"category": "animals", "colors": 3},
+    "ce_hidden_lion.dds": {"category": "animals", "colors": 1, "visible": False},
+}
+
+
+def _open_built(metadata, tmp_path):
+    db = tmp_path / emblem_search.INDEX_FILENAME
+    build_search_index(metadata, db)
+    index = EmblemSearchIndex.open(db)
+    assert isinstance(index, EmblemSearchIndex)
+    return index
+
+
+@pytest.fixture(params=["fts", "substring"])
+def index(request, tmp_path):
+    if request.param == "fts":
+        idx = _open_built(METADATA, tmp_path)
+    else:
+        from asset_converter.src.search_index import iter_emblem_records
+        idx = SubstringEmblemSearch(iter_emblem_records(METADATA))
+    yield idx
+    idx.close()
+
+
+def test_parse_query():
+    assert parse_query("lion cat:Animals colors:2 mod:heraldry") == (
+        ["lion"], {"category": "Animals", "colors": "2", "source": "heraldry"})
+    assert parse_query("lion colors:") == (["lion"], {})
+    assert parse_query("") == ([], {})
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Search
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestSearch:
+
+    def test_substring_of_filename(self, index):
+        assert index.search("lion") == ["ce_lion_passant.dds", "ce_lion_rampant.dds"]
+        assert index.search("PASS") == ["ce_lion_passant.dds"]
+
+    def test_terms_are_anded(self, index):
+        assert index.search("lion rampant") == ["ce_lion_rampant.dds"]
+
+    def test_matches_category_and_source(self, index):
+        assert index.search("crosses") == ["ce_cross_pattee.dds"]
+        assert index.search("expanded") == ["ce_lion_passant.dds"]
+
+    def test_short_terms(self, index):
+        assert index.search("ox") == ["ce_ox.dds"]
+        assert index.search("_") == index.search("")
+
+    def test_facets_filter(self, index):
+        assert index.search("colors:1") == ["ce_cross_pattee.dds", "ce_lion_passant.dds"]
+        assert index.search("lion", colors=2) == ["ce_lion_rampant.dds"]
+        assert index.search("category:ANIMALS mod:heraldry") == ["ce_lion_passant.dds"]
+        assert index.search("colors:two") == []
+
+    def test_hidden_and_limit(self, index):
+        assert "ce_hidden_lion.dds" not in index.search("lion")
+        assert "ce_hidden_lion.dds" in index.search("lion", include_hidden=True)
+        assert len(index.search("", limit=2)) == 2
+
+    def test_facet_counts(self, index):
+        facets = index.facets()
+        assert facets["category"] == {"animals": 3, "crosses": 1}
+        assert facets["colors"][1] == 2
+        assert facets["source"]["Base Game"] == 3
+        assert len(index) == 5
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Prebuilt database
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestPrebuilt:
+
+    def test_converter_database_is_read(self, tmp_path):
+        db = tmp_path / "coa_emblems" / "metadata" / emblem_search.INDEX_FILENAME
+        assert build_search_index(METADATA, db) == 5
+
+        index = EmblemSearchIndex.load(tmp_path)
+        assert index.search("lion") == ["ce_lion_passant.dds", "ce_lion_rampant.dds"]
+        # Loaded into memory: the file can be replaced by the converter
+        db.unlink()
+        assert index.search("cross") == ["ce_cross_pattee.dds"]
+
+    def test_null_colors_do_not_abort_build(self, tmp_path):
+        metadata = dict(METADATA, **{"ce_null.dds": {"category": "misc", "colors": None}})
+        index = _open_built(metadata, tmp_path)
+        assert index.search("null") == ["ce_null.dds"]
+        assert index.facets()['colors'][1] == 3  # Counted as one colour
+        index.close()
+
+    def test_schema_mismatch_falls_back_to_metadata(self, tmp_path):
+        db = tmp_path / "coa_emblems" / "metadata" / emblem_search.INDEX_FILENAME
+        build_search_index({}, db)
+        conn = sqlite3.connect(str(db))
+        conn.execute("PRAGMA user_version = 999")
+        conn.commit()
+        conn.close()
+        assert EmblemSearchIndex.open(db) is None
+
+        import json
+        (tmp_path / "coa_emblems" / "metadata" / "50_coa_designer_emblems.json").write_text(
+            json.dumps(METADATA), encoding="utf-8")
+        source_dir = tmp_path / "coa_emblems" / "source"
+        source_dir.mkdir(parents=True)
+        (source_dir / "ce_ox.png").write_bytes(b"")
+        index = EmblemSearchIndex.load(tmp_path)
+        assert isinstance(index, SubstringEmblemSearch)
+        assert index.search("ox") == ["ce_ox.dds"]
+
+    def test_missing_fts_table_uses_substring_search(self, tmp_path):
+        db = tmp_path / emblem_search.INDEX_FILENAME
+        build_search_index(METADATA, db)
+        conn = sqlite3.connect(str(db))
+        conn.execute("DROP TABLE emblems_fts")
+        conn.commit()
+        conn.close()
+        index = EmblemSearchIndex.open(db)
+        assert isinstance(index, SubstringEmblemSearch)
+        assert index.search("lion") == ["ce_lion_passant.dds", "ce_lion_rampant.dds"]
+
+    def test_fts_error_during_query_falls_back(self, tmp_path):
+        index = _open_built(METADATA, tmp_path)
+        # e.g. a tokenizer this SQLite build lacks
+        index._conn.execute("DROP TABLE emblems_fts")
+        assert index.search("lion") == ["ce_lion_passant.dds", "ce_lion_rampant.dds"]
+        assert index.search("cross colors:1") == ["ce_cross_pattee.dds"]
+
+    def test_converter_without_trigram_writes_plain_table(self, tmp_path, monkeypatch):
+        from asset_converter.src import search_index
+        monkeypatch.setattr(search_index, "_FTS_SCHEMA",
+                            "CREATE VIRTUAL TABLE emblems_fts USING fts5(filename, tokenize='nope');")
+        db = tmp_path / emblem_search.INDEX_FILENAME
+        assert build_search_index(METADATA, db) == 5
+        index = EmblemSearchIndex.open(db)
+        assert isinstance(index, SubstringEmblemSearch)
+        assert index.search("expanded") == ["ce_lion_passant.dds"]
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Latency
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_as_you_type_latency_20k(tmp_path):
+    words = ["lion", "eagle", "cross", "tower", "sword", "crown", "star", "moon", "tree", "fish"]
+    metadata = {
+        f"ce_{words[i % 10]}_{words[(i // 10) % 10]}_{i}.dds": {
+            "category": words[(i // 100) % 10], "colors": i % 3 + 1, "_source": f"Mod {i % 40}",
+        }
+        for i in range(20_000)
+    }
+    index = _open_built(metadata, tmp_path)
+    for query in ("l", "li", "lio", "lion", "lion ea", "lion eagle colors:2", "mod:7"):
+        best = min(_timed_search(index, query) for _ in range(5))
+        assert best < 0.010, f"{query!r} took {best * 1000:.1f} ms"
+
+
+def _timed_search(index, query):
+    start = time.perf_counter()
+    index.search(query, limit=500)
+    return time.perf_counter() - start
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Sidebar
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_sidebar_search_filters_emblems(qtbot, index, monkeypatch):
+    from components import asset_sidebar
+    from components.asset_sidebar import AssetSidebar
+
+    monkeypatch.setattr(asset_sidebar, "get_search_index", lambda: index)
+    sidebar = AssetSidebar()
+    qtbot.addWidget(sidebar)
+    sidebar._emblems_by_dds = {
+        name: {"filename": name.replace(".dds", ".png"), "dds_filename": name, "path": "", "colors": 1}
+        for name in ("ce_lion_rampant.dds", "ce_cross_pattee.dds")
+    }
+    sidebar.switch_mode("emblems")
+
+    sidebar.set_search_text("lion")
+    assert [a["dds_filename"] for a in sidebar._get_filtered_assets()] == ["ce_lion_rampant.dds"]
+
+    sidebar.set_search_text("")
+    assert sidebar._get_filtered_assets() == [
+        a for a in sidebar.asset_data.get(sidebar.current_category, []) if a.get("visible", True)]
@@ -0,0 +1,90 @@
+"""
+Tests for frame-paced drag updates (services/frame_coalescer.py).
+
+Covers:
+- The first state after idle is applied immediately
+- States submitted within a frame collapse to the latest one
+- Frames are paced by the frame signal, or the fallback timer without it
+- flush() applies the pending state synchronously; cancel() drops it
+"""
+import pytest
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from services.frame_coalescer import FrameCoalescer, frame_interval_ms
+
+
+class _Canvas(QObject):
+    frameSwapped = pyqtSignal()
+
+
+@pytest.fixture
+def canvas(qapp):
+    return _Canvas()
+
+
+@pytest.fixture
+def applied():
+    return []
+
+
+@pytest.fixture
+def coalescer(canvas, applied):
+    # Long fallback interval: frames come from the signal in these tests
+    return FrameCoalescer(applied.append, frame_signal=canvas.frameSwapped, interval_ms=10_000)
+
+
+class TestPacing:
+
+    def test_first_state_applied_immediately(self, coalescer, applied):
+        coalescer.submit("a")
+        assert applied == ["a"]
+        assert not coalescer.has_pending
+
+    def test_one_update_per_frame(self, coalescer, canvas, applied):
+        for state in range(10):
+            coalescer.submit(state)
+        assert applied == [0]
+        assert coalescer.has_pending
+
+        canvas.frameSwapped.emit()
+        assert applied == [0, 9]
+        canvas.frameSwapped.emit()
+        assert applied == [0, 9]  # nothing new
+
+        # Idle again: the next submit goes straight through
+        coalescer.submit(10)
+        assert applied == [0, 9, 10]
+        assert (coalescer.submitted, coalescer.applied) == (11, 3)
+
+    def test_fallback_timer(self, qtbot, applied):
+        coalescer = FrameCoalescer(applied.append, interval_ms=5)
+        coalescer.submit(1)
+        coalescer.submit(2)
+        coalescer.submit(3)
+        assert applied == [1]
+        qtbot.waitUntil(lambda: applied == [1, 3], timeout=1000)
+
+    def test_frame_interval(self, qapp):
+        assert 1 <= frame_interval_ms() <= 100
+
+
+class TestDragEnd:
+
+    def test_flush_applies_last_state(self, coalescer, canvas, applied):
+        coalescer.submit("start")
+        coalescer.submit("move")
+        coalescer.submit("end")
+        coalescer.flush()
+        assert applied == ["start", "end"]
+        coalescer.flush()
+        assert applied == ["start", "end"]
+        # Pacing restarts with the next drag
+        coalescer.submit("next")
+        assert applied == ["start", "end", "next"]
+
+    def test_cancel_drops_pending(self, coalescer, canvas, applied):
+        coalescer.submit(1)
+        coalescer.submit(2)
+        coalescer.cancel()
+        canvas.frameSwapped.emit()
+        assert applied == [1]
@@ -0,0 +1,151 @@
+"""
+Tests for lazily loaded frame textures (services/frame_texture_cache.py).
+
+Covers:
+- Views read like the dicts they replace: membership and iteration are
+  the registered sources, get() loads on first use
+- LRU eviction across all views deletes the least recently used texture
+- Background prefetch hands its decode to the later get()
+- Unreadable sources fail once and are not retried every frame
+- neighbour_keys ordering
+
+Uploads are stubbed; no GL context is needed.
+"""
+import threading
+
+import OpenGL.GL as gl
+import pytest
+from PIL import Image
+
+from services.frame_texture_cache import FrameTextureCache, neighbour_keys
+from services.texture_loader import TextureLoader
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Record uploads (image shape + kwargs) and deletions; ids count from 1."""
+    calls = {'uploaded': [], 'deleted': []}
+
+    def upload(img_data, **kwargs):
+        calls['uploaded'].append((img_data.shape, kwargs))
+        return len(calls['uploaded'])
+
+    monkeypatch.setattr(TextureLoader, "upload_texture", staticmethod(upload))
+    monkeypatch.setattr(gl, "glDeleteTextures", lambda ids: calls['deleted'].extend(ids))
+    return calls
+
+
+@pytest.fixture
+def frame_dir(tmp_path):
+    for name in ("dynasty", "house", "house_frame_02"):
+        Image.new("RGBA", (16, 16), (255, 0, 0, 255)).save(tmp_path / f"{name}.png")
+    return tmp_path
+
+
+def _cache(frame_dir, capacity=8):
+    cache = FrameTextureCache(capacity=capacity)
+    for name in ("dynasty", "house", "house_frame_02"):
+        cache.add_source('frameTextures', name, frame_dir / f"{name}.png")
+        cache.add_source('frame_masks', name, frame_dir / f"{name}.png",
+                         resize=(8, 8), wrap_mode=gl.GL_CLAMP_TO_BORDER)
+    return cache
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Views
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestViews:
+
+    def test_membership_without_loading(self, frame_dir, uploads):
+        frames = _cache(frame_dir).view('frameTextures')
+        assert "house" in frames and "missing" not in frames
+        assert list(frames) == ["dynasty", "house", "house_frame_02"]
+        assert len(frames) == 3
+        assert uploads['uploaded'] == []
+
+    def test_get_loads_once(self, frame_dir, uploads):
+        cache = _cache(frame_dir)
+        masks = cache.view('frame_masks')
+        first = masks.get("house")
+        assert masks.get("house") == first == masks["house"]
+        assert uploads['uploaded'] == [((8, 8, 4), {'wrap_mode': gl.GL_CLAMP_TO_BORDER})]
+        assert cache.loads == 1
+
+    def test_missing_key(self, frame_dir, uploads):
+        frames = _cache(frame_dir).view('frameTextures')
+        assert frames.get("missing", 99) == 99
+        with pytest.raises(KeyError):
+            frames["missing"]
+
+    def test_unreadable_source_fails_once(self, tmp_path, uploads, capsys):
+        cache = FrameTextureCache()
+        cache.add_source('topframes', 86, tmp_path / "gone.png")
+        view = cache.view('topframes')
+        assert view.get(86) is None and view.get(86) is None
+        assert capsys.readouterr().out.count("Error loading texture") == 1
+        assert 86 in view
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Eviction and prefetch
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestEviction:
+
+    def test_least_recently_used_deleted(self, frame_dir, uploads):
+        cache = _cache(frame_dir, capacity=2)
+        frames = cache.view('frameTextures')
+        dynasty = frames.get("dynasty")
+        frames.get("house")
+        frames.get("dynasty")  # house is now least recently used
+        frames.get("house_frame_02")
+
+        assert cache.is_resident('frameTextures', "dynasty")
+        assert not cache.is_resident('frameTextures', "house")
+        assert uploads['deleted'] == [2]
+        assert frames.get("dynasty") == dynasty
+        # Evicted textures reload on demand
+        frames.get("house")
+        assert cache.loads == 4 and cache.evictions == 2
+
+    def test_release_keeps_sources(self, frame_dir, uploads):
+        cache = _cache(frame_dir)
+        cache.view('frameTextures').get("house")
+        cache.release()
+        assert uploads['deleted'] == [1]
+        assert "house" in cache.view('frameTextures')
+        assert not cache.is_resident('frameTextures', "house")
+
+
+class TestPrefetch:
+
+    def test_prefetched_decode_is_used(self, frame_dir, uploads, monkeypatch):
+        decoded_on = []
+        real_decode = TextureLoader.decode_image
+
+        def decode(path, resize=None):
+            decoded_on.append(threading.current_thread().name)
+            return real_decode(path, resize)
+
+        monkeypatch.setattr(TextureLoader, "decode_image", staticmethod(decode))
+        cache = _cache(frame_dir)
+        cache.prefetch([('frameTextures', "house"), ('frameTextures', "missing")])
+        assert cache.view('frameTextures').get("house") == 1
+        cache.shutdown()
+        assert len(decoded_on) == 1 and decoded_on[0].startswith("frame-prefetch")
+
+    def test_resident_entries_not_prefetched(self, frame_dir, uploads):
+        cache = _cache(frame_dir)
+        cache.view('frameTextures').get("house")
+        cache.prefetch([('frameTextures', "house")])
+        assert not cache._decoded
+        cache.shutdown()
+
+
+def test_neighbour_keys():
+    keys = ["a", "b", "c", "d"]
+    assert neighbour_keys(keys, "b") == ["b", "a", "c"]
+    assert neighbour_keys(keys, "a") == ["a", "b"]
+    assert neighbour_keys(keys, "c", radius=2) == ["c", "b", "d", "a"]
+    assert neighbour_keys(keys, "zz") == ["zz"]
@@ -0,0 +1,137 @@
+"""
+Cold-import budgets for the command-line entry points.
+
+Each scenario runs in a fresh interpreter with ``python -X importtime``;
+only imports made after a marker line are counted, so interpreter startup
+(site, encodings) is excluded.
+
+Covers:
+- headless.py --help loads no GUI, GL or imaging libraries
+- asset_converter.py --help does not import the converter GUI
+- CoA.from_string() stays free of heavy dependencies
+- Cumulative import time of each scenario stays within its budget
+  (opt-in: set IMPORT_TIME_BUDGETS=1; wall-clock limits depend on the machine)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EDITOR_SRC = REPO_ROOT / "editor" / "src"
+
+HEAVY_MODULES = {"numpy", "PyQt5", "PIL", "OpenGL", "imageio", "svgpathtools"}
+
+# Ceilings (ms), roughly 4x the current cost on a developer machine.
+# Heavy libraries are caught by name above on every run; these catch
+# gradual creep and only run when asked for, since shared CI machines
+# are too noisy for absolute timings.
+BUDGETS_ENABLED = os.environ.get("IMPORT_TIME_BUDGETS") == "1"
+BUDGET_MS = {
+    "headless_help": 150,
+    "converter_help": 150,
+    "coa_from_string": 250,
+}
+
+_MARKER = "--- measured imports ---"
+
+_RUN_SCRIPT = """
+import runpy, sys
+sys.argv = [{path!r}, '--help']
+try:
+    runpy.run_path({path!r}, run_name='__main__')
+except SystemExit:
+    pass
+"""
+
+SCENARIOS = {
+    "headless_help": _RUN_SCRIPT.format(path=str(EDITOR_SRC / "headless.py")),
+    "converter_help": _RUN_SCRIPT.format(path=str(REPO_ROOT / "asset_converter" / "asset_converter.py")),
+    "coa_from_string": (
+        "from models.coa import CoA\n"
+        "CoA.from_string('coa = { pattern = \"pattern_solid.dds\" color1 = red "
+        "colored_emblem = { texture = \"ce_fleur.dds\" instance = { position = { 0.5 0.5 } } } }')\n"
+    ),
+}
+
+
+def _profile_imports(code):
+    """Run code in a fresh interpreter under -X importtime.
+
+    Returns:
+        (total_ms, modules) - summed cumulative time of the top-level
+        imports made by code, and the names of every module it imported
+    """
+    script = f"import sys\nsys.stderr.write({_MARKER!r} + '\\n')\nsys.stderr.flush()\n{code}"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(EDITOR_SRC), str(REPO_ROOT)])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=str(REPO_ROOT), env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    lines = result.stderr.splitlines()
+    lines = lines[lines.index(_MARKER) + 1:]
+    total_us = 0
+    modules = set()
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):  # top level (one space after the bar)
+            total_us += int(cumulative)
+    return total_us / 1000.0, modules
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    """Best of three cold runs per scenario (the first also writes .pyc files)."""
+    results = {}
+    for name, code in SCENARIOS.items():
+        runs = [_profile_imports(code) for _ in range(3)]
+        results[name] = (min(ms for ms, _ in runs), runs[-1][1])
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Heavy dependencies
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_no_heavy_dependencies(profiles, scenario):
+    _, modules = profiles[scenario]
+    loaded = {m for m in modules if m.split(".")[0] in HEAVY_MODULES}
+    assert not loaded, f"{scenario} imported {sorted(loaded)[:10]}"
+
+
+def test_converter_help_skips_gui(profiles):
+    _, modules = profiles["converter_help"]
+    assert not {"src.gui", "src.converter_worker"} & modules
+
+
+def test_headless_help_skips_output_backends(profiles):
+    _, modules = profiles["headless_help"]
+    assert not {"zipfile", "tarfile", "sqlite3"} & modules
+
+
+def test_ck3_parser_import_is_light():
+    _, modules = _profile_imports("from asset_converter.src.ck3_parser import CK3Parser")
+    assert "asset_converter.src.ck3_parser" in modules
+    assert not {m for m in modules if m.split(".")[0] in HEAVY_MODULES}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Budgets
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.skipif(not BUDGETS_ENABLED, reason="set IMPORT_TIME_BUDGETS=1 to check wall-clock budgets")
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_import_time_budget(profiles, scenario):
+    total_ms, _ = profiles[scenario]
+    assert total_ms < BUDGET_MS[scenario], f"{scenario}: {total_ms:.1f} ms of imports"
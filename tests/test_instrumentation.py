@@ -0,0 +1,120 @@
+"""
+Tests for model hot-path instrumentation.
+
+Covers:
+- CoAInstrumentation leaves mixin methods untouched while disabled
+- Per-method counts/timings and ring-buffer events while enabled
+- Originals restored on disable; classmethods (from_string) instrumented
+- Chrome trace export
+- LayerTracker call log is a bounded ring buffer
+"""
+import json
+
+import pytest
+
+from models.coa import CoA, CoAInstrumentation, CoATransformMixin, LayerTracker
+
+
+@pytest.fixture
+def instrumentation():
+    CoAInstrumentation.reset()
+    yield CoAInstrumentation
+    CoAInstrumentation.disable()
+    CoAInstrumentation.reset()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Enable / disable
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestEnableDisable:
+
+    def test_disabled_leaves_methods_untouched(self, instrumentation, simple_coa_text):
+        original = CoATransformMixin.__dict__['set_layer_position']
+        coa = CoA.from_string(simple_coa_text)
+        coa.set_layer_position(coa.get_all_layer_uuids()[0], 0.4, 0.4)
+        assert CoATransformMixin.__dict__['set_layer_position'] is original
+        assert instrumentation.get_stats() == {}
+
+    def test_disable_restores_originals(self, instrumentation):
+        original = CoATransformMixin.__dict__['set_layer_position']
+        instrumentation.enable()
+        assert CoATransformMixin.__dict__['set_layer_position'] is not original
+        instrumentation.disable()
+        assert CoATransformMixin.__dict__['set_layer_position'] is original
+
+    def test_recording_context(self, instrumentation, simple_coa_text):
+        with instrumentation.recording():
+            CoA.from_string(simple_coa_text)
+        assert not instrumentation.is_enabled()
+        assert 'CoASerializationMixin.from_string' in instrumentation.get_stats()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Recording
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestRecording:
+
+    def test_counts_and_times_calls(self, instrumentation, simple_coa_text):
+        coa = CoA.from_string(simple_coa_text)
+        uuid = coa.get_all_layer_uuids()[0]
+        instrumentation.enable()
+        for _ in range(3):
+            coa.set_layer_position(uuid, 0.3, 0.6)
+        stats = instrumentation.get_stats()['CoATransformMixin.set_layer_position']
+        assert stats['calls'] == 3
+        assert stats['total_ms'] >= stats['max_ms'] >= 0.0
+        # Behaviour unchanged under the wrapper
+        assert coa.get_layer_position(uuid)[0] == pytest.approx(0.3)
+
+    def test_ring_buffer_keeps_most_recent(self, instrumentation, simple_coa_text):
+        coa = CoA.from_string(simple_coa_text)
+        instrumentation.enable(buffer_size=5)
+        try:
+            for _ in range(20):
+                coa.get_layer_count()
+            events = instrumentation.get_events()
+            assert len(events) == 5
+            assert instrumentation.get_stats()['CoAQueryMixin.get_layer_count']['calls'] == 20
+        finally:
+            instrumentation.disable()
+            instrumentation.enable(buffer_size=CoAInstrumentation.DEFAULT_BUFFER_SIZE)
+
+    def test_report_lists_methods(self, instrumentation, simple_coa_text):
+        with instrumentation.recording():
+            CoA.from_string(simple_coa_text).to_string()
+        report = instrumentation.report()
+        assert 'from_string' in report and 'to_string' in report
+
+    def test_chrome_trace_export(self, instrumentation, tmp_path, simple_coa_text):
+        with instrumentation.recording():
+            CoA.from_string(simple_coa_text).to_string()
+        out = tmp_path / "trace.json"
+        instrumentation.export_trace(str(out))
+        events = json.loads(out.read_text())['traceEvents']
+        assert events and all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+        assert {'from_string', 'to_string'} <= {e['name'] for e in events}
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# LayerTracker call log
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestLayerTrackerLog:
+
+    def test_log_is_bounded(self):
+        LayerTracker.clear_log()
+        for i in range(LayerTracker._max_log_size + 50):
+            LayerTracker.log_call('CoA', i, 'probe')
+        log = LayerTracker.get_log()
+        assert len(log) == LayerTracker._max_log_size
+        assert log[-1] == {'caller': 'CoA', 'layer_id': LayerTracker._max_log_size + 49,
+                           'method': 'probe', 'property': None, 'value': None}
+
+    def test_get_log_filters(self):
+        LayerTracker.clear_log()
+        LayerTracker.log_call('CoA', 1, 'a')
+        LayerTracker.log_call('Layers', 2, 'b')
+        assert [e['method'] for e in LayerTracker.get_log(caller='Layers')] == ['b']
+        assert [e['method'] for e in LayerTracker.get_log(layer_id=1)] == ['a']
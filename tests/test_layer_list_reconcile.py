@@ -0,0 +1,200 @@
+"""
+Tests for LayerListWidget.rebuild() reconciliation.
+
+Covers:
+- longest_increasing_run() helper
+- Unchanged rebuild reuses every widget
+- Add / delete / reorder only touch the affected rows
+- Layout order always matches the CoA model
+- Changed layers (color, visibility) and containers (collapse) are recreated
+- Reused rows follow the current selection
+- rebuild(full=True) and clear_thumbnail_cache() recreate everything
+"""
+import pytest
+
+from models.color import Color
+from components.property_sidebar_widgets.layer_list_widget import (
+    LayerListWidget, longest_increasing_run)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Helpers
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def coa(fresh_coa):
+    for i in range(5):
+        fresh_coa.add_layer(emblem_path=f"ce_layer_{i}.dds")
+    return fresh_coa
+
+
+@pytest.fixture
+def widget(coa, qtbot):
+    widget = LayerListWidget()
+    qtbot.addWidget(widget)
+    widget.coa = coa
+    widget.rebuild()
+    return widget
+
+
+def _layout_rows(widget):
+    layout = widget.layers_layout
+    return [layout.itemAt(i).widget() for i in range(layout.count())]
+
+
+def _describe_rows(widget):
+    rows = []
+    for row in _layout_rows(widget):
+        if row is None:
+            rows.append(None)  # Trailing stretch
+        elif hasattr(row, 'layer_button'):
+            rows.append(('layer', row.layer_button.property('layer_uuid')))
+        elif hasattr(row, 'drop_zone'):
+            zone = row.drop_zone
+            rows.append(('zone', zone.property('drop_index'), zone.property('indented'),
+                         zone.property('container_uuid')))
+        else:
+            rows.append(('container', row.property('container_uuid')))
+    return rows
+
+
+def _assert_matches_fresh_build(widget):
+    """Layout must equal what a from-scratch rebuild produces"""
+    fresh = LayerListWidget()
+    fresh.coa = widget.coa
+    fresh.collapsed_containers = set(widget.collapsed_containers)
+    fresh.rebuild(full=True)
+    assert _describe_rows(widget) == _describe_rows(fresh)
+    fresh.deleteLater()
+
+
+def _buttons(widget):
+    return dict(widget.layer_buttons)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# longest_increasing_run
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestLongestIncreasingRun:
+
+    def test_sorted(self):
+        assert longest_increasing_run([0, 1, 2, 3]) == {0, 1, 2, 3}
+
+    def test_empty(self):
+        assert longest_increasing_run([]) == set()
+
+    def test_one_moved(self):
+        # Last item moved to the front: everything else stays
+        assert longest_increasing_run([4, 0, 1, 2, 3]) == {1, 2, 3, 4}
+
+    def test_result_is_increasing(self):
+        values = [3, 9, 1, 7, 2, 8, 4, 6, 0, 5]
+        run = sorted(longest_increasing_run(values))
+        picked = [values[i] for i in run]
+        assert picked == sorted(picked)
+        assert len(run) == 4  # e.g. 1, 2, 4, 6
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Reconciliation
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestReconcile:
+
+    def test_unchanged_rebuild_reuses_everything(self, widget):
+        before = _layout_rows(widget)
+        widget.rebuild()
+        assert _layout_rows(widget) == before
+        assert widget.rebuild_stats['created'] == 0
+        assert widget.rebuild_stats['moved'] == 0
+        assert widget.rebuild_stats['removed'] == 0
+
+    def test_add_layer(self, widget, coa):
+        before = _buttons(widget)
+        new_uuid = coa.add_layer(emblem_path="ce_new.dds")
+        widget.rebuild()
+        after = _buttons(widget)
+        assert set(after) == set(before) | {new_uuid}
+        assert all(after[uuid] is before[uuid] for uuid in before)
+        assert widget.rebuild_stats['created'] == 2  # Layer row + its drop zone
+        _assert_matches_fresh_build(widget)
+
+    def test_delete_layer(self, widget, coa):
+        before = _buttons(widget)
+        removed = coa.get_all_layer_uuids()[2]
+        coa.remove_layer(removed)
+        widget.rebuild()
+        after = _buttons(widget)
+        assert removed not in after
+        assert all(after[uuid] is before[uuid] for uuid in after)
+        assert widget.rebuild_stats['created'] == 0
+        assert widget.rebuild_stats['removed'] == 2
+        _assert_matches_fresh_build(widget)
+
+    def test_reorder_moves_rows(self, widget, coa):
+        before = _buttons(widget)
+        bottom = coa.get_all_layer_uuids()[0]
+        coa.move_layer_to_top(bottom)
+        widget.rebuild()
+        after = _buttons(widget)
+        assert all(after[uuid] is before[uuid] for uuid in before)
+        assert widget.rebuild_stats['created'] == 0
+        assert 0 < widget.rebuild_stats['moved'] <= 2
+        _assert_matches_fresh_build(widget)
+        assert [uuid for uuid, _ in widget.layer_buttons] == coa.get_all_layer_uuids()[::-1]
+
+    def test_changed_layer_recreated(self, widget, coa):
+        before = _buttons(widget)
+        uuids = coa.get_all_layer_uuids()
+        coa.set_layer_color(uuids[1], 1, Color.from_name('blue'))
+        coa.set_layer_visible(uuids[3], False)
+        widget.rebuild()
+        after = _buttons(widget)
+        changed = {uuids[1], uuids[3]}
+        assert all(after[uuid] is not before[uuid] for uuid in changed)
+        assert all(after[uuid] is before[uuid] for uuid in set(uuids) - changed)
+        assert widget.rebuild_stats['created'] == 2
+        _assert_matches_fresh_build(widget)
+
+    def test_container_collapse(self, widget, coa):
+        uuids = coa.get_all_layer_uuids()
+        container_uuid = coa.create_container_from_layers(uuids[1:3], name="Group")
+        widget.rebuild()
+        _assert_matches_fresh_build(widget)
+        marker = dict(widget.container_markers)[container_uuid]
+
+        widget._toggle_container_collapse(container_uuid)
+        assert dict(widget.container_markers)[container_uuid] is not marker
+        assert set(_buttons(widget)) == set(uuids) - set(uuids[1:3])
+        _assert_matches_fresh_build(widget)
+
+        widget._toggle_container_collapse(container_uuid)
+        assert set(_buttons(widget)) == set(uuids)
+        _assert_matches_fresh_build(widget)
+
+    def test_reused_rows_follow_selection(self, widget, coa):
+        uuids = coa.get_all_layer_uuids()
+        widget.selected_layer_uuids = {uuids[0]}
+        widget.update_selection_visuals()
+        widget.selected_layer_uuids = {uuids[4]}
+        widget.rebuild()
+        checked = {uuid for uuid, row in widget.layer_buttons if row.layer_button.isChecked()}
+        assert checked == {uuids[4]}
+
+
+class TestFullRebuild:
+
+    def test_full_recreates_everything(self, widget):
+        before = set(_layout_rows(widget)) - {None}
+        widget.rebuild(full=True)
+        after = set(_layout_rows(widget)) - {None}
+        assert not before & after
+        assert widget.rebuild_stats['reused'] == 0
+
+    def test_cleared_thumbnails_recreate_layers(self, widget):
+        before = _buttons(widget)
+        widget.clear_thumbnail_cache()
+        widget.rebuild()
+        after = _buttons(widget)
+        assert all(after[uuid] is not before[uuid] for uuid in before)
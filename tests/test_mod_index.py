@@ -0,0 +1,150 @@
+"""
+Tests for the single-pass mod asset index (asset_converter/src/mod_support.py).
+
+Covers:
+- Asset flags and buckets from one scandir per asset directory
+- Title frame ordering and detection markers
+- build_asset_sources: parallel and serial scans agree, asset-less mods
+  are dropped, and find_asset_files reuses the index
+- Missing directories
+"""
+import os
+
+import pytest
+
+from asset_converter.src import mod_support
+from asset_converter.src.mod_support import (
+    ModAssetIndex, ModAssetSource, build_asset_sources, detect_coa_assets, find_asset_files,
+)
+
+
+def _touch(root, *parts):
+    path = root.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return path
+
+
+def _make_content(root, emblems=(), patterns=(), title_frames=(), realm_frames=(), cultures=()):
+    for name in emblems:
+        _touch(root, "gfx", "coat_of_arms", "colored_emblems", name)
+    for name in patterns:
+        _touch(root, "gfx", "coat_of_arms", "patterns", name)
+    for name in title_frames:
+        _touch(root, "gfx", "interface", "coat_of_arms", name)
+    for name in realm_frames:
+        _touch(root, "gfx", "interface", "icons", "realm_frames", name)
+    for name in cultures:
+        _touch(root, "common", "culture", "cultures", name)
+
+
+@pytest.fixture
+def game_and_mods(tmp_path):
+    """CK3 install with two CoA mods and one unrelated mod."""
+    ck3 = tmp_path / "ck3"
+    _make_content(
+        ck3 / "game",
+        emblems=["ce_lion.dds", "ce_cross.dds", "50_emblems.txt", ".hidden.dds"],
+        patterns=["pattern_solid.dds"],
+        title_frames=["topframe_28.dds", "title_mask.dds", "title_28.dds", "crown_strip_28.dds",
+                      "holyorder_topframe_28.dds", "house_mask.dds", "readme.txt"],
+        realm_frames=["clan_mask.dds", "clan_frame.dds"],
+        cultures=["00_cultures.txt"],
+    )
+    _touch(ck3, "game", "gfx", "interface", "coat_of_arms", "frames", "28_frame.dds")
+
+    mod_dir = tmp_path / "mod"
+    mods = {
+        "Heraldry": dict(emblems=["ce_wyvern.dds"]),
+        "Frames": dict(title_frames=["custom_mask.dds"]),
+        "Events Only": dict(cultures=[]),
+    }
+    for name, content in mods.items():
+        path = tmp_path / "workshop" / name.replace(" ", "_")
+        path.mkdir(parents=True)
+        _make_content(path, **content)
+        (mod_dir / f"{name}.mod").parent.mkdir(parents=True, exist_ok=True)
+        (mod_dir / f"{name}.mod").write_text(f'name = "{name}"\npath = "{path.as_posix()}"\n')
+    return ck3, mod_dir
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Index
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestIndex:
+
+    def test_flags(self, game_and_mods):
+        ck3, _ = game_and_mods
+        assert detect_coa_assets(ck3 / "game") == {
+            'has_emblems': True, 'has_patterns': True, 'has_frames': True,
+            'has_realm_frames': True, 'has_title_frames': True, 'has_culture_files': True,
+            'has_emblem_metadata': True, 'has_pattern_metadata': False,
+        }
+
+    def test_buckets(self, game_and_mods):
+        ck3, _ = game_and_mods
+        index = ModAssetIndex.scan(ck3 / "game")
+        assert sorted(p.name for p in index.files('emblems')) == ["ce_cross.dds", "ce_lion.dds"]
+        assert [p.name for p in index.files('emblem_metadata')] == ["50_emblems.txt"]
+        assert [p.name for p in index.files('frames')] == ["28_frame.dds"]
+        assert sorted(p.name for p in index.files('realm_frames')) == ["clan_frame.dds", "clan_mask.dds"]
+        assert index.files('unknown') == []
+
+    def test_title_frame_order(self, game_and_mods):
+        ck3, _ = game_and_mods
+        names = [p.name for p in ModAssetIndex.scan(ck3 / "game").files('title_frames')]
+        assert names == ["title_mask.dds", "house_mask.dds", "crown_strip_28.dds", "title_28.dds",
+                         "topframe_28.dds", "holyorder_topframe_28.dds"]
+
+    def test_title_frame_markers_are_broader_than_conversion(self, tmp_path):
+        _make_content(tmp_path, title_frames=["custom_mask.dds"])
+        index = ModAssetIndex.scan(tmp_path)
+        assert index.flags()['has_title_frames']
+        assert index.files('title_frames') == []
+
+    def test_missing_directories(self, tmp_path):
+        index = ModAssetIndex.scan(tmp_path / "nowhere")
+        assert not any(index.flags().values())
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Asset sources
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestAssetSources:
+
+    @staticmethod
+    def _summary(sources):
+        return [(s.name, [str(p) for p in find_asset_files(s, 'emblems')],
+                 [str(p) for p in find_asset_files(s, 'title_frames')]) for s in sources]
+
+    def test_parallel_matches_serial(self, game_and_mods):
+        ck3, mod_dir = game_and_mods
+        parallel = build_asset_sources(ck3, mod_dir, max_workers=4)
+        serial = build_asset_sources(ck3, mod_dir, max_workers=1)
+        assert [s.name for s in parallel][0] == "Base Game"
+        assert sorted(s.name for s in parallel[1:]) == ["Frames", "Heraldry"]
+        assert self._summary(parallel) == self._summary(serial)
+
+    def test_each_directory_listed_once(self, game_and_mods, monkeypatch):
+        ck3, mod_dir = game_and_mods
+        listed = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(mod_support.os, "scandir", lambda d: listed.append(str(d)) or real_scandir(d))
+
+        sources = build_asset_sources(ck3, mod_dir, max_workers=1)
+        for source in sources:
+            for asset_type in ModAssetIndex.ASSET_TYPES:
+                find_asset_files(source, asset_type)
+        assert len(listed) == len(set(listed))
+        # Six asset directories per source (base game + three mods), plus the .mod folder
+        assert str(mod_dir) in listed
+        assert len(listed) == 6 * 4 + 1
+
+    def test_source_without_index_scans_on_demand(self, game_and_mods):
+        ck3, _ = game_and_mods
+        source = ModAssetSource("Base Game", ck3, is_base_game=True)
+        assert source.index is None
+        assert [p.name for p in find_asset_files(source, 'culture_files')] == ["00_cultures.txt"]
+        assert source.index is not None
@@ -0,0 +1,231 @@
+"""
+Tests for headless render output sinks.
+
+Covers:
+- create_sink() picks the sink from the output extension
+- Directory, zip, tar and SQLite sinks store every render under its name
+- BackgroundWriter batches writes and surfaces worker errors
+- headless.py stops rendering at the first sink error
+"""
+import sqlite3
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from services.output_sinks import (
+    BackgroundWriter, DirectorySink, OutputSink, SQLiteSink, TarSink, ZipSink,
+    create_sink,
+)
+
+
+RENDERS = [(f"coa_{i}", f"png-bytes-{i}".encode()) for i in range(10)]
+
+
+def _write_all(sink, batch_size=4):
+    with BackgroundWriter(sink, batch_size=batch_size) as writer:
+        for name, data in RENDERS:
+            writer.submit(name, data)
+    return writer
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Sink selection
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestCreateSink:
+
+    @pytest.mark.parametrize("output,expected", [
+        ("renders", DirectorySink),
+        ("renders.zip", ZipSink),
+        ("renders.tar", TarSink),
+        ("renders.tar.gz", TarSink),
+        ("renders.sqlite", SQLiteSink),
+        ("renders.db", SQLiteSink),
+    ])
+    def test_auto_from_extension(self, tmp_path, output, expected):
+        assert isinstance(create_sink(str(tmp_path / output)), expected)
+
+    def test_explicit_kind_overrides_extension(self, tmp_path):
+        assert isinstance(create_sink(str(tmp_path / "out.zip"), "dir"), DirectorySink)
+
+    def test_unknown_kind_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_sink(str(tmp_path), "ftp")
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Sink contents
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestSinkContents:
+
+    def test_directory(self, tmp_path):
+        out = tmp_path / "renders"
+        _write_all(DirectorySink(str(out)))
+        for name, data in RENDERS:
+            assert (out / f"{name}.png").read_bytes() == data
+
+    def test_zip(self, tmp_path):
+        out = tmp_path / "renders.zip"
+        _write_all(ZipSink(str(out)))
+        with zipfile.ZipFile(out) as zf:
+            for name, data in RENDERS:
+                assert zf.read(f"{name}.png") == data
+
+    @pytest.mark.parametrize("filename", ["renders.tar", "renders.tgz"])
+    def test_tar(self, tmp_path, filename):
+        out = tmp_path / filename
+        _write_all(TarSink(str(out)))
+        with tarfile.open(out) as tf:
+            for name, data in RENDERS:
+                assert tf.extractfile(f"{name}.png").read() == data
+
+    def test_sqlite(self, tmp_path):
+        out = tmp_path / "renders.sqlite"
+        _write_all(SQLiteSink(str(out)))
+        conn = sqlite3.connect(out)
+        rows = dict(conn.execute("SELECT name, png FROM renders"))
+        conn.close()
+        assert rows == dict(RENDERS)
+
+    def test_sqlite_rerender_replaces(self, tmp_path):
+        out = str(tmp_path / "renders.sqlite")
+        _write_all(SQLiteSink(out))
+        with BackgroundWriter(SQLiteSink(out)) as writer:
+            writer.submit("coa_0", b"new")
+        conn = sqlite3.connect(out)
+        assert conn.execute("SELECT png FROM renders WHERE name='coa_0'").fetchone()[0] == b"new"
+        assert conn.execute("SELECT COUNT(*) FROM renders").fetchone()[0] == len(RENDERS)
+        conn.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Background writer
+# ══════════════════════════════════════════════════════════════════════════
+
+class RecordingSink(OutputSink):
+    def __init__(self):
+        super().__init__(".")
+        self.batches = []
+        self.closed = False
+
+    def write(self, name, data):
+        self.batches.append([(name, data)])
+
+    def write_batch(self, items):
+        self.batches.append(list(items))
+
+    def close(self):
+        self.closed = True
+
+
+class FailingSink(RecordingSink):
+    def write_batch(self, items):
+        raise OSError("disk full")
+
+
+class TestBackgroundWriter:
+
+    def test_batches_respect_batch_size(self):
+        sink = RecordingSink()
+        writer = _write_all(sink, batch_size=3)
+        assert all(len(batch) <= 3 for batch in sink.batches)
+        assert [item for batch in sink.batches for item in batch] == RENDERS
+        assert writer.written == len(RENDERS)
+        assert sink.closed
+
+    def test_encodes_images_on_worker(self):
+        class FakeImage:
+            def save(self, buf, fmt):
+                buf.write(fmt.encode())
+
+        sink = RecordingSink()
+        with BackgroundWriter(sink) as writer:
+            writer.submit("coa", FakeImage())
+        assert sink.batches == [[("coa", b"PNG")]]
+
+    def test_worker_error_raised_on_close(self):
+        sink = FailingSink()
+        writer = BackgroundWriter(sink)
+        writer.submit("coa", b"data")
+        with pytest.raises(OSError, match="disk full"):
+            writer.close()
+        assert sink.closed
+
+    def test_worker_error_exposed(self):
+        writer = BackgroundWriter(FailingSink())
+        assert writer.error is None
+        writer.submit("coa", b"data")
+        with pytest.raises(OSError):
+            writer.close()
+        assert isinstance(writer.error, OSError)
+
+    def test_submit_after_close_raises(self):
+        writer = BackgroundWriter(RecordingSink())
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit("coa", b"data")
+
+    def test_on_encoded_receives_png_bytes(self):
+        received = []
+        with BackgroundWriter(RecordingSink()) as writer:
+            writer.submit("coa", b"data", on_encoded=received.append)
+            writer.submit("other", b"more")
+        assert received == [b"data"]
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Headless run
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_headless_stops_at_first_sink_error(tmp_path, monkeypatch, capsys):
+    import headless
+    from services import headless_renderer, output_sinks
+
+    samples = sorted(Path(headless._project_root, "examples", "game_samples").glob("*.txt"))[:3]
+    input_file = tmp_path / "many.txt"
+    input_file.write_text("\n".join(p.read_text(encoding="utf-8-sig") for p in samples),
+                          encoding="utf-8")
+
+    writers = []
+    renders = []
+
+    class TrackedWriter(BackgroundWriter):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            writers.append(self)
+
+    class FailingOpenSink(RecordingSink):
+        def open(self):
+            raise OSError("read-only filesystem")
+
+    class FakeRenderer:
+        def __init__(self, **kwargs):
+            pass
+
+        def render_image(self, coa):
+            while writers[0].error is None:  # Let the worker fail first
+                time.sleep(0.001)
+            renders.append(coa)
+            return b"png"
+
+        def cleanup(self):
+            pass
+
+    monkeypatch.setattr(output_sinks, "BackgroundWriter", TrackedWriter)
+    monkeypatch.setattr(output_sinks, "create_sink", lambda output, kind: FailingOpenSink())
+    monkeypatch.setattr(headless_renderer, "HeadlessRenderer", FakeRenderer)
+    monkeypatch.setattr(sys, "argv", ["headless.py", str(input_file), "-o", str(tmp_path / "out")])
+
+    with pytest.raises(SystemExit) as exit_info:
+        headless.main()
+    out = capsys.readouterr().out
+    assert exit_info.value.code == 1
+    assert "Found 3 coat(s) of arms." in out
+    assert len(renders) <= 1
+    assert "[FAIL]" not in out
+    assert out.count("read-only filesystem") == 1
@@ -0,0 +1,197 @@
+"""
+Tests for batch preview-variant export (services/preview_export.py and
+CanvasPreviewMixin.export_preview_variants).
+
+Covers:
+- Variant enumeration: government x rank x size, titles once per rank/size
+- Output names are stable slugs
+- ReadbackImage flips bottom-up pixels and encodes on the writer thread
+- Pooled export: framebuffers reused round robin, each round rendered
+  before it is read back, preview state and GL bindings restored
+
+GL calls and framebuffers are stubbed; no GL context is needed.
+"""
+import threading
+
+import numpy as np
+import OpenGL.GL as gl
+import pytest
+from PIL import Image
+
+from components.canvas_widgets.canvas_preview_mixin import CanvasPreviewMixin
+from services.output_sinks import BackgroundWriter, DirectorySink, OutputSink
+from services.preview_export import (
+    PREVIEW_RANKS, PREVIEW_SIZES, FramebufferPool, PreviewVariant, ReadbackImage,
+    preview_variants,
+)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Variants
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestPreviewVariants:
+
+    def test_counts(self):
+        variants = preview_variants(["_default", "clan_government"])
+        per_government = len(PREVIEW_RANKS) * len(PREVIEW_SIZES)
+        assert len(variants) == 3 * per_government
+        assert sum(v.kind == 'title' for v in variants) == per_government
+        assert all(v.government is None for v in variants if v.kind == 'title')
+
+    def test_grouped_by_government_then_size(self):
+        variants = preview_variants(["a", "b"], ["Duke", "King"], [86, 115], kinds=['government'])
+        assert [(v.government, v.size, v.rank) for v in variants[:3]] == [
+            ("a", 86, "Duke"), ("a", 86, "King"), ("a", 115, "Duke")]
+        assert variants[4].government == "b"
+
+    def test_title_only(self):
+        variants = preview_variants(["a"], ["Duke"], [28], kinds=['title'])
+        assert variants == [PreviewVariant('title', "Duke", 28)]
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            preview_variants(["a"], kinds=['banner'])
+
+    def test_output_names(self):
+        assert (PreviewVariant('government', "Holy Order", 86, "clan_government").output_name("my_coa")
+                == "my_coa_gov_clan_government_holy_order_86")
+        assert PreviewVariant('government', "Duke", 28, "_default").output_name("x") == "x_gov_default_duke_28"
+        assert PreviewVariant('title', "King", 115).output_name("x") == "x_title_king_115"
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Deferred encoding
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestReadbackImage:
+
+    def test_flips_and_encodes(self, tmp_path):
+        pixels = np.zeros((4, 4, 4), dtype=np.uint8)
+        pixels[0] = (255, 0, 0, 255)  # bottom row as read by glReadPixels
+        with BackgroundWriter(DirectorySink(str(tmp_path))) as writer:
+            writer.submit("flip", ReadbackImage(pixels))
+        with Image.open(tmp_path / "flip.png") as img:
+            arr = np.asarray(img)
+        assert img.mode == "RGBA"
+        assert tuple(arr[3, 0]) == (255, 0, 0, 255)
+        assert tuple(arr[0, 0]) == (0, 0, 0, 0)
+
+    def test_converted_on_writer_thread(self):
+        converted_on = []
+
+        class Recording(ReadbackImage):
+            def to_image(self):
+                converted_on.append(threading.current_thread().name)
+                return super().to_image()
+
+        class NullSink(OutputSink):
+            def write(self, name, data):
+                pass
+
+        with BackgroundWriter(NullSink("unused")) as writer:
+            writer.submit("a", Recording(np.zeros((2, 2, 4), dtype=np.uint8)))
+        assert converted_on == ["render-writer"]
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Pooled export
+# ══════════════════════════════════════════════════════════════════════════
+
+class FakeFbo:
+    def __init__(self, fbo_id):
+        self.fbo_id = fbo_id
+
+    def handle(self):
+        return self.fbo_id
+
+
+class FakeCanvas(CanvasPreviewMixin):
+    """Renders a variant by filling the bound FBO with its index."""
+
+    def __init__(self, gl_state, variants):
+        self.gl_state = gl_state
+        self.variant_index = {v: i for i, v in enumerate(variants)}
+        self.preview_government = "_default"
+        self.preview_rank = "Duke"
+        self.prefetched = []
+        self.frame_texture_cache = type("Cache", (), {"prefetch": lambda _, e: self.prefetched.append(e)})()
+
+    def _render_preview_variant(self, variant, canvas_size):
+        super()._render_preview_variant(variant, canvas_size)
+        self.gl_state['contents'][self.gl_state['bound']] = self.variant_index[variant]
+        self.gl_state['log'].append(('render', variant))
+
+    def _render_preview_centered(self, render_fn, canvas_size, render_size, texture_size=None):
+        pass
+
+
+@pytest.fixture
+def gl_state(monkeypatch):
+    """Stub framebuffers and the GL calls export_preview_variants makes."""
+    state = {'bound': 7, 'contents': {}, 'log': [], 'viewport': None, 'created': 0}
+
+    def create(pool):
+        state['created'] += 1
+        fbo = FakeFbo(100 + state['created'])
+        fbo.bind = lambda: state.update(bound=fbo.fbo_id)
+        return fbo
+
+    def read_pixels(x, y, w, h, fmt, dtype):
+        value = state['contents'][state['bound']]
+        state['log'].append(('read', value))
+        return np.full((h, w, 4), value, dtype=np.uint8).tobytes()
+
+    monkeypatch.setattr(FramebufferPool, "_create", create)
+    monkeypatch.setattr(gl, "glGetIntegerv", lambda name: 7 if name == gl.GL_FRAMEBUFFER_BINDING else [0, 0, 640, 480])
+    monkeypatch.setattr(gl, "glBindFramebuffer", lambda target, fbo: state.update(bound=fbo))
+    monkeypatch.setattr(gl, "glViewport", lambda *args: state.update(viewport=args))
+    monkeypatch.setattr(gl, "glReadPixels", read_pixels)
+    return state
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, name, image, on_encoded=None):
+        self.submitted.append((name, image))
+
+
+class TestExportPreviewVariants:
+
+    def _export(self, gl_state, variants, pool_size=2):
+        canvas = FakeCanvas(gl_state, variants)
+        writer = RecordingWriter()
+        count = canvas.export_preview_variants(variants, writer, prefix="coa", export_size=4, pool_size=pool_size)
+        return canvas, writer, count
+
+    def test_every_variant_written_in_order(self, gl_state):
+        variants = preview_variants(["a"], ["Duke", "King"], [86], kinds=['government', 'title'])
+        canvas, writer, count = self._export(gl_state, variants)
+        assert count == len(variants) == 4
+        assert [name for name, _ in writer.submitted] == [v.output_name("coa") for v in variants]
+        for i, (_, image) in enumerate(writer.submitted):
+            assert isinstance(image, ReadbackImage) and image.pixels.shape == (4, 4, 4)
+            assert (image.pixels == i).all()
+
+    def test_pool_reused_and_rounds_render_before_readback(self, gl_state):
+        variants = preview_variants(["a", "b", "c"], ["Duke"], [86], kinds=['government'])
+        self._export(gl_state, variants, pool_size=2)
+        assert gl_state['created'] == 2
+        assert [entry[0] for entry in gl_state['log']] == [
+            'render', 'render', 'read', 'read', 'render', 'read']
+
+    def test_state_restored(self, gl_state):
+        variants = preview_variants(["clan_government"], ["King"], [115])
+        canvas, _, _ = self._export(gl_state, variants)
+        assert (canvas.preview_government, canvas.preview_rank) == ("_default", "Duke")
+        assert gl_state['bound'] == 7
+        assert gl_state['viewport'] == (0, 0, 640, 480)
+
+    def test_next_round_prefetched(self, gl_state):
+        variants = preview_variants(["a", "b"], ["Mercenary"], [62], kinds=['government'])
+        canvas, _, _ = self._export(gl_state, variants, pool_size=1)
+        assert canvas.prefetched[0] == [('realm_frame_masks', "b"), ('realm_frame_frames', ("b", 62)),
+                                        ('mercenary_topframes', 62), ('topframes', 62)]
+        assert len(canvas.prefetched) == 1
@@ -0,0 +1,108 @@
+"""
+Tests for the content-addressed headless render cache.
+
+Covers:
+- Keys depend on the renderer namespace
+- Hits, misses and hit rate accounting
+- In-flight duplicates served from reserve()
+- Entries persist across cache instances
+- LRU eviction under the size cap
+- Namespace helpers track file changes and shader sources
+"""
+import pytest
+
+import os
+
+from services.render_cache import RenderCache, stat_stamp, tree_digest
+
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "renders.cache")
+
+
+class TestRenderCache:
+
+    def test_namespace_changes_key(self, cache_path):
+        a = RenderCache(cache_path, MB, namespace="size=256")
+        b = RenderCache(cache_path, MB, namespace="size=512")
+        assert a.make_key("abc") != b.make_key("abc")
+        a.close()
+        b.close()
+
+    def test_miss_then_hit(self, cache_path):
+        cache = RenderCache(cache_path, MB)
+        key = cache.make_key("abc")
+        assert cache.get(key) is None
+        cache.put(key, b"png")
+        assert cache.get(key) == b"png"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == pytest.approx(0.5)
+        cache.close()
+
+    def test_reserved_render_counts_as_hit(self, cache_path):
+        cache = RenderCache(cache_path, MB)
+        image = object()
+        cache.reserve("k", image)
+        assert cache.get("k") is image
+        cache.put("k", b"png")
+        assert cache.get("k") == b"png"
+        assert cache.hits == 2
+        cache.close()
+
+    def test_persists_across_instances(self, cache_path):
+        cache = RenderCache(cache_path, MB)
+        cache.put("k", b"png")
+        cache.close()
+
+        reopened = RenderCache(cache_path, MB)
+        assert reopened.get("k") == b"png"
+        assert reopened.total_bytes == 3
+        reopened.close()
+
+    def test_lru_eviction(self, cache_path):
+        cache = RenderCache(cache_path, max_bytes=30)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.put("c", b"x" * 10)
+        cache.get("a")  # a is now more recent than b
+        cache.put("d", b"x" * 10)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+        assert cache.total_bytes <= 30
+        cache.close()
+
+    def test_oversized_entry_not_stored(self, cache_path):
+        cache = RenderCache(cache_path, max_bytes=4)
+        cache.put("k", b"too large")
+        assert cache.get("k") is None
+        assert cache.total_bytes == 0
+        cache.close()
+
+
+class TestNamespaceHelpers:
+
+    def test_stat_stamp_changes_on_rewrite(self, tmp_path):
+        path = tmp_path / "hot_reload.json"
+        assert stat_stamp(path) == "hot_reload.json=missing"
+        path.write_text('{"sequence": 1}')
+        first = stat_stamp(path)
+        path.write_text('{"sequence": 2}')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        assert stat_stamp(path) != first
+
+    def test_tree_digest(self, tmp_path):
+        assert tree_digest(tmp_path / "nope") == "missing"
+        (tmp_path / "coa").mkdir()
+        shader = tmp_path / "coa" / "emblem.frag"
+        shader.write_text("void main() {}")
+        (tmp_path / "notes.txt").write_text("ignored")
+        first = tree_digest(tmp_path)
+        (tmp_path / "notes.txt").write_text("still ignored")
+        assert tree_digest(tmp_path) == first
+        shader.write_text("void main() { discard; }")
+        assert tree_digest(tmp_path) != first
@@ -0,0 +1,174 @@
+"""
+Tests for the canvas render profiler (services/render_profiler.py).
+
+Covers:
+- Disabled profiler records nothing and leaves GL functions untouched
+- Stage timing and frame history
+- GL call counters are installed only during a frame and always restored
+- Calls from other threads are not counted
+- Overlay summary and Chrome trace export
+- Culled emblem instance counts
+
+GPU timer queries need a live GL context, so these tests run CPU-only.
+"""
+import json
+import threading
+
+import OpenGL.GL as gl
+import pytest
+from PyQt5.QtGui import QOpenGLShaderProgram
+
+from services.render_profiler import RenderProfiler
+
+
+@pytest.fixture
+def profiler():
+    prof = RenderProfiler(history=10, gpu_timing=False)
+    yield prof
+    prof.set_enabled(False)
+
+
+def _record_frame(prof, stages=("coa_rtt", "composite")):
+    prof.begin_frame()
+    for name in stages:
+        with prof.stage(name):
+            pass
+    prof.end_frame()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Recording
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestRecording:
+
+    def test_disabled_records_nothing(self, profiler):
+        original = gl.glDrawElements
+        _record_frame(profiler)
+        assert len(profiler.frames) == 0
+        assert gl.glDrawElements is original
+
+    def test_stages_recorded_per_frame(self, profiler):
+        profiler.set_enabled(True)
+        _record_frame(profiler)
+        frame = profiler.frames[-1]
+        assert set(frame.stage_cpu_ms) == {"coa_rtt", "composite"}
+        assert frame.cpu_ms >= sum(frame.stage_cpu_ms.values())
+        assert frame.gpu_ms is None
+
+    def test_history_is_bounded(self, profiler):
+        profiler.set_enabled(True)
+        for _ in range(25):
+            _record_frame(profiler)
+        assert len(profiler.frames) == 10
+        assert profiler.frames[-1].index == 24
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# GL call counters
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestCounters:
+
+    def test_counters_installed_only_during_frame(self, profiler):
+        original_draw = gl.glDrawElements
+        original_uniform = QOpenGLShaderProgram.setUniformValue
+        profiler.set_enabled(True)
+        assert gl.glDrawElements is original_draw
+        with profiler.frame():
+            assert gl.glDrawElements is not original_draw
+            assert QOpenGLShaderProgram.setUniformValue is not original_uniform
+        assert gl.glDrawElements is original_draw
+        assert QOpenGLShaderProgram.setUniformValue is original_uniform
+
+    def test_counters_restored_when_frame_raises(self, profiler):
+        original_draw = gl.glDrawElements
+        profiler.set_enabled(True)
+        with pytest.raises(ValueError):
+            with profiler.frame():
+                raise ValueError("draw failed")
+        assert gl.glDrawElements is original_draw
+        assert len(profiler.frames) == 0
+
+    def test_disable_mid_frame_restores(self, profiler):
+        original_draw = gl.glDrawElements
+        profiler.set_enabled(True)
+        profiler.begin_frame()
+        profiler.set_enabled(False)
+        assert gl.glDrawElements is original_draw
+
+    def test_other_threads_not_counted(self, monkeypatch, profiler):
+        monkeypatch.setattr(gl, "glDrawElements", lambda *a: None)
+        profiler.set_enabled(True)
+        with profiler.frame():
+            worker = threading.Thread(target=gl.glDrawElements, args=(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None))
+            worker.start()
+            worker.join()
+            gl.glDrawElements(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None)
+        assert profiler.frames[-1].draw_calls == 1
+
+    def test_calls_counted_within_frame(self, monkeypatch, profiler):
+        # monkeypatch is requested first so it tears down last, after the
+        # profiler has put the fakes back
+        calls = []
+        monkeypatch.setattr(gl, "glDrawElements", lambda *a: calls.append("draw"))
+        monkeypatch.setattr(gl, "glBindTexture", lambda *a: calls.append("bind"))
+        monkeypatch.setattr(gl, "glUniform2ui", lambda *a: calls.append("uniform"))
+        profiler.set_enabled(True)
+
+        with profiler.frame():
+            with profiler.stage("coa_rtt"):
+                gl.glBindTexture(gl.GL_TEXTURE_2D, 1)
+                gl.glUniform2ui(0, 1, 2)
+                gl.glDrawElements(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None)
+                gl.glDrawElements(gl.GL_TRIANGLES, 6, gl.GL_UNSIGNED_INT, None)
+
+        frame = profiler.frames[-1]
+        assert calls == ["bind", "uniform", "draw", "draw"]
+        assert (frame.draw_calls, frame.texture_binds, frame.uniform_updates) == (2, 1, 1)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Reporting
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestReporting:
+
+    def test_overlay_lines(self, profiler):
+        assert "waiting" in profiler.overlay_lines()[0]
+        profiler.set_enabled(True)
+        _record_frame(profiler)
+        lines = profiler.overlay_lines()
+        assert lines[0].startswith("frame")
+        assert "gpu n/a" in lines[0]
+        assert any("coa_rtt" in line for line in lines)
+
+    def test_chrome_trace_export(self, profiler, tmp_path):
+        profiler.set_enabled(True)
+        _record_frame(profiler)
+        _record_frame(profiler)
+        out = tmp_path / "trace.json"
+        profiler.export_chrome_trace(str(out))
+
+        events = json.loads(out.read_text())["traceEvents"]
+        frames = [e for e in events if e.get("cat") == "frame"]
+        stages = [e for e in events if e.get("cat") == "cpu"]
+        counters = [e for e in events if e["ph"] == "C" and e["name"] == "gl_calls"]
+        assert len(frames) == 2 and len(stages) == 4 and len(counters) == 2
+        assert all(e["dur"] >= 0 for e in frames + stages)
+
+    def test_instance_counts(self, profiler):
+        profiler.count_instances(10, 4)  # no frame: ignored
+        profiler.set_enabled(True)
+        profiler.begin_frame()
+        profiler.count_instances(10, 4)
+        profiler.count_instances(2, 0)
+        profiler.end_frame()
+
+        frame = profiler.frames[-1]
+        assert (frame.instances, frame.culled_instances) == (12, 4)
+        assert profiler.summary()['culled_instances'] == 4
+        assert any("culled 4" in line for line in profiler.overlay_lines())
+        counter = next(e for e in profiler.to_chrome_trace()["traceEvents"]
+                       if e["name"] == "emblem_instances")
+        assert counter["args"] == {"drawn": 8, "culled": 4}
@@ -0,0 +1,95 @@
+"""
+Tests for the adaptive CoA render target size (services/rtt_resolution.py)
+and FramebufferRTT.resize().
+
+Covers:
+- The smallest allowed size covering the on-screen CoA is chosen
+- Dragging/panning renders one step lower; idle restores it
+- Downsizing waits for a margin below the smaller size (hysteresis)
+- Limits from GL_MAX_TEXTURE_SIZE
+- resize() reallocates the existing texture only when the size changes
+
+GL calls are stubbed; no GL context is needed.
+"""
+import pytest
+
+from services import framebuffer_rtt
+from services.framebuffer_rtt import FramebufferRTT
+from services.rtt_resolution import RTTResolutionPolicy
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Policy
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestRTTResolutionPolicy:
+
+    @pytest.mark.parametrize("displayed,expected", [
+        (100, 256), (256, 256), (300, 512), (900, 1024), (1800, 2048), (5000, 2048),
+    ])
+    def test_covers_displayed_size(self, displayed, expected):
+        assert RTTResolutionPolicy(initial=256).choose(displayed) == expected
+
+    def test_interactive_is_lower_and_idle_restores(self):
+        policy = RTTResolutionPolicy()
+        assert policy.choose(1800) == 2048
+        assert policy.choose(1800, interactive=True) == 1024
+        assert policy.choose(1800) == 2048
+        assert policy.changes == 3
+
+    def test_hysteresis_on_downsize(self):
+        policy = RTTResolutionPolicy()
+        assert policy.choose(600) == 1024
+        # Fits 512 but not with margin: keep 1024
+        assert policy.choose(480) == 1024
+        assert policy.choose(400) == 512
+        # Back above the smaller size upsizes straight away
+        assert policy.choose(520) == 1024
+        assert policy.changes == 3
+
+    def test_steady_zoom_does_not_churn(self):
+        policy = RTTResolutionPolicy()
+        for displayed in (500, 470, 505, 460, 511) * 3:
+            policy.choose(displayed)
+        assert policy.current == 512 and policy.changes == 0
+
+    def test_limits(self):
+        policy = RTTResolutionPolicy(initial=2048)
+        policy.set_limits(policy.min_size, 1024)
+        assert policy.current == 1024
+        assert policy.choose(4000) == 1024
+        assert RTTResolutionPolicy(max_size=100).allowed == (256,)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# FramebufferRTT.resize
+# ══════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def allocations(monkeypatch):
+    """Record texture (re)allocations made by framebuffer_rtt."""
+    sizes = []
+    monkeypatch.setattr(framebuffer_rtt, "glTexImage2D",
+                        lambda target, level, fmt, w, h, *args: sizes.append((w, h)))
+    monkeypatch.setattr(framebuffer_rtt, "glBindTexture", lambda target, texture: None)
+    return sizes
+
+
+class TestFramebufferResize:
+
+    def test_default_is_canonical(self):
+        rtt = FramebufferRTT()
+        assert (rtt.width, rtt.height) == (FramebufferRTT.COA_RTT_WIDTH, FramebufferRTT.COA_RTT_HEIGHT)
+
+    def test_uninitialized_only_records_size(self, allocations):
+        rtt = FramebufferRTT()
+        assert rtt.resize(1024) is False
+        assert rtt.width == 1024 and allocations == []
+
+    def test_reallocates_existing_texture(self, allocations):
+        rtt = FramebufferRTT()
+        rtt.initialized, rtt.texture = True, 5
+        assert rtt.resize(512) is False
+        assert rtt.resize(2048) is True
+        assert allocations == [(2048, 2048)]
+        rtt.initialized, rtt.texture = False, None  # skip GL cleanup in __del__
@@ -267,3 +267,54 @@ class TestArbitraryKeyPrefixLoading:
         coa = CoA.from_string(text)
         assert coa.pattern == "pattern_solid.dds"
         assert coa.pattern_color1.name == "white"
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Canonical Form / Content Hash
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestContentHash:
+    """Render-equivalent CoAs share a content hash; visual changes alter it."""
+
+    def test_hash_stable_across_parses(self, simple_coa_text):
+        assert CoA.from_string(simple_coa_text).get_content_hash() == \
+            CoA.from_string(simple_coa_text).get_content_hash()
+
+    def test_hash_survives_roundtrip(self, parsed_multi_coa):
+        coa2 = CoA.from_string(parsed_multi_coa.to_string())
+        assert coa2.get_content_hash() == parsed_multi_coa.get_content_hash()
+
+    def test_float_formatting_ignored(self, simple_coa_text):
+        reformatted = simple_coa_text.replace("0.700000 0.700000", "0.7 0.70")
+        assert CoA.from_string(reformatted).get_content_hash() == \
+            CoA.from_string(simple_coa_text).get_content_hash()
+
+    def test_named_color_matches_rgb(self, simple_coa_text):
+        red = Color.from_name("red")
+        rgb = f"rgb {{ {red.r} {red.g} {red.b} }}"
+        as_rgb = simple_coa_text.replace("\tcolor1=red", f"\tcolor1={rgb}")
+        assert CoA.from_string(as_rgb).get_content_hash() == \
+            CoA.from_string(simple_coa_text).get_content_hash()
+
+    def test_editor_metadata_ignored(self, parsed_simple_coa):
+        before = parsed_simple_coa.get_content_hash()
+        uuid = parsed_simple_coa.get_layer_by_index(0).uuid
+        parsed_simple_coa.set_layer_name(uuid, "Renamed")
+        assert parsed_simple_coa.get_content_hash() == before
+
+    def test_hidden_layer_ignored(self, parsed_simple_coa):
+        before = parsed_simple_coa.get_content_hash()
+        uuid = parsed_simple_coa.add_layer(emblem_path="ce_lion.dds")
+        parsed_simple_coa.set_layer_visible(uuid, False)
+        assert parsed_simple_coa.get_content_hash() == before
+
+    def test_color_change_alters_hash(self, parsed_simple_coa):
+        before = parsed_simple_coa.get_content_hash()
+        parsed_simple_coa.pattern_color2 = Color.from_name("blue")
+        assert parsed_simple_coa.get_content_hash() != before
+
+    def test_position_change_alters_hash(self, parsed_simple_coa):
+        before = parsed_simple_coa.get_content_hash()
+        uuid = parsed_simple_coa.get_layer_by_index(0).uuid
+        parsed_simple_coa.set_layer_position(uuid, 0.25, 0.5)
+        assert parsed_simple_coa.get_content_hash() != before
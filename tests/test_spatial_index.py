@@ -0,0 +1,327 @@
+"""
+Tests for the CoA spatial index (models/coa/_internal/spatial_index.py) and
+the CoA queries built on it.
+
+Covers:
+- Point queries respect rotation, layer order and visibility
+- Rectangle queries: overlap (separating axis) vs. fully contained
+- Symmetry mirrors are indexed like the renderer draws them
+- get_layer_drawn_instances: seeds then mirrors, copies, follows edits
+- Only layers whose geometry changed are re-indexed; undo snapshots,
+  removal and reordering are picked up
+- get_layer_bounds keeps its unrotated seed-instance semantics
+- Instance geometry matches the emblem shader (flips, rotation, then
+  non-uniform scale); drawn/opaque boxes are conservative for random
+  transforms; get_layer_instance_boxes pairs them with drawn instances
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from models.coa._internal.spatial_index import (
+    EmblemShape, InstanceGeometry, _Quad, drawn_box, opaque_box,
+)
+from models.transform import Vec2
+from services.emblem_batch import instance_transform_px, iter_layer_instances
+
+
+def _layer(coa, x, y, scale=0.2, rotation=0.0):
+    uuid = coa.add_layer(emblem_path="ce_test.dds")
+    coa.set_layer_position(uuid, x, y)
+    coa.set_layer_scale(uuid, scale, scale)
+    if rotation:
+        coa.get_layer_by_uuid(uuid).rotation = rotation
+    return uuid
+
+
+def _reindexed(coa):
+    return coa._spatial_index.reindexed
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Queries
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestPointQueries:
+
+    def test_topmost_first(self, fresh_coa):
+        bottom = _layer(fresh_coa, 0.5, 0.5, scale=0.6)
+        top = _layer(fresh_coa, 0.5, 0.5, scale=0.2)
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == [top, bottom]
+        assert fresh_coa.get_layers_at_point(0.7, 0.5) == [bottom]
+        assert fresh_coa.get_layers_at_point(0.05, 0.05) == []
+
+    def test_rotation(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.5, 0.5, scale=0.4, rotation=45)
+        # Square corner (0.7, 0.7) is cut off by the rotated quad ...
+        assert fresh_coa.get_layers_at_point(0.68, 0.68) == []
+        # ... which reaches 0.2 * sqrt(2) along the axes instead
+        assert fresh_coa.get_layers_at_point(0.5 + 0.27, 0.5) == [uuid]
+
+    def test_hidden_layers(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.5, 0.5)
+        fresh_coa.set_layer_visible(uuid, False)
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == []
+        assert fresh_coa.get_layers_at_point(0.5, 0.5, visible_only=False) == [uuid]
+
+    def test_every_instance(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.2)
+        fresh_coa.add_instance(uuid, 0.8, 0.8)
+        fresh_coa.get_layer_instance(uuid, 1).scale = Vec2(0.2, 0.2)
+        assert fresh_coa.get_layers_at_point(0.8, 0.8) == [uuid]
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == []
+
+
+class TestRectQueries:
+
+    def test_overlap_in_layer_order(self, fresh_coa):
+        a = _layer(fresh_coa, 0.2, 0.2)
+        b = _layer(fresh_coa, 0.8, 0.8)
+        _layer(fresh_coa, 0.9, 0.1)
+        assert fresh_coa.get_layers_in_rect(0.0, 0.95, 1.0, 1.0) == []
+        assert fresh_coa.get_layers_in_rect(0.25, 0.25, 0.75, 0.75) == [a, b]
+        # Corners may be given in any order
+        assert fresh_coa.get_layers_in_rect(0.75, 0.75, 0.25, 0.25) == [a, b]
+
+    def test_rotated_quad_corner_gap(self, fresh_coa):
+        _layer(fresh_coa, 0.5, 0.5, scale=0.4, rotation=45)
+        # Inside the AABB corner but outside the diamond
+        assert fresh_coa.get_layers_in_rect(0.7, 0.7, 0.75, 0.75) == []
+        assert len(fresh_coa.get_layers_in_rect(0.6, 0.6, 0.75, 0.75)) == 1
+
+    def test_contained(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.5, 0.5, scale=0.2)
+        assert fresh_coa.get_layers_in_rect(0.45, 0.45, 0.55, 0.55, contained=True) == []
+        assert fresh_coa.get_layers_in_rect(0.3, 0.3, 0.7, 0.7, contained=True) == [uuid]
+
+
+class TestSymmetry:
+
+    def test_mirrors_indexed_like_renderer(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.3, scale=0.1, rotation=30)
+        fresh_coa.set_layer_symmetry_type(uuid, 'rotational')
+        drawn = list(iter_layer_instances(fresh_coa, uuid))
+        assert len(drawn) > 1
+        for inst in drawn:
+            assert uuid in fresh_coa.get_layers_at_point(inst.pos.x, inst.pos.y)
+
+        extent = fresh_coa.get_layers_extent([uuid])
+        for inst in drawn:
+            half = inst.scale.x / 2.0 * math.sqrt(2) + 1e-9
+            assert extent['min_x'] <= inst.pos.x - half * 0.5
+            assert extent['max_x'] >= inst.pos.x + half * 0.5
+        # Seed bounds are unchanged by symmetry
+        assert fresh_coa.get_layer_bounds(uuid)['width'] == pytest.approx(0.1)
+
+    def test_drawn_instances_seed_then_mirrors(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.3, scale=0.1)
+        assert len(fresh_coa.get_layer_drawn_instances(uuid)) == 1
+        fresh_coa.set_layer_symmetry_type(uuid, 'rotational')
+        drawn = fresh_coa.get_layer_drawn_instances(uuid)
+        assert len(drawn) > 1
+        assert (drawn[0].pos.x, drawn[0].pos.y) == pytest.approx((0.2, 0.3))
+
+    def test_drawn_instances_are_copies(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.3, scale=0.1)
+        fresh_coa.get_layer_drawn_instances(uuid)[0].pos.x = 0.9
+        assert fresh_coa.get_layer_drawn_instances(uuid)[0].pos.x == pytest.approx(0.2)
+        fresh_coa.set_layer_position(uuid, 0.6, 0.3)
+        assert fresh_coa.get_layer_drawn_instances(uuid)[0].pos.x == pytest.approx(0.6)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Incremental maintenance
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestIncrementalUpdates:
+
+    def test_only_changed_layer_reindexed(self, fresh_coa):
+        uuids = [_layer(fresh_coa, 0.1 * i + 0.05, 0.5, scale=0.05) for i in range(10)]
+        fresh_coa.get_layers_at_point(0.5, 0.5)
+        before = _reindexed(fresh_coa)
+
+        fresh_coa.get_layers_at_point(0.5, 0.5)
+        assert _reindexed(fresh_coa) == before
+
+        fresh_coa.set_layer_position(uuids[3], 0.5, 0.9)
+        assert fresh_coa.get_layers_at_point(0.5, 0.9) == [uuids[3]]
+        assert _reindexed(fresh_coa) == before + 1
+
+    def test_instance_added_and_removed(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.2)
+        fresh_coa.get_layers_at_point(0.8, 0.8)
+        fresh_coa.add_instance(uuid, 0.8, 0.8)
+        assert fresh_coa.get_layers_at_point(0.8, 0.8) == [uuid]
+        fresh_coa.remove_instance(uuid, 1)
+        assert fresh_coa.get_layers_at_point(0.8, 0.8) == []
+
+    def test_snapshot_restore(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.2, 0.2)
+        snapshot = fresh_coa.get_snapshot()
+        fresh_coa.set_layer_position(uuid, 0.8, 0.8)
+        assert fresh_coa.get_layers_at_point(0.8, 0.8) == [uuid]
+        fresh_coa.set_snapshot(snapshot)
+        assert fresh_coa.get_layers_at_point(0.8, 0.8) == []
+        assert fresh_coa.get_layers_at_point(0.2, 0.2) == [uuid]
+
+    def test_removal_and_reorder(self, fresh_coa):
+        a = _layer(fresh_coa, 0.5, 0.5)
+        b = _layer(fresh_coa, 0.5, 0.5)
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == [b, a]
+        fresh_coa.move_layer_to_top(a)
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == [a, b]
+        fresh_coa.remove_layer(a)
+        assert fresh_coa.get_layers_at_point(0.5, 0.5) == [b]
+        assert fresh_coa._spatial_index.extent([a]) is None
+
+
+class TestLayerBounds:
+
+    def test_seed_bounds_ignore_rotation(self, parsed_multi_coa):
+        uuid = parsed_multi_coa.get_all_layer_uuids()[-1]
+        bounds = parsed_multi_coa.get_layer_bounds(uuid)
+        # Two instances at x=0.97 and x=0.0, default scale 1.0
+        assert bounds['min_x'] == pytest.approx(-0.5)
+        assert bounds['max_x'] == pytest.approx(1.47)
+        assert bounds['center_y'] == pytest.approx(0.555)
+
+    def test_bounds_follow_changes(self, fresh_coa):
+        uuid = _layer(fresh_coa, 0.5, 0.5, scale=0.2)
+        assert fresh_coa.get_layer_bounds(uuid)['min_x'] == pytest.approx(0.4)
+        fresh_coa.set_layer_position(uuid, 0.3, 0.5)
+        bounds = fresh_coa.get_layer_bounds(uuid)
+        assert bounds['min_x'] == pytest.approx(0.2)
+        bounds['min_x'] = 99  # callers get a copy
+        assert fresh_coa.get_layer_bounds(uuid)['min_x'] == pytest.approx(0.2)
+
+    def test_extent_errors(self, fresh_coa):
+        with pytest.raises(ValueError):
+            fresh_coa.get_layers_extent([])
+        with pytest.raises(ValueError):
+            fresh_coa.get_layers_extent(["missing"])
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Instance geometry (matches emblem.vert)
+# ══════════════════════════════════════════════════════════════════════════
+
+TEXEL = 1.0 / 256.0
+_ALL = (1 << 256) - 1
+_TOP_HALF = sum(1 << (r * 16 + c) for r in range(8) for c in range(16))
+_DOT = sum(1 << (r * 16 + c) for r in range(6, 10) for c in range(6, 10))
+
+SOLID = EmblemShape((0.0, 0.0, 1.0, 1.0), _ALL, 16, _ALL)
+TOP_HALF = EmblemShape((0.0, 0.0, 1.0, 1.0), _ALL, 16, _TOP_HALF)
+DOT = EmblemShape((0.375, 0.375, 0.625, 0.625), _DOT, 16, 0)
+
+
+class _Inst:
+    def __init__(self, x, y, sx, sy, rotation, flip_x, flip_y):
+        self.pos = Vec2(x, y)
+        self.scale = Vec2(sx, sy)
+        self.rotation = rotation
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+
+
+def _random_instance(rng, quarter_turns=False):
+    rotation = rng.choice([0, 90, 180, 270, -90]) if quarter_turns else rng.uniform(-360, 360)
+    return _Inst(rng.uniform(-0.2, 1.2), rng.uniform(-0.2, 1.2),
+                 rng.choice([-1, 1]) * rng.uniform(0.05, 1.5), rng.choice([-1, 1]) * rng.uniform(0.05, 1.5),
+                 rotation, rng.random() < 0.5, rng.random() < 0.5)
+
+
+def _shader_vertex(inst, vertex, rtt_size=512.0):
+    """emblem.vert on one unit-quad vertex, back in CoA space."""
+    cx, cy, sx, sy, rotation = instance_transform_px(inst, rtt_size)
+    x, y = vertex[0] * math.copysign(1.0, sx), vertex[1] * math.copysign(1.0, sy)
+    x, y = x * math.cos(rotation) - y * math.sin(rotation), x * math.sin(rotation) + y * math.cos(rotation)
+    ndc_x = x * abs(sx) / (rtt_size / 2) + cx / (rtt_size / 2)
+    ndc_y = y * abs(sy) / (rtt_size / 2) + cy / (rtt_size / 2)
+    return (ndc_x + 1) / 2, (1 - ndc_y) / 2
+
+
+def test_geometry_matches_shader():
+    rng = random.Random(3)
+    for _ in range(50):
+        inst = _random_instance(rng)
+        # Quad vertex (x, y) carries UV (x + 0.5, 0.5 - y)
+        geometry = InstanceGeometry(inst)
+        for vertex in ((-0.5, 0.5), (0.5, 0.5), (0.5, -0.5), (-0.5, -0.5)):
+            expected = _shader_vertex(inst, vertex)
+            assert geometry.to_coa(vertex[0] + 0.5, 0.5 - vertex[1]) == pytest.approx(expected)
+
+
+def test_quad_hits_match_shader():
+    rng = random.Random(5)
+    for _ in range(50):
+        inst = _random_instance(rng)
+        quad = _Quad(inst)
+        corners = [_shader_vertex(inst, v) for v in ((-0.5, 0.5), (0.5, 0.5), (0.5, -0.5), (-0.5, -0.5))]
+        cx = sum(c[0] for c in corners) / 4.0
+        cy = sum(c[1] for c in corners) / 4.0
+        for x, y in corners:
+            # Just inside and just outside each drawn corner
+            assert quad.contains(cx + (x - cx) * 0.99, cy + (y - cy) * 0.99)
+            assert not quad.contains(cx + (x - cx) * 1.01, cy + (y - cy) * 1.01)
+
+
+def test_drawn_box_contains_visible_texels():
+    rng = random.Random(7)
+    for _ in range(200):
+        geometry = InstanceGeometry(_random_instance(rng))
+        box = drawn_box(geometry, DOT, TEXEL, 1.0 / 512)
+        for _ in range(10):
+            x, y = geometry.to_coa(rng.uniform(0.375 - TEXEL, 0.625 + TEXEL),
+                                   rng.uniform(0.375 - TEXEL, 0.625 + TEXEL))
+            assert box[0] < x < box[2] and box[1] < y < box[3]
+
+
+def test_opaque_box_maps_inside_opaque_texels():
+    rng = random.Random(11)
+    checked = 0
+    for _ in range(200):
+        geometry = InstanceGeometry(_random_instance(rng, quarter_turns=True))
+        box = opaque_box(geometry, TOP_HALF, TEXEL, 1.0 / 512)
+        if box is None:
+            continue
+        # Invert the (affine) tile -> CoA map
+        origin = np.array(geometry.to_coa(0.0, 0.0))
+        axes = np.column_stack([np.array(geometry.to_coa(1.0, 0.0)) - origin,
+                                np.array(geometry.to_coa(0.0, 1.0)) - origin])
+        x0, y0 = max(box[0], 0.0), max(box[1], 0.0)
+        x1, y1 = min(box[2], 1.0), min(box[3], 1.0)
+        for _ in range(10):
+            point = np.array([rng.uniform(x0, x1), rng.uniform(y0, y1)])
+            u, v = np.linalg.solve(axes, point - origin)
+            # Clamped sampling keeps u, v beyond the tile on its edge texels
+            u, v = min(max(u, 0.0), 1.0), min(max(v, 0.0), 1.0)
+            assert v <= 0.5 - TEXEL + 1e-9
+            checked += 1
+    assert checked > 100
+
+
+def _geometry(*args):
+    return InstanceGeometry(_Inst(*args))
+
+
+def test_opaque_box_none_when_rotated():
+    assert opaque_box(_geometry(0.5, 0.5, 1, 1, 30, False, False), SOLID, TEXEL, 0.002) is None
+    assert opaque_box(_geometry(0.5, 0.5, 1, 1, -270, False, False), SOLID, TEXEL, 0.002) is not None
+    assert opaque_box(_geometry(0.5, 0.5, 1, 1, 0, False, False), None, TEXEL, 0.002) is None
+    full = opaque_box(_geometry(0.5, 0.5, 1, 1, 0, False, False), SOLID, TEXEL, 0.002)
+    assert all(math.isinf(v) for v in full)
+
+
+def test_layer_instance_boxes(fresh_coa):
+    uuid = _layer(fresh_coa, 0.5, 0.5, scale=0.2)
+    fresh_coa.add_instance(uuid, 2.0, 2.0)
+    boxes = fresh_coa.get_layer_instance_boxes(uuid, TEXEL, 0.002)
+    assert [(inst.pos.x, inst.pos.y) for inst, _, _ in boxes] == pytest.approx([(0.5, 0.5), (2.0, 2.0)])
+    assert boxes[0][1] == pytest.approx((0.398, 0.398, 0.602, 0.602))
+    # Unknown shape: no opaque area
+    assert all(covered is None for _, _, covered in boxes)
+    with pytest.raises(ValueError):
+        fresh_coa.get_layer_instance_boxes("missing", TEXEL, 0.002)
@@ -0,0 +1,254 @@
+"""
+Tests for staged editor startup (services/startup_pipeline.py).
+
+Covers:
+- StartupTimeline stages, report and Chrome trace
+- Background jobs deliver results on the GUI thread, in submission order
+- GUI-thread work is drained in time slices
+- Failed stages and deferred stages do not hang the pipeline
+- Decode-only texture paths (no GL context needed) and tile-streamed
+  atlas uploads against stubbed GL entry points
+- AssetSidebar deferred loading
+
+Canvas uploads need a live GL context and are not exercised here.
+"""
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.startup_pipeline import StartupPipeline, StartupTimeline
+from services.texture_loader import TextureLoader
+
+
+@pytest.fixture
+def pipeline(qapp):
+    pipe = StartupPipeline(slice_ms=5.0)
+    yield pipe
+    pipe.shutdown()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Timeline
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestTimeline:
+
+    def test_spans_and_marks(self):
+        timeline = StartupTimeline()
+        with timeline.span("load"):
+            time.sleep(0.002)
+        timeline.mark("ready")
+        events = timeline.events()
+        assert [e['name'] for e in events] == ["load", "ready"]
+        assert events[0]['duration_ms'] >= 2.0
+        assert events[1]['duration_ms'] == 0.0
+        assert timeline.elapsed_ms("ready") >= timeline.elapsed_ms("load")
+        assert timeline.elapsed_ms("missing") is None
+        assert "ready" in timeline.report()
+
+    def test_chrome_trace_has_thread_tracks(self, tmp_path):
+        timeline = StartupTimeline()
+        timeline.mark("main")
+        worker = threading.Thread(target=lambda: timeline.record("worker", time.perf_counter(),
+                                                                 time.perf_counter() + 0.001))
+        worker.start()
+        worker.join()
+        out = tmp_path / "startup.json"
+        timeline.export_chrome_trace(str(out))
+        events = json.loads(out.read_text())['traceEvents']
+        assert {e['ph'] for e in events} == {'i', 'X', 'M'}
+        assert len({e['tid'] for e in events if e['ph'] != 'M'}) == 2
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Pipeline
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestPipeline:
+
+    def test_background_result_applied_on_gui_thread(self, pipeline):
+        applied = []
+        gui_thread = threading.current_thread()
+        pipeline.run_in_background(
+            "work", lambda: threading.current_thread().name,
+            on_done=lambda name: applied.append((name, threading.current_thread()))
+        )
+        assert pipeline.wait_until_idle(5)
+        (worker_name, apply_thread), = applied
+        assert worker_name.startswith("startup")
+        assert apply_thread is gui_thread
+        names = [e['name'] for e in pipeline.timeline.events()]
+        assert "work" in names and "work (apply)" in names
+
+    def test_gui_jobs_posted_from_worker_keep_order(self, pipeline):
+        order = []
+
+        def produce():
+            for i in range(20):
+                pipeline.run_on_gui(f"step {i}", lambda i=i: order.append(i))
+
+        pipeline.run_in_background("produce", produce)
+        assert pipeline.wait_until_idle(5)
+        assert order == list(range(20))
+
+    def test_gui_work_is_time_sliced(self, pipeline):
+        ticks = []
+        original = pipeline._run_slice
+        pipeline._run_slice = lambda: (ticks.append(1), original())
+        pipeline._timer.timeout.disconnect()
+        pipeline._timer.timeout.connect(pipeline._run_slice)
+
+        for i in range(10):
+            pipeline.run_on_gui(f"slow {i}", lambda: time.sleep(0.003))
+        assert pipeline.wait_until_idle(5)
+        # 5 ms budget, 3 ms jobs: at most two jobs per slice
+        assert len(ticks) >= 5
+
+    def test_finished_emitted_when_idle(self, pipeline):
+        finished = []
+        pipeline.finished.connect(lambda: finished.append(pipeline.is_idle()))
+        pipeline.run_in_background("a", lambda: 1, on_done=lambda _: None)
+        pipeline.run_in_background("b", lambda: 2)
+        assert pipeline.wait_until_idle(5)
+        assert finished and all(finished)
+
+    def test_failed_stage_does_not_hang(self, pipeline, capsys):
+        applied = []
+        pipeline.run_in_background("boom", lambda: 1 / 0, on_done=applied.append)
+        pipeline.run_on_gui("gui boom", lambda: [][1])
+        assert pipeline.wait_until_idle(5)
+        assert applied == []
+        out = capsys.readouterr().out
+        assert "'boom' failed" in out and "'gui boom' failed" in out
+
+    def test_defer_holds_until_done(self, pipeline):
+        done = pipeline.defer("wait for canvas")
+        pipeline.run_on_gui("quick", lambda: None)
+        assert not pipeline.wait_until_idle(0.05)
+        done()
+        done()  # second call is a no-op
+        assert pipeline.is_idle()
+        assert pipeline.timeline.elapsed_ms("wait for canvas") is not None
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Decode-only texture paths
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestTextureDecode:
+
+    def test_decode_image_resizes(self, tmp_path):
+        path = tmp_path / "frame.png"
+        Image.new("RGBA", (40, 20), (10, 20, 30, 255)).save(path)
+        data = TextureLoader.decode_image(path, resize=(16, 16))
+        assert data.shape == (16, 16, 4) and data.dtype == np.uint8
+
+    def test_atlas_pages_pack_and_premultiply(self, tmp_path):
+        files = []
+        for i in range(5):
+            path = tmp_path / f"e{i}.png"
+            Image.new("RGBA", (8, 8), (200, 100, 50, 128 if i == 0 else 255)).save(path)
+            files.append((f"e{i}.dds", path))
+
+        pages = list(TextureLoader.iter_atlas_arrays(files, tile_size=4, atlas_size=8))
+        assert [idx for idx, _ in pages] == [0, 1]
+        first = pages[0][1]
+        assert first.shape == (8, 8, 4)
+        # Tile 0 premultiplied by alpha 128/255; tile 1 opaque
+        assert np.abs(first[0, 0].astype(int) - (100, 50, 25, 128)).max() <= 1
+        assert tuple(first[0, 4]) == (200, 100, 50, 255)
+        # Second page holds only the fifth tile
+        assert tuple(pages[1][1][0, 0]) == (200, 100, 50, 255)
+        assert not pages[1][1][4:, :].any()
+
+    def test_tile_positions_match_uv_slots(self):
+        from services.asset_catalog import compute_atlas_slots
+        slots = compute_atlas_slots([str(i) for i in range(9)], tile_size=4, atlas_size=8)
+        for i in range(9):
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(i, tile_size=4, atlas_size=8)
+            assert slots[str(i)][:3] == (atlas_idx, x / 8, y / 8)
+
+    def test_blank_slots_cover_last_tile_neighbours(self):
+        # 2x2 tiles per page: after tile 4 (page 1, top-left) clear its
+        # right and lower neighbours; a full page needs nothing
+        assert list(TextureLoader.atlas_blank_slots(5, tile_size=4, atlas_size=8)) == [5, 6]
+        assert list(TextureLoader.atlas_blank_slots(7, tile_size=4, atlas_size=8)) == [7]
+        assert list(TextureLoader.atlas_blank_slots(8, tile_size=4, atlas_size=8)) == []
+
+    def test_decode_into_staging_buffer(self, tmp_path):
+        path = tmp_path / "e.png"
+        Image.new("RGBA", (8, 8), (200, 100, 50, 77)).save(path)
+        staging = np.full((4, 4, 4), 9, dtype=np.uint8)
+        tile = TextureLoader.decode_atlas_tile(path, tile_size=4, out=staging)
+        assert tile is staging
+        assert np.array_equal(tile, TextureLoader.decode_atlas_tile(path, tile_size=4))
+
+    def test_unreadable_tile_is_blank(self, tmp_path, capsys):
+        staging = np.full((4, 4, 4), 9, dtype=np.uint8)
+        tile = TextureLoader.decode_atlas_tile_or_blank(tmp_path / "missing.png", 4, out=staging)
+        assert tile is staging and not tile.any()
+        assert "missing.png" in capsys.readouterr().out
+
+    def test_atlas_streamed_tile_by_tile(self, monkeypatch, tmp_path):
+        import OpenGL.GL as gl
+        files = []
+        for i in range(5):
+            path = tmp_path / f"e{i}.png"
+            Image.new("RGBA", (8, 8), (200, 100, 50, 255)).save(path)
+            files.append((f"e{i}.dds", path))
+
+        ids = iter(range(1, 10))
+        allocations, uploads = [], []
+        monkeypatch.setattr(gl, "glGenTextures", lambda n: next(ids))
+        monkeypatch.setattr(gl, "glBindTexture", lambda *a: None)
+        monkeypatch.setattr(gl, "glTexParameteri", lambda *a: None)
+        monkeypatch.setattr(gl, "glTexImage2D", lambda *a: allocations.append((a[3], a[8])))
+        monkeypatch.setattr(gl, "glTexSubImage2D",
+                            lambda *a: uploads.append((a[2], a[3], a[4], a[8].any())))
+
+        atlases, uv_map = TextureLoader.load_texture_atlas(files, tile_size=4, atlas_size=8)
+        assert atlases == [1, 2]
+        # Storage allocated once per page without host data
+        assert allocations == [(8, None), (8, None)]
+        # Every tile copied at its slot, then the last tile's neighbours cleared
+        assert uploads == [(0, 0, 4, True), (4, 0, 4, True), (0, 4, 4, True), (4, 4, 4, True),
+                           (0, 0, 4, True), (4, 0, 4, False), (0, 4, 4, False)]
+        assert uv_map["e4.dds"] == (1, 0.0, 0.0, 0.5, 0.5)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Deferred UI loading
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_asset_sidebar_deferred_load(qtbot):
+    from components.asset_sidebar import AssetSidebar
+
+    sidebar = AssetSidebar(defer_load=True)
+    qtbot.addWidget(sidebar)
+    assert sidebar.asset_data == {}
+
+    emblem = {"filename": "ce_a.png", "dds_filename": "ce_a.dds", "path": "", "category": "Animals", "colors": 1}
+    sidebar.set_asset_data({"Animals": [emblem], "__Base_Patterns__": []})
+    assert sidebar._emblems_by_dds == {"ce_a.dds": emblem}
+    sidebar.switch_mode("emblems")
+    assert sidebar.category_combo.currentText() == "Animals"
+
+
+def test_shape_preload_publishes_complete_list(tmp_path):
+    from services.layer_generator.generators import ShapeGenerator
+
+    saved = (dict(ShapeGenerator._loaded_shapes), list(ShapeGenerator._shape_names))
+    try:
+        (tmp_path / "broken.svg").write_text("not svg")
+        ShapeGenerator.preload_shapes(str(tmp_path))
+        assert ShapeGenerator.get_shape_names() == []
+        ShapeGenerator.preload_shapes(str(tmp_path / "missing"))
+        assert ShapeGenerator.get_shape_names() == []
+    finally:
+        ShapeGenerator._loaded_shapes.clear()
+        ShapeGenerator._loaded_shapes.update(saved[0])
+        ShapeGenerator._shape_names[:] = saved[1]
@@ -0,0 +1,254 @@
+"""
+Tests for on-demand texture residency (services/texture_residency.py).
+
+Covers:
+- texture_uv_map interface: membership is the catalog, get() only
+  returns resident tiles and queues misses
+- Tiles are placed with the load_texture_atlas slot layout
+- LRU eviction once every slot is taken; tiles used in the current frame
+  are never evicted
+- Prefetching a parsed CoA's textures
+- Pages are allocated (and cleared) only as slots fill
+- Hot-reload: changed resident tiles are re-uploaded into their slots
+- Canvas upload slices invalidate the picker RTT when tiles arrive
+
+GL entry points are stubbed; uploads are recorded, not drawn.
+"""
+import OpenGL.GL as gl
+import pytest
+from PIL import Image
+
+from services.texture_loader import TextureLoader
+from services.texture_residency import TextureResidency, coa_texture_keys
+
+TILE = 4
+ATLAS = 8  # 2x2 tiles per page
+
+
+@pytest.fixture
+def gl_stub(monkeypatch):
+    """Record atlas allocations and tile uploads instead of calling GL."""
+    calls = {'pages': [], 'uploads': [], 'deleted': []}
+    ids = iter(range(1, 100))
+    monkeypatch.setattr(gl, "glGenTextures", lambda n: next(ids))
+    monkeypatch.setattr(gl, "glBindTexture", lambda *a: None)
+    monkeypatch.setattr(gl, "glTexParameteri", lambda *a: None)
+    monkeypatch.setattr(gl, "glTexImage2D", lambda *a: calls['pages'].append(a[3]))
+    monkeypatch.setattr(gl, "glTexSubImage2D",
+                        lambda *a: calls['uploads'].append((a[2], a[3], a[4], a[5], int(a[8][0, 0, 0]))))
+    monkeypatch.setattr(gl, "glDeleteTextures", lambda ids: calls['deleted'].extend(ids))
+    return calls
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Five solid tiles; red channel encodes the index."""
+    result = []
+    for i in range(5):
+        path = tmp_path / f"t{i}.png"
+        Image.new("RGBA", (8, 8), (10 + i, 0, 0, 255)).save(path)
+        result.append((f"t{i}.dds", path))
+    return result
+
+
+def _residency(files, capacity=4):
+    return TextureResidency(files, capacity=capacity, tile_size=TILE, atlas_size=ATLAS)
+
+
+def _tile_uploads(gl_stub):
+    """Tile uploads only (page clears are full-width strips)."""
+    return [u for u in gl_stub['uploads'] if u[2] == TILE]
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Lookup
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestLookup:
+
+    def test_membership_is_the_catalog(self, files, gl_stub):
+        residency = _residency(files)
+        assert "t0.dds" in residency and "missing.dds" not in residency
+        assert len(residency) == 5 and residency
+        assert not TextureResidency([])
+        assert gl_stub['pages'] == []  # nothing loaded up front
+
+    def test_miss_is_queued_and_loaded(self, files, gl_stub):
+        residency = _residency(files)
+        assert residency.get("t3.dds") is None
+        assert residency.get("missing.dds", "fallback") == "fallback"
+        assert residency.pending == ["t3.dds"]
+
+        assert residency.upload_pending() == 1
+        assert residency.pending == [] and residency.is_resident("t3.dds")
+        # First slot of the first page, same UV layout as load_texture_atlas
+        assert residency.get("t3.dds") == (0, 0.0, 0.0, 0.5, 0.5)
+        assert _tile_uploads(gl_stub) == [(0, 0, TILE, TILE, 13)]
+
+    def test_slots_fill_pages_in_atlas_order(self, files, gl_stub):
+        residency = _residency(files, capacity=5)
+        residency.request(key for key, _ in files)
+        assert residency.upload_pending(limit=2) == 2
+        assert residency.upload_pending() == 3
+        for slot, (key, _) in enumerate(files):
+            atlas_idx, x, y = TextureLoader.atlas_tile_position(slot, TILE, ATLAS)
+            assert residency.get(key)[:3] == (atlas_idx, x / ATLAS, y / ATLAS)
+        assert residency.pages == [1, 2]
+        # Pages allocated lazily and cleared before tiles go in
+        assert gl_stub['pages'] == [ATLAS, ATLAS]
+        assert (0, 0, ATLAS, ATLAS, 0) in gl_stub['uploads']
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Eviction
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestEviction:
+
+    def test_least_recently_used_is_evicted(self, files, gl_stub):
+        residency = _residency(files, capacity=2)
+        residency.prefetch(["t0.dds", "t1.dds"])
+        residency.begin_frame()
+        residency.get("t0.dds")  # t1 is now least recently used
+
+        residency.request(["t2.dds"])
+        assert residency.upload_pending() == 1
+        assert residency.is_resident("t0.dds") and residency.is_resident("t2.dds")
+        assert not residency.is_resident("t1.dds")
+        assert residency.evictions == 1
+        # t2 reuses t1's slot
+        assert residency.get("t2.dds")[1:3] == (0.5, 0.0)
+
+    def test_current_frame_is_never_evicted(self, files, gl_stub):
+        residency = _residency(files, capacity=1)
+        residency.begin_frame()
+        residency.get("t0.dds")
+        residency.upload_pending()
+        residency.get("t0.dds")
+        residency.get("t1.dds")
+
+        assert residency.upload_pending() == 0
+        assert residency.pending == ["t1.dds"]
+        # Next frame t0 is evictable again
+        residency.begin_frame()
+        assert residency.upload_pending() == 1
+        assert residency.is_resident("t1.dds") and not residency.is_resident("t0.dds")
+
+    def test_prefetched_tiles_do_not_evict_each_other(self, files, gl_stub):
+        residency = _residency(files, capacity=2)
+        assert residency.prefetch(["t0.dds", "t1.dds", "t2.dds"]) == 2
+        assert residency.pending == ["t2.dds"]
+
+    def test_release(self, files, gl_stub):
+        residency = _residency(files)
+        residency.prefetch(["t0.dds"])
+        residency.release()
+        assert gl_stub['deleted'] == [1]
+        assert residency.pages == [] and not residency.is_resident("t0.dds")
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Hot-reload
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestReload:
+
+    def test_changed_tile_reuploaded_in_place(self, files, gl_stub):
+        residency = _residency(files)
+        residency.prefetch(["t0.dds", "t1.dds"])
+        slot = residency.get("t1.dds")
+        Image.new("RGBA", (8, 8), (99, 0, 0, 255)).save(files[1][1])
+        del gl_stub['uploads'][:]
+
+        assert residency.reload(["t1.dds", "t3.dds", "missing.dds"]) == 1
+        assert _tile_uploads(gl_stub) == [(TILE, 0, TILE, TILE, 99)]
+        assert residency.get("t1.dds") == slot
+        assert residency.loads == 2  # no new slot taken
+        assert not residency.pending
+
+    def test_reload_all_resident(self, files, gl_stub):
+        residency = _residency(files)
+        residency.prefetch(["t0.dds", "t2.dds"])
+        assert residency.reload() == 2
+
+    def test_set_files(self, files, gl_stub, tmp_path):
+        residency = _residency(files)
+        residency.prefetch(["t0.dds"])
+        new_path = tmp_path / "new.png"
+        Image.new("RGBA", (8, 8), (50, 0, 0, 255)).save(new_path)
+        residency.set_files(files + [("new.dds", new_path)])
+
+        assert "new.dds" in residency and residency.is_resident("t0.dds")
+        assert residency.prefetch(["new.dds"]) == 1
+        assert _tile_uploads(gl_stub)[-1][4] == 50
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# CoA prefetch
+# ══════════════════════════════════════════════════════════════════════════
+
+def test_coa_texture_keys(parsed_multi_coa):
+    keys = coa_texture_keys(parsed_multi_coa)
+    layer_files = [parsed_multi_coa.get_layer_filename(uuid)
+                   for uuid in parsed_multi_coa.get_all_layer_uuids()]
+    assert keys[0] == parsed_multi_coa.pattern
+    assert set(keys[1:]) == set(layer_files) - {parsed_multi_coa.pattern}
+    assert len(keys) == len(set(keys))
+
+
+def test_prefetch_coa(parsed_multi_coa, tmp_path, gl_stub):
+    keys = coa_texture_keys(parsed_multi_coa)
+    path = tmp_path / "tile.png"
+    Image.new("RGBA", (8, 8), (1, 2, 3, 255)).save(path)
+    residency = TextureResidency([(key, path) for key in keys] + [("unused.dds", path)],
+                                 tile_size=TILE, atlas_size=ATLAS * 4)
+    assert residency.prefetch(coa_texture_keys(parsed_multi_coa)) == len(keys)
+    assert all(residency.get(key) is not None for key in keys)
+    assert not residency.is_resident("unused.dds")
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Canvas upload slices
+# ══════════════════════════════════════════════════════════════════════════
+
+class _Canvas:
+    """Just enough of CoACanvas for the texture loader's upload slices."""
+
+    def __init__(self, residency):
+        self.texture_uv_map = residency
+        self.picker_invalidations = 0
+        self.repaints = 0
+
+    def makeCurrent(self):
+        pass
+
+    def doneCurrent(self):
+        pass
+
+    def update(self):
+        self.repaints += 1
+
+    def invalidate_picker_rtt(self):
+        self.picker_invalidations += 1
+
+
+@pytest.fixture
+def canvas_class():
+    from components.canvas_widgets.canvas_texture_loader_mixin import CanvasTextureLoaderMixin
+    return type("Canvas", (CanvasTextureLoaderMixin, _Canvas), {})
+
+
+def test_upload_slice_invalidates_picker(files, gl_stub, canvas_class):
+    residency = _residency(files)
+    canvas = canvas_class(residency)
+    residency.get("t0.dds")  # Queues the miss
+    canvas._upload_pending_textures()
+    assert residency.is_resident("t0.dds")
+    assert canvas.picker_invalidations == 1
+    assert canvas.repaints == 1
+
+
+def test_empty_upload_slice_keeps_picker(files, gl_stub, canvas_class):
+    canvas = canvas_class(_residency(files))
+    canvas._upload_pending_textures()
+    assert canvas.picker_invalidations == 0
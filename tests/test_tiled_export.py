@@ -0,0 +1,209 @@
+"""
+Tests for tiled high-resolution export (services/tiled_export.py).
+
+Covers:
+- Tile grid clips the last row/column to the image
+- Tile view: quad position and CoA bounds shifted into each tile
+- Supersample box filter is alpha-weighted
+- Streaming PNG writer round-trips through PIL and rejects short images
+- TiledExport: tiles assembled in place, written band by band, bounded
+  queue, cancel and render errors remove the partial file
+
+Tile rendering is faked with numpy; no GL context is needed.
+"""
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from services import tiled_export
+from services.tiled_export import (
+    StreamingPNGWriter, TiledExport, downsample, tile_grid, tile_view,
+)
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Geometry
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestTileGrid:
+
+    def test_exact_fit(self):
+        rows = tile_grid(8, 8, 4)
+        assert rows == [[(0, 0, 4, 4), (4, 0, 4, 4)], [(0, 4, 4, 4), (4, 4, 4, 4)]]
+
+    def test_edges_clipped(self):
+        rows = tile_grid(10, 5, 4)
+        assert [len(row) for row in rows] == [3, 3]
+        assert rows[0][-1] == (8, 0, 2, 4)
+        assert rows[1][0] == (0, 4, 4, 1)
+
+    def test_invalid_tile_size(self):
+        with pytest.raises(ValueError):
+            tile_grid(8, 8, 0)
+
+
+class TestTileView:
+
+    def test_single_tile_is_the_full_view(self):
+        bounds = (10.0, 90.0, 5.0, 85.0)
+        assert tile_view(0, 0, 100, 100, 100, bounds) == ((0.0, 0.0), bounds)
+
+    def test_quadrants(self):
+        bounds = (10.0, 90.0, 5.0, 85.0)
+        # Top-left tile: the image centre is right of and below the tile centre
+        position, tile_bounds = tile_view(0, 0, 50, 50, 100, bounds)
+        assert position == (25.0, -25.0)
+        assert tile_bounds == (10.0, 90.0, -45.0, 35.0)
+        # Bottom-right tile starts at the GL origin of the full image
+        position, tile_bounds = tile_view(50, 50, 50, 50, 100, bounds)
+        assert position == (-25.0, 25.0)
+        assert tile_bounds == (-40.0, 40.0, 5.0, 85.0)
+
+
+class TestDownsample:
+
+    def test_factor_one_is_identity(self):
+        pixels = np.arange(64, dtype=np.uint8).reshape(4, 4, 4)
+        assert downsample(pixels, 1) is pixels
+
+    def test_transparent_pixels_do_not_darken(self):
+        pixels = np.zeros((2, 2, 4), dtype=np.uint8)
+        pixels[0, 0] = (200, 100, 50, 255)
+        out = downsample(pixels, 2)
+        assert out.shape == (1, 1, 4)
+        assert tuple(out[0, 0]) == (200, 100, 50, 64)
+
+    def test_fully_transparent_block(self):
+        out = downsample(np.zeros((4, 4, 4), dtype=np.uint8), 2)
+        assert out.shape == (2, 2, 4) and not out.any()
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Streaming PNG
+# ══════════════════════════════════════════════════════════════════════════
+
+class TestStreamingPNGWriter:
+
+    def test_round_trip_in_bands(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tiled_export, "IDAT_CHUNK_SIZE", 64)  # several IDAT chunks
+        rng = np.random.default_rng(1)
+        image = rng.integers(0, 256, size=(13, 7, 4), dtype=np.uint8)
+        path = tmp_path / "out.png"
+        with StreamingPNGWriter(str(path), 7, 13) as writer:
+            for start in range(0, 13, 5):
+                writer.write_rows(image[start:start + 5])
+        with Image.open(path) as img:
+            assert img.mode == "RGBA" and img.size == (7, 13)
+            np.testing.assert_array_equal(np.asarray(img), image)
+
+    def test_missing_rows(self, tmp_path):
+        writer = StreamingPNGWriter(str(tmp_path / "short.png"), 2, 2)
+        writer.write_rows(np.zeros((1, 2, 4), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            writer.close()
+
+    def test_wrong_width(self, tmp_path):
+        with StreamingPNGWriter(str(tmp_path / "w.png"), 2, 1) as writer:
+            with pytest.raises(ValueError):
+                writer.write_rows(np.zeros((1, 3, 4), dtype=np.uint8))
+            writer.write_rows(np.zeros((1, 2, 4), dtype=np.uint8))
+
+
+# ══════════════════════════════════════════════════════════════════════════
+# Tiled export
+# ══════════════════════════════════════════════════════════════════════════
+
+def _reference(size):
+    """Output image the fake renderer draws: a per-pixel gradient."""
+    ys, xs = np.mgrid[0:size, 0:size]
+    image = np.empty((size, size, 4), dtype=np.uint8)
+    image[..., 0] = xs % 256
+    image[..., 1] = ys % 256
+    image[..., 2] = (xs + ys) % 256
+    image[..., 3] = 255
+    return image
+
+
+class FakeRenderer:
+    """render_tile() returning bottom-up, supersampled pixels of _reference."""
+
+    def __init__(self, size, supersample=1):
+        self.image = _reference(size)
+        self.supersample = supersample
+        self.calls = []
+
+    def __call__(self, x, y, w, h):
+        self.calls.append((x, y, w, h))
+        tile = self.image[y:y + h, x:x + w]
+        tile = np.repeat(np.repeat(tile, self.supersample, axis=0), self.supersample, axis=1)
+        return tile[::-1].copy()
+
+
+class TestTiledExport:
+
+    @pytest.mark.parametrize("supersample", [1, 2])
+    def test_assembles_image(self, tmp_path, supersample):
+        path = str(tmp_path / "big.png")
+        renderer = FakeRenderer(37, supersample)
+        export = TiledExport(path, 37, renderer, supersample=supersample, tile_size=16)
+        assert export.tiles_total == 9
+        assert export.run() == path
+        assert export.tiles_done == 9 and renderer.calls[-1] == (32, 32, 5, 5)
+        with Image.open(path) as img:
+            np.testing.assert_array_equal(np.asarray(img), renderer.image)
+        assert not os.path.exists(path + ".part")
+
+    def test_step_and_on_close(self, tmp_path):
+        closed = []
+        export = TiledExport(str(tmp_path / "s.png"), 8, FakeRenderer(8), tile_size=4,
+                             on_close=lambda: closed.append(True))
+        assert [export.step() for _ in range(4)] == [True, True, True, False]
+        assert closed == [True]
+        export.finish()
+        assert closed == [True]
+
+    def test_bands_written_as_rows_complete(self, tmp_path, monkeypatch):
+        written = []
+        original = StreamingPNGWriter.write_rows
+        monkeypatch.setattr(StreamingPNGWriter, "write_rows",
+                            lambda self, rows: (written.append(rows.shape), original(self, rows)))
+        TiledExport(str(tmp_path / "b.png"), 10, FakeRenderer(10), tile_size=4).run()
+        assert written == [(4, 10, 4), (4, 10, 4), (2, 10, 4)]
+
+    def test_cancel_removes_partial_file(self, tmp_path):
+        path = tmp_path / "c.png"
+        closed = []
+        export = TiledExport(str(path), 8, FakeRenderer(8), tile_size=4, on_close=lambda: closed.append(True))
+        export.step()
+        export.cancel()
+        assert closed == [True]
+        assert not path.exists() and not (tmp_path / "c.png.part").exists()
+        with pytest.raises(RuntimeError):
+            export.step()
+
+    def test_render_error_cancels(self, tmp_path):
+        def broken(x, y, w, h):
+            raise RuntimeError("GL error")
+
+        export = TiledExport(str(tmp_path / "e.png"), 8, broken, tile_size=4)
+        with pytest.raises(RuntimeError, match="GL error"):
+            export.step()
+        assert export.cancelled
+        assert not list(tmp_path.iterdir())
+
+    def test_writer_error_reported(self, tmp_path):
+        def wrong_size(x, y, w, h):
+            return np.zeros((h, w + 1, 4), dtype=np.uint8)
+
+        export = TiledExport(str(tmp_path / "w.png"), 4, wrong_size, tile_size=4)
+        with pytest.raises(RuntimeError, match="Tiled export failed"):
+            export.finish()
+        assert not list(tmp_path.iterdir())
+
+    def test_limits(self, tmp_path):
+        with pytest.raises(ValueError):
+            TiledExport(str(tmp_path / "x.png"), tiled_export.MAX_EXPORT_SIZE + 1, FakeRenderer(1))
+        with pytest.raises(ValueError):
+            TiledExport(str(tmp_path / "x.png"), 8, FakeRenderer(8), supersample=8)